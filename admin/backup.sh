@@ -17,6 +17,12 @@ if [ -f "/workspaces/Crypto-signal-bot/bot_stats.json" ]; then
     echo "✅ bot_stats.json backup създаден"
 fi
 
+# Backup на bot_stats_events.jsonl (пълната история на сигналите)
+if [ -f "/workspaces/Crypto-signal-bot/bot_stats_events.jsonl" ]; then
+    cp /workspaces/Crypto-signal-bot/bot_stats_events.jsonl "$BACKUP_DIR/bot_stats_events_$DATE.jsonl"
+    echo "✅ bot_stats_events.jsonl backup създаден"
+fi
+
 # Backup на credentials.json
 if [ -f "/workspaces/Crypto-signal-bot/admin/credentials.json" ]; then
     cp /workspaces/Crypto-signal-bot/admin/credentials.json "$BACKUP_DIR/credentials_$DATE.json"
@@ -30,7 +36,7 @@ if [ -f "/workspaces/Crypto-signal-bot/admin/admin_password.json" ]; then
 fi
 
 # Изтрий backups по-стари от 30 дни
-find "$BACKUP_DIR" -name "*.json" -type f -mtime +30 -delete
+find "$BACKUP_DIR" \( -name "*.json" -o -name "*.jsonl" \) -type f -mtime +30 -delete
 echo "🗑️ Стари backups изтрити (>30 дни)"
 
 echo "✅ Backup процес завършен!"
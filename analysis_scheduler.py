@@ -0,0 +1,262 @@
+"""
+⏱️ Analysis Scheduler
+Candle-close-aligned scheduling of the auto signal analysis
+
+The auto signal jobs ran as staggered APScheduler crons (1h at :05, 2h at
+:07, 4h at :10, 1d at 09:15 local time): not aligned to the UTC candle
+closes, and at 00:00 UTC four separate passes fetched the same klines.
+CandleCloseScheduler fires once per candle close:
+
+- Alignment: a pass starts `settle_delay` seconds after the UTC close of
+  the candle (Binance candles are aligned to the epoch; 1w to Monday)
+- Coalescing: timeframes closing at the same instant (1h+2h+4h at 00:00,
+  + 1d at midnight) run as ONE pass, so the handler can share fetches
+- Concurrency: at most `max_concurrency` passes run at once; closes that
+  fire while the limit is reached are merged into a single pending pass
+- Deadline: a pass running longer than its budget is cancelled
+- Lag metrics: start lag (start - close), duration and outcome per run,
+  kept in a bounded history plus per-timeframe aggregates
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAME_SECONDS = {
+    '1m': 60, '3m': 180, '5m': 300, '15m': 900, '30m': 1800,
+    '1h': 3600, '2h': 7200, '4h': 14400, '6h': 21600, '8h': 28800, '12h': 43200,
+    '1d': 86400, '3d': 259200, '1w': 604800,
+}
+
+# Epoch (1970-01-01) is a Thursday; Binance weekly candles open on Monday 00:00 UTC
+WEEK_OFFSET = 4 * 86400
+
+DEFAULT_SETTLE_DELAY = 5.0      # seconds after the close (lets the exchange publish the candle)
+DEFAULT_DEADLINE_RATIO = 0.5    # deadline = ratio x shortest timeframe of the pass
+HISTORY_SIZE = 200
+MAX_SLEEP = 60.0                # re-check the wall clock at least this often (clock changes, suspend)
+
+PassHandler = Callable[[Tuple[str, ...], datetime], Awaitable[Any]]
+
+
+def next_close(timeframe: str, now: float) -> float:
+    """
+    Next candle close of a timeframe strictly after `now`
+
+    Args:
+        timeframe: Binance interval ('1h', '4h', '1d', '1w', ...)
+        now: Unix timestamp
+
+    Returns:
+        Unix timestamp of the close
+    """
+    period = TIMEFRAME_SECONDS[timeframe]
+    offset = WEEK_OFFSET if timeframe == '1w' else 0
+    return ((now - offset) // period + 1) * period + offset
+
+
+def due_timeframes(timeframes: Iterable[str], now: float) -> Tuple[float, Tuple[str, ...]]:
+    """
+    Earliest upcoming close and every timeframe that closes at that instant
+
+    Returns:
+        (close timestamp, timeframes sorted shortest first)
+    """
+    closes = {timeframe: next_close(timeframe, now) for timeframe in timeframes}
+    earliest = min(closes.values())
+    due = sorted((tf for tf, close in closes.items() if close == earliest), key=TIMEFRAME_SECONDS.get)
+    return earliest, tuple(due)
+
+
+class CandleCloseScheduler:
+    """
+    Runs an analysis pass at every candle close of the given timeframes
+
+    Args:
+        handler: async handler(timeframes, close_time) - one pass for all due timeframes
+        timeframes: Timeframes to follow
+        settle_delay: Seconds to wait after the close before starting
+        max_concurrency: Passes allowed to run at the same time
+        deadline: Pass budget in seconds (None = DEFAULT_DEADLINE_RATIO x shortest timeframe)
+        clock: Wall clock (Unix seconds), injectable for tests
+    """
+
+    def __init__(
+        self,
+        handler: PassHandler,
+        timeframes: Iterable[str],
+        settle_delay: float = DEFAULT_SETTLE_DELAY,
+        max_concurrency: int = 1,
+        deadline: Optional[float] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAME_SECONDS]
+        if unknown:
+            raise ValueError(f"Unsupported timeframes: {unknown}")
+
+        self.handler = handler
+        self.timeframes = tuple(dict.fromkeys(timeframes))
+        self.settle_delay = settle_delay
+        self.max_concurrency = max(1, max_concurrency)
+        self.deadline = deadline
+        self.clock = clock
+        self.max_sleep = MAX_SLEEP
+
+        self._running = 0
+        self._pending: Optional[Tuple[set, float]] = None  # (timeframes, latest close) merged while busy
+        self._tasks = set()
+        self._loop_task: Optional[asyncio.Task] = None
+
+        self.history: deque = deque(maxlen=HISTORY_SIZE)
+        self.stats = {'passes': 0, 'ok': 0, 'timeout': 0, 'error': 0, 'coalesced': 0}
+        self._by_timeframe: Dict[str, Dict[str, float]] = {}
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    def start(self) -> asyncio.Task:
+        """Start the scheduling loop on the running event loop"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"⏱️ Candle-close scheduler started for {', '.join(self.timeframes)}")
+        return self._loop_task
+
+    async def stop(self):
+        """Stop scheduling and cancel running passes"""
+        tasks = [task for task in (self._loop_task, *self._tasks) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+
+    async def _run(self):
+        close, due = due_timeframes(self.timeframes, self.clock())
+        while True:
+            delay = close + self.settle_delay - self.clock()
+            if delay > 0:
+                await asyncio.sleep(min(delay, self.max_sleep))
+                continue
+            self.trigger(due, close)
+            close, due = due_timeframes(self.timeframes, close)
+
+    def trigger(self, timeframes: Iterable[str], close: float) -> Optional[asyncio.Task]:
+        """
+        Start a pass for the given closed candles (or merge it into the pending pass)
+
+        Returns:
+            The started task, or None if the pass was coalesced
+        """
+        if self._running >= self.max_concurrency:
+            if self._pending is None:
+                self._pending = (set(timeframes), close)
+            else:
+                self._pending[0].update(timeframes)
+                self._pending = (self._pending[0], max(self._pending[1], close))
+            self.stats['coalesced'] += 1
+            logger.warning(f"⏳ Analysis pass busy - {', '.join(timeframes)} merged into the next pass")
+            return None
+
+        self._running += 1
+        task = asyncio.get_running_loop().create_task(
+            self._execute(tuple(sorted(set(timeframes), key=TIMEFRAME_SECONDS.get)), close))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _deadline_for(self, timeframes: Tuple[str, ...]) -> float:
+        if self.deadline is not None:
+            return self.deadline
+        return DEFAULT_DEADLINE_RATIO * min(TIMEFRAME_SECONDS[tf] for tf in timeframes)
+
+    async def _execute(self, timeframes: Tuple[str, ...], close: float):
+        started = self.clock()
+        close_time = datetime.fromtimestamp(close, tz=timezone.utc)
+        status = 'ok'
+        try:
+            await asyncio.wait_for(self.handler(timeframes, close_time), timeout=self._deadline_for(timeframes))
+        except asyncio.TimeoutError:
+            status = 'timeout'
+            logger.error(f"⏰ Analysis pass {'+'.join(timeframes)} exceeded its "
+                         f"{self._deadline_for(timeframes):.0f}s deadline - cancelled")
+        except asyncio.CancelledError:
+            status = 'cancelled'
+            raise
+        except Exception as e:
+            status = 'error'
+            logger.error(f"❌ Analysis pass {'+'.join(timeframes)} failed: {e}")
+        finally:
+            self._record(timeframes, close, started, self.clock(), status)
+            self._running -= 1
+            if status != 'cancelled' and self._pending is not None:
+                pending, self._pending = self._pending, None
+                self.trigger(pending[0], pending[1])
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _record(self, timeframes: Tuple[str, ...], close: float, started: float, finished: float, status: str):
+        run = {
+            'timeframes': timeframes,
+            'close': datetime.fromtimestamp(close, tz=timezone.utc).isoformat(),
+            'start_lag': started - close,
+            'duration': finished - started,
+            'finish_lag': finished - close,
+            'status': status,
+        }
+        self.history.append(run)
+        self.stats['passes'] += 1
+        if status in self.stats:
+            self.stats[status] += 1
+
+        for timeframe in timeframes:
+            entry = self._by_timeframe.setdefault(
+                timeframe, {'runs': 0, 'lag_sum': 0.0, 'max_lag': 0.0, 'duration_sum': 0.0, 'max_duration': 0.0})
+            entry['runs'] += 1
+            entry['lag_sum'] += run['start_lag']
+            entry['max_lag'] = max(entry['max_lag'], run['start_lag'])
+            entry['duration_sum'] += run['duration']
+            entry['max_duration'] = max(entry['max_duration'], run['duration'])
+
+        level = logging.INFO if status == 'ok' else logging.WARNING
+        logger.log(level, f"⏱️ Pass {'+'.join(timeframes)} @ {run['close']}: start lag {run['start_lag']:.1f}s, "
+                          f"duration {run['duration']:.1f}s ({status})")
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Lag metrics
+
+        Returns:
+            {'stats', 'timeframes': {tf: runs/avg_lag/max_lag/avg_duration/max_duration}, 'last'}
+        """
+        timeframes = {}
+        for timeframe, entry in self._by_timeframe.items():
+            runs = entry['runs']
+            timeframes[timeframe] = {
+                'runs': runs,
+                'avg_lag': entry['lag_sum'] / runs,
+                'max_lag': entry['max_lag'],
+                'avg_duration': entry['duration_sum'] / runs,
+                'max_duration': entry['max_duration'],
+            }
+        return {
+            'stats': dict(self.stats),
+            'timeframes': timeframes,
+            'last': self.history[-1] if self.history else None,
+            'running': self._running,
+        }
+
+    def upcoming(self, count: int = 5) -> List[Tuple[datetime, Tuple[str, ...]]]:
+        """Next `count` passes as (close time UTC, timeframes)"""
+        result = []
+        now = self.clock()
+        for _ in range(count):
+            now, due = due_timeframes(self.timeframes, now)
+            result.append((datetime.fromtimestamp(now, tz=timezone.utc), due))
+        return result
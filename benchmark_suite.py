@@ -0,0 +1,475 @@
+"""
+⏱️ Benchmark Suite
+Reproducible timings of the ICT detectors, signal engine, chart and monitor
+
+Every case runs on synthetic_ohlcv frames (trend / range / volatile regimes,
+200-50 000 bars, fixed seed), so two runs on the same machine measure the
+code, not the market. Results are written as JSON baselines and a later run
+is compared against them:
+
+    python benchmark_suite.py run --output baseline.json
+    python benchmark_suite.py run --output current.json --quick
+    python benchmark_suite.py compare baseline.json current.json --threshold 0.2
+
+`compare` exits with status 1 when a case got slower than the threshold
+(median of the repeats, relative change), so it can gate a CI job.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from synthetic_ohlcv import DEFAULT_SEED, REGIMES, generate_ohlcv
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = (200, 1000, 5000, 50000)
+QUICK_SIZES = (200, 1000)
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.20        # +20% median time = regression
+CASE_TIME_BUDGET = 20.0         # stop repeating a case after this many seconds (>= 1 run)
+MONITOR_POSITIONS = 20
+
+SYMBOL = 'BTCUSDT'
+TIMEFRAME = '1h'
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    One benchmarked call
+
+    Args:
+        name: Case name used as the baseline key prefix
+        setup: setup(df) -> zero-argument callable that performs the measured work
+        max_bars: Largest frame the case is run on (None = all sizes)
+        prepared: Pass the frame as the signal engine hands it to the detectors
+            (timestamp index, atr / volume_ratio columns) instead of raw klines
+    """
+    name: str
+    setup: Callable[[pd.DataFrame], Callable[[], Any]]
+    max_bars: Optional[int] = None
+    prepared: bool = True
+
+
+# ----------------------------------------------------------------------
+# Cases
+# ----------------------------------------------------------------------
+
+def _order_blocks(df):
+    from order_block_detector import OrderBlockDetector
+    return lambda: OrderBlockDetector().detect_order_blocks(df, TIMEFRAME)
+
+
+def _fvgs(df):
+    from fvg_detector import FVGDetector
+    return lambda: FVGDetector().detect_fvgs(df, TIMEFRAME)
+
+
+def _whale_blocks(df):
+    from ict_whale_detector import WhaleDetector
+    return lambda: WhaleDetector().detect_whale_blocks(df, TIMEFRAME)
+
+
+def _liquidity(df):
+    from liquidity_map import LiquidityMapper
+
+    def run():
+        mapper = LiquidityMapper()
+        zones = mapper.detect_liquidity_zones(df, TIMEFRAME)
+        return mapper.detect_liquidity_sweeps(df, zones)
+    return run
+
+
+def _ilp(df):
+    from ilp_detector import InternalLiquidityPoolDetector
+    return lambda: InternalLiquidityPoolDetector().analyze(df)
+
+
+def _luxalgo_sr(df):
+    from luxalgo_sr_mtf import LuxAlgoSRMTF
+    return lambda: LuxAlgoSRMTF().analyze(df)
+
+
+def _fibonacci(df):
+    from fibonacci_analyzer import FibonacciAnalyzer
+    bias = 'BULLISH' if df['close'].iloc[-1] >= df['open'].iloc[0] else 'BEARISH'
+    return lambda: FibonacciAnalyzer().analyze(df, bias)
+
+
+def _klines_parse(df):
+    from candle_frame import klines_to_frame
+    opens = (df['timestamp'].astype('int64') // 10 ** 6).tolist()
+    klines = [[t, f"{o:.8f}", f"{h:.8f}", f"{lo:.8f}", f"{c:.8f}", f"{v:.8f}", t, "0", 0, "0", "0", "0"]
+              for t, o, h, lo, c, v in zip(opens, df['open'], df['high'], df['low'], df['close'], df['volume'])]
+    return lambda: klines_to_frame(klines)
+
+
+def _generate_signal(df):
+    from ict_signal_engine import ICTSignalEngine
+    engine = ICTSignalEngine()
+    engine.cache_manager = None  # every run must do the full analysis
+    return lambda: engine.generate_signal(df.copy(), SYMBOL, TIMEFRAME)
+
+
+@lru_cache(maxsize=1)
+def _engine():
+    from ict_signal_engine import ICTSignalEngine
+    return ICTSignalEngine()
+
+
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Raw klines -> the frame ICTSignalEngine passes to its detectors"""
+    return _engine()._prepare_dataframe(df)
+
+
+def _benchmark_signal(df):
+    """ICTSignal around the last close, carrying real detector zones for the chart"""
+    from fvg_detector import FVGDetector
+    from ict_signal_engine import ICTSignal, MarketBias, SignalStrength, SignalType
+    from order_block_detector import OrderBlockDetector
+
+    prepared = prepare_frame(df)
+    entry = float(df['close'].iloc[-1])
+    return ICTSignal(
+        timestamp=df['timestamp'].iloc[-1].to_pydatetime(),
+        symbol=SYMBOL,
+        timeframe=TIMEFRAME,
+        signal_type=SignalType.BUY,
+        signal_strength=SignalStrength.STRONG,
+        entry_price=entry,
+        sl_price=entry * 0.98,
+        tp_prices=[entry * 1.02, entry * 1.04, entry * 1.06],
+        confidence=70.0,
+        risk_reward_ratio=3.0,
+        order_blocks=[ob.to_dict() for ob in OrderBlockDetector().detect_order_blocks(prepared, TIMEFRAME)[-5:]],
+        fair_value_gaps=[fvg.to_dict() for fvg in FVGDetector().detect_fvgs(prepared, TIMEFRAME)[-5:]],
+        bias=MarketBias.BULLISH,
+    )
+
+
+def _chart(df):
+    import matplotlib
+    matplotlib.use('Agg')
+    from chart_generator import ChartGenerator
+
+    generator = ChartGenerator()
+    signal = _benchmark_signal(df)
+    return lambda: generator.generate(df, signal, SYMBOL, TIMEFRAME)
+
+
+class _NullBot:
+    """Telegram stand-in: accepts every send"""
+
+    async def send_message(self, chat_id, text, **kwargs):
+        return SimpleNamespace(chat_id=chat_id, text=text, photo=None)
+
+
+def _monitor_loop(df):
+    """
+    RealTimePositionMonitor._check_all_signals over the frame's closes
+
+    One tick per bar for MONITOR_POSITIONS positions with TP/SL 1-10% away;
+    prices come from the frame instead of Binance and alerts are queued on a
+    throw-away dispatcher (the monitor's side of the work is measured).
+    """
+    from real_time_monitor import RealTimePositionMonitor
+    from telegram_dispatcher import get_telegram_dispatcher, reset_telegram_dispatcher
+
+    closes = df['close'].to_numpy()
+    symbols = [f"SYM{i}USDT" for i in range(4)]
+
+    async def scenario():
+        reset_telegram_dispatcher()
+        monitor = RealTimePositionMonitor(_NullBot(), None, 0, '', '')
+        tick = {'index': 0}
+
+        async def price(symbol):
+            return float(closes[tick['index']]) * (1 + 0.001 * symbols.index(symbol))
+
+        async def klines(symbol, timeframe, limit=100):
+            return None
+
+        monitor._fetch_current_price = price
+        monitor._fetch_klines = klines
+
+        for i in range(MONITOR_POSITIONS):
+            symbol = symbols[i % len(symbols)]
+            entry = float(closes[0]) * (1 + 0.001 * symbols.index(symbol))
+            distance = 0.01 * (1 + i % 10)
+            side = 'BUY' if i % 2 == 0 else 'SELL'
+            tp, sl = (entry * (1 + distance), entry * (1 - distance)) if side == 'BUY' else \
+                (entry * (1 - distance), entry * (1 + distance))
+            monitor.add_signal(f"bench-{i}", symbol, side, entry, tp, sl, 70.0, TIMEFRAME, user_chat_id=1)
+
+        for index in range(len(closes)):
+            tick['index'] = index
+            await monitor._check_all_signals()
+
+        await get_telegram_dispatcher().stop()
+        reset_telegram_dispatcher()
+
+    return lambda: asyncio.run(scenario())
+
+
+# order_blocks / fvg are quadratic in the frame length (~1s at 1000 volatile bars) - capped
+CASES: Dict[str, BenchmarkCase] = {case.name: case for case in [
+    BenchmarkCase('order_blocks', _order_blocks, max_bars=5000),
+    BenchmarkCase('fvg', _fvgs, max_bars=5000),
+    BenchmarkCase('whale_blocks', _whale_blocks),
+    BenchmarkCase('liquidity_map', _liquidity),
+    BenchmarkCase('ilp', _ilp),
+    BenchmarkCase('luxalgo_sr', _luxalgo_sr, prepared=False),
+    BenchmarkCase('fibonacci', _fibonacci),
+    BenchmarkCase('klines_parse', _klines_parse, prepared=False),
+    BenchmarkCase('generate_signal', _generate_signal, max_bars=5000, prepared=False),
+    BenchmarkCase('chart', _chart, max_bars=1000, prepared=False),
+    BenchmarkCase('monitor_loop', _monitor_loop, max_bars=5000, prepared=False),
+]}
+
+
+# ----------------------------------------------------------------------
+# Running
+# ----------------------------------------------------------------------
+
+def time_callable(fn: Callable[[], Any], repeat: int = DEFAULT_REPEAT, warmup: int = 1,
+                  budget: float = CASE_TIME_BUDGET) -> Dict[str, float]:
+    """
+    Time a callable
+
+    Args:
+        fn: Zero-argument callable
+        repeat: Timed runs (fewer if the budget runs out, never less than one)
+        warmup: Untimed runs first (imports, caches, JIT-like first-call costs)
+        budget: Seconds after which no further runs are started
+
+    Returns:
+        {'median', 'min', 'max', 'mean', 'runs'} in seconds
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    started = time.perf_counter()
+    for _ in range(max(1, repeat)):
+        run_started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - run_started)
+        if time.perf_counter() - started > budget:
+            break
+
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'mean': statistics.fmean(timings),
+        'runs': len(timings),
+    }
+
+
+def result_key(case: str, regime: str, bars: int) -> str:
+    return f"{case}/{regime}/{bars}"
+
+
+def run_suite(
+    cases: Optional[Iterable[str]] = None,
+    regimes: Optional[Iterable[str]] = None,
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = DEFAULT_SEED,
+    warmup: int = 1
+) -> Dict[str, Any]:
+    """
+    Run the benchmark matrix (case x regime x size)
+
+    Args:
+        cases: Case names (default: all CASES)
+        regimes: Regime names (default: all REGIMES)
+        sizes: Frame sizes in bars
+        repeat: Timed runs per combination
+        seed: Generator seed (stored in the result; baselines must share it)
+        warmup: Untimed runs per combination
+
+    Returns:
+        {'meta': {...}, 'results': {'case/regime/bars': timing}}
+    """
+    case_names = list(cases) if cases else list(CASES)
+    unknown = [name for name in case_names if name not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {unknown}")
+    regime_names = list(regimes) if regimes else list(REGIMES)
+
+    results = {}
+    for regime in regime_names:
+        for bars in sizes:
+            frames = {False: generate_ohlcv(bars, regime, seed=seed)}
+            for name in case_names:
+                case = CASES[name]
+                if case.max_bars is not None and bars > case.max_bars:
+                    continue
+                if case.prepared and True not in frames:
+                    frames[True] = prepare_frame(frames[False])
+                key = result_key(name, regime, bars)
+                try:
+                    results[key] = time_callable(case.setup(frames[case.prepared]), repeat=repeat, warmup=warmup)
+                except Exception as e:
+                    logger.error(f"❌ Benchmark {key} failed: {e}")
+                    results[key] = {'error': str(e)}
+                    continue
+                logger.info(f"⏱️ {key}: median {results[key]['median'] * 1000:.2f}ms "
+                            f"({results[key]['runs']} runs)")
+
+    return {
+        'meta': {
+            'schema': SCHEMA_VERSION,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'seed': seed,
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': f"{platform.system()} {platform.machine()}",
+        },
+        'results': results,
+    }
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    """Write a run as a JSON baseline"""
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Read a JSON baseline written by save_results"""
+    with open(path) as f:
+        return json.load(f)
+
+
+# ----------------------------------------------------------------------
+# Comparison
+# ----------------------------------------------------------------------
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Compare two runs case by case (median times)
+
+    Args:
+        baseline: Earlier run (load_results / run_suite output)
+        current: New run
+        threshold: Relative change that counts as a regression / improvement
+
+    Returns:
+        Rows {'key', 'baseline', 'current', 'change', 'status'} where status is
+        'regression', 'improvement', 'ok', 'new', 'missing' or 'error'
+    """
+    base_results = baseline.get('results', {})
+    current_results = current.get('results', {})
+    if baseline.get('meta', {}).get('seed') != current.get('meta', {}).get('seed'):
+        logger.warning("⚠️ Baseline and current run use different seeds - timings are not comparable")
+
+    rows = []
+    for key in sorted(set(base_results) | set(current_results)):
+        before = base_results.get(key, {}).get('median')
+        after = current_results.get(key, {}).get('median')
+        row = {'key': key, 'baseline': before, 'current': after, 'change': None}
+        if key not in current_results:
+            row['status'] = 'missing'
+        elif key not in base_results:
+            row['status'] = 'new'
+        elif before is None or after is None:
+            row['status'] = 'error'
+        else:
+            row['change'] = (after - before) / before if before > 0 else 0.0
+            if row['change'] > threshold:
+                row['status'] = 'regression'
+            elif row['change'] < -threshold:
+                row['status'] = 'improvement'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """Plain-text table of compare_results rows"""
+    icons = {'regression': '🔴', 'improvement': '🟢', 'ok': '⚪', 'new': '🆕', 'missing': '❔', 'error': '❌'}
+    lines = [f"{'case/regime/bars':<36} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for row in rows:
+        before = f"{row['baseline'] * 1000:.2f}ms" if row['baseline'] is not None else '-'
+        after = f"{row['current'] * 1000:.2f}ms" if row['current'] is not None else '-'
+        change = f"{row['change'] * 100:+.1f}%" if row['change'] is not None else '-'
+        lines.append(f"{row['key']:<36} {before:>12} {after:>12} {change:>9} {icons[row['status']]} {row['status']}")
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='ICT bot benchmark suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the benchmarks and write a JSON baseline')
+    run_parser.add_argument('--output', '-o', required=True, help='JSON file to write')
+    run_parser.add_argument('--cases', nargs='+', choices=sorted(CASES), help='Cases to run (default: all)')
+    run_parser.add_argument('--regimes', nargs='+', choices=sorted(REGIMES), help='Regimes (default: all)')
+    run_parser.add_argument('--sizes', nargs='+', type=int, help=f'Frame sizes (default: {DEFAULT_SIZES})')
+    run_parser.add_argument('--quick', action='store_true', help=f'Only {QUICK_SIZES} bars')
+    run_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    run_parser.add_argument('--compare', metavar='BASELINE', help='Compare the new run against a baseline')
+    run_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    compare_parser = commands.add_parser('compare', help='Compare two JSON runs')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+    # Detector / engine chatter would dominate the output - only errors and our progress lines
+    logging.basicConfig(level=logging.ERROR, format='%(message)s')
+    logger.setLevel(logging.INFO)
+
+    if args.command == 'run':
+        sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+        current = run_suite(args.cases, args.regimes, sizes, repeat=args.repeat, seed=args.seed)
+        save_results(current, args.output)
+        print(f"✅ {len(current['results'])} results written to {args.output}")
+        if not args.compare:
+            return 0
+        baseline = load_results(args.compare)
+    else:
+        baseline, current = load_results(args.baseline), load_results(args.current)
+
+    rows = compare_results(baseline, current, args.threshold)
+    print(format_comparison(rows))
+    regressions = [row for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"🔴 {len(regressions)} regression(s) above {args.threshold * 100:.0f}%")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
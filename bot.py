@@ -131,6 +131,7 @@ try:
     from order_block_detector import OrderBlockDetector
     from fvg_detector import FVGDetector
     from real_time_monitor import RealTimePositionMonitor
+    from stage_profiler import get_stage_profiler, TOTAL_STAGE
     ICT_SIGNAL_ENGINE_AVAILABLE = True
     logger.info("✅ ICT Signal Engine loaded")
     ict_engine_global = ICTSignalEngine()  # Global initialization for logs
@@ -179,6 +180,17 @@ try:
     position_manager_global = PositionManager()
     logger.info(f"✅ Position Manager initialized: {position_manager_global}")
     logger.info(f"🔍 DIAGNOSTIC: Database path: {position_manager_global.db_path if hasattr(position_manager_global, 'db_path') else 'UNKNOWN'}")
+
+    # Portfolio state: running risk totals, rebuilt once and then event-driven
+    try:
+        from portfolio_state import get_portfolio_state
+        portfolio_state_global = get_portfolio_state()
+        portfolio_state_global.rebuild_from_db(position_manager_global.db_path)
+        position_manager_global.portfolio_state = portfolio_state_global
+        if RISK_MANAGER_AVAILABLE:
+            get_risk_manager().attach_portfolio_state(portfolio_state_global)
+    except ImportError as e:
+        logger.warning(f"⚠️ Portfolio state not available: {e}")
 except ImportError as e:
     POSITION_MANAGER_AVAILABLE = False
     logger.warning(f"⚠️ Position Manager not available: {e}")
@@ -256,6 +268,37 @@ except ImportError as e:
     ML_PREDICTOR_AVAILABLE = False
     print(f"⚠️ ML Predictor not available: {e}")
 
+# ================= OUTBOUND TELEGRAM QUEUE =================
+try:
+    from telegram_dispatcher import (
+        get_telegram_dispatcher, PRIORITY_CRITICAL, PRIORITY_ALERT, PRIORITY_SIGNAL, PRIORITY_NEWS
+    )
+    TELEGRAM_DISPATCHER_AVAILABLE = True
+    print("✅ Telegram Dispatcher loaded successfully")
+except ImportError as e:
+    TELEGRAM_DISPATCHER_AVAILABLE = False
+    PRIORITY_CRITICAL, PRIORITY_ALERT, PRIORITY_SIGNAL, PRIORITY_NEWS = 0, 1, 2, 3
+    print(f"⚠️ Telegram Dispatcher not available: {e}")
+
+try:
+    from analysis_scheduler import CandleCloseScheduler
+    ANALYSIS_SCHEDULER_AVAILABLE = True
+    print("✅ Candle-close Analysis Scheduler loaded successfully")
+except ImportError as e:
+    ANALYSIS_SCHEDULER_AVAILABLE = False
+    print(f"⚠️ Candle-close Analysis Scheduler not available: {e}")
+
+try:
+    from signal_broadcast import (
+        SUBSCRIPTION_DEFAULTS, get_signal_broadcaster, select_subscribers, subscription_settings
+    )
+    SIGNAL_BROADCAST_AVAILABLE = True
+    print("✅ Signal Broadcast loaded successfully")
+except ImportError as e:
+    SIGNAL_BROADCAST_AVAILABLE = False
+    SUBSCRIPTION_DEFAULTS = {}
+    print(f"⚠️ Signal Broadcast not available: {e}")
+
 # ================= LOGGING SETUP (EARLY) =================
 # Logging already configured at line 35 with RotatingFileHandler at line 72
 # No need for duplicate basicConfig() call to avoid double logging
@@ -263,11 +306,16 @@ except ImportError as e:
 
 # ICT Enhancement Layer
 try:
-    from config.config_loader import load_feature_flags, update_feature_flag
+    from config.config_loader import load_feature_flags, update_feature_flag, feature_flag_integration_enabled
     from ict_enhancement.ict_enhancer import ICTEnhancer
     
-    FEATURE_FLAGS = load_feature_flags()
-    ict_enhancer = ICTEnhancer(FEATURE_FLAGS)
+    if feature_flag_integration_enabled():
+        FEATURE_FLAGS = load_feature_flags()
+        ict_enhancer = ICTEnhancer(FEATURE_FLAGS)
+    else:
+        logger.info("ℹ️ ICT Enhancement disabled (FEATURE_FLAG_INTEGRATION=false)")
+        FEATURE_FLAGS = {'use_ict_enhancer': False}
+        ict_enhancer = None
 except ImportError as e:
     logger.warning(f"ICT Enhancement not available: {e}")
     FEATURE_FLAGS = {'use_ict_enhancer': False}
@@ -347,20 +395,32 @@ ACCESS_DENIED_MESSAGE = (
 ADMIN_PASSWORD_HASH = os.getenv('ADMIN_PASSWORD_HASH', hashlib.sha256("8109".encode()).hexdigest())
 
 # Binance API endpoints (от .env или fallback към defaults)
-BINANCE_PRICE_URL = os.getenv('BINANCE_PRICE_URL', "https://api.binance.com/api/v3/ticker/price")
-BINANCE_24H_URL = os.getenv('BINANCE_24H_URL', "https://api.binance.com/api/v3/ticker/24hr")
-BINANCE_KLINES_URL = os.getenv('BINANCE_KLINES_URL', "https://api.binance.com/api/v3/klines")
+# BINANCE_API_BASE пренасочва ВСИЧКИ заявки (напр. към локалния stand-in от market_data_backend.py)
+from market_data_backend import binance_api_base
+BINANCE_API_BASE = binance_api_base()
+BINANCE_PRICE_URL = os.getenv('BINANCE_PRICE_URL', f"{BINANCE_API_BASE}/api/v3/ticker/price")
+BINANCE_24H_URL = os.getenv('BINANCE_24H_URL', f"{BINANCE_API_BASE}/api/v3/ticker/24hr")
+BINANCE_KLINES_URL = os.getenv('BINANCE_KLINES_URL', f"{BINANCE_API_BASE}/api/v3/klines")
 
 # Провери дали TELEGRAM_BOT_TOKEN е зареден
 if not TELEGRAM_BOT_TOKEN:
     logger.error("❌ TELEGRAM_BOT_TOKEN не е намерен в .env файла!")
     logger.error("💡 Създай .env файл от .env.example и попълни с реални стойности")
     raise ValueError("TELEGRAM_BOT_TOKEN е задължителен!")
-BINANCE_DEPTH_URL = "https://api.binance.com/api/v3/depth"
+BINANCE_DEPTH_URL = f"{BINANCE_API_BASE}/api/v3/depth"
+
+# Kline JSON -> компактен OHLCV DataFrame (само timestamp + OHLCV, float масиви)
+from candle_frame import klines_to_frame
 
 # Win-rate tracking file - използва BASE_PATH
 STATS_FILE = f"{BASE_PATH}/bot_stats.json"
 
+# Signal stats: append-only event log + rollups, bot_stats.json е периодичен snapshot
+import atexit
+from signal_stats import get_signal_stats
+signal_stats_global = get_signal_stats(STATS_FILE)
+atexit.register(signal_stats_global.snapshot)
+
 # Auto-Signal Tracking file - следи активните автоматични сигнали
 ACTIVE_SIGNALS_FILE = f"{BASE_PATH}/active_auto_signals.json"
 
@@ -398,6 +458,10 @@ SWING_LOWER_THRESHOLD = 0.33  # Price in lower 33% = bearish
 #     'alert_interval': 3600,  # Интервал в секунди
 #     'news_enabled': False,  # Автоматични новини
 #     'news_interval': 7200,  # Интервал за новини (2 часа)
+#     'auto_signals_subscribed': False,  # Получава автоматичните сигнали (/subscribe)
+#     'signal_timeframes': None,  # Само тези таймфреймове (None = всички)
+#     'signal_symbols': None,  # Само тези символи (None = всички)
+#     'min_confidence': 0,  # Минимална увереност в %
 # }
 
 # ================= ДЕДУПЛИКАЦИЯ НА СИГНАЛИ =================
@@ -405,6 +469,11 @@ SWING_LOWER_THRESHOLD = 0.33  # Price in lower 33% = bearish
 # Формат: {"BTCUSDT_BUY_4h": {'timestamp': datetime, 'confidence': 75, 'entry_price': 97100}, ...}
 SENT_SIGNALS_CACHE = {}
 
+# ================= CANDLE-CLOSE ANALYSIS SCHEDULER =================
+# Auto signal passes start this many seconds after the UTC candle close
+AUTO_SIGNAL_SETTLE_DELAY = float(os.getenv('AUTO_SIGNAL_SETTLE_DELAY', '5'))
+analysis_scheduler_global = None
+
 # ================= STARTUP MODE SUPPRESSION (PR #111) =================
 # Prevents duplicate signals on bot startup for first 5 minutes
 STARTUP_MODE = True
@@ -1068,7 +1137,7 @@ async def translate_text(text: str, target_lang: str = 'bg') -> str:
         return text
 
 
-async def safe_send_telegram(context_or_bot, chat_id, text, **kwargs) -> Optional[Any]:
+async def safe_send_telegram(context_or_bot, chat_id, text, priority=None, coalesce_key=None, **kwargs) -> Optional[Any]:
     """
     Safe Telegram send with DIAGNOSTIC_MODE support
     
@@ -1077,14 +1146,19 @@ async def safe_send_telegram(context_or_bot, chat_id, text, **kwargs) -> Optiona
     - Admin messages are prefixed with [DIAGNOSTIC]
     - All sends are logged
     
+    The message is queued on the Telegram dispatcher (priority lanes, rate
+    shaping, retry) and the call returns without waiting for delivery.
+    
     Args:
         context_or_bot: Telegram context or bot instance
         chat_id: Chat ID to send to
         text: Message text
+        priority: Dispatcher lane (PRIORITY_*, default PRIORITY_SIGNAL)
+        coalesce_key: Merge with a queued message with the same key (e.g. alerts for one position)
         **kwargs: Additional arguments for send_message
     
     Returns:
-        Message object or None if blocked
+        Future resolved with the Message (Message if sent directly), None if blocked
     """
     if DIAGNOSTIC_MODE:
         # Block non-admin messages
@@ -1096,13 +1170,34 @@ async def safe_send_telegram(context_or_bot, chat_id, text, **kwargs) -> Optiona
         # Prefix admin messages
         text = f"[DIAGNOSTIC MODE]\n\n{text}"
     
-    # Send normally - handle both context and bot objects
-    if hasattr(context_or_bot, 'bot'):
-        # It's a context object
-        return await context_or_bot.bot.send_message(chat_id=chat_id, text=text, **kwargs)
-    else:
-        # It's a bot object directly
-        return await context_or_bot.send_message(chat_id=chat_id, text=text, **kwargs)
+    # Handle both context and bot objects
+    bot = context_or_bot.bot if hasattr(context_or_bot, 'bot') else context_or_bot
+    return await queue_telegram_send(bot, 'send_message', chat_id, priority, coalesce_key, text=text, **kwargs)
+
+
+async def queue_telegram_send(bot, method, chat_id, priority=None, coalesce_key=None, **kwargs) -> Optional[Any]:
+    """
+    Queue a Bot API call on the Telegram dispatcher (direct await if unavailable)
+    
+    Args:
+        bot: Bot instance
+        method: Bot method name ('send_message', 'send_photo', ...)
+        chat_id: Chat ID to send to
+        priority: Dispatcher lane (PRIORITY_*, default PRIORITY_SIGNAL)
+        coalesce_key: Merge with a queued message with the same key
+        **kwargs: Arguments for the Bot method
+    
+    Returns:
+        Future resolved with the Message, or the Message if sent directly
+    """
+    if TELEGRAM_DISPATCHER_AVAILABLE:
+        return get_telegram_dispatcher().enqueue(
+            bot, method, chat_id,
+            priority=PRIORITY_SIGNAL if priority is None else priority,
+            coalesce_key=coalesce_key,
+            **kwargs
+        )
+    return await getattr(bot, method)(chat_id=chat_id, **kwargs)
 
 
 def get_user_settings(bot_data, chat_id):
@@ -1125,9 +1220,37 @@ def get_user_settings(bot_data, chat_id):
         bot_data[chat_id]['use_fundamental'] = False
     if 'fundamental_weight' not in bot_data[chat_id]:
         bot_data[chat_id]['fundamental_weight'] = 0.3
+    # Абонамент за автоматични сигнали (broadcast)
+    for key, value in SUBSCRIPTION_DEFAULTS.items():
+        bot_data[chat_id].setdefault(key, value)
     return bot_data[chat_id]
 
 
+def get_signal_subscribers(bot_data, symbol, timeframe, confidence):
+    """
+    Получатели на автоматичен сигнал: owner + абонираните разрешени потребители
+    
+    Args:
+        bot_data: application.bot_data (None = само owner)
+        symbol: Символ на сигнала
+        timeframe: Таймфрейм на сигнала
+        confidence: Увереност в %
+    
+    Returns:
+        Списък с chat_id (owner първи)
+    """
+    if DIAGNOSTIC_MODE or bot_data is None or not SIGNAL_BROADCAST_AVAILABLE:
+        return [OWNER_CHAT_ID]
+    return select_subscribers(
+        ALLOWED_USERS,
+        # Само четене - без да се създават записи в bot_data за всеки разрешен потребител
+        lambda chat_id: subscription_settings(bot_data, chat_id),
+        symbol, timeframe, confidence,
+        always=[OWNER_CHAT_ID],
+        is_authorized=auth_manager.is_authorized if SECURITY_MODULES_AVAILABLE else None
+    )
+
+
 def get_main_keyboard():
     """Връща основната клавиатура с менюто"""
     keyboard = [
@@ -1503,18 +1626,7 @@ def generate_chart(klines_data, symbol, signal, current_price, tp_price, sl_pric
     """Генерира графика със свещи, индикатори, Order Blocks, ликвидни зони и стрелка за тренда"""
     try:
         # Конвертирай klines data към DataFrame
-        df = pd.DataFrame(klines_data, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-        
-        # Конвертирай към числа и datetime
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
-        
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
+        df = klines_to_frame(klines_data, set_index=True)
         
         # Вземи последните 50 свещи за по-добра визуализация
         df = df.tail(50)
@@ -2829,16 +2941,18 @@ async def send_signal_alert(alert):
                 message += f"⚠️ Грешка при реанализ: {e}\n"
                 message += f"💡 Препоръчвам частично затваряне за сигурност\n"
         
-        # Изпрати съобщението
+        # Изпрати съобщението (SL/TP преди всичко останало; alerts за същия сигнал се сливат)
         await safe_send_telegram(
             application.bot,
             OWNER_CHAT_ID,
             message,
+            priority=PRIORITY_CRITICAL if alert_type in ('TP_HIT', 'SL_HIT') else PRIORITY_ALERT,
+            coalesce_key=f"signal:{symbol}:{timeframe}:{signal['timestamp']}",
             parse_mode='HTML',
             disable_notification=False  # Със звук!
         )
         
-        logger.info(f"📤 Signal alert sent: {alert_type} for {symbol}")
+        logger.info(f"📤 Signal alert queued: {alert_type} for {symbol}")
         
     except Exception as e:
         logger.error(f"Грешка при изпращане на signal alert: {e}")
@@ -3196,13 +3310,22 @@ async def analyze_btc_correlation(symbol, timeframe):
         if symbol == 'BTCUSDT':
             return None  # BTC се анализира сам
         
-        # Вземи BTC данни
-        btc_klines = await fetch_klines('BTCUSDT', timeframe, limit=50)
-        
-        if not btc_klines or len(btc_klines) < 20:
+        # Вземи BTC данни (споделена BTC серия - fetch само при нова свещ)
+        from btc_reference_series import get_btc_reference_series
+        btc_reference = get_btc_reference_series()
+        btc_series = await asyncio.to_thread(btc_reference.get_closes, timeframe)
+        if btc_series is None or len(btc_series) < 20:
+            # Споделената серия не е достъпна - през fetch_klines (3h се строи от 1h в серията)
+            from btc_reference_series import DERIVED_INTERVALS
+            source_tf, factor = DERIVED_INTERVALS.get(timeframe, (timeframe, 1))
+            btc_reference.update_from_klines(timeframe, await fetch_klines('BTCUSDT', source_tf, limit=50 * factor),
+                                             source_timeframe=source_tf)
+            btc_series = btc_reference.get_closes(timeframe, refresh=False)
+        
+        if btc_series is None or len(btc_series) < 20:
             return None
         
-        btc_closes = [float(k[4]) for k in btc_klines]
+        btc_closes = btc_series.iloc[-50:].tolist()
         btc_current = btc_closes[-1]
         
         # Определи BTC тренд БЕЗ MA - директно от ценова динамика
@@ -3275,22 +3398,9 @@ def check_liquidity(volume_24h, avg_volume, volume_ratio):
 
 
 def load_stats():
-    """Зареди статистика за win-rate"""
+    """Зареди статистика за win-rate (bot_stats.json формат от signal stats store)"""
     try:
-        if os.path.exists(STATS_FILE):
-            with open(STATS_FILE, 'r') as f:
-                data = json.load(f)
-                # Надгради стария формат ако няма 'signals'
-                if 'signals' not in data:
-                    data['signals'] = []
-                return data
-        return {
-            'total_signals': 0, 
-            'by_symbol': {}, 
-            'by_timeframe': {}, 
-            'by_confidence': {},
-            'signals': []  # Детайлен списък с всички сигнали
-        }
+        return signal_stats_global.to_dict()
     except Exception as e:
         logger.error(f"Грешка при зареждане на статистика: {e}")
         return {
@@ -3302,15 +3412,6 @@ def load_stats():
         }
 
 
-def save_stats(stats):
-    """Запази статистика"""
-    try:
-        with open(STATS_FILE, 'w') as f:
-            json.dump(stats, f, indent=2)
-    except Exception as e:
-        logger.error(f"Грешка при записване на статистика: {e}")
-
-
 # ================= TRADING JOURNAL (ML SELF-LEARNING) =================
 
 # Trading Journal file - използва BASE_PATH
@@ -3360,6 +3461,10 @@ def save_journal(journal):
             fcntl.flock(f.fileno(), fcntl.LOCK_EX)
             json.dump(journal, f, indent=2)
         logger.info("✅ Trading journal saved successfully")
+        
+        # Обнови материализираните report rollups (само променените trades)
+        if REPORTS_AVAILABLE:
+            report_engine.note_journal_saved(journal)
     except Exception as e:
         logger.error(f"Грешка при запазване на journal: {e}")
 
@@ -3404,6 +3509,10 @@ def log_trade_to_journal(symbol, timeframe, signal_type, confidence, entry_price
             'notes': []
         }
         
+        # Sequence number за incremental journal -> positions sync
+        from sync_journal_to_positions import next_journal_seq
+        trade_entry['seq'] = next_journal_seq(journal)
+        
         journal['trades'].append(trade_entry)
         journal['metadata']['total_trades'] += 1
         
@@ -3916,6 +4025,10 @@ async def save_trade_to_journal(trade: Dict):
                 'conditions': trade.get('signal_data', {}).get('conditions', {})
             }
             
+            # Sequence number за incremental journal -> positions sync
+            from sync_journal_to_positions import next_journal_seq
+            journal_entry['seq'] = next_journal_seq(journal)
+            
             # Add to journal
             journal['trades'].append(journal_entry)
             
@@ -3993,59 +4106,12 @@ async def update_trade_statistics():
 
 
 def record_signal(symbol, timeframe, signal_type, confidence, entry_price=None, tp_price=None, sl_price=None):
-    """Записва сигнал в статистиката"""
+    """Записва сигнал в статистиката (append към event log, без пренаписване на bot_stats.json)"""
     try:
-        from datetime import datetime
-        stats = load_stats()
-        stats['total_signals'] += 1
-        
-        # По символ
-        if symbol not in stats['by_symbol']:
-            stats['by_symbol'][symbol] = {'count': 0, 'BUY': 0, 'SELL': 0}
-        stats['by_symbol'][symbol]['count'] += 1
-        stats['by_symbol'][symbol][signal_type] += 1
-        
-        # По таймфрейм
-        if timeframe not in stats['by_timeframe']:
-            stats['by_timeframe'][timeframe] = {'count': 0}
-        stats['by_timeframe'][timeframe]['count'] += 1
-        
-        # По увереност
-        conf_bucket = f"{int(confidence//10)*10}-{int(confidence//10)*10+9}"
-        if conf_bucket not in stats['by_confidence']:
-            stats['by_confidence'][conf_bucket] = {'count': 0}
-        stats['by_confidence'][conf_bucket]['count'] += 1
-        
-        # Запиши детайлен сигнал (за дневни отчети)
-        signal_detail = {
-            'symbol': symbol,
-            'timeframe': timeframe,
-            'type': signal_type,
-            'confidence': confidence,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Добави trading параметри ако са подадени
-        if entry_price is not None:
-            signal_detail['entry_price'] = entry_price
-        if tp_price is not None:
-            signal_detail['tp_price'] = tp_price
-        if sl_price is not None:
-            signal_detail['sl_price'] = sl_price
-        
-        if 'signals' not in stats:
-            stats['signals'] = []
-        
-        stats['signals'].append(signal_detail)
-        
-        # Пази само последните 1000 сигнала (за да не расте файлът безкрайно)
-        if len(stats['signals']) > 1000:
-            stats['signals'] = stats['signals'][-1000:]
-        
-        save_stats(stats)
-        
-        # Върни signal_id (индексът в масива)
-        return len(stats['signals']) - 1
+        return signal_stats_global.record(
+            symbol, timeframe, signal_type, confidence,
+            entry_price=entry_price, tp_price=tp_price, sl_price=sl_price
+        )
         
     except Exception as e:
         logger.error(f"Грешка при record_signal: {e}")
@@ -4055,7 +4121,7 @@ def record_signal(symbol, timeframe, signal_type, confidence, entry_price=None,
 def get_performance_stats():
     """Вземи обобщена статистика"""
     try:
-        stats = load_stats()
+        stats = signal_stats_global.summary()
         
         summary = f"📊 <b>Статистика на бота:</b>\n\n"
         summary += f"Общо сигнали: {stats['total_signals']}\n\n"
@@ -4063,7 +4129,7 @@ def get_performance_stats():
         if stats['by_symbol']:
             summary += f"<b>По валута:</b>\n"
             for sym, data in sorted(stats['by_symbol'].items(), key=lambda x: x[1]['count'], reverse=True):
-                summary += f"  {sym}: {data['count']} ({data['BUY']} BUY, {data['SELL']} SELL)\n"
+                summary += f"  {sym}: {data['count']} ({data.get('BUY', 0)} BUY, {data.get('SELL', 0)} SELL)\n"
         
         if stats['by_timeframe']:
             summary += f"\n<b>По таймфрейм:</b>\n"
@@ -4086,22 +4152,10 @@ def get_yesterday_signal_stats():
     """Извлича статистика за сигналите от предходния ден"""
     try:
         from datetime import datetime, timedelta
-        stats = load_stats()
         
-        # Изчисли границите на предходния ден
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        yesterday_start = today - timedelta(days=1)
-        yesterday_end = today
-        
-        # Филтрирай сигналите от предходния ден
-        yesterday_signals = []
-        for signal in stats.get('signals', []):
-            try:
-                signal_time = datetime.fromisoformat(signal['timestamp'])
-                if yesterday_start <= signal_time < yesterday_end:
-                    yesterday_signals.append(signal)
-            except:
-                continue
+        # Сигналите от предходния ден (дневен bucket на store-а)
+        yesterday = (datetime.now() - timedelta(days=1)).date()
+        yesterday_signals = signal_stats_global.signals_for_day(yesterday)
         
         # Брои на сигналите
         total_signals = len(yesterday_signals)
@@ -4151,31 +4205,20 @@ def get_daily_signals_report():
     """Генерира дневен отчет за сигналите от предходния ден"""
     try:
         from datetime import datetime, timedelta
-        stats = load_stats()
         journal = load_journal()
         
-        # Вземи вчерашната дата
+        # Вземи вчерашната дата и дневния rollup
         yesterday = (datetime.now() - timedelta(days=1)).date()
-        
-        # Филтрирай сигналите от вчера
-        yesterday_signals = []
-        if 'signals' in stats and stats['signals']:
-            for sig in stats['signals']:
-                try:
-                    sig_date = datetime.fromisoformat(sig['timestamp']).date()
-                    if sig_date == yesterday:
-                        yesterday_signals.append(sig)
-                except:
-                    continue
+        day = signal_stats_global.day_rollup(yesterday)
         
         # Брой сигнали по тип
-        total_signals = len(yesterday_signals)
-        buy_signals = sum(1 for s in yesterday_signals if s['type'] == 'BUY')
-        sell_signals = sum(1 for s in yesterday_signals if s['type'] == 'SELL')
-        hold_signals = sum(1 for s in yesterday_signals if s['type'] == 'HOLD')
+        total_signals = day['count']
+        buy_signals = day['by_type'].get('BUY', 0)
+        sell_signals = day['by_type'].get('SELL', 0)
+        hold_signals = day['by_type'].get('HOLD', 0)
         
         # Средна увереност
-        avg_confidence = sum(s['confidence'] for s in yesterday_signals) / total_signals if total_signals > 0 else 0
+        avg_confidence = day['confidence_sum'] / total_signals if total_signals > 0 else 0
         
         # Успешни/неуспешни trades от journal (ако има)
         successful_trades = 0
@@ -4233,14 +4276,9 @@ def get_daily_signals_report():
             report += f"\n⏳ Все още няма приключени trades от вчера\n"
         
         # Най-активни символи
-        if yesterday_signals:
-            symbol_counts = {}
-            for sig in yesterday_signals:
-                sym = sig.get('symbol', 'Unknown')
-                symbol_counts[sym] = symbol_counts.get(sym, 0) + 1
-            
+        if total_signals:
             report += f"\n<b>💰 Най-активни символи:</b>\n"
-            for sym, count in sorted(symbol_counts.items(), key=lambda x: x[1], reverse=True)[:3]:
+            for sym, count in sorted(day['by_symbol'].items(), key=lambda x: x[1], reverse=True)[:3]:
                 report += f"  {sym}: {count} сигнала\n"
         
         report += f"\n<i>📱 Използвай /stats за пълна статистика</i>"
@@ -4252,7 +4290,42 @@ def get_daily_signals_report():
         return None
 
 
-def fetch_mtf_data(symbol: str, timeframe: str, primary_df: pd.DataFrame) -> dict:
+def fetch_klines_df(symbol: str, interval: str, limit: int, kline_cache: Optional[dict] = None) -> Optional[pd.DataFrame]:
+    """
+    Fetch Binance klines as a DataFrame
+    
+    Args:
+        symbol: Trading symbol (e.g., 'BTCUSDT')
+        interval: Kline interval (e.g., '4h')
+        limit: Number of candles
+        kline_cache: Optional dict shared by one analysis pass - a (symbol, interval, limit)
+            fetched once is reused (as a copy) by every timeframe of the pass
+    
+    Returns:
+        DataFrame or None if the request failed
+    """
+    key = (symbol, interval, limit)
+    if kline_cache is not None and key in kline_cache:
+        cached = kline_cache[key]
+        return cached.copy() if cached is not None else None
+    
+    response = requests.get(
+        BINANCE_KLINES_URL,
+        params={'symbol': symbol, 'interval': interval, 'limit': limit},
+        timeout=10
+    )
+    
+    df = None
+    if response.status_code == 200:
+        df = klines_to_frame(response.json())
+    
+    if kline_cache is not None:
+        kline_cache[key] = df
+        return df.copy() if df is not None else None
+    return df
+
+
+def fetch_mtf_data(symbol: str, timeframe: str, primary_df: pd.DataFrame, kline_cache: Optional[dict] = None) -> dict:
     """
     Fetch Multi-Timeframe data for ICT analysis
     
@@ -4260,6 +4333,7 @@ def fetch_mtf_data(symbol: str, timeframe: str, primary_df: pd.DataFrame) -> dic
         symbol: Trading symbol (e.g., 'BTCUSDT')
         timeframe: Current timeframe (e.g., '4h')
         primary_df: Primary DataFrame to reuse if timeframe matches
+        kline_cache: Optional per-pass kline cache (see fetch_klines_df)
         
     Returns:
         Dictionary with timeframes as keys and DataFrames as values
@@ -4276,23 +4350,9 @@ def fetch_mtf_data(symbol: str, timeframe: str, primary_df: pd.DataFrame) -> dic
             continue
         
         try:
-            mtf_response = requests.get(
-                BINANCE_KLINES_URL,
-                params={'symbol': symbol, 'interval': mtf_tf, 'limit': 100},
-                timeout=10
-            )
+            mtf_df = fetch_klines_df(symbol, mtf_tf, 100, kline_cache)
             
-            if mtf_response.status_code == 200:
-                mtf_klines = mtf_response.json()
-                mtf_df = pd.DataFrame(mtf_klines, columns=[
-                    'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                    'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                    'taker_buy_quote', 'ignore'
-                ])
-                mtf_df['timestamp'] = pd.to_datetime(mtf_df['timestamp'], unit='ms')
-                for col in ['open', 'high', 'low', 'close', 'volume']:
-                    mtf_df[col] = mtf_df[col].astype(float)
-                
+            if mtf_df is not None:
                 mtf_data[mtf_tf] = mtf_df
                 logger.debug(f"✅ Fetched MTF data for {mtf_tf}")
         except Exception as e:
@@ -5940,7 +6000,7 @@ async def check_news_impact_on_positions(article, impact):
                 # Get current price
                 try:
                     import requests
-                    response = requests.get(f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}", timeout=5)
+                    response = requests.get(BINANCE_PRICE_URL, params={'symbol': symbol}, timeout=5)
                     current_price = float(response.json()['price'])
                 except Exception as e:
                     logger.warning(f"Could not get current price for {symbol}: {e}")
@@ -6093,27 +6153,16 @@ async def send_daily_signal_report(bot):
     try:
         from datetime import datetime, timedelta
         
-        # Зареди статистиката
-        stats = load_stats()
-        
-        if 'signals' not in stats or not stats['signals']:
+        if signal_stats_global.total_signals == 0:
             logger.info("Няма сигнали за дневен отчет")
             return
         
-        # Определи началото и края на предходния ден
+        # Определи началото на предходния ден
         today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         yesterday_start = today - timedelta(days=1)
-        yesterday_end = today
         
-        # Филтрирай сигналите от предходния ден
-        yesterday_signals = []
-        for signal in stats['signals']:
-            try:
-                signal_time = datetime.fromisoformat(signal['timestamp'])
-                if yesterday_start <= signal_time < yesterday_end:
-                    yesterday_signals.append(signal)
-            except:
-                continue
+        # Сигналите от предходния ден (дневен bucket на store-а)
+        yesterday_signals = signal_stats_global.signals_for_day(yesterday_start.date())
         
         if not yesterday_signals:
             message = f"""📊 <b>ДНЕВЕН ОТЧЕТ</b>
@@ -6167,7 +6216,7 @@ async def send_daily_signal_report(bot):
             if sym not in by_symbol:
                 by_symbol[sym] = {'count': 0, 'BUY': 0, 'SELL': 0}
             by_symbol[sym]['count'] += 1
-            by_symbol[sym][signal['type']] += 1
+            by_symbol[sym][signal['type']] = by_symbol[sym].get(signal['type'], 0) + 1
         
         # Статистика по таймфрейм
         by_timeframe = {}
@@ -6333,17 +6382,21 @@ async def send_critical_news_alert(critical_news):
             else:
                 message += "Следи пазара за промени!"
             
-            # Изпрати с звукова алерта
-            await bot.send_message(
-                chat_id=OWNER_CHAT_ID,
+            # Изпрати с звукова алерта (опашката ограничава темпото между съобщенията)
+            await queue_telegram_send(
+                bot,
+                'send_message',
+                OWNER_CHAT_ID,
+                priority=PRIORITY_NEWS,
                 text=message,
                 parse_mode='HTML',
                 disable_web_page_preview=True,
                 disable_notification=False  # ЗВУКОВА АЛЕРТА!
             )
             
-            # Малка пауза между съобщенията
-            await asyncio.sleep(1)
+            if not TELEGRAM_DISPATCHER_AVAILABLE:
+                # Малка пауза между съобщенията
+                await asyncio.sleep(1)
         
     except Exception as e:
         logger.error(f"Грешка при изпращане на критична новина: {e}")
@@ -6797,7 +6850,7 @@ async def generate_swing_trading_analysis(symbol: str, language: str = 'bg') ->
     """
     try:
         # Fetch current price and 24h data
-        price_data = await fetch_json(f"https://api.binance.com/api/v3/ticker/24hr?symbol={symbol}")
+        price_data = await fetch_json(BINANCE_24H_URL, {'symbol': symbol})
         if not price_data:
             return "❌ Грешка при извличане на данни" if language == 'bg' else "❌ Error fetching data"
         
@@ -6806,7 +6859,7 @@ async def generate_swing_trading_analysis(symbol: str, language: str = 'bg') ->
         volume = float(price_data['volume'])
         
         # Fetch 7d data for trend
-        klines_7d = await fetch_json(f"https://api.binance.com/api/v3/klines?symbol={symbol}&interval=1d&limit=7")
+        klines_7d = await fetch_json(BINANCE_KLINES_URL, {'symbol': symbol, 'interval': '1d', 'limit': 7})
         change_7d = 0
         if klines_7d and len(klines_7d) > 0:
             price_7d_ago = float(klines_7d[0][1])  # Open price 7 days ago
@@ -7124,7 +7177,7 @@ async def generate_comprehensive_swing_analysis(symbol: str, display_name: str,
     """
     try:
         # Fetch real-time data from Binance
-        price_data = await fetch_json(f"https://api.binance.com/api/v3/ticker/24hr?symbol={symbol}")
+        price_data = await fetch_json(BINANCE_24H_URL, {'symbol': symbol})
         if not price_data:
             raise Exception("Failed to fetch price data")
         
@@ -7134,15 +7187,15 @@ async def generate_comprehensive_swing_analysis(symbol: str, display_name: str,
         quote_volume = float(price_data['quoteVolume'])
         
         # Fetch 7d data for trend
-        klines_7d = await fetch_json(f"https://api.binance.com/api/v3/klines?symbol={symbol}&interval=1d&limit=7")
+        klines_7d = await fetch_json(BINANCE_KLINES_URL, {'symbol': symbol, 'interval': '1d', 'limit': 7})
         change_7d = 0
         if klines_7d and len(klines_7d) > 0:
             price_7d_ago = float(klines_7d[0][1])  # Open price 7 days ago
             change_7d = ((current_price - price_7d_ago) / price_7d_ago) * 100
         
         # Fetch 4H and 1D candles for structure analysis
-        klines_4h = await fetch_json(f"https://api.binance.com/api/v3/klines?symbol={symbol}&interval=4h&limit=50")
-        klines_1d = await fetch_json(f"https://api.binance.com/api/v3/klines?symbol={symbol}&interval=1d&limit=20")
+        klines_4h = await fetch_json(BINANCE_KLINES_URL, {'symbol': symbol, 'interval': '4h', 'limit': 50})
+        klines_1d = await fetch_json(BINANCE_KLINES_URL, {'symbol': symbol, 'interval': '1d', 'limit': 20})
         
         # Analyze market structure
         structure_4h = "NEUTRAL"
@@ -7860,7 +7913,8 @@ async def detect_market_swing_state(symbol: str, timeframe: str = '4h') -> str:
     try:
         # Fetch historical klines data from Binance
         klines = await fetch_json(
-            f"https://api.binance.com/api/v3/klines?symbol={symbol}&interval={timeframe}&limit={SWING_KLINES_LIMIT}"
+            BINANCE_KLINES_URL,
+            {'symbol': symbol, 'interval': timeframe, 'limit': SWING_KLINES_LIMIT}
         )
         
         if not klines or len(klines) < SWING_MIN_CANDLES:
@@ -8106,9 +8160,8 @@ async def market_full_report(update: Update, context: ContextTypes.DEFAULT_TYPE)
             # Add BTC correlation for altcoins
             if symbol != 'BTCUSDT':
                 try:
-                    from config.config_loader import load_feature_flags
-                    flags = load_feature_flags()
-                    btc_corr_enabled = flags.get('fundamental_analysis', {}).get('btc_correlation', False)
+                    from config.config_loader import get_feature_flag
+                    btc_corr_enabled = get_feature_flag('fundamental_analysis.btc_correlation', False)
                     
                     if btc_corr_enabled:
                         # Get BTC correlation from external data if available
@@ -8157,15 +8210,7 @@ async def market_full_report(update: Update, context: ContextTypes.DEFAULT_TYPE)
                     klines_data = klines_response.json()
                     
                     # Prepare dataframe
-                    df = pd.DataFrame(klines_data, columns=[
-                        'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                        'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                        'taker_buy_quote', 'ignore'
-                    ])
-                    
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                    for col in ['open', 'high', 'low', 'close', 'volume']:
-                        df[col] = df[col].astype(float)
+                    df = klines_to_frame(klines_data)
                     
                     # Fetch MTF data for ICT analysis
                     mtf_data = fetch_mtf_data(symbol, timeframe, df)
@@ -8256,11 +8301,10 @@ async def market_full_report(update: Update, context: ContextTypes.DEFAULT_TYPE)
         
         # Try to add sentiment analysis and impact scores if enabled
         try:
-            from config.config_loader import load_feature_flags
+            from config.config_loader import get_feature_flag
             from fundamental.sentiment_analyzer import SentimentAnalyzer
             
-            flags = load_feature_flags()
-            sentiment_enabled = flags.get('fundamental_analysis', {}).get('sentiment_analysis', False)
+            sentiment_enabled = get_feature_flag('fundamental_analysis.sentiment_analysis', False)
             
             if sentiment_enabled:
                 sentiment_analyzer = SentimentAnalyzer()
@@ -8499,15 +8543,7 @@ async def signal_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             klines_data = klines_response.json()
             
             # Prepare dataframe
-            df = pd.DataFrame(klines_data, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-            
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
+            df = klines_to_frame(klines_data)
             
             # ✅ FETCH MTF DATA for ICT analysis
             mtf_data = fetch_mtf_data(symbol, timeframe, df)
@@ -8599,13 +8635,12 @@ async def signal_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             
             try:
                 from utils.fundamental_helper import FundamentalHelper, format_fundamental_section
-                from config.config_loader import load_feature_flags
+                from config.config_loader import get_feature_flag
                 
                 helper = FundamentalHelper()
-                feature_flags = load_feature_flags()
                 
                 # Check BOTH user setting AND feature flag
-                if user_wants_fundamental and feature_flags.get('fundamental_analysis', {}).get('enabled', False):
+                if user_wants_fundamental and get_feature_flag('fundamental_analysis.enabled', False):
                     logger.info(f"🔬 Running user-enabled fundamental analysis for {symbol}")
                     
                     # Get BTC data for correlation
@@ -8619,15 +8654,7 @@ async def signal_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
                         btc_klines_data = btc_klines_response.json()
                         
                         # Prepare BTC dataframe
-                        btc_df = pd.DataFrame(btc_klines_data, columns=[
-                            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                            'taker_buy_quote', 'ignore'
-                        ])
-                        
-                        btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'], unit='ms')
-                        for col in ['open', 'high', 'low', 'close', 'volume']:
-                            btc_df[col] = btc_df[col].astype(float)
+                        btc_df = klines_to_frame(btc_klines_data)
                         
                         # Get fundamental data (uses news cache)
                         fundamental_data = helper.get_fundamental_data(
@@ -8879,15 +8906,7 @@ async def ict_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
         
         # Prepare dataframe
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-        
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
+        df = klines_to_frame(klines)
         
         # Generate ICT signal
         # ✅ FETCH MTF DATA
@@ -9389,10 +9408,9 @@ def format_standardized_signal(signal: ICTSignal, signal_source: str = "AUTO") -
     
     # === NEW: FUNDAMENTAL ANALYSIS INTEGRATION ===
     try:
-        from config.config_loader import load_feature_flags
-        flags = load_feature_flags()
+        from config.config_loader import get_feature_flag
         
-        if flags.get('fundamental_analysis', {}).get('signal_integration', False):
+        if get_feature_flag('fundamental_analysis.signal_integration', False):
             # Try to get fundamental data
             try:
                 from utils.fundamental_helper import FundamentalHelper
@@ -10408,8 +10426,7 @@ async def risk_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 return
             
             config_key = setting_map[setting_name]
-            rm.config[config_key] = setting_value
-            rm.save_config(rm.config)
+            rm.update_setting(config_key, setting_value)
             
             await update.message.reply_text(
                 f"✅ <b>Настройката е обновена!</b>\n\n"
@@ -11110,6 +11127,55 @@ async def alerts_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Невалидна стойност за минути")
 
 
+@require_access()
+@rate_limited(calls=20, period=60)
+async def subscribe_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Абонамент за автоматичните сигнали (broadcast)
+    
+    /subscribe - Вкл/Изкл
+    /subscribe 4h 1d BTC ETH 75 - Само тези таймфреймове, символи и увереност >= 75%
+    """
+    settings = get_user_settings(context.application.bot_data, update.effective_chat.id)
+    
+    if not SIGNAL_BROADCAST_AVAILABLE:
+        await update.message.reply_text("❌ Абонаментите за сигнали не са налични")
+        return
+    
+    if not context.args:
+        settings['auto_signals_subscribed'] = not settings['auto_signals_subscribed']
+    else:
+        timeframes, symbols = [], []
+        min_confidence = 0.0
+        for arg in context.args:
+            value = arg.strip()
+            if value.lower() in ('1h', '2h', '4h', '1d'):
+                timeframes.append(value.lower())
+            elif value.upper() in SYMBOLS or value.upper() in SYMBOLS.values():
+                symbols.append(SYMBOLS.get(value.upper(), value.upper()))
+            else:
+                try:
+                    min_confidence = max(0.0, min(100.0, float(value.rstrip('%'))))
+                except ValueError:
+                    await update.message.reply_text(f"❌ Невалиден параметър: {value}")
+                    return
+        settings['auto_signals_subscribed'] = True
+        settings['signal_timeframes'] = timeframes or None
+        settings['signal_symbols'] = symbols or None
+        settings['min_confidence'] = min_confidence
+    
+    if settings['auto_signals_subscribed']:
+        message = "📡 Абонаментът за автоматични сигнали е включен ✅\n\n"
+        message += f"Таймфреймове: {', '.join(settings['signal_timeframes'] or ['всички'])}\n"
+        message += f"Символи: {', '.join(settings['signal_symbols'] or ['всички'])}\n"
+        message += f"Мин. увереност: {settings['min_confidence']:.0f}%\n\n"
+        message += "Филтри: /subscribe 4h 1d BTC ETH 75"
+    else:
+        message = "📡 Абонаментът за автоматични сигнали е изключен ❌"
+    
+    await update.message.reply_text(message)
+
+
 @require_access()
 @rate_limited(calls=10, period=60)
 async def autonews_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -11304,14 +11370,7 @@ async def send_alert_signal(context: ContextTypes.DEFAULT_TYPE):
                 return None
             
             klines_data = klines_response.json()
-            df = pd.DataFrame(klines_data, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
+            df = klines_to_frame(klines_data)
             
             # ✅ FETCH MTF DATA
             mtf_data = fetch_mtf_data(symbol, timeframe, df)
@@ -11543,7 +11602,7 @@ async def end_startup_mode_timer(context):
 
 # ✅ PR #6: AUTO SIGNAL SCHEDULER JOB - для конкретного timeframe
 @safe_job("auto_signal_timeframe", max_retries=3, retry_delay=60)
-async def auto_signal_job(timeframe: str, bot_instance):
+async def auto_signal_job(timeframe: str, bot_instance, bot_data=None, kline_cache=None):
     """
     Auto signal job for scheduled timeframes (1h, 2h, 4h, 1d)
     Generates and sends signals automatically at specific intervals
@@ -11551,6 +11610,8 @@ async def auto_signal_job(timeframe: str, bot_instance):
     Args:
         timeframe: '1h', '2h', '4h', or '1d'
         bot_instance: Telegram bot instance for sending messages
+        bot_data: application.bot_data for subscriber fan-out (None = owner only)
+        kline_cache: Per-pass kline cache shared by timeframes closing together (see auto_signal_pass)
     """
     try:
         # ✅ AUTO TIMEFRAME FILTER (only 1h, 2h, 4h, 1d)
@@ -11583,27 +11644,13 @@ async def auto_signal_job(timeframe: str, bot_instance):
             """Analyze one symbol with ICT Engine"""
             try:
                 # Fetch klines for primary timeframe
-                klines_response = requests.get(
-                    BINANCE_KLINES_URL,
-                    params={'symbol': symbol, 'interval': timeframe, 'limit': 200},
-                    timeout=10
-                )
+                df = fetch_klines_df(symbol, timeframe, 200, kline_cache)
                 
-                if klines_response.status_code != 200:
+                if df is None:
                     return None
                 
-                klines_data = klines_response.json()
-                df = pd.DataFrame(klines_data, columns=[
-                    'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                    'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                    'taker_buy_quote', 'ignore'
-                ])
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                for col in ['open', 'high', 'low', 'close', 'volume']:
-                    df[col] = df[col].astype(float)
-                
                 # ✅ FETCH MTF DATA
-                mtf_data = fetch_mtf_data(symbol, timeframe, df)
+                mtf_data = fetch_mtf_data(symbol, timeframe, df, kline_cache)
                 
                 # ✅ USE ICT ENGINE
                 ict_signal = ict_engine_global.generate_signal(
@@ -11695,36 +11742,57 @@ async def auto_signal_job(timeframe: str, bot_instance):
             # ✅ Format signal with AUTO source
             signal_msg = format_standardized_signal(ict_signal, "AUTO")
             
-            # Send message to owner
-            try:
-                await bot_instance.send_message(
-                    chat_id=OWNER_CHAT_ID,
-                    text=signal_msg,
-                    parse_mode='HTML',
-                    disable_web_page_preview=True,
-                    disable_notification=False  # Sound alert for auto signals
-                )
-                logger.info(f"✅ Auto signal sent for {symbol} ({timeframe.upper()})")
-            except Exception as e:
-                logger.error(f"❌ Failed to send auto signal message for {symbol}: {e}")
-                continue
-            
-            # Send chart if available
+            # Render the chart once (shared by all recipients)
+            chart_bytes = None
             if CHART_VISUALIZATION_AVAILABLE:
                 try:
                     generator = ChartGenerator()
                     chart_bytes = generator.generate(df, ict_signal, symbol, timeframe)
-                    
+                except Exception as e:
+                    logger.warning(f"⚠️ Chart generation failed for auto signal: {e}")
+            chart_caption = f"📊 {symbol} ({timeframe.upper()})"
+            
+            # Queue message + chart (delivery + retries handled by the dispatcher)
+            try:
+                if SIGNAL_BROADCAST_AVAILABLE and TELEGRAM_DISPATCHER_AVAILABLE:
+                    recipients = get_signal_subscribers(bot_data, symbol, timeframe, ict_signal.confidence)
+                    get_signal_broadcaster().schedule(
+                        bot_instance,
+                        recipients,
+                        signal_msg,
+                        chart=chart_bytes or None,
+                        caption=chart_caption,
+                        priority=PRIORITY_SIGNAL,
+                        parse_mode='HTML',
+                        disable_web_page_preview=True,
+                        disable_notification=False  # Sound alert for auto signals
+                    )
+                    logger.info(f"✅ Auto signal queued for {symbol} ({timeframe.upper()}) to {len(recipients)} chat(s)")
+                else:
+                    await queue_telegram_send(
+                        bot_instance,
+                        'send_message',
+                        OWNER_CHAT_ID,
+                        priority=PRIORITY_SIGNAL,
+                        text=signal_msg,
+                        parse_mode='HTML',
+                        disable_web_page_preview=True,
+                        disable_notification=False  # Sound alert for auto signals
+                    )
                     if chart_bytes:
-                        await bot_instance.send_photo(
-                            chat_id=OWNER_CHAT_ID,
+                        await queue_telegram_send(
+                            bot_instance,
+                            'send_photo',
+                            OWNER_CHAT_ID,
+                            priority=PRIORITY_SIGNAL,
                             photo=BytesIO(chart_bytes),
-                            caption=f"📊 {symbol} ({timeframe.upper()})",
+                            caption=chart_caption,
                             parse_mode='HTML'
                         )
-                        logger.info(f"✅ Chart sent for auto signal {symbol}")
-                except Exception as e:
-                    logger.warning(f"⚠️ Chart generation failed for auto signal: {e}")
+                    logger.info(f"✅ Auto signal queued for {symbol} ({timeframe.upper()})")
+            except Exception as e:
+                logger.error(f"❌ Failed to send auto signal message for {symbol}: {e}")
+                continue
             
             # Record signal to stats
             try:
@@ -11794,8 +11862,11 @@ async def auto_signal_job(timeframe: str, bot_instance):
                         logger.info(f"✅ Position auto-opened for tracking (ID: {position_id})")
                         
                         # Send confirmation
-                        await bot_instance.send_message(
-                            chat_id=OWNER_CHAT_ID,
+                        await queue_telegram_send(
+                            bot_instance,
+                            'send_message',
+                            OWNER_CHAT_ID,
+                            priority=PRIORITY_SIGNAL,
                             text=f"📊 Position tracking started for {symbol} (ID: {position_id})",
                             parse_mode='HTML'
                         )
@@ -11822,6 +11893,26 @@ async def auto_signal_job(timeframe: str, bot_instance):
         logger.error(f"❌ Auto signal job error for {timeframe}: {e}")
 
 
+async def auto_signal_pass(timeframes, close_time, bot_instance, bot_data=None):
+    """
+    Един анализ при затваряне на свещ за всички таймфреймове, които затварят едновременно
+    
+    Klines са общи за прохода: напр. в 00:00 UTC (1h+2h+4h+1d) всяка (символ, интервал)
+    се тегли веднъж вместо по веднъж за всеки таймфрейм.
+    
+    Args:
+        timeframes: Таймфреймове със затворена свещ (най-късият първи)
+        close_time: UTC време на затваряне
+        bot_instance: Telegram bot instance
+        bot_data: application.bot_data (за broadcast)
+    """
+    kline_cache = {}
+    logger.info(f"🕯️ Candle close {close_time:%Y-%m-%d %H:%M} UTC - analysis pass for {', '.join(tf.upper() for tf in timeframes)}")
+    for timeframe in timeframes:
+        await auto_signal_job(timeframe, bot_instance, bot_data, kline_cache=kline_cache)
+    logger.info(f"🕯️ Analysis pass done: {len(kline_cache)} kline requests shared by {len(timeframes)} timeframe(s)")
+
+
 # ============================================================================
 # PR #7: POSITION MONITORING - HELPER FUNCTIONS
 # ============================================================================
@@ -12126,7 +12217,7 @@ async def monitor_positions_job(bot_instance):
         try:
             from unified_trade_manager import UnifiedTradeManager
             
-            manager = UnifiedTradeManager(bot_instance=bot_instance)
+            manager = UnifiedTradeManager(bot_instance=bot_instance, position_manager=position_manager_global)
             positions = position_manager_global.get_open_positions()
             
             if not positions:
@@ -12586,6 +12677,7 @@ https://github.com/galinborisov10-art/Crypto-signal-bot
 <b>🔔 АВТОМАТИЗАЦИЯ</b>
 /alerts - Вкл/Изкл авто-сигнали
 /alerts 30 - Интервал 30 минути
+/subscribe - Абонамент за авто-сигналите
 
 <b>🔐 ADMIN (изисква парола)</b>
 /admin_login [pass] - Вход в админ
@@ -12700,6 +12792,7 @@ https://github.com/galinborisov10-art/Crypto-signal-bot
 <b>🔔 АВТОМАТИЗАЦИЯ</b>
 /alerts - Вкл/Изкл авто-сигнали
 /alerts 30 - Интервал 30 минути
+/subscribe - Абонамент за авто-сигналите
 
 <b>🔐 ADMIN (изисква парола)</b>
 /admin_login [pass] - Вход в админ
@@ -12945,15 +13038,7 @@ async def signal_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 logger.info(f"✅ Fetched {len(klines_data)} candles")
                 
                 # Prepare dataframe
-                df = pd.DataFrame(klines_data, columns=[
-                    'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                    'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                    'taker_buy_quote', 'ignore'
-                ])
-                
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                for col in ['open', 'high', 'low', 'close', 'volume']:
-                    df[col] = df[col].astype(float)
+                df = klines_to_frame(klines_data)
                 logger.info(f"✅ DataFrame prepared: {len(df)} rows")
                 
                 # ✅ FETCH MTF DATA for ICT analysis
@@ -13870,7 +13955,8 @@ async def auto_update_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         # Backup important files
         await status_msg.edit_text("💾 Backup на данни...")
-        backup_files = ['bot_stats.json', 'trading_journal.json', 'copilot_tasks.json']
+        # bot_stats.json е snapshot (35 дни) - пълната история на сигналите е в bot_stats_events.jsonl
+        backup_files = ['bot_stats.json', 'bot_stats_events.jsonl', 'trading_journal.json', 'copilot_tasks.json']
         for f in backup_files:
             try:
                 result = subprocess.run(['cp', f, f + '.backup'], cwd=project_dir, timeout=5, capture_output=True, text=True)
@@ -16335,16 +16421,16 @@ async def handle_replay_report(update: Update, context: ContextTypes.DEFAULT_TYP
         from diagnostics import ReplayCache
         
         cache = ReplayCache()
-        signals = cache.load_signals()
+        signals = cache.load_metadata()
         
         report = f"📈 *Replay Cache Status*\n\n"
         report += f"Cached signals: {len(signals)}/{cache.MAX_SIGNALS}\n"
-        report += f"Storage: {cache.CACHE_FILE}\n\n"
+        report += f"Storage: {cache.CACHE_DIR}\n\n"
         
         if signals:
             report += "*Recent Signals:*\n"
             for sig in signals[-5:]:  # Last 5
-                report += f"• {sig.symbol} {sig.timeframe} - {sig.timestamp[:19]}\n"
+                report += f"• {sig['symbol']} {sig['timeframe']} - {sig['timestamp'][:19]}\n"
         else:
             report += "No signals cached yet."
         
@@ -16733,6 +16819,14 @@ async def toggle_ict_command(update, context):
             await update.message.reply_text("❌ Owner only")
             return
         
+        # Същата защита като при стартиране - без FEATURE_FLAG_INTEGRATION enhancer-ът остава изключен
+        if not feature_flag_integration_enabled():
+            await update.message.reply_text(
+                "ℹ️ ICT Enhancer е изключен (FEATURE_FLAG_INTEGRATION=false)\n"
+                "Задай FEATURE_FLAG_INTEGRATION=true и рестартирай бота"
+            )
+            return
+        
         config = load_feature_flags()
         new_value = not config.get('use_ict_enhancer', False)
         update_feature_flag('use_ict_enhancer', new_value)
@@ -16762,9 +16856,10 @@ async def toggle_ict_only_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE
         # Toggle the flag
         new_value = toggle_flag('use_ict_only')
         
-        # Update global config if needed
+        # Update global config if needed (only when flag integration is enabled, as at startup)
         global FEATURE_FLAGS
-        FEATURE_FLAGS = load_feature_flags()
+        if feature_flag_integration_enabled():
+            FEATURE_FLAGS = load_feature_flags()
         
         # Send status message
         if new_value:
@@ -16941,13 +17036,79 @@ async def cache_stats_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(f"❌ Error: {e}")
 
 
+def format_stage_profile(key: Optional[str] = None) -> str:
+    """
+    HTML таблица с времената по стъпки на generate_signal
+    
+    Args:
+        key: None (всички стъпки + таймфреймове), таймфрейм ('4h'), символ ('BTCUSDT') или 'profile'
+    
+    Returns:
+        HTML текст за Telegram
+    """
+    profiler = get_stage_profiler()
+    
+    if key == 'profile':
+        if not profiler.reports:
+            return ("🔬 Няма profiling проби.\n"
+                    "Включи с STAGE_PROFILE_SAMPLE_EVERY=N (и STAGE_PROFILE_TRACEMALLOC=true)")
+        report = profiler.reports[-1]
+        message = f"🔬 <b>PROFILE</b> {report['symbol']} {report['timeframe']} ({report['total']:.2f}s)\n"
+        for stage_name, seconds in sorted(report['stages'], key=lambda item: item[1], reverse=True)[:8]:
+            message += f"  {stage_name}: {seconds * 1000:.0f}ms\n"
+        if 'memory_peak' in report:
+            message += f"\n💾 Peak memory: {report['memory_peak'] / 1024 / 1024:.1f} MB\n"
+        if 'profile' in report:
+            profile_text = html.escape(report['profile'][-3000:])
+            message += f"\n<pre>{profile_text}</pre>"
+        return message
+    
+    if key is None:
+        stages = profiler.summary()
+        total = stages.get(TOTAL_STAGE)
+        message = "<b>GENERATE_SIGNAL STAGES</b>\n"
+        if total:
+            message += (f"  Calls: {total['count']} | p50 {total['p50'] * 1000:.0f}ms | "
+                        f"p95 {total['p95'] * 1000:.0f}ms | max {total['max'] * 1000:.0f}ms\n")
+            outcomes = ', '.join(f"{name} {count}" for name, count in sorted(profiler.outcomes.items()))
+            message += f"  Outcomes: {outcomes}\n"
+        grand_total = sum(stats['total'] for name, stats in stages.items() if name != TOTAL_STAGE) or 1
+        for stage_name, stats in profiler.top_stages():
+            message += (f"  {stage_name}: {stats['total'] / grand_total * 100:.0f}% | "
+                        f"avg {stats['avg'] * 1000:.0f}ms | p95 {stats['p95'] * 1000:.0f}ms\n")
+        timeframe_totals = {name[0]: stats for name, stats in profiler.summary('timeframe').items()
+                            if name[1] == TOTAL_STAGE}
+        if timeframe_totals:
+            message += "  Per TF: " + ', '.join(
+                f"{tf} p50 {stats['p50'] * 1000:.0f}ms" for tf, stats in sorted(timeframe_totals.items())) + "\n"
+        message += "  Детайли: /performance 4h | BTCUSDT | profile\n\n"
+        return message
+    
+    by = 'symbol' if key.upper().endswith('USDT') or key == '__other__' else 'timeframe'
+    lookup = key.upper() if by == 'symbol' else key
+    stats_by_stage = {name[1]: stats for name, stats in profiler.summary(by, lookup).items()}
+    if not stats_by_stage:
+        return f"📊 Няма данни за {html.escape(key)}"
+    
+    message = f"📊 <b>STAGES: {html.escape(lookup)}</b>\n"
+    total = stats_by_stage.pop(TOTAL_STAGE, None)
+    if total:
+        message += f"  Calls: {total['count']} | p50 {total['p50'] * 1000:.0f}ms | p95 {total['p95'] * 1000:.0f}ms\n"
+    for stage_name, stats in sorted(stats_by_stage.items(), key=lambda item: item[1]['total'], reverse=True):
+        message += f"  {stage_name}: avg {stats['avg'] * 1000:.0f}ms | p95 {stats['p95'] * 1000:.0f}ms\n"
+    return message
+
+
 @require_access()
 @rate_limited(calls=20, period=60)
 async def performance_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Show performance metrics (admin only)
     
-    Usage: /performance
+    Usage:
+        /performance - handler metrics + generate_signal stage breakdown
+        /performance 4h | BTCUSDT - stages for one timeframe / symbol
+        /performance profile - last sampled cProfile / tracemalloc report
     """
     user_id = update.effective_user.id
     
@@ -16955,9 +17116,14 @@ async def performance_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("⛔ Admin only")
         return
     
+    if context.args and ICT_SIGNAL_ENGINE_AVAILABLE:
+        await update.message.reply_text(format_stage_profile(context.args[0]), parse_mode='HTML')
+        return
+    
     metrics = get_metrics_summary()
+    stage_stats = get_stage_profiler().summary() if ICT_SIGNAL_ENGINE_AVAILABLE else {}
     
-    if not metrics:
+    if not metrics and not stage_stats:
         await update.message.reply_text("📊 No performance data yet")
         return
     
@@ -16970,6 +17136,21 @@ async def performance_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         message += f"  Min/Max: {stats['min']:.2f}s / {stats['max']:.2f}s\n"
         message += f"  Median: {stats['median']:.2f}s\n\n"
     
+    if stage_stats:
+        message += format_stage_profile()
+    
+    # Candle-close analysis passes (lag = start after the candle close)
+    if analysis_scheduler_global is not None:
+        scheduler_metrics = analysis_scheduler_global.metrics()
+        scheduler_stats = scheduler_metrics['stats']
+        message += "<b>CANDLE-CLOSE PASSES</b>\n"
+        message += (f"  Passes: {scheduler_stats['passes']} (timeout {scheduler_stats['timeout']}, "
+                    f"error {scheduler_stats['error']}, merged {scheduler_stats['coalesced']})\n")
+        for timeframe, tf_stats in scheduler_metrics['timeframes'].items():
+            message += (f"  {timeframe}: lag avg {tf_stats['avg_lag']:.1f}s / max {tf_stats['max_lag']:.1f}s, "
+                        f"run avg {tf_stats['avg_duration']:.1f}s / max {tf_stats['max_duration']:.1f}s\n")
+        message += "\n"
+    
     # Cache stats
     message += "<b>CACHE STATS</b>\n"
     for cache_type, cache_data in CACHE.items():
@@ -17584,6 +17765,7 @@ def main():
     app.add_handler(CommandHandler("timeframe", timeframe_cmd))
     app.add_handler(CommandHandler("trade_status", trade_status_cmd))  # 🔄 Trade checkpoint analysis
     app.add_handler(CommandHandler("alerts", alerts_cmd))
+    app.add_handler(CommandHandler("subscribe", subscribe_cmd))
     app.add_handler(CommandHandler("stats", stats_cmd))
     app.add_handler(CommandHandler("journal", journal_cmd))  # 📝 Trading Journal с ML
     app.add_handler(CommandHandler("risk", risk_cmd))  # 🛡️ Risk Management
@@ -18384,81 +18566,96 @@ Last 7 days: {trend.get('wr_7d', 0):.1f}% {trend.get('trend_7d', '')}
             async def auto_signal_1h_wrapper():
                 """Wrapper for 1H auto signal job"""
                 try:
-                    await auto_signal_job('1h', application.bot)
+                    await auto_signal_job('1h', application.bot, application.bot_data)
                 except Exception as e:
                     logger.error(f"❌ Auto Signal 1H error: {e}", exc_info=True)
             
             async def auto_signal_2h_wrapper():
                 """Wrapper for 2H auto signal job"""
                 try:
-                    await auto_signal_job('2h', application.bot)
+                    await auto_signal_job('2h', application.bot, application.bot_data)
                 except Exception as e:
                     logger.error(f"❌ Auto Signal 2H error: {e}", exc_info=True)
             
             async def auto_signal_4h_wrapper():
                 """Wrapper for 4H auto signal job"""
                 try:
-                    await auto_signal_job('4h', application.bot)
+                    await auto_signal_job('4h', application.bot, application.bot_data)
                 except Exception as e:
                     logger.error(f"❌ Auto Signal 4H error: {e}", exc_info=True)
             
             async def auto_signal_1d_wrapper():
                 """Wrapper for 1D auto signal job"""
                 try:
-                    await auto_signal_job('1d', application.bot)
+                    await auto_signal_job('1d', application.bot, application.bot_data)
                 except Exception as e:
                     logger.error(f"❌ Auto Signal 1D error: {e}", exc_info=True)
             
             # ================= PR #6: AUTO SIGNAL SCHEDULER JOBS =================
-            # Auto signal scheduler jobs for 1H, 2H, 4H, 1D timeframes
-            # Staggered timing to prevent overlaps
+            # Auto signal passes for 1H, 2H, 4H, 1D timeframes
+            # Aligned to the UTC candle closes; coinciding closes run as one pass
+            global analysis_scheduler_global
+            if ANALYSIS_SCHEDULER_AVAILABLE:
+                async def auto_signal_pass_handler(timeframes, close_time):
+                    await auto_signal_pass(timeframes, close_time, application.bot, application.bot_data)
+                
+                analysis_scheduler_global = CandleCloseScheduler(
+                    auto_signal_pass_handler,
+                    ['1h', '2h', '4h', '1d'],
+                    settle_delay=AUTO_SIGNAL_SETTLE_DELAY,
+                    max_concurrency=1
+                )
+                analysis_scheduler_global.start()
+                logger.info(f"✅ Auto signals scheduled at candle close (+{AUTO_SIGNAL_SETTLE_DELAY:.0f}s) for 1H, 2H, 4H, 1D")
+            else:
+                # Fallback: staggered cron jobs
             
-            # 1H - Every hour at :05
-            scheduler.add_job(
-                auto_signal_1h_wrapper,
-                'cron',
-                minute=5,
-                id='auto_signal_1h',
-                name='Auto Signal 1H',
-                replace_existing=True
-            )
-            logger.info("✅ Auto signal 1H scheduled (every hour at :05)")
+                # 1H - Every hour at :05
+                scheduler.add_job(
+                    auto_signal_1h_wrapper,
+                    'cron',
+                    minute=5,
+                    id='auto_signal_1h',
+                    name='Auto Signal 1H',
+                    replace_existing=True
+                )
+                logger.info("✅ Auto signal 1H scheduled (every hour at :05)")
             
-            # 2H - Every 2 hours at :07
-            scheduler.add_job(
-                auto_signal_2h_wrapper,
-                'cron',
-                hour='*/2',
-                minute=7,
-                id='auto_signal_2h',
-                name='Auto Signal 2H',
-                replace_existing=True
-            )
-            logger.info("✅ Auto signal 2H scheduled (every 2 hours at :07)")
+                # 2H - Every 2 hours at :07
+                scheduler.add_job(
+                    auto_signal_2h_wrapper,
+                    'cron',
+                    hour='*/2',
+                    minute=7,
+                    id='auto_signal_2h',
+                    name='Auto Signal 2H',
+                    replace_existing=True
+                )
+                logger.info("✅ Auto signal 2H scheduled (every 2 hours at :07)")
             
-            # 4H - Every 4 hours at :10
-            scheduler.add_job(
-                auto_signal_4h_wrapper,
-                'cron',
-                hour='*/4',
-                minute=10,
-                id='auto_signal_4h',
-                name='Auto Signal 4H',
-                replace_existing=True
-            )
-            logger.info("✅ Auto signal 4H scheduled (every 4 hours at :10)")
+                # 4H - Every 4 hours at :10
+                scheduler.add_job(
+                    auto_signal_4h_wrapper,
+                    'cron',
+                    hour='*/4',
+                    minute=10,
+                    id='auto_signal_4h',
+                    name='Auto Signal 4H',
+                    replace_existing=True
+                )
+                logger.info("✅ Auto signal 4H scheduled (every 4 hours at :10)")
             
-            # 1D - Daily at 09:15
-            scheduler.add_job(
-                auto_signal_1d_wrapper,
-                'cron',
-                hour=9,
-                minute=15,
-                id='auto_signal_1d',
-                name='Auto Signal 1D',
-                replace_existing=True
-            )
-            logger.info("✅ Auto signal 1D scheduled (daily at 09:15 UTC)")
+                # 1D - Daily at 09:15
+                scheduler.add_job(
+                    auto_signal_1d_wrapper,
+                    'cron',
+                    hour=9,
+                    minute=15,
+                    id='auto_signal_1d',
+                    name='Auto Signal 1D',
+                    replace_existing=True
+                )
+                logger.info("✅ Auto signal 1D scheduled (daily at 09:15 UTC)")
             
             # ============================================================================
             # PR #10: INTELLIGENT HEALTH MONITORING JOBS
@@ -18809,7 +19006,7 @@ Last 7 days: {trend.get('wr_7d', 0):.1f}% {trend.get('trend_7d', '')}
             try:
                 logger.debug("🔄 Running scheduled journal sync...")
                 from sync_journal_to_positions import sync_journal_to_positions
-                stats = sync_journal_to_positions()
+                stats = sync_journal_to_positions(position_manager_global)
                 
                 if stats['added'] > 0:
                     logger.info(f"✅ Scheduled journal sync: {stats['added']} new positions added")
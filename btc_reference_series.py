@@ -0,0 +1,375 @@
+"""
+BTC Reference Series - Shared, incrementally updated BTCUSDT close series
+
+Every altcoin signal used to download 500 BTCUSDT candles (blocking
+requests.get) just to correlate against them, and fundamental analysis and
+bot.py did the same. This service keeps one BTC close series per timeframe,
+extends it with only the candles opened since the last update (at most once
+per candle), and computes return correlations for many assets in a single
+vectorized pass.
+
+Author: galinborisov10-art
+Date: 2026-02-02
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from market_data_backend import binance_url
+from utils.candle_time import candle_open_times, timeframe_duration, utc_now_naive
+
+logger = logging.getLogger(__name__)
+
+BINANCE_KLINES_URL = binance_url('/api/v3/klines')
+
+# fetcher(symbol, interval, start_ms or None, limit) -> Binance kline rows
+KlineFetcher = Callable[[str, str, Optional[int], int], Optional[List[list]]]
+
+# Intervals Binance does not serve: built from (base interval, base candles per candle)
+DERIVED_INTERVALS = {'3h': ('1h', 3)}
+
+
+def _binance_fetcher(symbol: str, interval: str, start_ms: Optional[int], limit: int) -> Optional[List[list]]:
+    """Default fetcher: blocking Binance REST klines request"""
+    # Import requests here to handle missing dependency gracefully
+    import requests
+
+    params = {'symbol': symbol, 'interval': interval, 'limit': limit}
+    if start_ms is not None:
+        params['startTime'] = start_ms
+    response = requests.get(BINANCE_KLINES_URL, params=params, timeout=10)
+    if response.status_code != 200:
+        logger.warning(f"Binance API returned {response.status_code}")
+        return None
+    return response.json()
+
+
+def _klines_to_series(klines: List[list]) -> pd.Series:
+    """Binance kline rows → close Series indexed by naive UTC open time"""
+    opens = pd.to_datetime([int(k[0]) for k in klines], unit='ms')
+    closes = np.array([float(k[4]) for k in klines], dtype=np.float64)
+    return pd.Series(closes, index=pd.DatetimeIndex(opens), name='close')
+
+
+def aggregate_klines(klines: List[list], timeframe: str) -> List[list]:
+    """
+    Aggregate base-interval kline rows into UTC-aligned candles of timeframe
+
+    A leading bucket that starts mid-candle is dropped; the last bucket may
+    still be forming (it is replaced on the next merge).
+
+    Args:
+        klines: Base-interval rows ([open_time_ms, open, high, low, close, volume, ...])
+        timeframe: Target timeframe (e.g. '3h')
+
+    Returns:
+        Rows [open_time_ms, open, high, low, close, volume]
+    """
+    duration = timeframe_duration(timeframe)
+    if not klines or duration is None:
+        return []
+    step_ms = int(duration.total_seconds() * 1000)
+
+    buckets: Dict[int, list] = {}
+    for k in klines:
+        open_ms = int(k[0])
+        bucket = open_ms - open_ms % step_ms
+        row = buckets.get(bucket)
+        if row is None:
+            if not buckets and open_ms != bucket:
+                continue  # partial leading candle
+            buckets[bucket] = [bucket, float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5])]
+        else:
+            row[2] = max(row[2], float(k[2]))
+            row[3] = min(row[3], float(k[3]))
+            row[4] = float(k[4])
+            row[5] += float(k[5])
+    return list(buckets.values())
+
+
+def correlate_returns(
+    reference: np.ndarray,
+    assets: np.ndarray,
+    min_periods: int = 29
+) -> np.ndarray:
+    """
+    Pearson correlation of percentage returns, one asset per column
+
+    Args:
+        reference: Reference closes, shape (n,)
+        assets: Asset closes aligned to reference, shape (n, k); NaN = missing
+        min_periods: Minimum number of paired returns per column
+
+    Returns:
+        Correlations, shape (k,); NaN where undefined
+    """
+    ref_returns = reference[1:] / reference[:-1] - 1.0
+    asset_returns = assets[1:] / assets[:-1] - 1.0
+
+    mask = np.isfinite(asset_returns) & np.isfinite(ref_returns)[:, None]
+    count = mask.sum(axis=0)
+    safe_count = np.maximum(count, 1)
+
+    ref_matrix = np.where(mask, ref_returns[:, None], 0.0)
+    asset_matrix = np.where(mask, asset_returns, 0.0)
+    ref_dev = np.where(mask, ref_matrix - ref_matrix.sum(axis=0) / safe_count, 0.0)
+    asset_dev = np.where(mask, asset_matrix - asset_matrix.sum(axis=0) / safe_count, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = (ref_dev * asset_dev).sum(axis=0) / np.sqrt(
+            (ref_dev ** 2).sum(axis=0) * (asset_dev ** 2).sum(axis=0)
+        )
+    corr[count < min_periods] = np.nan
+    corr[~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+class BTCReferenceSeries:
+    """
+    BTC close series per timeframe, refreshed incrementally.
+
+    Features:
+    - One fetch per timeframe per new candle, regardless of signal count
+    - Incremental fetch (only candles since the last stored one)
+    - Can be fed from klines the caller already fetched (no extra request)
+    - Intervals Binance does not serve (3h) are built from the base interval
+    - Vectorized return correlations for many assets at once
+    """
+
+    def __init__(
+        self,
+        symbol: str = 'BTCUSDT',
+        max_candles: int = 1000,
+        fetcher: Optional[KlineFetcher] = None
+    ):
+        """
+        Initialize the reference series.
+
+        Args:
+            symbol: Reference symbol
+            max_candles: Candles kept per timeframe (Binance max per request: 1000)
+            fetcher: Kline fetcher (default: blocking Binance REST request)
+        """
+        self.symbol = symbol
+        self.max_candles = max_candles
+        self.fetcher = fetcher or _binance_fetcher
+        self._series: Dict[str, pd.Series] = {}
+        self._lock = threading.Lock()
+        self._fetches = 0
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def needs_refresh(self, timeframe: str, now: Optional[datetime] = None) -> bool:
+        """
+        Whether a new candle has opened since the series was last updated
+
+        Args:
+            timeframe: Timeframe
+            now: Reference time, naive UTC (default: current UTC time)
+        """
+        with self._lock:
+            series = self._series.get(timeframe)
+        if series is None or series.empty:
+            return True
+        duration = timeframe_duration(timeframe)
+        if duration is None:
+            return True
+        return series.index[-1] + duration <= (now or utc_now_naive())
+
+    def _merge(self, timeframe: str, update: pd.Series):
+        with self._lock:
+            current = self._series.get(timeframe)
+            if current is not None and not current.empty:
+                # Newer values win (the last stored candle may have been forming)
+                update = pd.concat([current[current.index < update.index[0]], update])
+            update = update[~update.index.duplicated(keep='last')].sort_index()
+            self._series[timeframe] = update.iloc[-self.max_candles:]
+
+    def update_from_klines(self, timeframe: str, klines: Optional[List[list]], source_timeframe: Optional[str] = None):
+        """
+        Merge Binance kline rows into the series
+
+        Args:
+            timeframe: Timeframe of the series
+            klines: Kline rows ([open_time_ms, open, high, low, close, ...])
+            source_timeframe: Timeframe of the rows if smaller (aggregated first)
+        """
+        if source_timeframe and source_timeframe != timeframe:
+            klines = aggregate_klines(klines, timeframe)
+        if not klines:
+            return
+        self._merge(timeframe, _klines_to_series(klines))
+
+    def update_from_frame(self, timeframe: str, df: pd.DataFrame):
+        """
+        Merge a BTC OHLCV DataFrame into the series
+
+        Args:
+            timeframe: Timeframe of the frame
+            df: DataFrame with 'close' and a DatetimeIndex or 'timestamp' column
+        """
+        if df is None or df.empty or 'close' not in df.columns:
+            return
+        times = candle_open_times(df)
+        if times is None:
+            return
+        series = pd.Series(df['close'].to_numpy(dtype=np.float64), index=times, name='close')
+        self._merge(timeframe, series.sort_index())
+
+    def refresh(self, timeframe: str, now: Optional[datetime] = None) -> bool:
+        """
+        Fetch candles opened since the last update, if any
+
+        Args:
+            timeframe: Timeframe
+            now: Reference time, naive UTC (default: current UTC time)
+
+        Returns:
+            True if the series is available after the call
+        """
+        if not self.needs_refresh(timeframe, now):
+            return True
+
+        with self._lock:
+            current = self._series.get(timeframe)
+        start_ms = None
+        if current is not None and not current.empty:
+            start_ms = int(current.index[-1].value // 10**6)
+
+        # Binance has no endpoint for derived intervals (3h) - fetch the base interval
+        base_timeframe, factor = DERIVED_INTERVALS.get(timeframe, (timeframe, 1))
+        limit = self.max_candles if factor == 1 else min(self.max_candles * factor, 1000)
+        try:
+            klines = self.fetcher(self.symbol, base_timeframe, start_ms, limit)
+            self._fetches += 1
+        except ImportError as e:
+            logger.warning(f"Required library not available - BTC reference series disabled: {e}")
+            klines = None
+        except Exception as e:
+            logger.warning(f"BTC reference fetch failed: {e}")
+            klines = None
+
+        if klines:
+            self.update_from_klines(timeframe, klines, source_timeframe=base_timeframe)
+            logger.debug(f"✅ BTC reference {timeframe}: +{len(klines)} candles")
+
+        with self._lock:
+            series = self._series.get(timeframe)
+        return series is not None and not series.empty
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_closes(self, timeframe: str, refresh: bool = True, now: Optional[datetime] = None) -> Optional[pd.Series]:
+        """
+        Get the BTC close series for a timeframe
+
+        Args:
+            timeframe: Timeframe
+            refresh: Fetch new candles first if a candle has opened since the last update
+            now: Reference time, naive UTC (default: current UTC time)
+
+        Returns:
+            Close Series indexed by naive UTC open time, or None
+        """
+        if refresh:
+            self.refresh(timeframe, now)
+        with self._lock:
+            return self._series.get(timeframe)
+
+    def correlations(
+        self,
+        timeframe: str,
+        assets: Dict[str, pd.Series],
+        min_periods: int = 29,
+        refresh: bool = True,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Return correlations of many assets against BTC in one pass
+
+        Each asset Series (closes indexed by open time) is aligned to the BTC
+        timestamps it overlaps; returns are paired candle by candle.
+
+        Args:
+            timeframe: Timeframe of the asset series
+            assets: {symbol: close Series}
+            min_periods: Minimum number of paired returns
+            refresh: Refresh the BTC series first if needed
+            now: Reference time, naive UTC (default: current UTC time)
+
+        Returns:
+            {symbol: correlation or None}
+        """
+        result: Dict[str, Optional[float]] = {symbol: None for symbol in assets}
+        btc = self.get_closes(timeframe, refresh=refresh, now=now)
+        if btc is None or len(btc) < 2 or not assets:
+            return result
+
+        symbols = list(assets)
+        start = min(s.index[0] for s in assets.values() if len(s))
+        end = max(s.index[-1] for s in assets.values() if len(s))
+        btc = btc[(btc.index >= start) & (btc.index <= end)]
+        if len(btc) < 2:
+            return result
+
+        matrix = np.column_stack([
+            assets[symbol].reindex(btc.index).to_numpy(dtype=np.float64) for symbol in symbols
+        ])
+        corr = correlate_returns(btc.to_numpy(), matrix, min_periods)
+        for symbol, value in zip(symbols, corr):
+            result[symbol] = None if np.isnan(value) else float(value)
+        return result
+
+    def correlation(
+        self,
+        symbol: str,
+        closes: pd.Series,
+        timeframe: str,
+        min_periods: int = 29,
+        now: Optional[datetime] = None
+    ) -> Optional[float]:
+        """Single-asset convenience wrapper around correlations()"""
+        return self.correlations(timeframe, {symbol: closes}, min_periods, now=now)[symbol]
+
+    def get_stats(self) -> Dict:
+        """Get series statistics"""
+        with self._lock:
+            return {
+                'timeframes': {tf: len(s) for tf, s in self._series.items()},
+                'fetches': self._fetches,
+            }
+
+
+# Global BTC reference series instance
+_btc_reference_series_instance: Optional[BTCReferenceSeries] = None
+
+
+def get_btc_reference_series() -> BTCReferenceSeries:
+    """
+    Get or create the global BTC reference series (singleton).
+
+    Returns:
+        BTCReferenceSeries instance
+    """
+    global _btc_reference_series_instance
+
+    if _btc_reference_series_instance is None:
+        _btc_reference_series_instance = BTCReferenceSeries()
+        logger.info("Created global BTC reference series instance")
+
+    return _btc_reference_series_instance
+
+
+def reset_btc_reference_series() -> None:
+    """Reset global BTC reference series instance (for testing)."""
+    global _btc_reference_series_instance
+    _btc_reference_series_instance = None
@@ -1,36 +1,77 @@
-"""Config Loader Module - Loads feature flags from JSON"""
-import json
+"""Config Loader Module - Loads feature flags from JSON
+
+Flags are parsed once into the config registry and served from memory;
+edits to feature_flags.json are picked up by mtime polling.
+"""
+import copy
 import logging
 import os
 from typing import Dict, Any
 
+from config.config_registry import get_config_registry
+
 logger = logging.getLogger(__name__)
-CONFIG_PATH = os.path. join(os.path.dirname(__file__), 'feature_flags.json')
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'feature_flags.json')
+FEATURE_FLAGS = 'feature_flags'
+
+
+def _registry():
+    registry = get_config_registry()
+    registry.register(FEATURE_FLAGS, CONFIG_PATH)  # no-op once registered
+    return registry
+
 
 def load_feature_flags() -> Dict[str, Any]:
-    """Load feature flags from config/feature_flags.json"""
+    """Load feature flags from config/feature_flags.json (a mutable copy)"""
     try:
-        with open(CONFIG_PATH, 'r') as f:
-            return json.load(f)
+        return copy.deepcopy(_registry().get(FEATURE_FLAGS))
     except Exception as e:
         logger.error(f"Error loading feature flags: {e}")
         return {}
 
 def get_feature_flag(path: str, default: Any = False) -> Any:
     """Get specific feature flag by dot-separated path"""
-    try: 
-        flags = load_feature_flags()
-        keys = path.split('.')
-        value = flags
-        for key in keys:
-            value = value.get(key, default)
-            if value == default:
-                break
-        return value
-    except Exception as e: 
+    try:
+        return _registry().lookup(FEATURE_FLAGS, path, default)
+    except Exception as e:
         logger.error(f"Error getting feature flag:  {e}")
         return default
 
 def is_feature_enabled(feature_path: str) -> bool:
     """Check if feature is enabled"""
     return get_feature_flag(feature_path, default=False) == True
+
+def feature_flag_integration_enabled() -> bool:
+    """
+    Whether the ICT enhancer and ICTSignalEngine flag overrides read feature_flags.json
+
+    Off unless FEATURE_FLAG_INTEGRATION=true (these paths were never active before).
+    """
+    return os.getenv('FEATURE_FLAG_INTEGRATION', 'false').lower() == 'true'
+
+def get_flag(path: str, default: Any = False) -> Any:
+    """Alias of get_feature_flag"""
+    return get_feature_flag(path, default)
+
+def update_feature_flag(path: str, value: Any) -> bool:
+    """Set a flag by dot-separated path and persist feature_flags.json atomically"""
+    try:
+        registry = _registry()
+        flags = copy.deepcopy(registry.get(FEATURE_FLAGS))
+        *parents, leaf = path.split('.')
+        node = flags
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = value
+        registry.write(FEATURE_FLAGS, flags)
+        logger.info(f"🔧 Feature flag updated: {path} = {value}")
+        return True
+    except Exception as e:
+        logger.error(f"Error updating feature flag {path}: {e}")
+        return False
+
+def toggle_flag(path: str) -> bool:
+    """Invert a boolean flag and return its new value"""
+    new_value = not is_feature_enabled(path)
+    update_feature_flag(path, new_value)
+    return new_value
@@ -0,0 +1,220 @@
+"""Config Registry - Parsed JSON configs served from memory, reloaded on file change
+
+Each registered file is parsed once. Lookups are answered from the in-memory
+snapshot; the file is re-stat'ed at most once per poll interval and re-parsed
+only when its mtime/size changes. A reload swaps the snapshot in one step,
+and a broken edit (invalid JSON) keeps the previous snapshot live.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=1024)
+def split_path(path: str) -> Tuple[str, ...]:
+    """Split a dot-separated flag path once; results are memoized"""
+    return tuple(path.split('.'))
+
+
+class _Entry:
+    """One registered config file and its current snapshot"""
+
+    def __init__(self, path: str, defaults: Optional[Dict[str, Any]], create_if_missing: bool):
+        self.path = path
+        self.defaults = defaults
+        self.create_if_missing = create_if_missing
+        self.data: Dict[str, Any] = {}
+        self.signature: Optional[Tuple[int, int]] = None
+        self.last_check = 0.0
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+
+class ConfigRegistry:
+    """
+    In-memory registry of JSON config files
+
+    Args:
+        poll_interval: Minimum seconds between mtime checks of a file
+    """
+
+    def __init__(self, poll_interval: float = 1.0):
+        self.poll_interval = poll_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+
+    def register(
+        self,
+        name: str,
+        path: str,
+        defaults: Optional[Dict[str, Any]] = None,
+        create_if_missing: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Register a config file (idempotent) and return its snapshot
+
+        Args:
+            name: Registry key (e.g. 'feature_flags')
+            path: JSON file path
+            defaults: Values used for keys missing from the file
+            create_if_missing: Write defaults to path if the file does not exist
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.path != path:
+                entry = _Entry(path, defaults, create_if_missing)
+                self._entries[name] = entry
+                self._load(entry)
+            return entry.data
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._entries
+
+    def _signature(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, entry: _Entry) -> bool:
+        """(Re)parse the file; keep the old snapshot on error"""
+        entry.last_check = time.monotonic()
+        signature = self._signature(entry.path)
+
+        if signature is None:
+            if entry.create_if_missing and entry.defaults is not None:
+                self._write_file(entry.path, entry.defaults)
+                signature = self._signature(entry.path)
+            entry.data = dict(entry.defaults or {})
+            entry.signature = signature
+            return True
+
+        try:
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading config {entry.path}: {e}")
+            entry.signature = signature  # don't retry the same broken file every poll
+            if entry.defaults is not None and not entry.data:
+                entry.data = dict(entry.defaults)
+            return False
+
+        if entry.defaults is not None and isinstance(loaded, dict):
+            data = dict(entry.defaults)
+            data.update(loaded)
+        else:
+            data = loaded
+
+        # Atomic swap - readers see either the old or the new snapshot
+        entry.data = data
+        entry.signature = signature
+        for listener in list(entry.listeners):
+            try:
+                listener(data)
+            except Exception as e:
+                logger.warning(f"Config listener error for {entry.path}: {e}")
+        return True
+
+    def _maybe_reload(self, entry: _Entry):
+        if time.monotonic() - entry.last_check < self.poll_interval:
+            return
+        with self._lock:
+            entry.last_check = time.monotonic()
+            if self._signature(entry.path) != entry.signature:
+                logger.info(f"🔄 Config changed on disk, reloading {entry.path}")
+                self._load(entry)
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """
+        Current snapshot of a registered config (treat as read-only)
+
+        Raises:
+            KeyError: If the name is not registered
+        """
+        entry = self._entries[name]
+        self._maybe_reload(entry)
+        return entry.data
+
+    def lookup(self, name: str, path: str, default: Any = None) -> Any:
+        """
+        Look up a dot-separated path in a registered config
+
+        Args:
+            name: Registry key
+            path: Dot-separated key path (e.g. 'fundamental_analysis.enabled')
+            default: Returned when any key along the path is missing
+        """
+        value: Any = self.get(name)
+        for key in split_path(path):
+            if not isinstance(value, dict):
+                return default
+            value = value.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+        return value
+
+    def reload(self, name: Optional[str] = None) -> bool:
+        """Force a re-parse of one (or every) registered config"""
+        with self._lock:
+            names = [name] if name is not None else list(self._entries)
+            return all(self._load(self._entries[n]) for n in names)
+
+    def write(self, name: str, data: Dict[str, Any]):
+        """
+        Atomically write a config file and make it the current snapshot
+
+        Args:
+            name: Registry key
+            data: Full config content
+        """
+        with self._lock:
+            entry = self._entries[name]
+            self._write_file(entry.path, data)
+            self._load(entry)
+
+    def subscribe(self, name: str, listener: Callable[[Dict[str, Any]], None]):
+        """Call listener(snapshot) after every reload of a config"""
+        with self._lock:
+            self._entries[name].listeners.append(listener)
+
+    @staticmethod
+    def _write_file(path: str, data: Dict[str, Any]):
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# Global registry instance
+_registry: Optional[ConfigRegistry] = None
+
+
+def get_config_registry() -> ConfigRegistry:
+    """Get or create the global config registry (singleton)"""
+    global _registry
+    if _registry is None:
+        _registry = ConfigRegistry()
+    return _registry
+
+
+def reset_config_registry() -> None:
+    """Reset global config registry instance (for testing)"""
+    global _registry
+    _registry = None
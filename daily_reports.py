@@ -8,6 +8,8 @@ import json
 import os
 import pytz
 
+from report_aggregates import JOURNAL_FIELDS, SIGNAL_FIELDS, CONFIDENCE_RANGES, ReportAggregates
+
 class DailyReportEngine:
     def __init__(self):
         # Auto-detect base path (works on Codespace AND server AND GitHub Actions)
@@ -26,6 +28,93 @@ class DailyReportEngine:
         
         # Bulgarian timezone
         self.bg_tz = pytz.timezone('Europe/Sofia')
+        
+        # Материализирани дневни rollups (journal + bot_stats.json backup)
+        self.journal_aggregates = ReportAggregates(self._convert_journal_to_signal_format, JOURNAL_FIELDS)
+        self.stats_aggregates = ReportAggregates(fields=SIGNAL_FIELDS)
+        self._journal_stamp = None
+        self._stats_stamp = None
+    
+    @staticmethod
+    def _file_stamp(path):
+        """(mtime_ns, size) на файла или None ако липсва"""
+        try:
+            stat = os.stat(path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+    
+    def note_journal_saved(self, journal):
+        """
+        Обновява rollups след запис на journal-а (извиква се от save_journal)
+        
+        Args:
+            journal: Току-що записаният journal dict
+        """
+        try:
+            self.journal_aggregates.sync(journal.get('trades', []))
+            self._journal_stamp = self._file_stamp(self.journal_path)
+        except Exception as e:
+            print(f"❌ Error updating report aggregates: {e}")
+            self._journal_stamp = None
+    
+    def _aggregates(self):
+        """
+        Връща актуалните rollups: journal ако има trades, иначе bot_stats.json
+        
+        Файловете се препрочитат само ако mtime/size са се променили, а
+        sync() конвертира наново само променените trades.
+        """
+        stamp = self._file_stamp(self.journal_path)
+        if stamp != self._journal_stamp:
+            self.journal_aggregates.sync(self._load_trades_from_journal())
+            self._journal_stamp = stamp
+        if len(self.journal_aggregates):
+            return self.journal_aggregates
+        
+        # Ако няма trades в journal, използвай bot_stats.json като backup
+        print("ℹ️ No trades in journal, using bot_stats.json as backup")
+        stamp = self._file_stamp(self.stats_path)
+        if stamp != self._stats_stamp:
+            self.stats_aggregates.sync(self._load_trades_from_stats())
+            self._stats_stamp = stamp
+        return self.stats_aggregates
+    
+    @staticmethod
+    def _breakdown_stats(breakdown):
+        """Rollup breakdown -> {key: total, completed, wins, accuracy, profit}"""
+        return {
+            key: {
+                'total': entry['total'],
+                'completed': entry['completed'],
+                'wins': entry['wins'],
+                'accuracy': (entry['wins'] / entry['completed'] * 100) if entry['completed'] else 0,
+                'profit': entry['profit']
+            }
+            for key, entry in breakdown.items()
+        }
+    
+    @staticmethod
+    def _period_stats(bucket):
+        """Общите полета на дневен/седмичен/месечен отчет от rollup bucket"""
+        completed = bucket['completed']
+        avg_win = bucket['win_sum'] / bucket['win_count'] if bucket['win_count'] else 0
+        avg_loss = bucket['loss_sum'] / bucket['loss_count'] if bucket['loss_count'] else 0
+        return {
+            'total_signals': bucket['total'],
+            'buy_signals': bucket['by_type'].get('BUY', 0),
+            'sell_signals': bucket['by_type'].get('SELL', 0),
+            'active_signals': bucket['active'],
+            'completed_signals': completed,
+            'wins': bucket['wins'],
+            'losses': bucket['losses'],
+            'accuracy': (bucket['wins'] / completed * 100) if completed else 0,
+            'total_profit': bucket['profit_sum'],
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'profit_factor': abs(avg_win / avg_loss) if avg_loss != 0 else 0,
+            'avg_confidence': bucket['confidence_sum'] / bucket['total'] if bucket['total'] else 0,
+        }
     
     def _load_trades_from_journal(self):
         """Зарежда trades от Trading Journal (ML Journal)"""
@@ -98,17 +187,9 @@ class DailyReportEngine:
         """Генерира дневен отчет с анализ на точност и успеваемост"""
         try:
             # ИЗПОЛЗВАМЕ TRADING JOURNAL (ML Journal) като основен източник
-            journal_trades = self._load_trades_from_journal()
-            
-            # Ако няма trades в journal, използвай bot_stats.json като backup
-            if not journal_trades:
-                print("ℹ️ No trades in journal, using bot_stats.json as backup")
-                signals = self._load_trades_from_stats()
-            else:
-                # Преобразувай journal trades в signal формат
-                signals = [self._convert_journal_to_signal_format(t) for t in journal_trades]
+            aggregates = self._aggregates()
             
-            if not signals:
+            if not len(aggregates):
                 return None
             
             # Използвай българско време
@@ -116,149 +197,64 @@ class DailyReportEngine:
             today = now_bg.date()
             yesterday = today - timedelta(days=1)
             
-            # Филтрирай ВЧЕРАШНИ сигнали (не днешни!)
-            yesterday_signals = [
-                s for s in signals
-                if datetime.fromisoformat(s['timestamp']).date() == yesterday
-            ]
+            # ВЧЕРАШНИЯТ дневен bucket (не днешният!)
+            day = aggregates.day(yesterday)
             
-            if not yesterday_signals:
+            if not day['total']:
                 return self._generate_no_signals_report(yesterday)
             
-            # === ОСНОВНИ СТАТИСТИКИ ===
-            total = len(yesterday_signals)
-            buy_signals = len([s for s in yesterday_signals if s['type'] == 'BUY'])
-            sell_signals = len([s for s in yesterday_signals if s['type'] == 'SELL'])
-            
-            # === АНАЛИЗ НА ТОЧНОСТ ===
-            completed_signals = [s for s in yesterday_signals if s.get('status') == 'COMPLETED']
-            active_signals = [s for s in yesterday_signals if s.get('status') == 'ACTIVE']
-            
-            # Точност (Accuracy) - колко сигнала са завършени успешно
-            if completed_signals:
-                wins = len([s for s in completed_signals if s.get('result') == 'WIN'])
-                losses = len([s for s in completed_signals if s.get('result') == 'LOSS'])
-                breakeven = len([s for s in completed_signals if s.get('result') == 'BREAKEVEN'])
-                
-                accuracy = (wins / len(completed_signals) * 100) if completed_signals else 0
-                win_rate = (wins / len(completed_signals) * 100) if completed_signals else 0
-            else:
-                wins = losses = breakeven = 0
-                accuracy = win_rate = 0
-            
-            # === УСПЕВАЕМОСТ (Performance) ===
-            total_profit = 0
-            avg_win = 0
-            avg_loss = 0
-            best_trade = None
-            worst_trade = None
-            
-            if completed_signals:
-                profitable_trades = [s for s in completed_signals if s.get('profit_pct', 0) > 0]
-                losing_trades = [s for s in completed_signals if s.get('profit_pct', 0) < 0]
-                
-                # Общ profit
-                total_profit = sum([s.get('profit_pct', 0) for s in completed_signals])
-                
-                # Среден печеливш и губещ trade
-                if profitable_trades:
-                    avg_win = sum([s['profit_pct'] for s in profitable_trades]) / len(profitable_trades)
-                    best_trade = max(profitable_trades, key=lambda x: x['profit_pct'])
-                
-                if losing_trades:
-                    avg_loss = sum([s['profit_pct'] for s in losing_trades]) / len(losing_trades)
-                    worst_trade = min(losing_trades, key=lambda x: x['profit_pct'])
-            
-            # === СТАТИСТИКА ПО CONFIDENCE ===
-            avg_confidence = sum([s['confidence'] for s in yesterday_signals]) / total if total > 0 else 0
+            stats = self._period_stats(day)
             
             # Точност по confidence ranges
             confidence_accuracy = {}
-            for range_name in ['60-69', '70-79', '80-89', '90-100']:
-                range_signals = [s for s in completed_signals 
-                                if self._in_confidence_range(s['confidence'], range_name)]
-                if range_signals:
-                    range_wins = len([s for s in range_signals if s.get('result') == 'WIN'])
+            for range_name in CONFIDENCE_RANGES:
+                entry = day['confidence_accuracy'].get(range_name)
+                if entry:
                     confidence_accuracy[range_name] = {
-                        'total': len(range_signals),
-                        'wins': range_wins,
-                        'accuracy': (range_wins / len(range_signals) * 100)
+                        'total': entry['total'],
+                        'wins': entry['wins'],
+                        'accuracy': (entry['wins'] / entry['total'] * 100)
                     }
             
-            # === СТАТИСТИКА ПО СИМВОЛИ ===
-            symbols_stats = {}
-            symbols_traded = list(set([s['symbol'] for s in yesterday_signals]))
-            
-            for symbol in symbols_traded:
-                symbol_signals = [s for s in yesterday_signals if s['symbol'] == symbol]
-                symbol_completed = [s for s in symbol_signals if s.get('status') == 'COMPLETED']
-                
-                if symbol_completed:
-                    symbol_wins = len([s for s in symbol_completed if s.get('result') == 'WIN'])
-                    symbol_accuracy = (symbol_wins / len(symbol_completed) * 100)
-                    symbol_profit = sum([s.get('profit_pct', 0) for s in symbol_completed])
-                else:
-                    symbol_wins = 0
-                    symbol_accuracy = 0
-                    symbol_profit = 0
-                
-                symbols_stats[symbol] = {
-                    'total': len(symbol_signals),
-                    'completed': len(symbol_completed),
-                    'wins': symbol_wins,
-                    'accuracy': symbol_accuracy,
-                    'profit': symbol_profit
-                }
-            
-            # === ML СТАТИСТИКА ===
-            ml_signals = [s for s in yesterday_signals if s.get('ml_mode')]
-            ml_completed = [s for s in ml_signals if s.get('status') == 'COMPLETED']
-            
-            if ml_completed:
-                ml_wins = len([s for s in ml_completed if s.get('result') == 'WIN'])
-                ml_accuracy = (ml_wins / len(ml_completed) * 100)
-            else:
-                ml_wins = 0
-                ml_accuracy = 0
-            
             report = {
                 'date': yesterday.isoformat(),  # Вчерашна дата!
                 'timestamp': now_bg.isoformat(),
                 
                 # Основни данни
-                'total_signals': total,
-                'buy_signals': buy_signals,
-                'sell_signals': sell_signals,
-                'active_signals': len(active_signals),
-                'completed_signals': len(completed_signals),
+                'total_signals': stats['total_signals'],
+                'buy_signals': stats['buy_signals'],
+                'sell_signals': stats['sell_signals'],
+                'active_signals': stats['active_signals'],
+                'completed_signals': stats['completed_signals'],
                 
                 # Точност
-                'wins': wins,
-                'losses': losses,
-                'breakeven': breakeven,
-                'accuracy': accuracy,
-                'win_rate': win_rate,
+                'wins': stats['wins'],
+                'losses': stats['losses'],
+                'breakeven': day['breakeven'],
+                'accuracy': stats['accuracy'],
+                'win_rate': stats['accuracy'],
                 
                 # Успеваемост
-                'total_profit': total_profit,
-                'avg_win': avg_win,
-                'avg_loss': avg_loss,
-                'best_trade': best_trade,
-                'worst_trade': worst_trade,
-                'profit_factor': abs(avg_win / avg_loss) if avg_loss != 0 else 0,
+                'total_profit': stats['total_profit'],
+                'avg_win': stats['avg_win'],
+                'avg_loss': stats['avg_loss'],
+                'best_trade': day['best_profitable'][2] if day['best_profitable'] else None,
+                'worst_trade': day['worst_losing'][2] if day['worst_losing'] else None,
+                'profit_factor': stats['profit_factor'],
                 
                 # Confidence
-                'avg_confidence': avg_confidence,
+                'avg_confidence': stats['avg_confidence'],
                 'confidence_accuracy': confidence_accuracy,
                 
-                # Символи
-                'symbols_traded': symbols_traded,
-                'symbols_stats': symbols_stats,
+                # Символи и таймфреймове
+                'symbols_traded': list(day['symbols']),
+                'symbols_stats': self._breakdown_stats(day['symbols']),
+                'timeframes_stats': self._breakdown_stats(day['timeframes']),
                 
                 # ML
-                'ml_signals_count': len(ml_signals),
-                'ml_completed': len(ml_completed),
-                'ml_accuracy': ml_accuracy
+                'ml_signals_count': day['ml_signals'],
+                'ml_completed': day['ml_completed'],
+                'ml_accuracy': (day['ml_wins'] / day['ml_completed'] * 100) if day['ml_completed'] else 0
             }
             
             # Запази отчета
@@ -482,15 +478,9 @@ class DailyReportEngine:
         """Седмичен обобщен отчет с точност и успеваемост - ИЗМИНАЛА СЕДМИЦА (Пн-Нд)"""
         try:
             # ИЗПОЛЗВАМЕ TRADING JOURNAL (ML Journal) като основен източник
-            journal_trades = self._load_trades_from_journal()
-            
-            if not journal_trades:
-                print("ℹ️ No trades in journal, using bot_stats.json as backup")
-                signals = self._load_trades_from_stats()
-            else:
-                signals = [self._convert_journal_to_signal_format(t) for t in journal_trades]
+            aggregates = self._aggregates()
             
-            if not signals:
+            if not len(aggregates):
                 return None
             
             # Използвай българско време
@@ -507,92 +497,43 @@ class DailyReportEngine:
             # Намери края на ИЗМИНАЛАТА седмица (неделя)
             last_week_sunday = last_week_monday + timedelta(days=6, hours=23, minutes=59, seconds=59)
             
-            # Филтрирай сигналите за ИЗМИНАЛАТА седмица
-            weekly_signals = [
-                s for s in signals
-                if last_week_monday.date() <= datetime.fromisoformat(s['timestamp']).date() <= last_week_sunday.date()
-            ]
+            # 7 дневни bucket-а на ИЗМИНАЛАТА седмица
+            days = [aggregates.day(last_week_monday.date() + timedelta(days=i)) for i in range(7)]
+            week = aggregates.period(last_week_monday.date(), last_week_sunday.date())
             
-            if not weekly_signals:
+            if not week['total']:
                 return None
             
-            # Основни статистики
-            total_signals = len(weekly_signals)
-            buy_signals = len([s for s in weekly_signals if s['type'] == 'BUY'])
-            sell_signals = len([s for s in weekly_signals if s['type'] == 'SELL'])
-            
-            # Завършени trades
-            completed = [s for s in weekly_signals if s.get('status') == 'COMPLETED']
-            active = [s for s in weekly_signals if s.get('status') == 'ACTIVE']
-            
-            # Точност
-            if completed:
-                wins = len([s for s in completed if s.get('result') == 'WIN'])
-                losses = len([s for s in completed if s.get('result') == 'LOSS'])
-                accuracy = (wins / len(completed) * 100)
-            else:
-                wins = losses = 0
-                accuracy = 0
-            
-            # Успеваемост
-            total_profit = sum([s.get('profit_pct', 0) for s in completed])
-            
-            if completed:
-                profitable = [s for s in completed if s.get('profit_pct', 0) > 0]
-                losing = [s for s in completed if s.get('profit_pct', 0) < 0]
-                
-                avg_win = sum([s['profit_pct'] for s in profitable]) / len(profitable) if profitable else 0
-                avg_loss = sum([s['profit_pct'] for s in losing]) / len(losing) if losing else 0
-                best_trade = max(completed, key=lambda x: x.get('profit_pct', 0)) if completed else None
-                worst_trade = min(completed, key=lambda x: x.get('profit_pct', 0)) if completed else None
-            else:
-                avg_win = avg_loss = 0
-                best_trade = worst_trade = None
-            
-            # Confidence
-            avg_confidence = sum([s['confidence'] for s in weekly_signals]) / total_signals
+            stats = self._period_stats(week)
             
             # По дни
             daily_breakdown = {}
-            for i in range(7):
-                day = last_week_monday.date() + timedelta(days=i)
-                day_signals = [s for s in weekly_signals 
-                             if datetime.fromisoformat(s['timestamp']).date() == day]
-                day_completed = [s for s in day_signals if s.get('status') == 'COMPLETED']
-                
-                if day_completed:
-                    day_wins = len([s for s in day_completed if s.get('result') == 'WIN'])
-                    day_accuracy = (day_wins / len(day_completed) * 100)
-                    day_profit = sum([s.get('profit_pct', 0) for s in day_completed])
-                else:
-                    day_accuracy = 0
-                    day_profit = 0
-                
-                daily_breakdown[day.isoformat()] = {
-                    'total': len(day_signals),
-                    'completed': len(day_completed),
-                    'accuracy': day_accuracy,
-                    'profit': day_profit
+            for i, day in enumerate(days):
+                daily_breakdown[(last_week_monday.date() + timedelta(days=i)).isoformat()] = {
+                    'total': day['total'],
+                    'completed': day['completed'],
+                    'accuracy': (day['wins'] / day['completed'] * 100) if day['completed'] else 0,
+                    'profit': day['profit_sum'] if day['completed'] else 0
                 }
             
             return {
                 'period': f'Изминала седмица ({last_week_monday.strftime("%d.%m")} - {last_week_sunday.strftime("%d.%m")})',
                 'start_date': last_week_monday.date().isoformat(),
                 'end_date': last_week_sunday.date().isoformat(),
-                'total_signals': total_signals,
-                'buy_signals': buy_signals,
-                'sell_signals': sell_signals,
-                'active_signals': len(active),
-                'completed_signals': len(completed),
-                'wins': wins,
-                'losses': losses,
-                'accuracy': accuracy,
-                'total_profit': total_profit,
-                'avg_win': avg_win,
-                'avg_loss': avg_loss,
-                'avg_confidence': avg_confidence,
-                'best_trade': best_trade,
-                'worst_trade': worst_trade,
+                'total_signals': stats['total_signals'],
+                'buy_signals': stats['buy_signals'],
+                'sell_signals': stats['sell_signals'],
+                'active_signals': stats['active_signals'],
+                'completed_signals': stats['completed_signals'],
+                'wins': stats['wins'],
+                'losses': stats['losses'],
+                'accuracy': stats['accuracy'],
+                'total_profit': stats['total_profit'],
+                'avg_win': stats['avg_win'],
+                'avg_loss': stats['avg_loss'],
+                'avg_confidence': stats['avg_confidence'],
+                'best_trade': week['best_completed'][2] if week['best_completed'] else None,
+                'worst_trade': week['worst_completed'][2] if week['worst_completed'] else None,
                 'daily_breakdown': daily_breakdown
             }
             
@@ -606,15 +547,9 @@ class DailyReportEngine:
         """Месечен обобщен отчет с точност и успеваемост - ИЗМИНАЛ МЕСЕЦ (1-во - последно число)"""
         try:
             # ИЗПОЛЗВАМЕ TRADING JOURNAL (ML Journal) като основен източник
-            journal_trades = self._load_trades_from_journal()
-            
-            if not journal_trades:
-                print("ℹ️ No trades in journal, using bot_stats.json as backup")
-                signals = self._load_trades_from_stats()
-            else:
-                signals = [self._convert_journal_to_signal_format(t) for t in journal_trades]
+            aggregates = self._aggregates()
             
-            if not signals:
+            if not len(aggregates):
                 return None
             
             # Използвай българско време
@@ -634,76 +569,13 @@ class DailyReportEngine:
             last_month_start = last_month_end.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
             last_month_end = last_month_end.replace(hour=23, minute=59, second=59, microsecond=999999)
             
-            # Филтрирай сигналите за ИЗМИНАЛИЯ месец
-            monthly_signals = [
-                s for s in signals
-                if last_month_start.date() <= datetime.fromisoformat(s['timestamp']).date() <= last_month_end.date()
-            ]
+            # Merge на дневните bucket-и за ИЗМИНАЛИЯ месец
+            month = aggregates.period(last_month_start.date(), last_month_end.date())
             
-            if not monthly_signals:
+            if not month['total']:
                 return None
             
-            # Основни статистики
-            total_signals = len(monthly_signals)
-            buy_signals = len([s for s in monthly_signals if s['type'] == 'BUY'])
-            sell_signals = len([s for s in monthly_signals if s['type'] == 'SELL'])
-            
-            # Завършени trades
-            completed = [s for s in monthly_signals if s.get('status') == 'COMPLETED']
-            active = [s for s in monthly_signals if s.get('status') == 'ACTIVE']
-            
-            # Точност
-            if completed:
-                wins = len([s for s in completed if s.get('result') == 'WIN'])
-                losses = len([s for s in completed if s.get('result') == 'LOSS'])
-                accuracy = (wins / len(completed) * 100)
-            else:
-                wins = losses = 0
-                accuracy = 0
-            
-            # Успеваемост
-            total_profit = sum([s.get('profit_pct', 0) for s in completed])
-            
-            if completed:
-                profitable = [s for s in completed if s.get('profit_pct', 0) > 0]
-                losing = [s for s in completed if s.get('profit_pct', 0) < 0]
-                
-                avg_win = sum([s['profit_pct'] for s in profitable]) / len(profitable) if profitable else 0
-                avg_loss = sum([s['profit_pct'] for s in losing]) / len(losing) if losing else 0
-                best_trade = max(completed, key=lambda x: x.get('profit_pct', 0)) if completed else None
-                worst_trade = min(completed, key=lambda x: x.get('profit_pct', 0)) if completed else None
-                profit_factor = abs(avg_win / avg_loss) if avg_loss != 0 else 0
-            else:
-                avg_win = avg_loss = profit_factor = 0
-                best_trade = worst_trade = None
-            
-            # Confidence
-            avg_confidence = sum([s['confidence'] for s in monthly_signals]) / total_signals
-            
-            # Статистика по символи
-            symbols_stats = {}
-            symbols = list(set([s['symbol'] for s in monthly_signals]))
-            
-            for symbol in symbols:
-                symbol_signals = [s for s in monthly_signals if s['symbol'] == symbol]
-                symbol_completed = [s for s in symbol_signals if s.get('status') == 'COMPLETED']
-                
-                if symbol_completed:
-                    symbol_wins = len([s for s in symbol_completed if s.get('result') == 'WIN'])
-                    symbol_accuracy = (symbol_wins / len(symbol_completed) * 100)
-                    symbol_profit = sum([s.get('profit_pct', 0) for s in symbol_completed])
-                else:
-                    symbol_wins = 0
-                    symbol_accuracy = 0
-                    symbol_profit = 0
-                
-                symbols_stats[symbol] = {
-                    'total': len(symbol_signals),
-                    'completed': len(symbol_completed),
-                    'wins': symbol_wins,
-                    'accuracy': symbol_accuracy,
-                    'profit': symbol_profit
-                }
+            stats = self._period_stats(month)
             
             # По седмици
             weekly_breakdown = {}
@@ -712,24 +584,13 @@ class DailyReportEngine:
             
             while current_date <= last_month_end.date():
                 week_end = min(current_date + timedelta(days=6), last_month_end.date())
-                
-                week_signals = [s for s in monthly_signals 
-                              if current_date <= datetime.fromisoformat(s['timestamp']).date() <= week_end]
-                week_completed = [s for s in week_signals if s.get('status') == 'COMPLETED']
-                
-                if week_completed:
-                    week_wins = len([s for s in week_completed if s.get('result') == 'WIN'])
-                    week_accuracy = (week_wins / len(week_completed) * 100)
-                    week_profit = sum([s.get('profit_pct', 0) for s in week_completed])
-                else:
-                    week_accuracy = 0
-                    week_profit = 0
+                week = aggregates.period(current_date, week_end)
                 
                 weekly_breakdown[f'Седмица {week_num}'] = {
-                    'total': len(week_signals),
-                    'completed': len(week_completed),
-                    'accuracy': week_accuracy,
-                    'profit': week_profit
+                    'total': week['total'],
+                    'completed': week['completed'],
+                    'accuracy': (week['wins'] / week['completed'] * 100) if week['completed'] else 0,
+                    'profit': week['profit_sum'] if week['completed'] else 0
                 }
                 
                 current_date = week_end + timedelta(days=1)
@@ -741,22 +602,23 @@ class DailyReportEngine:
                 'period': f'{month_name} ({last_month_start.strftime("%d.%m")} - {last_month_end.strftime("%d.%m")})',
                 'start_date': last_month_start.date().isoformat(),
                 'end_date': last_month_end.date().isoformat(),
-                'total_signals': total_signals,
-                'buy_signals': buy_signals,
-                'sell_signals': sell_signals,
-                'active_signals': len(active),
-                'completed_signals': len(completed),
-                'wins': wins,
-                'losses': losses,
-                'accuracy': accuracy,
-                'total_profit': total_profit,
-                'avg_win': avg_win,
-                'avg_loss': avg_loss,
-                'profit_factor': profit_factor,
-                'avg_confidence': avg_confidence,
-                'best_trade': best_trade,
-                'worst_trade': worst_trade,
-                'symbols_stats': symbols_stats,
+                'total_signals': stats['total_signals'],
+                'buy_signals': stats['buy_signals'],
+                'sell_signals': stats['sell_signals'],
+                'active_signals': stats['active_signals'],
+                'completed_signals': stats['completed_signals'],
+                'wins': stats['wins'],
+                'losses': stats['losses'],
+                'accuracy': stats['accuracy'],
+                'total_profit': stats['total_profit'],
+                'avg_win': stats['avg_win'],
+                'avg_loss': stats['avg_loss'],
+                'profit_factor': stats['profit_factor'],
+                'avg_confidence': stats['avg_confidence'],
+                'best_trade': month['best_completed'][2] if month['best_completed'] else None,
+                'worst_trade': month['worst_completed'][2] if month['worst_completed'] else None,
+                'symbols_stats': self._breakdown_stats(month['symbols']),
+                'timeframes_stats': self._breakdown_stats(month['timeframes']),
                 'weekly_breakdown': weekly_breakdown
             }
             
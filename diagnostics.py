@@ -22,6 +22,8 @@ import json
 import hashlib
 from dataclasses import dataclass, asdict
 
+from market_data_backend import binance_url
+
 logger = logging.getLogger(__name__)
 
 class DiagnosticResult:
@@ -367,7 +369,7 @@ def check_mtf_timeframes_available() -> DiagnosticResult:
     Severity: MED (network-dependent check)
     """
     try:
-        BINANCE_KLINES_URL = "https://api.binance.com/api/v3/klines"
+        BINANCE_KLINES_URL = binance_url('/api/v3/klines')
         timeframes = ['1h', '2h', '4h', '1d']
         failed_timeframes = []
         
@@ -491,7 +493,7 @@ def check_klines_data_freshness() -> DiagnosticResult:
     Severity: MED (network-dependent check)
     """
     try:
-        BINANCE_KLINES_URL = "https://api.binance.com/api/v3/klines"
+        BINANCE_KLINES_URL = binance_url('/api/v3/klines')
         
         response = requests.get(
             BINANCE_KLINES_URL,
@@ -572,7 +574,7 @@ def check_price_data_sanity() -> DiagnosticResult:
     Severity: MED (network-dependent check)
     """
     try:
-        BINANCE_KLINES_URL = "https://api.binance.com/api/v3/klines"
+        BINANCE_KLINES_URL = binance_url('/api/v3/klines')
         
         response = requests.get(
             BINANCE_KLINES_URL,
@@ -1115,14 +1117,14 @@ def check_binance_api_reachable() -> DiagnosticResult:
     Check 17: Verify Binance API is reachable and responding
     
     Tests:
-    - GET https://api.binance.com/api/v3/ping
+    - GET {BINANCE_API_BASE}/api/v3/ping
     - Response status 200
     - Response time < 3s
     
     Severity: MED (network-dependent check)
     """
     try:
-        BINANCE_PING_URL = "https://api.binance.com/api/v3/ping"
+        BINANCE_PING_URL = binance_url('/api/v3/ping')
         
         start = time.time()
         response = requests.get(BINANCE_PING_URL, timeout=3)
@@ -1409,13 +1411,16 @@ class SignalSnapshot:
     timestamp: str
     symbol: str
     timeframe: str
-    klines_snapshot: List[List]  # Max 100 rows
+    klines_snapshot: List[List]  # Rows of [open_time_ms, open, high, low, close, volume] (list or float64 array)
     original_signal: Dict
     signal_hash: str
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
-        return asdict(self)
+        data = asdict(self)
+        if isinstance(self.klines_snapshot, np.ndarray):
+            data['klines_snapshot'] = self.klines_snapshot.tolist()
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'SignalSnapshot':
@@ -1424,13 +1429,156 @@ class SignalSnapshot:
 
 
 class ReplayCache:
-    """Manages replay signal storage with rotation"""
-    MAX_SIGNALS = 10
-    MAX_KLINES_PER_SIGNAL = 100
-    CACHE_FILE = Path("replay_cache.json")
-    
-    def __init__(self):
+    """
+    Manages replay signal storage with rotation
+    
+    Storage layout (CACHE_DIR):
+    - segment-000001.jsonl  One metadata line per signal (symbol, timeframe,
+                            original signal, byte offset and row count of its klines)
+    - segment-000001.f8     Klines as raw little-endian float64 rows of
+                            [open_time_ms, open, high, low, close, volume]
+    
+    Saving appends to the active segment (O(1), no rewrite of older data).
+    Klines are read back through np.memmap one signal at a time, and the
+    oldest segments are dropped when a new segment starts, so at most
+    MAX_SIGNALS signals (sealed segments + the active one) stay on disk.
+    """
+    MAX_SIGNALS = 5000
+    MAX_KLINES_PER_SIGNAL = 500
+    SIGNALS_PER_SEGMENT = 250
+    KLINE_COLUMNS = 6
+    CACHE_DIR = Path("replay_store")
+    CACHE_FILE = Path("replay_cache.json")  # Legacy JSON cache (migrated on first use)
+    
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else self.CACHE_DIR
         self.cache_file = self.CACHE_FILE
+        self._active_segment: Optional[int] = None
+        self._active_count = 0
+        self._migrate_legacy_cache()
+    
+    # ---------------- storage helpers ----------------
+    
+    def _meta_path(self, segment: int) -> Path:
+        return self.cache_dir / f"segment-{segment:06d}.jsonl"
+    
+    def _klines_path(self, segment: int) -> Path:
+        return self.cache_dir / f"segment-{segment:06d}.f8"
+    
+    def _list_segments(self) -> List[int]:
+        if not self.cache_dir.exists():
+            return []
+        segments = []
+        for path in self.cache_dir.glob("segment-*.jsonl"):
+            number = path.stem[len("segment-"):]
+            if number.isdigit():
+                segments.append(int(number))
+        return sorted(segments)
+    
+    @staticmethod
+    def _count_lines(path: Path) -> int:
+        with open(path, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    
+    def _ensure_active_segment(self):
+        """Locate the active segment (counted once per instance, bounded by SIGNALS_PER_SEGMENT)"""
+        if self._active_segment is not None:
+            return
+        segments = self._list_segments()
+        if segments:
+            self._active_segment = segments[-1]
+            self._active_count = self._count_lines(self._meta_path(segments[-1]))
+        else:
+            self._active_segment = 1
+            self._active_count = 0
+    
+    def _rotate_segments(self):
+        """Drop the oldest sealed segments so that, with the active one, at most MAX_SIGNALS are kept"""
+        max_segments = max(1, self.MAX_SIGNALS // self.SIGNALS_PER_SEGMENT)
+        sealed = [segment for segment in self._list_segments() if segment < self._active_segment]
+        keep = max_segments - 1
+        for segment in sealed[:len(sealed) - keep] if len(sealed) > keep else []:
+            self._meta_path(segment).unlink(missing_ok=True)
+            self._klines_path(segment).unlink(missing_ok=True)
+            logger.info(f"🔄 Rotated replay cache (removed segment {segment})")
+    
+    @classmethod
+    def _klines_to_array(cls, klines: pd.DataFrame) -> np.ndarray:
+        """Convert OHLCV DataFrame to a float64 [time_ms, o, h, l, c, v] array (vectorized)"""
+        n = len(klines)
+        index = klines.index
+        if isinstance(index, pd.DatetimeIndex):
+            if index.tz is not None:
+                index = index.tz_convert('UTC').tz_localize(None)
+            times = index.as_unit('ms').asi8.astype(np.float64)
+        else:
+            times = np.zeros(n, dtype=np.float64)
+        
+        columns = [times]
+        for name in ('open', 'high', 'low', 'close', 'volume'):
+            if name in klines.columns:
+                columns.append(pd.to_numeric(klines[name], errors='coerce').to_numpy(dtype=np.float64))
+            else:
+                columns.append(np.zeros(n, dtype=np.float64))
+        return np.ascontiguousarray(np.column_stack(columns), dtype='<f8')
+    
+    def _append(self, snapshot_meta: Dict, klines_array: np.ndarray) -> None:
+        """Append one signal to the active segment"""
+        self._ensure_active_segment()
+        if self._active_count >= self.SIGNALS_PER_SEGMENT:
+            self._active_segment += 1
+            self._active_count = 0
+            self._rotate_segments()
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        klines_path = self._klines_path(self._active_segment)
+        with open(klines_path, 'ab') as f:
+            offset = f.tell()
+            f.write(klines_array.tobytes())
+        
+        snapshot_meta = dict(snapshot_meta, offset=offset, rows=int(klines_array.shape[0]))
+        with open(self._meta_path(self._active_segment), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot_meta, default=str) + '\n')
+        self._active_count += 1
+    
+    def _load_klines(self, segment: int, offset: int, rows: int) -> np.ndarray:
+        """Memory-map one signal's klines and copy them out"""
+        if rows == 0:
+            return np.empty((0, self.KLINE_COLUMNS), dtype=np.float64)
+        mm = np.memmap(self._klines_path(segment), dtype='<f8', mode='r',
+                       offset=offset, shape=(rows, self.KLINE_COLUMNS))
+        try:
+            return np.array(mm)
+        finally:
+            del mm
+    
+    def _migrate_legacy_cache(self):
+        """Import signals from the old replay_cache.json once, then rename it"""
+        try:
+            if not self.cache_file.exists() or self._list_segments():
+                return
+            with open(self.cache_file, 'r') as f:
+                legacy = json.load(f).get('signals', [])
+            for sig in legacy:
+                snapshot = SignalSnapshot.from_dict(sig)
+                klines_array = np.asarray(snapshot.klines_snapshot, dtype=np.float64).reshape(-1, self.KLINE_COLUMNS)
+                self._append(self._snapshot_meta(snapshot), klines_array)
+            self.cache_file.rename(self.cache_file.with_suffix('.json.migrated'))
+            logger.info(f"✅ Migrated {len(legacy)} signals from legacy replay cache")
+        except Exception as e:
+            logger.warning(f"⚠️ Legacy replay cache migration skipped: {e}")
+    
+    @staticmethod
+    def _snapshot_meta(snapshot: SignalSnapshot) -> Dict:
+        return {
+            'timestamp': snapshot.timestamp,
+            'symbol': snapshot.symbol,
+            'timeframe': snapshot.timeframe,
+            'original_signal': snapshot.original_signal,
+            'signal_hash': snapshot.signal_hash,
+        }
+    
+    # ---------------- public API ----------------
     
     def _generate_signal_hash(self, signal_data: Dict, klines: pd.DataFrame) -> str:
         """Generate unique hash for signal"""
@@ -1460,75 +1608,60 @@ class ReplayCache:
                 return False
             
             # Limit klines to MAX_KLINES_PER_SIGNAL most recent rows
-            klines_limited = klines.tail(self.MAX_KLINES_PER_SIGNAL).copy()
-            
-            # Convert DataFrame to list of lists
-            klines_snapshot = []
-            for _, row in klines_limited.iterrows():
-                # Store essential OHLCV data
-                klines_snapshot.append([
-                    int(row.name.timestamp() * 1000) if hasattr(row.name, 'timestamp') else 0,
-                    str(row.get('open', 0)),
-                    str(row.get('high', 0)),
-                    str(row.get('low', 0)),
-                    str(row.get('close', 0)),
-                    str(row.get('volume', 0))
-                ])
-            
-            # Create snapshot
-            snapshot = SignalSnapshot(
-                timestamp=datetime.now().isoformat(),
-                symbol=signal_data.get('symbol', 'UNKNOWN'),
-                timeframe=signal_data.get('timeframe', 'UNKNOWN'),
-                klines_snapshot=klines_snapshot,
-                original_signal=signal_data,
-                signal_hash=self._generate_signal_hash(signal_data, klines)
-            )
-            
-            # Load existing signals
-            signals = self.load_signals()
+            klines_array = self._klines_to_array(klines.tail(self.MAX_KLINES_PER_SIGNAL))
             
-            # Add new snapshot
-            signals.append(snapshot)
-            
-            # Rotate if exceeds MAX_SIGNALS
-            if len(signals) > self.MAX_SIGNALS:
-                signals = signals[-self.MAX_SIGNALS:]
-                logger.info(f"🔄 Rotated replay cache (removed oldest signal)")
-            
-            # Save to file
-            cache_data = {
-                "signals": [sig.to_dict() for sig in signals],
-                "metadata": {
-                    "max_signals": self.MAX_SIGNALS,
-                    "max_klines": self.MAX_KLINES_PER_SIGNAL,
-                    "last_cleanup": datetime.now().isoformat(),
-                    "version": "1.0"
-                }
+            snapshot_meta = {
+                'timestamp': datetime.now().isoformat(),
+                'symbol': signal_data.get('symbol', 'UNKNOWN'),
+                'timeframe': signal_data.get('timeframe', 'UNKNOWN'),
+                'original_signal': signal_data,
+                'signal_hash': self._generate_signal_hash(signal_data, klines),
             }
+            self._append(snapshot_meta, klines_array)
             
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
-            
-            logger.info(f"✅ Saved signal snapshot: {snapshot.symbol} {snapshot.timeframe} (hash: {snapshot.signal_hash})")
+            logger.info(f"✅ Saved signal snapshot: {snapshot_meta['symbol']} {snapshot_meta['timeframe']} (hash: {snapshot_meta['signal_hash']})")
             return True
         
         except Exception as e:
             logger.warning(f"⚠️ Replay capture failed (non-critical): {e}")
             return False
     
+    def load_metadata(self) -> List[Dict]:
+        """Load signal metadata only (no klines), oldest first"""
+        entries = []
+        for segment in self._list_segments():
+            try:
+                with open(self._meta_path(segment), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            entry['segment'] = segment
+                            entries.append(entry)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to read replay segment {segment}: {e}")
+        return entries
+    
+    def iter_signals(self):
+        """Yield signal snapshots one at a time, loading klines lazily via memmap"""
+        for entry in self.load_metadata():
+            try:
+                klines = self._load_klines(entry['segment'], entry['offset'], entry['rows'])
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to load klines for {entry.get('symbol')}: {e}")
+                continue
+            yield SignalSnapshot(
+                timestamp=entry['timestamp'],
+                symbol=entry['symbol'],
+                timeframe=entry['timeframe'],
+                klines_snapshot=klines,
+                original_signal=entry['original_signal'],
+                signal_hash=entry['signal_hash'],
+            )
+    
     def load_signals(self) -> List[SignalSnapshot]:
         """Load all signal snapshots from cache"""
         try:
-            if not self.cache_file.exists():
-                return []
-            
-            with open(self.cache_file, 'r') as f:
-                cache_data = json.load(f)
-            
-            signals = cache_data.get('signals', [])
-            return [SignalSnapshot.from_dict(sig) for sig in signals]
-        
+            return list(self.iter_signals())
         except Exception as e:
             logger.warning(f"⚠️ Failed to load replay cache: {e}")
             return []
@@ -1536,8 +1669,17 @@ class ReplayCache:
     def clear_cache(self) -> bool:
         """Clear all cached signals"""
         try:
-            if self.cache_file.exists():
+            segments = self._list_segments()
+            had_legacy = self.cache_file.exists()
+            for segment in segments:
+                self._meta_path(segment).unlink(missing_ok=True)
+                self._klines_path(segment).unlink(missing_ok=True)
+            if had_legacy:
                 self.cache_file.unlink()
+            self._active_segment = None
+            self._active_count = 0
+            
+            if segments or had_legacy:
                 logger.info("✅ Replay cache cleared")
                 return True
             else:
@@ -1549,7 +1691,7 @@ class ReplayCache:
     
     def get_signal_count(self) -> int:
         """Get number of cached signals"""
-        return len(self.load_signals())
+        return sum(self._count_lines(self._meta_path(s)) for s in self._list_segments())
 
 
 class ReplayEngine:
@@ -1581,24 +1723,14 @@ class ReplayEngine:
             Dict with replayed signal data or None if failed
         """
         try:
-            # Reconstruct DataFrame from snapshot
-            klines_data = []
-            for kline in snapshot.klines_snapshot:
-                klines_data.append({
-                    'timestamp': kline[0],
-                    'open': float(kline[1]),
-                    'high': float(kline[2]),
-                    'low': float(kline[3]),
-                    'close': float(kline[4]),
-                    'volume': float(kline[5])
-                })
-            
-            df = pd.DataFrame(klines_data)
-            
-            # Convert timestamp to datetime index
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df.set_index('timestamp', inplace=True)
+            # Reconstruct DataFrame from snapshot (float array or legacy list rows)
+            klines = np.asarray(snapshot.klines_snapshot, dtype=np.float64).reshape(-1, ReplayCache.KLINE_COLUMNS)
+            df = pd.DataFrame(
+                klines[:, 1:],
+                columns=['open', 'high', 'low', 'close', 'volume'],
+                index=pd.to_datetime(klines[:, 0].astype(np.int64), unit='ms')
+            )
+            df.index.name = 'timestamp'
             
             # Generate signal (read-only - no cache write)
             signal = self.signal_engine.generate_signal(
@@ -1720,19 +1852,20 @@ class ReplayEngine:
             str: Formatted report for Telegram
         """
         try:
-            signals = self.cache.load_signals()
+            signal_count = self.cache.get_signal_count()
             
-            if not signals:
+            if not signal_count:
                 return "📊 *Replay Report*\n\n⚠️ No signals in cache yet.\n\nGenerate some signals first!"
             
             report = f"🎬 *Signal Replay Report*\n\n"
-            report += f"📊 Testing {len(signals)} cached signals...\n\n"
+            report += f"📊 Testing {signal_count} cached signals...\n\n"
             
             passed = 0
             failed = 0
             errors = 0
             
-            for i, snapshot in enumerate(signals, 1):
+            # Klines are loaded lazily, one snapshot at a time
+            for i, snapshot in enumerate(self.cache.iter_signals(), 1):
                 # Replay signal
                 replayed = await self.replay_signal(snapshot)
                 
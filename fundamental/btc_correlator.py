@@ -10,6 +10,12 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+try:
+    from btc_reference_series import get_btc_reference_series
+    BTC_REFERENCE_AVAILABLE = True
+except ImportError:
+    BTC_REFERENCE_AVAILABLE = False
+
 
 class BTCCorrelator:
     """Calculates correlation between trading symbol and BTC"""
@@ -27,7 +33,8 @@ class BTCCorrelator:
         self, 
         symbol: str,
         symbol_df: pd.DataFrame,
-        btc_df: pd.DataFrame
+        btc_df: Optional[pd.DataFrame] = None,
+        timeframe: str = '1h'
     ) -> Optional[Dict]:
         """
         Calculate correlation between symbol and BTC
@@ -35,7 +42,8 @@ class BTCCorrelator:
         Args:
             symbol: Trading symbol (e.g., 'ETHUSDT')
             symbol_df: DataFrame with symbol price data
-            btc_df: DataFrame with BTC price data
+            btc_df: DataFrame with BTC price data (default: shared BTC reference series)
+            timeframe: Timeframe of symbol_df, used when btc_df is not given
             
         Returns:
             {
@@ -54,6 +62,12 @@ class BTCCorrelator:
             return None
         
         try:
+            if btc_df is None:
+                btc_df = self._reference_frame(timeframe)
+                if btc_df is None:
+                    logger.warning("No BTC reference data available for correlation")
+                    return None
+            
             # Ensure dataframes have same length
             min_len = min(len(symbol_df), len(btc_df))
             if min_len < self.window:
@@ -102,6 +116,15 @@ class BTCCorrelator:
             logger.error(f"Error calculating BTC correlation: {e}")
             return None
     
+    def _reference_frame(self, timeframe: str) -> Optional[pd.DataFrame]:
+        """BTC closes from the shared reference series (no per-call fetch)"""
+        if not BTC_REFERENCE_AVAILABLE:
+            return None
+        closes = get_btc_reference_series().get_closes(timeframe)
+        if closes is None or closes.empty:
+            return None
+        return closes.to_frame('close')
+    
     def _calculate_impact(self, correlation: float, aligned: bool) -> int:
         """
         Calculate confidence impact based on correlation and alignment
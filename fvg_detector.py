@@ -23,6 +23,8 @@ from datetime import datetime, timedelta
 from enum import Enum
 import logging
 
+from candle_frame import candle_features
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -193,7 +195,8 @@ class FVGDetector:
         return valid_fvgs
     
     def _prepare_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Prepare dataframe with required indicators"""
+        """Prepare dataframe with required indicators (shared with the other detectors)"""
+        features = candle_features(df)
         df = df.copy()
         
         # Ensure datetime index
@@ -203,34 +206,19 @@ class FVGDetector:
         
         # Calculate volume metrics
         if 'volume' in df.columns:
-            df['volume_ma'] = df['volume'].rolling(window=20).mean()
-            df['volume_ratio'] = df['volume'] / df['volume_ma'].replace(0, 1)
+            df['volume_ma'] = features.volume_mean(20)
+            df['volume_ratio'] = features.volume_ratio(20)
         else:
             df['volume'] = 0
             df['volume_ma'] = 0
             df['volume_ratio'] = 1.0
         
         # Calculate price metrics
-        df['price_change'] = df['close'].pct_change() * 100
-        df['atr'] = self._calculate_atr(df, period=14)
+        df['price_change'] = features.price_change()
+        df['atr'] = features.atr(14)
         
         return df
     
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Calculate Average True Range"""
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-        
-        return atr
-    
     def _detect_bullish_fvgs(
         self,
         df: pd.DataFrame,
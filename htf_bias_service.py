@@ -0,0 +1,153 @@
+"""
+HTF Bias Service - Per-symbol higher-timeframe bias cache
+
+The 1D/4H bias of a symbol only changes when that HTF closes a new candle,
+yet it used to be recomputed for every primary timeframe and every
+reanalysis of the same symbol. This service keys the result on
+(symbol, HTF, last closed HTF candle) and shares it between all callers
+in the process (primary timeframes, trade reanalysis engine).
+
+Author: galinborisov10-art
+Date: 2026-02-02
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from utils.candle_time import last_closed_candle_key
+
+logger = logging.getLogger(__name__)
+
+# compute(df) -> (bias string, ICT components)
+BiasComputer = Callable[[pd.DataFrame], Tuple[str, Dict[str, Any]]]
+
+
+class HTFBiasService:
+    """
+    Cache of HTF bias results keyed on the last closed HTF candle.
+
+    Features:
+    - One entry per (symbol, HTF), replaced when a new HTF candle closes
+    - LRU eviction beyond max_entries
+    - Thread-safe; computation runs outside the lock
+    - Hit/miss statistics
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        """
+        Initialize the service.
+
+        Args:
+            max_entries: Maximum number of (symbol, HTF) entries kept
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Tuple[str, str], Tuple[Hashable, str, Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_bias(
+        self,
+        symbol: str,
+        htf: str,
+        df: pd.DataFrame,
+        compute: BiasComputer,
+        now: Optional[datetime] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Get the HTF bias for a symbol, computing it only on a new closed candle
+
+        Args:
+            symbol: Trading pair (e.g. 'BTCUSDT')
+            htf: Higher timeframe of df ('1d', '4h')
+            df: HTF OHLCV DataFrame
+            compute: Callback computing (bias, components) from df
+            now: Reference time, naive UTC (default: current UTC time)
+
+        Returns:
+            (bias string, HTF ICT components) - components must be treated as read-only
+        """
+        key = (symbol, htf.lower())
+        candle_key = last_closed_candle_key(df, htf, now)
+
+        if candle_key is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == candle_key:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[1], entry[2]
+                self._misses += 1
+
+        bias, components = compute(df)
+
+        if candle_key is not None:
+            with self._lock:
+                self._entries[key] = (candle_key, bias, components)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return bias, components
+
+    def invalidate(self, symbol: Optional[str] = None) -> int:
+        """
+        Drop cached entries
+
+        Args:
+            symbol: Only drop this symbol's entries (None = drop all)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if symbol is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            keys = [k for k in self._entries if k[0] == symbol]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / total * 100, 2) if total else 0.0,
+            }
+
+
+# Global HTF bias service instance
+_htf_bias_service_instance: Optional[HTFBiasService] = None
+
+
+def get_htf_bias_service() -> HTFBiasService:
+    """
+    Get or create the global HTF bias service (singleton).
+
+    Returns:
+        HTFBiasService instance
+    """
+    global _htf_bias_service_instance
+
+    if _htf_bias_service_instance is None:
+        _htf_bias_service_instance = HTFBiasService()
+        logger.info("Created global HTF bias service instance")
+
+    return _htf_bias_service_instance
+
+
+def reset_htf_bias_service() -> None:
+    """Reset global HTF bias service instance (for testing)."""
+    global _htf_bias_service_instance
+    _htf_bias_service_instance = None
@@ -9,6 +9,8 @@ from datetime import datetime
 from typing import Dict, Optional
 import pandas as pd
 
+from candle_frame import klines_to_frame
+
 logger = logging.getLogger(__name__)
 
 class ICT80AlertHandler:
@@ -82,20 +84,7 @@ class ICT80AlertHandler:
     
     def _klines_to_dataframe(self, klines: list) -> pd.DataFrame:
         """Convert Binance klines to DataFrame"""
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 
-            'taker_buy_base', 'taker_buy_quote', 'ignore'
-        ])
-        
-        # Convert types
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
-        
-        df = df.set_index('timestamp')
-        
-        return df[['open', 'high', 'low', 'close', 'volume']]
+        return klines_to_frame(klines, set_index=True)
     
     def _compare_signals(
         self,
@@ -25,6 +25,11 @@ from datetime import datetime, timedelta
 from enum import Enum
 import logging
 import json
+from bisect import bisect_left, bisect_right
+
+from zone_table import KINDS, KIND_CODES, BULLISH as ZONE_BULLISH, BEARISH as ZONE_BEARISH, zone_table_for
+from stage_profiler import get_stage_profiler, stage as profile_stage
+from candle_frame import candle_features
 
 # Import Entry Gating and Confidence Threshold evaluators (ESB v1.0 §2.1-2.2)
 try:
@@ -127,8 +132,42 @@ except ImportError:
     logging.warning("CacheManager not available")
 
 try:
-    from config.config_loader import load_feature_flags, get_flag
-    FEATURE_FLAGS_AVAILABLE = True
+    from htf_bias_service import get_htf_bias_service
+    HTF_BIAS_SERVICE_AVAILABLE = True
+except ImportError:
+    HTF_BIAS_SERVICE_AVAILABLE = False
+    logging.warning("HTFBiasService not available")
+
+try:
+    from mtf_consensus_matrix import get_mtf_consensus_matrix
+    MTF_MATRIX_AVAILABLE = True
+except ImportError:
+    MTF_MATRIX_AVAILABLE = False
+    logging.warning("MTFConsensusMatrix not available")
+
+try:
+    from btc_reference_series import get_btc_reference_series
+    from utils.candle_time import candle_open_times
+    BTC_REFERENCE_AVAILABLE = True
+except ImportError:
+    BTC_REFERENCE_AVAILABLE = False
+    logging.warning("BTCReferenceSeries not available")
+
+try:
+    from config.config_registry import get_config_registry
+    CONFIG_REGISTRY_AVAILABLE = True
+except ImportError:
+    CONFIG_REGISTRY_AVAILABLE = False
+
+try:
+    from portfolio_state import get_portfolio_state
+    PORTFOLIO_STATE_AVAILABLE = True
+except ImportError:
+    PORTFOLIO_STATE_AVAILABLE = False
+
+try:
+    from config.config_loader import load_feature_flags, get_flag, feature_flag_integration_enabled
+    FEATURE_FLAGS_AVAILABLE = feature_flag_integration_enabled()
 except ImportError:
     FEATURE_FLAGS_AVAILABLE = False
     logging.warning("Feature flags not available")
@@ -468,7 +507,9 @@ class ICTSignalEngine:
                     logger.warning(f"⚠️ ML Predictor initialization failed: {e}")
         
         # ✅ PR #4: Load timeframe hierarchy configuration
-        self.tf_hierarchy = self._load_tf_hierarchy()
+        self._tf_hierarchy = self._load_tf_hierarchy()
+        # Follow edits of timeframe_hierarchy.json when it came from the registry
+        self._tf_hierarchy_live = CONFIG_REGISTRY_AVAILABLE and get_config_registry().is_registered('timeframe_hierarchy')
         logger.info(f"✅ TF Hierarchy loaded: {len(self.tf_hierarchy.get('hierarchies', {}))} timeframes configured")
         
         logger.info("ICT Signal Engine initialized")
@@ -522,26 +563,53 @@ class ICTSignalEngine:
             'ml_override_threshold': 15,       # Min confidence diff for ML override
         }
     
+    @property
+    def tf_hierarchy(self) -> Dict:
+        """TF hierarchy rules (live view of the registry snapshot when available)"""
+        if self._tf_hierarchy_live:
+            registry = get_config_registry()
+            if registry.is_registered('timeframe_hierarchy'):
+                hierarchy = registry.get('timeframe_hierarchy')
+                if hierarchy:
+                    return hierarchy
+        return self._tf_hierarchy
+    
+    @tf_hierarchy.setter
+    def tf_hierarchy(self, value: Dict):
+        self._tf_hierarchy = value
+        self._tf_hierarchy_live = False
+    
     def _load_tf_hierarchy(self) -> Dict:
         """
         ✅ PR #4: Load timeframe hierarchy configuration
         
+        Parsed once per process via the config registry (reloaded when the
+        file changes), not re-read by every engine instance.
+        
         Returns:
             Dict with TF hierarchy rules for each entry timeframe
         """
         try:
-            # Try to load from config file
             from pathlib import Path
             config_path = Path(__file__).parent / 'config' / 'timeframe_hierarchy.json'
             
-            if config_path.exists():
+            if not config_path.exists():
+                logger.warning("⚠️ TF hierarchy config not found, using defaults")
+                return self._get_default_tf_hierarchy()
+            
+            if not CONFIG_REGISTRY_AVAILABLE:
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    hierarchy = json.load(f)
+                    return json.load(f)
+            
+            registry = get_config_registry()
+            if not registry.is_registered('timeframe_hierarchy'):
+                registry.register('timeframe_hierarchy', str(config_path))
                 logger.info(f"📊 Loaded TF hierarchy from {config_path}")
-                return hierarchy
-            else:
-                logger.warning("⚠️ TF hierarchy config not found, using defaults")
+            hierarchy = registry.get('timeframe_hierarchy')
+            if not hierarchy:
+                logger.error("❌ TF hierarchy config could not be parsed, using defaults")
                 return self._get_default_tf_hierarchy()
+            return hierarchy
                 
         except json.JSONDecodeError as e:
             logger.error(f"❌ JSON decode error in TF hierarchy: {e}")
@@ -731,10 +799,32 @@ class ICTSignalEngine:
         
         ✅ ЕДНАКВА последователност за ВСИЧКИ таймфремове (1w до 1m)
         ✅ ЕДНАКВА логика за ръчни И автоматични сигнали
+        
+        Every step is timed by the stage profiler (see stage_profiler.py).
         """
+        profiler = get_stage_profiler()
+        handle = profiler.begin(symbol, timeframe)
+        outcome = 'error'
+        try:
+            result = self._generate_signal_stages(df, symbol, timeframe, mtf_data, is_auto)
+            outcome = 'signal' if isinstance(result, ICTSignal) else 'no_signal'
+            return result
+        finally:
+            profiler.end(handle, outcome)
+    
+    def _generate_signal_stages(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        timeframe: str,
+        mtf_data: Optional[Dict[str, pd.DataFrame]],
+        is_auto: bool
+    ) -> Optional[ICTSignal]:
+        """generate_signal body; profile_stage() marks the start of each step"""
         logger.info(f"🎯 Generating UNIFIED ICT signal for {symbol} on {timeframe}")
         
         # Cache check with distance re-validation
+        profile_stage('cache_check')
         if self.cache_manager:
             try:
                 cached_signal = self.cache_manager.get_cached_signal(symbol, timeframe)
@@ -774,19 +864,23 @@ class ICTSignalEngine:
             logger.warning("Insufficient data")
             return None
         
+        profile_stage('prepare_dataframe')
         df = self._prepare_dataframe(df)
         
         # ═══════ УНИФИЦИРАНА ПОСЛЕДОВАТЕЛНОСТ (12 СТЪПКИ) ═══════
         
         # СТЪПКА 1: HTF BIAS (1D → 4H fallback)
+        profile_stage('htf_bias')
         logger.info("📊 Step 1: HTF Bias")
         htf_bias = self._get_htf_bias_with_fallback(symbol, mtf_data)
         
         # СТЪПКА 2: MTF STRUCTURE (4H)
+        profile_stage('mtf_structure')
         logger.info("📊 Step 2: MTF Structure")
         mtf_analysis = self._analyze_mtf_confluence(df, mtf_data, symbol) if mtf_data is not None and isinstance(mtf_data, dict) else None
         
         # ✅ PR #4: СТЪПКА 6b: TIMEFRAME HIERARCHY VALIDATION (NEW)
+        profile_stage('hierarchy_validation')
         logger.info("=" * 60)
         logger.info("STEP 6b: TIMEFRAME HIERARCHY VALIDATION")
         logger.info("=" * 60)
@@ -819,15 +913,18 @@ class ICTSignalEngine:
         logger.info(f"📊 Step 3: Entry Model ({timeframe})")
         
         # СТЪПКА 4: LIQUIDITY MAP (с cache fallback)
+        profile_stage('liquidity_map')
         logger.info("📊 Step 4: Liquidity Map")
         liquidity_zones = self._get_liquidity_zones_with_fallback(df, symbol, timeframe)
         
         # СТЪПКА 5-7: ICT COMPONENTS
+        profile_stage('ict_components')
         logger.info("📊 Steps 5-7: ICT Components")
         ict_components = self._detect_ict_components(df, timeframe)
         ict_components['liquidity_zones'] = liquidity_zones  # Add liquidity zones
         
         # STEP 7: Bias Determination - START DIAGNOSTIC LOGGING
+        profile_stage('bias')
         logger.info("🔍 Step 7: Bias Determination")
         
         # Calculate bias with diagnostic details
@@ -926,6 +1023,7 @@ class ICTSignalEngine:
         logger.info(f"✅ PASSED Step 7: Continuing with bias {bias.value} (penalty: {confidence_penalty*100:.0f}%)")
         
         # СТЪПКА 8: ENTRY CALCULATION WITH ICT-COMPLIANT ZONE
+        profile_stage('entry_zone')
         logger.info("🔍 Step 8: Entry Zone Validation")
         
         # Get current price
@@ -1068,6 +1166,7 @@ class ICTSignalEngine:
             }
         
         # СТЪПКА 9: SL/TP + VALIDATION
+        profile_stage('sl_tp')
         logger.info("🔍 Step 9: SL/TP Calculation & Validation")
         sl_price = self._calculate_sl_price(df, entry_setup, entry_price, bias)
         logger.info(f"   → Calculated SL: ${sl_price:.2f}")
@@ -1137,6 +1236,7 @@ class ICTSignalEngine:
         logger.info(f"✅ PASSED Step 9: SL/TP calculated and validated")
         
         # СТЪПКА 10: RR CHECK
+        profile_stage('risk_reward')
         logger.info("🔍 Step 10: Risk/Reward Validation")
         risk = abs(entry_price - sl_price)
         
@@ -1185,6 +1285,7 @@ class ICTSignalEngine:
         logger.info(f"✅ PASSED Step 10: RR validated ({risk_reward_ratio:.2f} ≥ {self.config['min_risk_reward']:.2f} → 1:{risk_reward_ratio:.1f} ≥ 1:{self.config['min_risk_reward']:.0f})")
         
         # BASE CONFIDENCE
+        profile_stage('confidence')
         logger.info("🔍 Step 11: Confidence Calculation")
         base_confidence = self._calculate_signal_confidence(
             ict_components, mtf_analysis, bias, structure_broken, 
@@ -1253,6 +1354,7 @@ class ICTSignalEngine:
             logger.warning(f"⚠️ Liquidity confidence adjustment failed: {e}")
         
         # ✅ APPLY CONTEXT-AWARE FILTERS (NEW - Enhances confidence accuracy)
+        profile_stage('context_filters')
         logger.info("📊 Step 11a: Context-Aware Filtering")
         context_warnings = []
         try:
@@ -1309,6 +1411,7 @@ class ICTSignalEngine:
                 context_warnings.append("ℹ️ HTF bias unclear, relying on own structure")
         
         # СТЪПКА 11: ML OPTIMIZATION (ЗАПАЗВАМЕ existing logic)
+        profile_stage('ml_optimization')
         logger.info("📊 Step 11: ML Optimization")
 
         ml_confidence_adjustment = 0.0
@@ -1408,6 +1511,7 @@ class ICTSignalEngine:
         logger.info(f"   → Confidence (before ML advisory): {confidence:.1f}%")
         
         # СТЪПКА 11.5: MTF CONSENSUS CHECK (STRICT ICT)
+        profile_stage('mtf_consensus')
         logger.info("🔍 Step 11.5: MTF Consensus Validation")
         mtf_consensus_data = self._calculate_mtf_consensus(symbol, timeframe, bias, mtf_data)
         
@@ -1438,6 +1542,7 @@ class ICTSignalEngine:
         logger.info(f"✅ PASSED Step 11.5: MTF consensus validated ({mtf_consensus_data['consensus_pct']:.1f}% ≥ 50%)")
         
         # Confidence check (dynamic based on auto vs manual)
+        profile_stage('confidence_gate')
         logger.info("🔍 Step 11.6: Final Confidence Check")
         
         # Determine min confidence based on signal type
@@ -1467,6 +1572,7 @@ class ICTSignalEngine:
         logger.info(f"✅ PASSED Step 11.6: Confidence validated ({confidence:.1f}% ≥ {min_confidence}% - {mode} mode)")
         
         # СТЪПКА 12: FINAL SIGNAL GENERATION
+        profile_stage('execution_gates')
         logger.info("🔍 Step 12: Final Signal Generation")
         signal_strength = self._calculate_signal_strength(confidence, risk_reward_ratio, ict_components)
         signal_type = self._determine_signal_type(bias, signal_strength, confidence)
@@ -1605,6 +1711,7 @@ class ICTSignalEngine:
         # ML acts ONLY as advisory layer that modifies confidence within bounds.
         # ML NEVER influences signal direction, entry/SL/TP, or overrides guards.
         # ═══════════════════════════════════════════════════════════════
+        profile_stage('ml_advisory')
         logger.info("=" * 60)
         logger.info("STEP 12.0: ML ADVISORY LAYER (PR-ML-8)")
         logger.info("=" * 60)
@@ -1657,6 +1764,7 @@ class ICTSignalEngine:
         # ═══════════════════════════════════════════════════════════════
         
         # ✅ FIX 3: STEP 12a - Entry Timing Validation
+        profile_stage('entry_timing')
         logger.info("🔍 Step 12a: Entry Timing Validation")
         is_valid, reason = self._validate_entry_timing(
             entry_price, 
@@ -1687,6 +1795,7 @@ class ICTSignalEngine:
             except Exception as e:
                 logger.error(f"Zone explanations error: {e}")
         
+        profile_stage('build_signal')
         # CREATE SIGNAL
         signal = ICTSignal(
             timestamp=datetime.now(),
@@ -1784,6 +1893,7 @@ class ICTSignalEngine:
         # ═══════════════════════════════════════════════════════════
         # ✅ PR #8 LAYER 1: NEWS SENTIMENT FILTER (Before final return)
         # ═══════════════════════════════════════════════════════════
+        profile_stage('news_check')
         logger.info("📰 Step 12b: News Sentiment Filter (PR #8)")
         
         news_check = self._check_news_sentiment_before_signal(
@@ -1809,21 +1919,28 @@ class ICTSignalEngine:
         return signal
     
     def _prepare_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Prepare dataframe with indicators"""
+        """
+        Prepare dataframe with indicators
+        
+        The returned frame is the one every detector receives; its derived
+        columns (ATR, volume averages, candle anatomy) are computed once via
+        candle_features() and shared with the detectors.
+        """
         df = df.copy()
         
         # Ensure datetime index
         if 'timestamp' in df.columns and not isinstance(df.index, pd.DatetimeIndex):
             df['timestamp'] = pd.to_datetime(df['timestamp'])
             df = df.set_index('timestamp')
+        features = candle_features(df)
         
         # Calculate ATR
-        df['atr'] = self._calculate_atr(df, period=14)
+        df['atr'] = features.atr(14)
         
         # Calculate volume metrics (Pure ICT - no MA)
         if 'volume' in df.columns:
-            df['volume_median'] = df['volume'].rolling(window=20).median()
-            df['volume_ratio'] = df['volume'] / df['volume_median'].replace(0, 1)
+            df['volume_median'] = features.volume_median(20)
+            df['volume_ratio'] = features.volume_ratio(20, average='median')
         else:
             df['volume'] = 0
             df['volume_median'] = 0
@@ -1831,23 +1948,6 @@ class ICTSignalEngine:
         
         return df
     
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Calculate Average True Range"""
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        # Note: .mean() here is legitimate - it's part of the standard ATR formula,
-        # not a moving average for trading signals (ICT compliant)
-        atr = tr.rolling(window=period).mean()
-        
-        return atr
-    
     def _detect_ict_components(
         self,
         df: pd.DataFrame,
@@ -2088,6 +2188,8 @@ class ICTSignalEngine:
         NEUTRAL = not aligned, not conflicting (excluded from calculation)
         
         Проверява bias на всички timeframes: 1m, 3m, 5m, 15m, 30m, 1h, 2h, 4h, 6h, 12h, 1d, 3d, 1w
+        Per-TF bias rows come from the shared MTFConsensusMatrix (per symbol,
+        refreshed only when a timeframe closes a new candle).
         
         Returns:
             Dict с:
@@ -2124,7 +2226,13 @@ class ICTSignalEngine:
                 if tf_df is not None and not tf_df.empty and len(tf_df) >= 20:
                     # ✅ PURE ICT BIAS CALCULATION (no MA/EMA)
                     try:
-                        tf_bias, confidence = self._calculate_pure_ict_bias_for_tf(tf_df)
+                        if MTF_MATRIX_AVAILABLE:
+                            # Row recomputed only when this TF closes a new candle
+                            tf_bias, confidence = get_mtf_consensus_matrix().get_row(
+                                symbol, tf, tf_df, self._calculate_pure_ict_bias_for_tf
+                            )
+                        else:
+                            tf_bias, confidence = self._calculate_pure_ict_bias_for_tf(tf_df)
                         
                         # ✅ FIX #3: Only exact match counts as aligned
                         if tf_bias == target_bias:
@@ -2621,254 +2729,81 @@ class ICTSignalEngine:
         
         # ==== SEARCH FOR VALID ZONES ====
         
-        if is_bearish:
-            # BEARISH (SELL): Look for zones ABOVE current price
-            
-            # Check FVG zones
-            for fvg in fvg_zones:
-                fvg_type = str(fvg.get('type', '')) if isinstance(fvg, dict) else str(getattr(fvg, 'type', ''))
-                if 'BEARISH' not in fvg_type.upper():
-                    continue
-                
-                # Get FVG boundaries
-                if isinstance(fvg, dict):
-                    fvg_low = fvg.get('bottom', fvg.get('low', 0))
-                    fvg_high = fvg.get('top', fvg.get('high', 0))
-                else:
-                    fvg_low = getattr(fvg, 'bottom', getattr(fvg, 'low', 0))
-                    fvg_high = getattr(fvg, 'top', getattr(fvg, 'high', 0))
-                
-                if not fvg_low or not fvg_high:
-                    continue
-                
-                # Check if FVG is ABOVE current price (min distance)
-                if fvg_low > current_price * (1 + min_distance_pct):
-                    distance_pct = (fvg_low - current_price) / current_price
-                    
-                    # ✅ SOFT CONSTRAINT: Always add zone, regardless of distance
-                    # Get quality
-                    quality = fvg.get('strength', 70) if isinstance(fvg, dict) else getattr(fvg, 'strength', 70)
-                    if not isinstance(quality, (int, float)):
-                        quality = 70
-                    
-                    valid_zones.append({
-                        'source': 'FVG',
-                        'low': fvg_low,
-                        'high': fvg_high,
-                        'quality': quality,
-                        'distance_pct': distance_pct,
-                        'distance_price': fvg_low - current_price,
-                        'out_of_optimal_range': distance_pct > max_distance_pct  # ✅ NEW: Soft constraint flag
-                    })
-            
-            # Check Order Blocks
-            for ob in order_blocks:
-                ob_type = str(ob.get('type', '')) if isinstance(ob, dict) else str(getattr(ob, 'type', ''))
-                if 'BEARISH' not in ob_type.upper():
-                    continue
-                
-                # Get OB boundaries
-                if isinstance(ob, dict):
-                    ob_low = ob.get('zone_low', ob.get('bottom', 0))
-                    ob_high = ob.get('zone_high', ob.get('top', 0))
-                else:
-                    ob_low = getattr(ob, 'zone_low', getattr(ob, 'bottom', 0))
-                    ob_high = getattr(ob, 'zone_high', getattr(ob, 'top', 0))
-                
-                if not ob_low or not ob_high:
-                    continue
-                
-                # Check if OB is ABOVE current price
-                if ob_low > current_price * (1 + min_distance_pct):
-                    distance_pct = (ob_low - current_price) / current_price
-                    
-                    # ✅ SOFT CONSTRAINT: Always add zone, regardless of distance
-                    quality = ob.get('strength', 75) if isinstance(ob, dict) else getattr(ob, 'strength', 75)
-                    if not isinstance(quality, (int, float)):
-                        quality = 75
-                    
-                    valid_zones.append({
-                        'source': 'OB',
-                        'low': ob_low,
-                        'high': ob_high,
-                        'quality': quality,
-                        'distance_pct': distance_pct,
-                        'distance_price': ob_low - current_price,
-                        'out_of_optimal_range': distance_pct > max_distance_pct  # ✅ NEW: Soft constraint flag
-                    })
-            
-            # Check Resistance levels
-            resistance_zones = sr_levels.get('resistance_zones', []) if isinstance(sr_levels, dict) else []
-            for res in resistance_zones:
-                res_price = res.get('price', res.get('price_level', 0)) if isinstance(res, dict) else getattr(res, 'price', 0)
-                
-                if not res_price:
-                    continue
-                
-                # Resistance must be ABOVE current price
-                if res_price > current_price * (1 + min_distance_pct):
-                    distance_pct = (res_price - current_price) / current_price
-                    
-                    # ✅ SOFT CONSTRAINT: Always add zone, regardless of distance
-                    quality = res.get('strength', 60) if isinstance(res, dict) else getattr(res, 'strength', 60)
-                    if not isinstance(quality, (int, float)):
-                        quality = 60
-                    
-                    # Create zone with small buffer around resistance
-                    zone_width = res_price * 0.002  # 0.2% width
-                    valid_zones.append({
-                        'source': 'S/R',
-                        'low': res_price - zone_width,
-                        'high': res_price + zone_width,
-                        'quality': quality,
-                        'distance_pct': distance_pct,
-                        'distance_price': res_price - current_price,
-                        'out_of_optimal_range': distance_pct > max_distance_pct  # ✅ NEW: Soft constraint flag
-                    })
+        # One columnar table over FVGs, OBs and S/R levels (rows keep FVG → OB → S/R list order)
+        zone_table = zone_table_for(
+            {'fvgs': fvg_zones, 'order_blocks': order_blocks, 'luxalgo_sr': sr_levels},
+            kinds=('fvgs', 'order_blocks', 'support_zones', 'resistance_zones')
+        )
+        is_fvg = zone_table.of_kind('fvgs')
+        is_block = is_fvg | zone_table.of_kind('order_blocks')
+        has_bounds = zone_table.has_bounds()
         
-        elif is_bullish:
-            # BULLISH (BUY): Look for zones BELOW current price
-            
-            # Check FVG zones
-            for fvg in fvg_zones:
-                fvg_type = str(fvg.get('type', '')) if isinstance(fvg, dict) else str(getattr(fvg, 'type', ''))
-                if 'BULLISH' not in fvg_type.upper():
-                    continue
-                
-                # Get FVG boundaries
-                if isinstance(fvg, dict):
-                    fvg_low = fvg.get('bottom', fvg.get('low', 0))
-                    fvg_high = fvg.get('top', fvg.get('high', 0))
-                else:
-                    fvg_low = getattr(fvg, 'bottom', getattr(fvg, 'low', 0))
-                    fvg_high = getattr(fvg, 'top', getattr(fvg, 'high', 0))
-                
-                if not fvg_low or not fvg_high:
-                    continue
-                
-                # Check if FVG is BELOW current price (min distance)
-                if fvg_high < current_price * (1 - min_distance_pct):
-                    distance_pct = (current_price - fvg_high) / current_price
-                    
-                    # ✅ SOFT CONSTRAINT: Always add zone, regardless of distance
-                    quality = fvg.get('strength', 70) if isinstance(fvg, dict) else getattr(fvg, 'strength', 70)
-                    if not isinstance(quality, (int, float)):
-                        quality = 70
-                    
-                    valid_zones.append({
-                        'source': 'FVG',
-                        'low': fvg_low,
-                        'high': fvg_high,
-                        'quality': quality,
-                        'distance_pct': distance_pct,
-                        'distance_price': current_price - fvg_high,
-                        'out_of_optimal_range': distance_pct > max_distance_pct  # ✅ NEW: Soft constraint flag
-                    })
-            
-            # Check Order Blocks
-            for ob in order_blocks:
-                ob_type = str(ob.get('type', '')) if isinstance(ob, dict) else str(getattr(ob, 'type', ''))
-                if 'BULLISH' not in ob_type.upper():
-                    continue
-                
-                # Get OB boundaries
-                if isinstance(ob, dict):
-                    ob_low = ob.get('zone_low', ob.get('bottom', 0))
-                    ob_high = ob.get('zone_high', ob.get('top', 0))
-                else:
-                    ob_low = getattr(ob, 'zone_low', getattr(ob, 'bottom', 0))
-                    ob_high = getattr(ob, 'zone_high', getattr(ob, 'top', 0))
-                
-                if not ob_low or not ob_high:
-                    continue
-                
-                # Check if OB is BELOW current price
-                if ob_high < current_price * (1 - min_distance_pct):
-                    distance_pct = (current_price - ob_high) / current_price
-                    
-                    # ✅ SOFT CONSTRAINT: Always add zone, regardless of distance
-                    quality = ob.get('strength', 75) if isinstance(ob, dict) else getattr(ob, 'strength', 75)
-                    if not isinstance(quality, (int, float)):
-                        quality = 75
-                    
-                    valid_zones.append({
-                        'source': 'OB',
-                        'low': ob_low,
-                        'high': ob_high,
-                        'quality': quality,
-                        'distance_pct': distance_pct,
-                        'distance_price': current_price - ob_high,
-                        'out_of_optimal_range': distance_pct > max_distance_pct  # ✅ NEW: Soft constraint flag
-                    })
-            
-            # Check Support levels
-            support_zones = sr_levels.get('support_zones', []) if isinstance(sr_levels, dict) else []
-            for sup in support_zones:
-                sup_price = sup.get('price', sup.get('price_level', 0)) if isinstance(sup, dict) else getattr(sup, 'price', 0)
-                
-                if not sup_price:
-                    continue
-                
-                # Support must be BELOW current price
-                if sup_price < current_price * (1 - min_distance_pct):
-                    distance_pct = (current_price - sup_price) / current_price
-                    
-                    # ✅ SOFT CONSTRAINT: Always add zone, regardless of distance
-                    quality = sup.get('strength', 60) if isinstance(sup, dict) else getattr(sup, 'strength', 60)
-                    if not isinstance(quality, (int, float)):
-                        quality = 60
-                    
-                    # Create zone with small buffer around support
-                    zone_width = sup_price * 0.002  # 0.2% width
-                    valid_zones.append({
-                        'source': 'S/R',
-                        'low': sup_price - zone_width,
-                        'high': sup_price + zone_width,
-                        'quality': quality,
-                        'distance_pct': distance_pct,
-                        'distance_price': current_price - sup_price,
-                        'out_of_optimal_range': distance_pct > max_distance_pct  # ✅ NEW: Soft constraint flag
-                    })
+        with np.errstate(invalid='ignore'):
+            if is_bearish:
+                # BEARISH (SELL): Look for zones ABOVE current price
+                # FVG / OB: bearish, bottom at least min distance above; Resistance: level above
+                threshold = current_price * (1 + min_distance_pct)
+                block_mask = is_block & zone_table.bearish() & has_bounds & (zone_table.bottom > threshold)
+                level_mask = zone_table.of_kind('resistance_zones') & (zone_table.price != 0) & (zone_table.price > threshold)
+                edges = zone_table.bottom
+            elif is_bullish:
+                # BULLISH (BUY): Look for zones BELOW current price
+                # FVG / OB: bullish, top at least min distance below; Support: level below
+                threshold = current_price * (1 - min_distance_pct)
+                block_mask = is_block & zone_table.bullish() & has_bounds & (zone_table.top < threshold)
+                level_mask = zone_table.of_kind('support_zones') & (zone_table.price != 0) & (zone_table.price < threshold)
+                edges = zone_table.top
+            else:
+                block_mask = level_mask = np.zeros(len(zone_table), dtype=bool)
+        
+        for row in zone_table.rows(block_mask | level_mask):
+            if block_mask[row]:
+                source = 'FVG' if is_fvg[row] else 'OB'
+                zone_low = float(zone_table.bottom[row])
+                zone_high = float(zone_table.top[row])
+                level = float(edges[row])
+                default_quality = 70 if source == 'FVG' else 75
+            else:
+                # Create zone with small buffer around the S/R level
+                source = 'S/R'
+                level = float(zone_table.price[row])
+                zone_width = level * 0.002  # 0.2% width
+                zone_low = level - zone_width
+                zone_high = level + zone_width
+                default_quality = 60
+            
+            distance_price = level - current_price if is_bearish else current_price - level
+            distance_pct = distance_price / current_price
+            
+            # ✅ SOFT CONSTRAINT: Always add zone, regardless of distance
+            quality = zone_table.strength[row]
+            quality = default_quality if np.isnan(quality) else float(quality)
+            
+            valid_zones.append({
+                'source': source,
+                'low': zone_low,
+                'high': zone_high,
+                'quality': quality,
+                'distance_pct': distance_pct,
+                'distance_price': distance_price,
+                'out_of_optimal_range': distance_pct > max_distance_pct  # ✅ NEW: Soft constraint flag
+            })
         
         # ==== EVALUATE ZONES ====
         
         if not valid_zones:
             # Check if there are zones in the WRONG direction (price already passed)
-            zones_behind = []
-            
-            if is_bearish:
-                # Check for bearish zones BELOW current price (too late)
-                for fvg in fvg_zones:
-                    fvg_type = str(fvg.get('type', '')) if isinstance(fvg, dict) else str(getattr(fvg, 'type', ''))
-                    if 'BEARISH' in fvg_type.upper():
-                        fvg_high = fvg.get('top', fvg.get('high', 0)) if isinstance(fvg, dict) else getattr(fvg, 'top', getattr(fvg, 'high', 0))
-                        if fvg_high and fvg_high < current_price:
-                            zones_behind.append(fvg)
-                
-                for ob in order_blocks:
-                    ob_type = str(ob.get('type', '')) if isinstance(ob, dict) else str(getattr(ob, 'type', ''))
-                    if 'BEARISH' in ob_type.upper():
-                        ob_high = ob.get('zone_high', ob.get('top', 0)) if isinstance(ob, dict) else getattr(ob, 'zone_high', getattr(ob, 'top', 0))
-                        if ob_high and ob_high < current_price:
-                            zones_behind.append(ob)
-            
-            elif is_bullish:
-                # Check for bullish zones ABOVE current price (too late)
-                for fvg in fvg_zones:
-                    fvg_type = str(fvg.get('type', '')) if isinstance(fvg, dict) else str(getattr(fvg, 'type', ''))
-                    if 'BULLISH' in fvg_type.upper():
-                        fvg_low = fvg.get('bottom', fvg.get('low', 0)) if isinstance(fvg, dict) else getattr(fvg, 'bottom', getattr(fvg, 'low', 0))
-                        if fvg_low and fvg_low > current_price:
-                            zones_behind.append(fvg)
-                
-                for ob in order_blocks:
-                    ob_type = str(ob.get('type', '')) if isinstance(ob, dict) else str(getattr(ob, 'type', ''))
-                    if 'BULLISH' in ob_type.upper():
-                        ob_low = ob.get('zone_low', ob.get('bottom', 0)) if isinstance(ob, dict) else getattr(ob, 'zone_low', getattr(ob, 'bottom', 0))
-                        if ob_low and ob_low > current_price:
-                            zones_behind.append(ob)
+            with np.errstate(invalid='ignore'):
+                if is_bearish:
+                    # Bearish FVG / OB already BELOW current price (too late)
+                    zones_behind = is_block & zone_table.bearish() & (zone_table.top != 0) & (zone_table.top < current_price)
+                elif is_bullish:
+                    # Bullish FVG / OB already ABOVE current price (too late)
+                    zones_behind = is_block & zone_table.bullish() & (zone_table.bottom != 0) & (zone_table.bottom > current_price)
+                else:
+                    zones_behind = np.zeros(len(zone_table), dtype=bool)
             
-            if zones_behind:
+            if zones_behind.any():
                 logger.warning(f"❌ Entry zones exist but price already passed them (TOO_LATE)")
                 return None, 'TOO_LATE'
             else:
@@ -4288,43 +4223,40 @@ class ICTSignalEngine:
     def _get_htf_bias_with_fallback(self, symbol: str, mtf_data: Optional[Dict]) -> str:
         """
         ЗАДЪЛЖИТЕЛНО: Получава HTF bias от 1D → 4H fallback
+
+        Results are shared per (symbol, HTF, last closed HTF candle) via
+        HTFBiasService, so primary timeframes and reanalysis reuse them.
         """
         if mtf_data is None or not isinstance(mtf_data, dict):
             logger.warning("No MTF data available, using NEUTRAL bias")
             return 'NEUTRAL'
         
         try:
-            # Опит 1: 1D timeframe (HTF)
-            if '1d' in mtf_data or '1D' in mtf_data:
-                df_1d = mtf_data.get('1d') if mtf_data.get('1d') is not None else mtf_data.get('1D')
-                if df_1d is not None and not df_1d.empty and len(df_1d) >= 20:
-                    # Determine bias from 1D
-                    bias_components = self._detect_ict_components(df_1d, '1d')
-                    
-                    # ✅ STORE HTF components for later use
-                    self.htf_components = bias_components
-                    
-                    htf_bias = self._determine_market_bias(df_1d, bias_components, None)
-                    htf_bias_str = htf_bias.value if hasattr(htf_bias, 'value') else str(htf_bias)
-                    logger.info(f"✅ HTF Bias from 1D: {htf_bias_str}")
-                    logger.info(f"✅ Stored {len(bias_components.get('order_blocks', []))} HTF Order Blocks for SL validation")
-                    return htf_bias_str
-            
-            # Опит 2: 4H timeframe (fallback)
-            logger.warning("⚠️ 1D bias failed, trying 4H fallback...")
-            if '4h' in mtf_data or '4H' in mtf_data:
-                df_4h = mtf_data.get('4h') if mtf_data.get('4h') is not None else mtf_data.get('4H')
-                if df_4h is not None and not df_4h.empty and len(df_4h) >= 20:
-                    bias_components = self._detect_ict_components(df_4h, '4h')
-                    
-                    # ✅ STORE HTF components for later use
-                    self.htf_components = bias_components
-                    
-                    htf_bias = self._determine_market_bias(df_4h, bias_components, None)
-                    htf_bias_str = htf_bias.value if hasattr(htf_bias, 'value') else str(htf_bias)
-                    logger.info(f"✅ HTF Bias from 4H (fallback): {htf_bias_str}")
-                    logger.info(f"✅ Stored {len(bias_components.get('order_blocks', []))} HTF Order Blocks for SL validation")
-                    return htf_bias_str
+            # Опит 1: 1D timeframe (HTF), Опит 2: 4H timeframe (fallback)
+            for htf, label in (('1d', '1D'), ('4h', '4H')):
+                if htf == '4h':
+                    logger.warning("⚠️ 1D bias failed, trying 4H fallback...")
+                if htf not in mtf_data and label not in mtf_data:
+                    continue
+                df_htf = mtf_data.get(htf) if mtf_data.get(htf) is not None else mtf_data.get(label)
+                if df_htf is None or df_htf.empty or len(df_htf) < 20:
+                    continue
+                
+                if HTF_BIAS_SERVICE_AVAILABLE:
+                    htf_bias_str, bias_components = get_htf_bias_service().get_bias(
+                        symbol, htf, df_htf,
+                        lambda df, tf=htf: self._compute_htf_bias(df, tf)
+                    )
+                else:
+                    htf_bias_str, bias_components = self._compute_htf_bias(df_htf, htf)
+                
+                # ✅ STORE HTF components for later use
+                self.htf_components = bias_components
+                
+                suffix = '' if htf == '1d' else ' (fallback)'
+                logger.info(f"✅ HTF Bias from {label}{suffix}: {htf_bias_str}")
+                logger.info(f"✅ Stored {len(bias_components.get('order_blocks', []))} HTF Order Blocks for SL validation")
+                return htf_bias_str
             
             logger.warning("❌ No HTF data available, using NEUTRAL bias")
             return 'NEUTRAL'
@@ -4333,6 +4265,22 @@ class ICTSignalEngine:
             logger.error(f"HTF bias error: {e}, defaulting to NEUTRAL")
             return 'NEUTRAL'
     
+    def _compute_htf_bias(self, df_htf: pd.DataFrame, htf: str) -> Tuple[str, Dict]:
+        """
+        Detect ICT components on an HTF frame and derive its bias
+        
+        Args:
+            df_htf: HTF OHLCV DataFrame
+            htf: Higher timeframe ('1d' or '4h')
+            
+        Returns:
+            (bias string, HTF ICT components)
+        """
+        bias_components = self._detect_ict_components(df_htf, htf)
+        htf_bias = self._determine_market_bias(df_htf, bias_components, None)
+        htf_bias_str = htf_bias.value if hasattr(htf_bias, 'value') else str(htf_bias)
+        return htf_bias_str, bias_components
+    
     def format_13_point_output(self, signal: ICTSignal, df: pd.DataFrame) -> Dict:
         """
         Format signal as comprehensive 13-point output structure
@@ -4353,6 +4301,9 @@ class ICTSignalEngine:
             # Validate SL positioning
             sl_compliant, sl_reason = self._validate_sl_under_over_ob(signal, primary_ob)
             
+            # One lookup for the forecast zone and its distance
+            nearest_liquidity, liquidity_distance = self._nearest_liquidity(current_price, signal.liquidity_zones)
+            
             output = {
                 '1_mtf_bias': {
                     'htf_bias': signal.htf_bias,
@@ -4453,9 +4404,9 @@ class ICTSignalEngine:
                 },
                 
                 '12_next_liquidity_forecast': {
-                    'nearest_liquidity': signal.liquidity_zones[0] if signal.liquidity_zones else None,
+                    'nearest_liquidity': nearest_liquidity,
                     'target_type': 'BUY_SIDE' if (hasattr(signal.bias, 'value') and signal.bias.value == 'BULLISH') else 'SELL_SIDE',
-                    'estimated_distance': self._calculate_liquidity_distance(current_price, signal.liquidity_zones)
+                    'estimated_distance': liquidity_distance
                 },
                 
                 '13_ml_optimization': {
@@ -4595,11 +4546,9 @@ class ICTSignalEngine:
         try:
             threshold = 0.02  # 2% threshold
             
-            support_zones = luxalgo_sr.get('support_zones', [])
-            resistance_zones = luxalgo_sr.get('resistance_zones', [])
-            
-            for zone in support_zones + resistance_zones:
-                zone_price = zone.get('price', 0)
+            sr_table = zone_table_for({'luxalgo_sr': luxalgo_sr}, kinds=('support_zones', 'resistance_zones'))
+            for row in sr_table.price_index().price_near(price, abs(price) * threshold):
+                zone_price = sr_table.price[row]
                 if zone_price and abs(price - zone_price) / price < threshold:
                     return True
             
@@ -4609,20 +4558,36 @@ class ICTSignalEngine:
             logger.error(f"Error checking price near S/R: {e}")
             return False
     
-    def _calculate_liquidity_distance(self, current_price: float, liquidity_zones: List) -> Optional[float]:
-        """Calculate distance to nearest liquidity zone"""
+    def _nearest_liquidity(self, current_price: float, liquidity_zones: List) -> Tuple[Any, Optional[float]]:
+        """
+        Nearest liquidity zone to the current price and its distance
+        
+        Args:
+            current_price: Current price
+            liquidity_zones: LiquidityZone objects and/or dicts
+            
+        Returns:
+            (zone, distance in %) - (None, None) without zones; a zone list
+            without prices gives its first zone at 0%
+        """
         if not liquidity_zones:
-            return None
+            return None, None
         
         try:
-            nearest_zone = liquidity_zones[0]
-            zone_price = nearest_zone.get('price', nearest_zone.get('price_level', current_price))
-            distance_pct = abs((zone_price - current_price) / current_price) * 100
-            return distance_pct
+            liquidity = zone_table_for({'liquidity_zones': liquidity_zones}, kinds=('liquidity_zones',))
+            row = liquidity.price_index().nearest(current_price)
+            if row is None:
+                return liquidity_zones[0], 0.0
+            zone_price = float(liquidity.price[row])
+            return liquidity.objects[row], abs((zone_price - current_price) / current_price) * 100
             
         except Exception as e:
             logger.error(f"Error calculating liquidity distance: {e}")
-            return None
+            return None, None
+    
+    def _calculate_liquidity_distance(self, current_price: float, liquidity_zones: List) -> Optional[float]:
+        """Calculate distance to nearest liquidity zone"""
+        return self._nearest_liquidity(current_price, liquidity_zones)[1]
 
     def _get_liquidity_zones_with_fallback(self, df: pd.DataFrame, symbol: str, timeframe: str) -> List:
         """
@@ -4660,7 +4625,10 @@ class ICTSignalEngine:
         timeframe: str = '1h'
     ) -> Optional[pd.DataFrame]:
         """
-        Fetch BTC price data for correlation calculation
+        Get BTC price data for correlation calculation
+        
+        Served from the shared BTC reference series, which only hits
+        Binance when a new candle has opened for the timeframe.
         
         Args:
             start_time: Start datetime
@@ -4668,79 +4636,26 @@ class ICTSignalEngine:
             timeframe: Candle timeframe (default: 1h)
             
         Returns:
-            DataFrame with BTC OHLCV data or None if fetch fails
+            DataFrame with BTC close prices or None if unavailable
         """
+        if not BTC_REFERENCE_AVAILABLE:
+            return None
+        
         try:
-            # Import requests here to handle missing dependency gracefully
-            # This allows the engine to work without requests if BTC correlation is not needed
-            import requests
-            
-            # Convert datetime to milliseconds
-            start_ms = int(start_time.timestamp() * 1000)
-            end_ms = int(end_time.timestamp() * 1000)
-            
-            # Binance timeframe mapping
-            tf_map = {
-                '1m': '1m',
-                '3m': '3m',
-                '5m': '5m',
-                '15m': '15m',
-                '30m': '30m',
-                '1h': '1h',
-                '2h': '2h',
-                '4h': '4h',
-                '6h': '6h',
-                '12h': '12h',
-                '1d': '1d',
-                '3d': '3d',
-                '1w': '1w',
-            }
-            
-            interval = tf_map.get(timeframe.lower(), '1h')
-            
-            # Binance API endpoint
-            url = "https://api.binance.com/api/v3/klines"
-            params = {
-                'symbol': 'BTCUSDT',
-                'interval': interval,
-                'startTime': start_ms,
-                'endTime': end_ms,
-                'limit': 500
-            }
-            
-            # Fetch BTC klines
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code != 200:
-                logger.warning(f"Binance API returned {response.status_code}")
+            closes = get_btc_reference_series().get_closes(timeframe.lower())
+            if closes is None or closes.empty:
+                logger.warning("No BTC data available for correlation")
                 return None
             
-            klines = response.json()
+            start, end = pd.Timestamp(start_time), pd.Timestamp(end_time)
+            if start.tz is not None:
+                start = start.tz_convert('UTC').tz_localize(None)
+            if end.tz is not None:
+                end = end.tz_convert('UTC').tz_localize(None)
             
-            if not klines:
-                logger.warning("No BTC data returned from Binance")
-                return None
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
+            closes = closes[(closes.index >= start) & (closes.index <= end)]
+            return closes.to_frame('close')
             
-            # Convert types
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df['close'] = df['close'].astype(float)
-            
-            # Set index
-            df = df.set_index('timestamp')
-            
-            logger.debug(f"✅ Fetched {len(df)} BTC candles for correlation")
-            return df[['close']]  # Return only close prices
-            
-        except ImportError as e:
-            logger.warning(f"Required library not available - BTC correlation disabled: {e}")
-            return None
         except Exception as e:
             logger.warning(f"BTC data fetch failed: {e}")
             return None
@@ -4755,7 +4670,7 @@ class ICTSignalEngine:
         
         Args:
             symbol: Trading pair symbol
-            df: Price DataFrame with datetime index
+            df: Price DataFrame with datetime index or 'timestamp' column
             
         Returns:
             Tuple of (correlation, is_aligned)
@@ -4772,69 +4687,39 @@ class ICTSignalEngine:
                 logger.debug("Insufficient data for BTC correlation (need 30+ candles)")
                 return None, None
             
-            # Get time range from df
-            start_time = df.index[0]
-            end_time = df.index[-1]
-            
-            # Determine timeframe from df index frequency
-            if len(df) >= 2:
-                time_diff = (df.index[1] - df.index[0]).total_seconds() / 60
-                if time_diff <= 1:
-                    tf = '1m'
-                elif time_diff <= 3:
-                    tf = '3m'
-                elif time_diff <= 5:
-                    tf = '5m'
-                elif time_diff <= 15:
-                    tf = '15m'
-                elif time_diff <= 30:
-                    tf = '30m'
-                elif time_diff <= 60:
-                    tf = '1h'
-                elif time_diff <= 240:
-                    tf = '4h'
-                else:
-                    tf = '1d'
-            else:
-                tf = '1h'  # Default fallback
-            
-            # Fetch BTC data
-            btc_df = self._fetch_btc_data(start_time, end_time, tf)
-            
-            if btc_df is None or len(btc_df) < 30:
-                logger.debug("BTC data fetch failed or insufficient")
-                return None, None
-            
-            # Align timestamps (merge on index)
-            merged = df[['close']].merge(
-                btc_df[['close']],
-                left_index=True,
-                right_index=True,
-                how='inner',
-                suffixes=('_asset', '_btc')
-            )
-            
-            if len(merged) < 30:
-                logger.debug(f"After merge, only {len(merged)} matching candles - insufficient")
+            if not BTC_REFERENCE_AVAILABLE:
                 return None, None
             
-            # Calculate percentage returns
-            returns_df = merged.pct_change().dropna()
-            
-            # Ensure we still have enough data after dropna
-            if len(returns_df) < 29:  # Need at least 29 returns for 30 candles
-                logger.debug(f"After pct_change, only {len(returns_df)} returns - insufficient")
+            times = candle_open_times(df)
+            if times is None:
+                logger.debug("No candle timestamps - BTC correlation skipped")
                 return None, None
             
-            asset_returns = returns_df['close_asset']
-            btc_returns = returns_df['close_btc']
+            # Determine timeframe from candle spacing
+            time_diff = (times[1] - times[0]).total_seconds() / 60
+            if time_diff <= 1:
+                tf = '1m'
+            elif time_diff <= 3:
+                tf = '3m'
+            elif time_diff <= 5:
+                tf = '5m'
+            elif time_diff <= 15:
+                tf = '15m'
+            elif time_diff <= 30:
+                tf = '30m'
+            elif time_diff <= 60:
+                tf = '1h'
+            elif time_diff <= 240:
+                tf = '4h'
+            else:
+                tf = '1d'
             
-            # Calculate Pearson correlation
-            correlation = asset_returns.corr(btc_returns)
+            # Aligned on shared timestamps, returns correlated in one vectorized pass
+            asset_closes = pd.Series(df['close'].to_numpy(dtype=float), index=times)
+            correlation = get_btc_reference_series().correlation(symbol, asset_closes, tf)
             
-            # Check if correlation is valid
-            if pd.isna(correlation) or np.isinf(correlation):
-                logger.debug("Correlation calculation returned NaN or Inf")
+            if correlation is None:
+                logger.debug("BTC data unavailable or insufficient overlap for correlation")
                 return None, None
             
             # Determine alignment
@@ -4906,208 +4791,51 @@ class ICTSignalEngine:
             
             logger.info(f"🔍 Scanning obstacles between ${min_price:.2f} and ${max_price:.2f}")
             
-            # 1. Check Order Blocks
-            order_blocks = ict_components.get('order_blocks', [])
-            for ob in order_blocks:
-                try:
-                    # Get OB price and type
-                    if hasattr(ob, 'price'):
-                        ob_price = ob.price
-                    elif isinstance(ob, dict):
-                        ob_price = ob.get('price', 0)
-                    else:
-                        continue
-                    
-                    # Check if in range
-                    if min_price <= ob_price <= max_price:
-                        # Get OB type
-                        if hasattr(ob, 'type'):
-                            ob_type_str = str(ob.type.value) if hasattr(ob.type, 'value') else str(ob.type)
-                        elif isinstance(ob, dict):
-                            ob_type_str = ob.get('type', '')
-                        else:
-                            continue
-                        
-                        # Check if opposing
-                        is_obstacle = False
-                        obstacle_type = ''
-                        
-                        if direction == 'LONG' and 'BEARISH' in ob_type_str.upper():
-                            is_obstacle = True
-                            obstacle_type = 'BEARISH_OB'
-                        elif direction == 'SHORT' and 'BULLISH' in ob_type_str.upper():
-                            is_obstacle = True
-                            obstacle_type = 'BULLISH_OB'
-                        
-                        if is_obstacle:
-                            # Get strength from OB
-                            strength = 70  # Default
-                            if hasattr(ob, 'strength'):
-                                strength = ob.strength
-                            elif isinstance(ob, dict):
-                                strength = ob.get('strength', 70)
-                            
-                            obstacles.append({
-                                'type': obstacle_type,
-                                'price': ob_price,
-                                'strength': strength,
-                                'description': 'Институционална зона' if obstacle_type == 'BEARISH_OB' else 'Институционална подкрепа',
-                                'source': 'ORDER_BLOCK'
-                            })
-                            logger.debug(f"   Found obstacle: {obstacle_type} @ ${ob_price:.2f} (strength: {strength})")
-                except Exception as e:
-                    logger.debug(f"Error processing order block: {e}")
-                    continue
-            
-            # 2. Check FVGs
-            fvgs = ict_components.get('fvgs', [])
-            for fvg in fvgs:
-                try:
-                    # Get FVG price (center)
-                    if hasattr(fvg, 'high') and hasattr(fvg, 'low'):
-                        fvg_price = (fvg.high + fvg.low) / 2
-                    elif isinstance(fvg, dict):
-                        fvg_high = fvg.get('high', 0)
-                        fvg_low = fvg.get('low', 0)
-                        fvg_price = (fvg_high + fvg_low) / 2 if fvg_high and fvg_low else 0
-                    else:
-                        continue
-                    
-                    if not fvg_price:
-                        continue
-                    
-                    # Check if in range
-                    if min_price <= fvg_price <= max_price:
-                        # Check if opposing
-                        is_bullish = False
-                        if hasattr(fvg, 'is_bullish'):
-                            is_bullish = fvg.is_bullish
-                        elif isinstance(fvg, dict):
-                            is_bullish = fvg.get('is_bullish', False)
-                        
-                        is_obstacle = False
-                        obstacle_type = ''
-                        
-                        if direction == 'LONG' and not is_bullish:
-                            is_obstacle = True
-                            obstacle_type = 'BEARISH_FVG'
-                        elif direction == 'SHORT' and is_bullish:
-                            is_obstacle = True
-                            obstacle_type = 'BULLISH_FVG'
-                        
-                        if is_obstacle:
-                            # FVG strength based on gap size
-                            strength = 60  # Default
-                            if hasattr(fvg, 'strength'):
-                                strength = fvg.strength
-                            elif isinstance(fvg, dict):
-                                strength = fvg.get('strength', 60)
-                            
-                            obstacles.append({
-                                'type': obstacle_type,
-                                'price': fvg_price,
-                                'strength': strength,
-                                'description': 'Fair Value Gap зона',
-                                'source': 'FVG'
-                            })
-                            logger.debug(f"   Found obstacle: {obstacle_type} @ ${fvg_price:.2f} (strength: {strength})")
-                except Exception as e:
-                    logger.debug(f"Error processing FVG: {e}")
-                    continue
-            
-            # 3. Check Support/Resistance (LuxAlgo)
-            luxalgo_sr = ict_components.get('luxalgo_sr', {})
-            if luxalgo_sr:
-                try:
-                    # For LONG, check resistance zones
-                    if direction == 'LONG':
-                        resistance_zones = luxalgo_sr.get('resistance_zones', [])
-                        for zone in resistance_zones:
-                            zone_price = zone.get('price', 0)
-                            if zone_price and min_price <= zone_price <= max_price:
-                                strength = zone.get('strength', 65)
-                                obstacles.append({
-                                    'type': 'RESISTANCE',
-                                    'price': zone_price,
-                                    'strength': strength,
-                                    'description': 'Съпротива (LuxAlgo)',
-                                    'source': 'LUXALGO_SR'
-                                })
-                                logger.debug(f"   Found obstacle: RESISTANCE @ ${zone_price:.2f} (strength: {strength})")
-                    
-                    # For SHORT, check support zones
-                    elif direction == 'SHORT':
-                        support_zones = luxalgo_sr.get('support_zones', [])
-                        for zone in support_zones:
-                            zone_price = zone.get('price', 0)
-                            if zone_price and min_price <= zone_price <= max_price:
-                                strength = zone.get('strength', 65)
-                                obstacles.append({
-                                    'type': 'SUPPORT',
-                                    'price': zone_price,
-                                    'strength': strength,
-                                    'description': 'Подкрепа (LuxAlgo)',
-                                    'source': 'LUXALGO_SR'
-                                })
-                                logger.debug(f"   Found obstacle: SUPPORT @ ${zone_price:.2f} (strength: {strength})")
-                except Exception as e:
-                    logger.debug(f"Error processing LuxAlgo S/R: {e}")
+            # kind: ((bearish, bullish) type, default strength, (bearish, bullish) description, source)
+            obstacle_kinds = {
+                'order_blocks': (('BEARISH_OB', 'BULLISH_OB'), 70,
+                                 ('Институционална зона', 'Институционална подкрепа'), 'ORDER_BLOCK'),
+                'fvgs': (('BEARISH_FVG', 'BULLISH_FVG'), 60, ('Fair Value Gap зона',) * 2, 'FVG'),
+                'resistance_zones': (('RESISTANCE',) * 2, 65, ('Съпротива (LuxAlgo)',) * 2, 'LUXALGO_SR'),
+                'support_zones': (('SUPPORT',) * 2, 65, ('Подкрепа (LuxAlgo)',) * 2, 'LUXALGO_SR'),
+                'whale_blocks': (('BEARISH_WHALE', 'BULLISH_WHALE'), 80, ('Whale Institution Block',) * 2, 'WHALE_BLOCK'),
+            }
             
-            # 4. Check Whale Blocks
-            whale_blocks = ict_components.get('whale_blocks', [])
-            for wb in whale_blocks:
-                try:
-                    # Get whale block price
-                    if hasattr(wb, 'price'):
-                        wb_price = wb.price
-                    elif isinstance(wb, dict):
-                        wb_price = wb.get('price', 0)
-                    else:
-                        continue
-                    
-                    if not wb_price:
-                        continue
-                    
-                    # Check if in range
-                    if min_price <= wb_price <= max_price:
-                        # Get whale block type
-                        if hasattr(wb, 'block_type'):
-                            wb_type_str = str(wb.block_type.value) if hasattr(wb.block_type, 'value') else str(wb.block_type)
-                        elif isinstance(wb, dict):
-                            wb_type_str = wb.get('block_type', '')
-                        else:
-                            continue
-                        
-                        # Check if opposing
-                        is_obstacle = False
-                        obstacle_type = ''
-                        
-                        if direction == 'LONG' and 'BEARISH' in wb_type_str.upper():
-                            is_obstacle = True
-                            obstacle_type = 'BEARISH_WHALE'
-                        elif direction == 'SHORT' and 'BULLISH' in wb_type_str.upper():
-                            is_obstacle = True
-                            obstacle_type = 'BULLISH_WHALE'
-                        
-                        if is_obstacle:
-                            # Whale blocks are typically stronger
-                            strength = 80  # Default high strength
-                            if hasattr(wb, 'strength'):
-                                strength = wb.strength
-                            elif isinstance(wb, dict):
-                                strength = wb.get('strength', 80)
-                            
-                            obstacles.append({
-                                'type': obstacle_type,
-                                'price': wb_price,
-                                'strength': strength,
-                                'description': 'Whale Institution Block',
-                                'source': 'WHALE_BLOCK'
-                            })
-                            logger.debug(f"   Found obstacle: {obstacle_type} @ ${wb_price:.2f} (strength: {strength})")
-                except Exception as e:
-                    logger.debug(f"Error processing whale block: {e}")
-                    continue
+            # Range query on the analysis-wide zone index, then keep opposing zones
+            zone_table = zone_table_for(ict_components)
+            rows = zone_table.price_index().price_between(min_price, max_price)
+            kinds = zone_table.kind[rows]
+            directions = zone_table.direction[rows]
+            if direction == 'LONG':
+                opposing = (directions == ZONE_BEARISH) & (kinds != KIND_CODES['support_zones'])
+            elif direction == 'SHORT':
+                opposing = (directions == ZONE_BULLISH) & (kinds != KIND_CODES['resistance_zones'])
+            else:
+                opposing = np.zeros(len(rows), dtype=bool)
+            keep = opposing & np.isin(kinds, [KIND_CODES[kind] for kind in obstacle_kinds]) & (zone_table.price[rows] != 0)
+            
+            # OB → FVG → S/R → whale order, so equal distances sort as before
+            kind_rank = {KIND_CODES[kind]: rank for rank, kind in enumerate(obstacle_kinds)}
+            rows = sorted(rows[keep].tolist(), key=lambda row: (kind_rank[zone_table.kind[row]], row))
+            
+            for row in rows:
+                kind = KINDS[zone_table.kind[row]]
+                obstacle_types, default_strength, descriptions, source = obstacle_kinds[kind]
+                bullish = int(zone_table.direction[row] == ZONE_BULLISH)
+                obstacle_type, description = obstacle_types[bullish], descriptions[bullish]
+                
+                price = float(zone_table.price[row])
+                strength = zone_table.strength[row]
+                strength = default_strength if np.isnan(strength) else float(strength)
+                
+                obstacles.append({
+                    'type': obstacle_type,
+                    'price': price,
+                    'strength': strength,
+                    'description': description,
+                    'source': source
+                })
+                logger.debug(f"   Found obstacle: {obstacle_type} @ ${price:.2f} (strength: {strength})")
             
             # Sort obstacles by proximity to entry price
             obstacles.sort(key=lambda x: abs(x['price'] - entry_price))
@@ -5458,43 +5186,39 @@ class ICTSignalEngine:
             min_price = min(entry_price, math_tp)
             max_price = max(entry_price, math_tp)
             
-            obstacles_in_path = []
-            for obs in obstacles:
-                obs_price = obs.get('price', 0)
-                obs_strength = obs.get('strength', 0)
+            # Walk obstacles from the entry towards the TP; the first significant one
+            # that will likely reject is the nearest (ties keep list order)
+            step = 1 if direction == 'LONG' else -1
+            ordered = sorted(obstacles, key=lambda obs: step * obs.get('price', 0))
+            keys = [step * obs.get('price', 0) for obs in ordered]
+            near_key, far_key = (min_price, max_price) if step == 1 else (-max_price, -min_price)
+            
+            nearest_obstacle = None
+            for pos in range(bisect_right(keys, near_key), bisect_left(keys, far_key)):
+                obs = ordered[pos]
+                if obs.get('strength', 0) < min_obstacle_strength:
+                    continue
+                # Evaluate obstacle
+                context = {
+                    'direction': direction,
+                    'htf_bias': 'NEUTRAL',  # Simplified for helper
+                    'displacement_detected': False,
+                    'mtf_confluence': 0
+                }
+                evaluation = self._evaluate_obstacle_strength(obs, context)
                 
-                # Check if in path and significant
-                if min_price < obs_price < max_price and obs_strength >= min_obstacle_strength:
-                    # Evaluate obstacle
-                    context = {
-                        'direction': direction,
-                        'htf_bias': 'NEUTRAL',  # Simplified for helper
-                        'displacement_detected': False,
-                        'mtf_confluence': 0
+                if evaluation['will_likely_reject']:
+                    nearest_obstacle = {
+                        'obstacle': obs,
+                        'evaluation': evaluation,
+                        'price': obs.get('price', 0)
                     }
-                    evaluation = self._evaluate_obstacle_strength(obs, context)
-                    
-                    if evaluation['will_likely_reject']:
-                        obstacles_in_path.append({
-                            'obstacle': obs,
-                            'evaluation': evaluation,
-                            'price': obs_price
-                        })
+                    break
             
             # No significant obstacles - use mathematical TP
-            if not obstacles_in_path:
+            if nearest_obstacle is None:
                 return math_tp
             
-            # Find nearest strong obstacle
-            if direction == 'LONG':
-                # For LONG, find lowest obstacle price
-                obstacles_in_path.sort(key=lambda x: x['price'])
-                nearest_obstacle = obstacles_in_path[0]
-            else:
-                # For SHORT, find highest obstacle price
-                obstacles_in_path.sort(key=lambda x: x['price'], reverse=True)
-                nearest_obstacle = obstacles_in_path[0]
-            
             # Calculate safe TP (before obstacle with buffer)
             obstacle_price = nearest_obstacle['price']
             if direction == 'LONG':
@@ -5970,11 +5694,11 @@ class ICTSignalEngine:
         
         Default: 0.0% (safe, non-blocking)
         
-        Future implementation: Sum risk from all open positions
+        Served from the shared PortfolioState running totals.
         """
-        # TODO: Implement total open risk aggregation
-        # For now, return safe default
-        return 0.0
+        if not PORTFOLIO_STATE_AVAILABLE:
+            return 0.0
+        return float(get_portfolio_state().total_open_risk())
     
     def _get_symbol_exposure(self, symbol: str) -> float:
         """
@@ -5988,11 +5712,11 @@ class ICTSignalEngine:
         
         Default: 0.0% (safe, non-blocking)
         
-        Future implementation: Calculate from open positions for this symbol
+        Served from the shared PortfolioState running totals.
         """
-        # TODO: Implement symbol exposure calculation
-        # For now, return safe default
-        return 0.0
+        if not PORTFOLIO_STATE_AVAILABLE:
+            return 0.0
+        return float(get_portfolio_state().symbol_exposure(symbol))
     
     def _get_direction_exposure(self, direction: str) -> float:
         """
@@ -6006,11 +5730,11 @@ class ICTSignalEngine:
         
         Default: 0.0% (safe, non-blocking)
         
-        Future implementation: Aggregate exposure from all positions in this direction
+        Served from the shared PortfolioState running totals.
         """
-        # TODO: Implement direction exposure calculation
-        # For now, return safe default
-        return 0.0
+        if not PORTFOLIO_STATE_AVAILABLE:
+            return 0.0
+        return float(get_portfolio_state().direction_exposure(direction))
     
     def _get_daily_loss(self) -> float:
         """
@@ -6021,11 +5745,11 @@ class ICTSignalEngine:
         
         Default: 0.0% (safe, non-blocking)
         
-        Future implementation: Calculate from closed trades today
+        Served from the shared PortfolioState running totals.
         """
-        # TODO: Implement daily loss calculation
-        # For now, return safe default
-        return 0.0
+        if not PORTFOLIO_STATE_AVAILABLE:
+            return 0.0
+        return float(get_portfolio_state().daily_loss())
     
     # ============================================================================
     # END RISK ADMISSION HELPER METHODS
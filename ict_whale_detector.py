@@ -256,6 +256,88 @@ class WhaleDetector:
         explanation = " | ".join(explanation_parts)
         return min(100, confidence), explanation
     
+    def _bar_features(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Whole-column equivalents of the per-bar detectors
+
+        Element i of each array equals what detect_displacement / detect_fvg /
+        detect_wickless_candles / detect_volume_spike return for idx=i, using
+        the same float operations in the same order.
+        """
+        n = len(df)
+        open_ = df['open'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Displacement: |close change| plus a small prior 3-bar close range
+            change_pct = np.zeros(n)
+            is_displacement = np.zeros(n, dtype=bool)
+            if n > 3:
+                prev_close = close[2:-1]
+                change = np.abs((close[3:] - prev_close) / prev_close * 100)
+                # fmax/fmin skip NaN like Series.max()/min()
+                prev_max = np.fmax(np.fmax(close[:-3], close[1:-2]), close[2:-1])
+                prev_min = np.fmin(np.fmin(close[:-3], close[1:-2]), close[2:-1])
+                prev_range_pct = ((prev_max - prev_min) / prev_close) * 100
+                change_pct[3:] = change
+                is_displacement[3:] = (change >= self.displacement_threshold) & (
+                    prev_range_pct < self.displacement_threshold
+                )
+
+            # FVG between candle i-2 and candle i
+            has_fvg = np.zeros(n, dtype=bool)
+            if n > 2:
+                cur_close = close[2:]
+                bullish = (low[:-2] > high[2:]) & (
+                    ((low[:-2] - high[2:]) / cur_close) * 100 >= self.fvg_min_size
+                )
+                bearish = (high[:-2] < low[2:]) & (
+                    ((low[2:] - high[:-2]) / cur_close) * 100 >= self.fvg_min_size
+                )
+                has_fvg[2:] = bullish | bearish
+
+            # Wickless candles (body > 90% of range) over the last 6 bars
+            full_range = high - low
+            wickless = (full_range != 0) & (np.abs(close - open_) / full_range > 0.90)
+
+        bull_candle = close > open_
+        bull_run = self._trailing_count(wickless & bull_candle, 6)
+        bear_run = self._trailing_count(wickless & (close < open_), 6)
+        wickless_count = np.where(bull_candle, bull_run, bear_run)
+
+        # Volume ratio vs. the mean of the previous lookback_period bars
+        volume_ratio = np.ones(n)
+        lookback = self.lookback_period
+        if 'volume' in df.columns and n > lookback > 0:
+            volume = df['volume'].to_numpy(dtype=np.float64)
+            windows = np.lib.stride_tricks.sliding_window_view(volume[:-1], lookback)
+            missing = np.isnan(windows)
+            # Same reduction as Series.mean(): NaN-skipping sum / count
+            sums = np.where(missing, 0.0, windows).sum(axis=1)
+            counts = lookback - missing.sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                avg = sums / counts
+                ratio = volume[lookback:] / avg
+            volume_ratio[lookback:] = np.where(avg == 0, 1.0, ratio)
+
+        return {
+            'change_pct': change_pct,
+            'is_displacement': is_displacement,
+            'has_fvg': has_fvg,
+            'bullish': bull_candle,
+            'wickless_count': wickless_count,
+            'volume_ratio': volume_ratio,
+        }
+
+    @staticmethod
+    def _trailing_count(flags: np.ndarray, window: int) -> np.ndarray:
+        """Number of True flags in [i - window + 1, i] (fewer bars at the start)"""
+        csum = np.concatenate(([0], np.cumsum(flags, dtype=np.int64)))
+        idx = np.arange(len(flags))
+        return csum[idx + 1] - csum[np.maximum(idx + 1 - window, 0)]
+
     def detect_whale_blocks(
         self,
         df: pd.DataFrame,
@@ -263,30 +345,30 @@ class WhaleDetector:
     ) -> List[WhaleOrderBlock]:
         """
         Main method: Detect all whale order blocks in DataFrame
-        
+
+        Displacement, FVG, wickless runs and volume ratios are computed as
+        column arrays in one pass; only displacement bars are scored.
+
         Returns: List of WhaleOrderBlock objects
         """
         whale_blocks = []
         
         try:
-            for idx in range(self.lookback_period, len(df)):
-                # Step 1: Check for displacement
-                is_displacement, displacement_pct = self.detect_displacement(df, idx)
-                
-                if not is_displacement:
-                    continue
-                
-                # Step 2: Check for FVG
-                has_fvg, fvg_data = self.detect_fvg(df, idx)
-                
-                # Step 3: Detect wickless candles
-                direction = 'bullish' if df.iloc[idx]['close'] > df.iloc[idx]['open'] else 'bearish'
-                wickless_count = self.detect_wickless_candles(df, idx, direction)
-                
-                # Step 4: Check volume spike
-                volume_spike = self.detect_volume_spike(df, idx)
+            features = self._bar_features(df)
+            candidates = np.flatnonzero(features['is_displacement'][self.lookback_period:]) + self.lookback_period
+            if len(candidates) == 0:
+                return whale_blocks
+            
+            highs = df['high'].to_numpy()
+            lows = df['low'].to_numpy()
+            
+            for idx in candidates:
+                displacement_pct = features['change_pct'][idx]
+                has_fvg = bool(features['has_fvg'][idx])
+                direction = 'bullish' if features['bullish'][idx] else 'bearish'
+                wickless_count = int(features['wickless_count'][idx])
+                volume_spike = features['volume_ratio'][idx]
                 
-                # Step 5: Calculate confidence
                 confidence, explanation = self.calculate_confidence(
                     displacement_pct,
                     has_fvg,
@@ -296,18 +378,10 @@ class WhaleDetector:
                 
                 # Only keep high-confidence blocks (>= 50)
                 if confidence >= 50:
-                    candle = df.iloc[idx]
                     zone_type = 'buy' if direction == 'bullish' else 'sell'
-                    
-                    # Define zone boundaries
-                    if zone_type == 'buy':
-                        zone_high = candle['high']
-                        zone_low = candle['low']
-                        price_level = zone_low
-                    else:
-                        zone_high = candle['high']
-                        zone_low = candle['low']
-                        price_level = zone_high
+                    zone_high = highs[idx]
+                    zone_low = lows[idx]
+                    price_level = zone_low if zone_type == 'buy' else zone_high
                     
                     whale_block = WhaleOrderBlock(
                         price_level=price_level,
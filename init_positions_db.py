@@ -6,6 +6,7 @@ Tables:
 1. open_positions - Currently active positions with checkpoint tracking
 2. checkpoint_alerts - Re-analysis results at each checkpoint
 3. position_history - Closed positions with P&L and statistics
+4. journal_sync_state - Journal sequence watermark of the journal -> positions sync
 
 Author: galinborisov10-art
 Date: 2026-01-13
@@ -86,8 +87,9 @@ def create_positions_database():
                 status TEXT DEFAULT 'OPEN',  -- 'OPEN', 'PARTIAL', 'CLOSED'
                 
                 -- Metadata
-                source TEXT,  -- 'AUTO', 'MANUAL'
-                notes TEXT
+                source TEXT,  -- 'AUTO', 'MANUAL', 'JOURNAL_SYNC'
+                notes TEXT,
+                journal_key TEXT  -- Journal entry synced into this row (JOURNAL_SYNC only)
             )
         """)
         
@@ -189,6 +191,8 @@ def create_positions_database():
         
         logger.info("✅ Created indexes for performance")
         
+        ensure_journal_sync_schema(conn)
+        
         # Commit and close
         conn.commit()
         conn.close()
@@ -204,6 +208,37 @@ def create_positions_database():
         return False
 
 
+def ensure_journal_sync_schema(conn: sqlite3.Connection):
+    """
+    Add the journal sync columns/tables to a positions database (idempotent)
+    
+    - open_positions.journal_key + UNIQUE index: a journal entry can be
+      inserted only once, whatever its later position status
+    - journal_sync_state: last journal sequence number processed by the sync
+      (journal_seq) and the journal_id it belongs to
+    
+    Args:
+        conn: Open connection to positions.db (caller commits)
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(open_positions)")}
+    if 'journal_key' not in columns:
+        conn.execute("ALTER TABLE open_positions ADD COLUMN journal_key TEXT")
+        logger.info("✅ Added column: open_positions.journal_key")
+    
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_open_positions_journal_key
+        ON open_positions(journal_key)
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS journal_sync_state (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
 def verify_database():
     """
     Verify database was created correctly
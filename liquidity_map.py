@@ -17,8 +17,11 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict
+from bisect import bisect_left, bisect_right
 import logging
 
+from candle_frame import candle_features
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +55,41 @@ class LiquiditySweep:
     volume_spike: float = 0.0
 
 
+class _SweepLevels:
+    """
+    Unswept zone levels of one side, sorted once
+
+    take_between() binary-searches the levels a bar pierces; swept entries
+    are skipped through path-compressed next pointers, so each zone is
+    visited once no matter how many bars are scanned.
+    """
+
+    def __init__(self, entries: List[Tuple[float, int, LiquidityZone]]):
+        self.entries = sorted(entries, key=lambda e: e[0])
+        self.levels = [e[0] for e in self.entries]
+        self._next = list(range(len(self.entries) + 1))
+        self.remaining = len(self.entries)
+
+    def _find(self, pos: int) -> int:
+        nxt = self._next
+        while nxt[pos] != pos:
+            nxt[pos] = nxt[nxt[pos]]
+            pos = nxt[pos]
+        return pos
+
+    def take_between(self, low: float, high: float) -> List[Tuple[float, int, LiquidityZone]]:
+        """Remove and return unswept entries with low < level < high"""
+        end = bisect_left(self.levels, high)
+        pos = self._find(bisect_right(self.levels, low))
+        taken = []
+        while pos < end:
+            taken.append(self.entries[pos])
+            self._next[pos] = pos + 1
+            pos = self._find(pos + 1)
+        self.remaining -= len(taken)
+        return taken
+
+
 class LiquidityMapper:
     """Advanced Liquidity Mapping System"""
     
@@ -203,59 +241,131 @@ class LiquidityMapper:
         return zones
     
     def detect_liquidity_sweeps(self, df: pd.DataFrame, zones: Optional[List[LiquidityZone]] = None) -> List[LiquiditySweep]:
-        """Detect liquidity sweep events"""
+        """
+        Detect liquidity sweep events
+
+        Zone levels are sorted once per side and each bar's pierced levels are
+        found by binary search; fake-breakout flags, volume means and reversal
+        runs are precomputed column arrays. A zone is swept on the first bar
+        (from bar 20) whose wick pierces it, closes back and is followed by a
+        fake breakout; sweeps are ordered by bar, then by position in zones.
+        """
         if zones is None:
             zones = self.liquidity_zones
         
         sweeps = []
-        volume_ma = df['volume'].rolling(20).mean()
+        n = len(df)
         
-        for i in range(20, len(df)):
-            current_high = df['high'].iloc[i]
-            current_low = df['low'].iloc[i]
-            current_close = df['close'].iloc[i]
-            current_volume = df['volume'].iloc[i]
+        # (level, position in zones, zone) per side; duplicates of one zone object count once
+        seen = set()
+        sides = {'BSL': [], 'SSL': []}
+        for order, zone in enumerate(zones):
+            if zone.zone_type in sides and not zone.swept and id(zone) not in seen and zone.price_level == zone.price_level:
+                seen.add(id(zone))
+                sides[zone.zone_type].append((zone.price_level, order, zone))
+        bsl = _SweepLevels(sides['BSL'])
+        ssl = _SweepLevels(sides['SSL'])
+        
+        if n > 20 and (bsl.remaining or ssl.remaining):
+            arrays = self._sweep_arrays(df)
+            high = arrays['high']
+            low = arrays['low']
+            close = arrays['close']
+            volume = arrays['volume']
+            candidates = np.flatnonzero(arrays['fake_bsl'][20:] | arrays['fake_ssl'][20:]) + 20
             
-            for zone in zones:
-                if zone.zone_type == 'BSL' and not zone.swept:
-                    if current_high > zone.price_level and current_close < zone.price_level:
-                        fake_breakout = self._check_fake_breakout(df, i, zone.price_level, 'BSL')
-                        
-                        if fake_breakout:
-                            sweep = LiquiditySweep(
-                                timestamp=df.index[i],
-                                price=current_high,
-                                sweep_type='BSL_SWEEP',
-                                liquidity_zone=zone,
-                                strength=self._calculate_sweep_strength(df, i, zone),
-                                fake_breakout=True,
-                                reversal_candles=self._count_reversal_candles(df, i, 'down'),
-                                volume_spike=current_volume / volume_ma.iloc[i] if volume_ma.iloc[i] > 0 else 1.0
-                            )
-                            sweeps.append(sweep)
-                            zone.swept = True
+            for i in candidates.tolist():
+                hits = []
+                if arrays['fake_bsl'][i] and bsl.remaining:
+                    hits.extend((order, zone, 'BSL') for _, order, zone in bsl.take_between(close[i], high[i]))
+                if arrays['fake_ssl'][i] and ssl.remaining:
+                    hits.extend((order, zone, 'SSL') for _, order, zone in ssl.take_between(low[i], close[i]))
+                if not hits:
+                    if not (bsl.remaining or ssl.remaining):
+                        break
+                    continue
                 
-                elif zone.zone_type == 'SSL' and not zone.swept:
-                    if current_low < zone.price_level and current_close > zone.price_level:
-                        fake_breakout = self._check_fake_breakout(df, i, zone.price_level, 'SSL')
-                        
-                        if fake_breakout:
-                            sweep = LiquiditySweep(
-                                timestamp=df.index[i],
-                                price=current_low,
-                                sweep_type='SSL_SWEEP',
-                                liquidity_zone=zone,
-                                strength=self._calculate_sweep_strength(df, i, zone),
-                                fake_breakout=True,
-                                reversal_candles=self._count_reversal_candles(df, i, 'up'),
-                                volume_spike=current_volume / volume_ma.iloc[i] if volume_ma.iloc[i] > 0 else 1.0
-                            )
-                            sweeps.append(sweep)
-                            zone.swept = True
+                volume_ma = arrays['volume_ma'][i]
+                volume_spike = volume[i] / volume_ma if volume_ma > 0 else 1.0
+                for _, zone, side in sorted(hits, key=lambda hit: hit[0]):
+                    sweeps.append(LiquiditySweep(
+                        timestamp=df.index[i],
+                        price=high[i] if side == 'BSL' else low[i],
+                        sweep_type=f'{side}_SWEEP',
+                        liquidity_zone=zone,
+                        strength=self._sweep_strength(zone.confidence, volume[i], arrays['prior_volume_mean'][i]),
+                        fake_breakout=True,
+                        reversal_candles=int(arrays['down_run' if side == 'BSL' else 'up_run'][i]),
+                        volume_spike=volume_spike
+                    ))
+                    zone.swept = True
         
         self.sweep_events.extend(sweeps)
         return sweeps
     
+    def _sweep_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Per-bar inputs of sweep detection as column arrays
+
+        Element i matches _check_fake_breakout / _calculate_sweep_strength /
+        _count_reversal_candles evaluated at bar i.
+        """
+        n = len(df)
+        open_ = df['open'].to_numpy()
+        close = df['close'].to_numpy()
+        volume = df['volume'].to_numpy()
+        bullish = close > open_
+        bearish = close < open_
+        
+        # Fake breakout: >= 60% of the next k candles reverse (needs k candles ahead)
+        k = self.config['sweep_reversal_candles']
+        ahead = np.zeros(n, dtype=bool)
+        ahead[:max(n - k, 0)] = True
+        bull_csum = np.concatenate(([0], np.cumsum(bullish)))
+        bear_csum = np.concatenate(([0], np.cumsum(bearish)))
+        start = np.minimum(np.arange(n) + 1, n)
+        stop = np.minimum(np.arange(n) + 1 + k, n)
+        fake_bsl = ahead & (bear_csum[stop] - bear_csum[start] >= k * 0.6)
+        fake_ssl = ahead & (bull_csum[stop] - bull_csum[start] >= k * 0.6)
+        
+        # Reversal candles: consecutive candles after bar i, capped at 10
+        up_run = np.zeros(n, dtype=np.int64)
+        down_run = np.zeros(n, dtype=np.int64)
+        if n > 1:
+            up_run[:-1] = np.minimum(self._run_lengths(bullish)[1:], 10)
+            down_run[:-1] = np.minimum(self._run_lengths(bearish)[1:], 10)
+        
+        # Mean volume of the 20 bars before i (same NaN-skipping mean as Series.mean())
+        prior_volume_mean = np.full(n, np.nan)
+        if n > 20:
+            values = volume.astype(np.float64)
+            missing = np.isnan(values)
+            windows = np.lib.stride_tricks.sliding_window_view(np.where(missing, 0.0, values)[:-1], 20)
+            counts = 20 - np.lib.stride_tricks.sliding_window_view(missing[:-1], 20).sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                prior_volume_mean[20:] = np.ascontiguousarray(windows).sum(axis=1) / counts
+        
+        return {
+            'high': df['high'].to_numpy(),
+            'low': df['low'].to_numpy(),
+            'close': close,
+            'volume': volume,
+            'volume_ma': candle_features(df).volume_mean(20),
+            'prior_volume_mean': prior_volume_mean,
+            'fake_bsl': fake_bsl,
+            'fake_ssl': fake_ssl,
+            'up_run': up_run,
+            'down_run': down_run,
+        }
+    
+    @staticmethod
+    def _run_lengths(flags: np.ndarray) -> np.ndarray:
+        """Length of the run of True values starting at each position"""
+        n = len(flags)
+        positions = np.arange(n)
+        next_false = np.minimum.accumulate(np.where(flags, n, positions)[::-1])[::-1]
+        return next_false - positions
+    
     def _check_fake_breakout(self, df: pd.DataFrame, index: int, level: float, sweep_type: str) -> bool:
         """Check if breakout is fake"""
         if index + self.config['sweep_reversal_candles'] >= len(df):
@@ -274,11 +384,16 @@ class LiquidityMapper:
     
     def _calculate_sweep_strength(self, df: pd.DataFrame, index: int, zone: LiquidityZone) -> float:
         """Calculate sweep strength"""
-        strength = zone.confidence * 0.4
         volume_ma = df['volume'].iloc[max(0, index-20):index].mean()
+        return self._sweep_strength(zone.confidence, df['volume'].iloc[index], volume_ma)
+    
+    @staticmethod
+    def _sweep_strength(confidence: float, volume: float, volume_ma: float) -> float:
+        """Zone confidence plus capped volume ratio vs. the prior 20-bar mean"""
+        strength = confidence * 0.4
         
         if volume_ma > 0:
-            volume_ratio = df['volume'].iloc[index] / volume_ma
+            volume_ratio = volume / volume_ma
             strength += min(volume_ratio / 3, 0.3)
         
         return min(strength, 1.0)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+🔎 Log Query Engine
+Fast pattern queries over bot.log and its rotated backups (bot.log.1 ... bot.log.N)
+
+- Files are memory-mapped, never read whole into Python lists
+- "Last N lines" queries read backwards from the end of the file
+- Time-window queries binary-search a sparse timestamp → byte-offset index
+  (kept per inode, so it survives RotatingFileHandler renames)
+- Several patterns are answered in a single pass
+- Timestamps are compared as bytes (log format is lexically ordered), no strptime
+"""
+
+import os
+import re
+import mmap
+import bisect
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Log line prefix: 2026-01-14 10:45:43,746
+_TIMESTAMP_RE = re.compile(rb'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+_TIMESTAMP_LEN = 19
+
+# Bisection stops once the window is this small; the rest is a linear scan
+INDEX_STRIDE_BYTES = 64 * 1024
+# How far a probe scans forward looking for a timestamped line
+PROBE_LIMIT_BYTES = 64 * 1024
+
+
+def _line_timestamp(line: bytes) -> Optional[bytes]:
+    """Return the 19-byte timestamp prefix of a log line, or None."""
+    if len(line) >= _TIMESTAMP_LEN and _TIMESTAMP_RE.match(line):
+        return line[:_TIMESTAMP_LEN]
+    return None
+
+
+class _SparseIndex:
+    """Sorted (line_offset, timestamp) samples for one log file (by inode)."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.offsets: List[int] = []
+        self.timestamps: List[bytes] = []
+
+    def add(self, offset: int, ts: bytes):
+        pos = bisect.bisect_left(self.offsets, offset)
+        if pos < len(self.offsets) and self.offsets[pos] == offset:
+            return
+        self.offsets.insert(pos, offset)
+        self.timestamps.insert(pos, ts)
+
+    def bounds(self, cutoff: bytes, size: int) -> Tuple[int, int]:
+        """Narrow the search window using known samples (timestamps are monotonic)."""
+        pos = bisect.bisect_right(self.timestamps, cutoff)
+        lo = self.offsets[pos - 1] if pos > 0 else 0
+        hi = self.offsets[pos] if pos < len(self.offsets) else size
+        return lo, hi
+
+
+class LogQueryEngine:
+    """
+    Pattern queries over a log file and its rotated backups
+
+    Args:
+        log_path: Path to the active log (e.g. /root/bot/bot.log)
+        max_rotated_files: Number of rotated backups to consider (bot.log.1 ...)
+    """
+
+    def __init__(self, log_path: str, max_rotated_files: int = 3):
+        self.log_path = log_path
+        self.max_rotated_files = max_rotated_files
+        self._indexes: Dict[Tuple[int, int], _SparseIndex] = {}
+        self._lock = threading.Lock()
+
+    def _files_oldest_first(self) -> List[str]:
+        candidates = [f'{self.log_path}.{i}' for i in range(self.max_rotated_files, 0, -1)]
+        candidates.append(self.log_path)
+        return [p for p in candidates if os.path.exists(p)]
+
+    def _index_for(self, stat: os.stat_result) -> _SparseIndex:
+        key = (stat.st_dev, stat.st_ino)
+        index = self._indexes.get(key)
+        if index is None or stat.st_size < index.size:
+            # New file or truncated in place - start over
+            index = _SparseIndex(stat.st_size)
+            self._indexes[key] = index
+        index.size = stat.st_size
+        return index
+
+    def _prune_indexes(self, live_keys: Iterable[Tuple[int, int]]):
+        live = set(live_keys)
+        for key in list(self._indexes):
+            if key not in live:
+                del self._indexes[key]
+
+    # ------------------------------------------------------------------
+    # Low-level scanning helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _probe(mm: mmap.mmap, offset: int) -> Optional[Tuple[int, bytes]]:
+        """First timestamped line starting at or after ``offset``."""
+        size = len(mm)
+        if offset > 0:
+            nl = mm.find(b'\n', offset - 1)
+            if nl == -1:
+                return None
+            offset = nl + 1
+        limit = min(size, offset + PROBE_LIMIT_BYTES)
+        while offset < limit:
+            nl = mm.find(b'\n', offset)
+            end = size if nl == -1 else nl
+            ts = _line_timestamp(mm[offset:min(end, offset + _TIMESTAMP_LEN)])
+            if ts is not None:
+                return offset, ts
+            if nl == -1:
+                return None
+            offset = nl + 1
+        return None
+
+    def _find_start_offset(self, mm: mmap.mmap, index: _SparseIndex, cutoff: bytes) -> int:
+        """Byte offset from which a forward scan covers every line newer than cutoff."""
+        size = len(mm)
+        lo, hi = index.bounds(cutoff, size)
+        while hi - lo > INDEX_STRIDE_BYTES:
+            mid = (lo + hi) // 2
+            probe = self._probe(mm, mid)
+            if probe is None or probe[0] >= hi:
+                hi = mid
+                continue
+            line_offset, ts = probe
+            index.add(line_offset, ts)
+            if ts > cutoff:
+                hi = mid
+            else:
+                lo = line_offset
+        return lo
+
+    @staticmethod
+    def _scan_forward(mm: mmap.mmap, start: int, cutoff: Optional[bytes],
+                      patterns: List[Tuple[str, bytes]], results: Dict[str, List[bytes]]):
+        size = len(mm)
+        offset = start
+        while offset < size:
+            nl = mm.find(b'\n', offset)
+            end = size if nl == -1 else nl
+            line = mm[offset:end]
+            offset = end + 1
+            ts = _line_timestamp(line)
+            if ts is None or (cutoff is not None and ts <= cutoff):
+                continue
+            for name, needle in patterns:
+                if needle in line:
+                    results[name].append(line)
+
+    @staticmethod
+    def _scan_backward(mm: mmap.mmap, max_lines: int, cutoff: Optional[bytes],
+                       patterns: List[Tuple[str, bytes]], results: Dict[str, List[bytes]]) -> Tuple[int, bool]:
+        """
+        Read up to ``max_lines`` lines from the end of the file
+
+        Returns:
+            (lines consumed, reached a line older than cutoff)
+        """
+        end = len(mm)
+        if end and mm[end - 1:end] == b'\n':
+            end -= 1
+        consumed = 0
+        while end > 0 and consumed < max_lines:
+            nl = mm.rfind(b'\n', 0, end)
+            line = mm[nl + 1:end]
+            end = nl if nl != -1 else 0
+            consumed += 1
+            ts = _line_timestamp(line)
+            if ts is None:
+                continue
+            if cutoff is not None and ts <= cutoff:
+                return consumed, True
+            for name, needle in patterns:
+                if needle in line:
+                    results[name].append(line)
+        return consumed, False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        patterns: List[str],
+        hours: Optional[float] = 6,
+        max_lines: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Find lines containing each pattern, in one pass over the logs
+
+        Args:
+            patterns: Substrings to search for
+            hours: Only lines newer than now - hours (None = no time limit)
+            max_lines: Only consider the last N lines (None = whole time window)
+            now: Reference time (default: datetime.now())
+
+        Returns:
+            {pattern: [matching lines, oldest first]}
+        """
+        needles = [(p, p.encode('utf-8')) for p in dict.fromkeys(patterns)]
+        raw: Dict[str, List[bytes]] = {p: [] for p, _ in needles}
+        cutoff = None
+        if hours is not None:
+            cutoff = ((now or datetime.now()) - timedelta(hours=hours)).strftime('%Y-%m-%d %H:%M:%S').encode()
+
+        with self._lock:
+            files = self._files_oldest_first()
+            live_keys = []
+
+            if max_lines is not None:
+                # Newest file first, reading backwards; results collected newest-first
+                remaining = max_lines
+                for path in reversed(files):
+                    if remaining <= 0:
+                        break
+                    with open(path, 'rb') as f:
+                        if os.fstat(f.fileno()).st_size == 0:
+                            continue
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            consumed, done = self._scan_backward(mm, remaining, cutoff, needles, raw)
+                    remaining -= consumed
+                    if done:
+                        break
+                for lines in raw.values():
+                    lines.reverse()
+            else:
+                for path in files:
+                    with open(path, 'rb') as f:
+                        stat = os.fstat(f.fileno())
+                        live_keys.append((stat.st_dev, stat.st_ino))
+                        if stat.st_size == 0:
+                            continue
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            start = 0
+                            if cutoff is not None:
+                                start = self._find_start_offset(mm, self._index_for(stat), cutoff)
+                            self._scan_forward(mm, start, cutoff, needles, raw)
+                self._prune_indexes(live_keys)
+
+        return {
+            p: [line.decode('utf-8', errors='ignore').strip() for line in lines]
+            for p, lines in raw.items()
+        }
+
+    def grep(self, pattern: str, hours: Optional[float] = 6,
+             max_lines: Optional[int] = None) -> List[str]:
+        """Single-pattern convenience wrapper around query()"""
+        return self.query([pattern], hours=hours, max_lines=max_lines)[pattern]
+
+
+# One engine per log path so sparse indexes are reused between calls
+_ENGINES: Dict[str, LogQueryEngine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_log_query_engine(log_path: str) -> LogQueryEngine:
+    """Get (or create) the shared engine for a log file path"""
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(log_path)
+        if engine is None:
+            engine = LogQueryEngine(log_path)
+            _ENGINES[log_path] = engine
+        return engine
@@ -6,8 +6,10 @@ Full Pine Script Implementation - Exact TradingView Replication
 © LuxAlgo - License: CC BY-NC-SA 4.0
 """
 
+import asyncio
 import numpy as np
 import pandas as pd
+from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 import logging
 
@@ -18,6 +20,13 @@ from ict_enhancement.breaker_detector import detect_breaker_blocks
 
 logger = logging.getLogger(__name__)
 
+try:
+    from mtf_consensus_matrix import get_mtf_consensus_matrix
+    from utils.candle_time import timeframe_duration, utc_now_naive
+    MTF_MATRIX_AVAILABLE = True
+except ImportError:
+    MTF_MATRIX_AVAILABLE = False
+
 # Constants
 ERROR_MESSAGE_MAX_LENGTH = 50  # Maximum length for error messages in status field
 
@@ -942,46 +951,115 @@ def combined_luxalgo_ict_analysis(opens: List[float], highs: List[float],
 # MULTI-TIMEFRAME CONTINUOUS ANALYSIS
 # ===================================
 
-async def analyze_all_timeframes(symbol: str, fetch_klines_func) -> Dict:
+async def _analyze_timeframe(symbol: str, tf: str, fetch_klines_func,
+                             now: Optional[datetime] = None) -> Optional[Tuple[Dict, float]]:
+    """
+    Fetch and analyze one timeframe; store the row in the consensus matrix
+
+    The row only holds data determined by the last closed candle (analysis +
+    signal); the live price is returned separately and attached on read.
+
+    Returns:
+        (row, live price) or None
+    """
+    try:
+        # Fetch klines for this timeframe
+        klines = await fetch_klines_func(symbol, tf, limit=200)
+        
+        if not klines or len(klines) < 50:
+            return None
+        
+        live_price = float(klines[-1][4])
+        
+        duration = timeframe_duration(tf) if MTF_MATRIX_AVAILABLE else None
+        closed_open = None
+        if duration is not None:
+            # Last kline is still forming unless its close time has passed
+            last_open = pd.Timestamp(int(klines[-1][0]), unit='ms').to_pydatetime()
+            if last_open + duration <= (now or utc_now_naive()):
+                closed_open = last_open
+            else:
+                closed_open = last_open - duration
+                klines = klines[:-1]
+        
+        # Extract OHLCV
+        opens = [float(k[1]) for k in klines]
+        highs = [float(k[2]) for k in klines]
+        lows = [float(k[3]) for k in klines]
+        closes = [float(k[4]) for k in klines]
+        volumes = [float(k[5]) for k in klines]
+        
+        # Run combined analysis
+        analysis = combined_luxalgo_ict_analysis(opens, highs, lows, closes, volumes)
+        
+        # Extract key signals
+        signal = determine_tf_signal(analysis)
+        
+        row = {
+            'analysis': analysis,
+            'signal': signal
+        }
+        
+        if closed_open is not None:
+            get_mtf_consensus_matrix().put_row(symbol, tf, row, closed_open, namespace='luxalgo')
+        
+        return row, live_price
+        
+    except Exception as e:
+        logger.error(f"Error analyzing {tf}: {e}")
+        return None
+
+
+async def _fetch_live_price(symbol: str, fetch_klines_func) -> Optional[float]:
+    """Last price from a single 1m kline (used when every row came from the matrix)"""
+    try:
+        klines = await fetch_klines_func(symbol, '1m', limit=1)
+        return float(klines[-1][4]) if klines else None
+    except Exception as e:
+        logger.error(f"Error fetching live price: {e}")
+        return None
+
+
+async def analyze_all_timeframes(symbol: str, fetch_klines_func,
+                                 now: Optional[datetime] = None) -> Dict:
     """
     Analyze ALL timeframes continuously
     Monitor entire chart structure across all TFs
     Returns combined MTF analysis
+
+    Timeframe rows are kept in the shared MTF consensus matrix; only the
+    timeframes that closed a new candle since their row was built are
+    fetched (concurrently) and re-analyzed. Every returned entry carries the
+    current price, not the price at the time its row was built.
     """
     try:
         timeframes = ['1m', '5m', '15m', '30m', '1h', '2h', '3h', '4h', '1d', '1w']
-        all_tf_analysis = {}
+        rows = {}
         
+        stale = []
         for tf in timeframes:
-            try:
-                # Fetch klines for this timeframe
-                klines = await fetch_klines_func(symbol, tf, limit=200)
-                
-                if not klines or len(klines) < 50:
-                    continue
-                
-                # Extract OHLCV
-                opens = [float(k[1]) for k in klines]
-                highs = [float(k[2]) for k in klines]
-                lows = [float(k[3]) for k in klines]
-                closes = [float(k[4]) for k in klines]
-                volumes = [float(k[5]) for k in klines]
-                
-                # Run combined analysis
-                analysis = combined_luxalgo_ict_analysis(opens, highs, lows, closes, volumes)
-                
-                # Extract key signals
-                signal = determine_tf_signal(analysis)
-                
-                all_tf_analysis[tf] = {
-                    'analysis': analysis,
-                    'signal': signal,
-                    'price': closes[-1]
-                }
-                
-            except Exception as e:
-                logger.error(f"Error analyzing {tf}: {e}")
-                continue
+            row = None
+            if MTF_MATRIX_AVAILABLE:
+                row = get_mtf_consensus_matrix().get_fresh_row(symbol, tf, namespace='luxalgo', now=now)
+            if row is not None:
+                rows[tf] = row
+            else:
+                stale.append(tf)
+        
+        results = await asyncio.gather(
+            *(_analyze_timeframe(symbol, tf, fetch_klines_func, now) for tf in stale)
+        )
+        live_price = None
+        for tf, result in zip(stale, results):
+            if result is not None:
+                rows[tf], price = result
+                if live_price is None:
+                    live_price = price  # lowest fetched timeframe = most recent close
+        
+        if live_price is None and rows:
+            live_price = await _fetch_live_price(symbol, fetch_klines_func)
+        
+        all_tf_analysis = {tf: dict(rows[tf], price=live_price) for tf in timeframes if tf in rows}
         
         # Calculate multi-timeframe consensus
         consensus = calculate_mtf_consensus(all_tf_analysis)
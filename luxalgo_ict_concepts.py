@@ -134,15 +134,15 @@ class LuxAlgoICT:
         if idx < self.swing_length or idx >= len(df) - self.swing_length:
             return None
         
-        center = df.loc[idx, 'high']
+        center = df['high'].iloc[idx]
         
         # Check left side
-        left_max = df.loc[idx - self.swing_length:idx - 1, 'high'].max()
+        left_max = df['high'].iloc[idx - self.swing_length:idx].max()
         if center <= left_max:
             return None
         
         # Check right side
-        right_max = df.loc[idx + 1:idx + self.swing_length, 'high'].max()
+        right_max = df['high'].iloc[idx + 1:idx + self.swing_length + 1].max()
         if center <= right_max:
             return None
         
@@ -153,15 +153,15 @@ class LuxAlgoICT:
         if idx < self.swing_length or idx >= len(df) - self.swing_length:
             return None
         
-        center = df.loc[idx, 'low']
+        center = df['low'].iloc[idx]
         
         # Check left side
-        left_min = df.loc[idx - self.swing_length:idx - 1, 'low'].min()
+        left_min = df['low'].iloc[idx - self.swing_length:idx].min()
         if center >= left_min:
             return None
         
         # Check right side
-        right_min = df.loc[idx + 1:idx + self.swing_length, 'low'].min()
+        right_min = df['low'].iloc[idx + 1:idx + self.swing_length + 1].min()
         if center >= right_min:
             return None
         
@@ -378,10 +378,111 @@ class LuxAlgoICT:
             discount_end=discount_end
         )
     
+    def _swing_mask(self, values: np.ndarray, is_high: bool) -> np.ndarray:
+        """Vectorized detect_swing_high / detect_swing_low (True at swing bars)"""
+        length = self.swing_length
+        n = len(values)
+        mask = np.zeros(n, dtype=bool)
+        if length < 1 or n < 2 * length + 1:
+            return mask
+        
+        windows = np.lib.stride_tricks.sliding_window_view(values, length)
+        center = values[length:n - length]
+        if is_high:
+            # fmax/fmin skip NaN like Series.max()/min()
+            left = np.fmax.reduce(windows[:n - 2 * length], axis=1)
+            right = np.fmax.reduce(windows[length + 1:], axis=1)
+            mask[length:n - length] = ~(center <= left) & ~(center <= right)
+        else:
+            left = np.fmin.reduce(windows[:n - 2 * length], axis=1)
+            right = np.fmin.reduce(windows[length + 1:], axis=1)
+            mask[length:n - length] = ~(center >= left) & ~(center >= right)
+        return mask
+    
+    @staticmethod
+    def _mean_prior_bodies(body: np.ndarray, window: int = 20) -> np.ndarray:
+        """
+        Mean absolute body of the previous `window` bars (fewer at the start)
+        
+        Same NaN-skipping sum / count reduction as Series.mean() per slice.
+        """
+        n = len(body)
+        avg = np.full(n, np.nan)
+        missing = np.isnan(body)
+        filled = np.where(missing, 0.0, body)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for idx in range(1, min(window, n)):
+                avg[idx] = filled[:idx].sum() / (idx - missing[:idx].sum())
+            if n > window:
+                windows = np.lib.stride_tricks.sliding_window_view(filled[:-1], window)
+                counts = window - np.lib.stride_tricks.sliding_window_view(missing[:-1], window).sum(axis=1)
+                avg[window:] = np.ascontiguousarray(windows).sum(axis=1) / counts
+        return avg
+    
+    def _scan_structure(self, closes: List[float], first: int, n: int):
+        """
+        BOS/MSS pass over bars first..n-1
+        
+        Each bar breaks at most one swing per side: the most recent unbroken
+        swing formed at least two bars earlier that its close crosses. Only
+        unbroken eligible swings are kept in the candidate lists, so broken
+        swings are not re-visited on every bar.
+        """
+        if not self.show_structure:
+            return
+        
+        open_highs: List[SwingPoint] = []
+        open_lows: List[SwingPoint] = []
+        next_high = next_low = 0
+        
+        for idx in range(first, n):
+            while next_high < len(self.swing_highs) and self.swing_highs[next_high].index < idx - 1:
+                open_highs.append(self.swing_highs[next_high])
+                next_high += 1
+            while next_low < len(self.swing_lows) and self.swing_lows[next_low].index < idx - 1:
+                open_lows.append(self.swing_lows[next_low])
+                next_low += 1
+            
+            close = closes[idx]
+            
+            # Check bullish breaks
+            for pos in range(len(open_highs) - 1, -1, -1):
+                if close > open_highs[pos].price:
+                    swing_high = open_highs.pop(pos)
+                    self.structures.append(MarketStructure(
+                        index=idx,
+                        price=swing_high.price,
+                        type='MSS' if self.trend == -1 else 'BOS',
+                        direction='bullish'
+                    ))
+                    swing_high.broken = True
+                    self.trend = 1
+                    self.last_bull_break = idx
+                    break
+            
+            # Check bearish breaks
+            for pos in range(len(open_lows) - 1, -1, -1):
+                if close < open_lows[pos].price:
+                    swing_low = open_lows.pop(pos)
+                    self.structures.append(MarketStructure(
+                        index=idx,
+                        price=swing_low.price,
+                        type='MSS' if self.trend == 1 else 'BOS',
+                        direction='bearish'
+                    ))
+                    swing_low.broken = True
+                    self.trend = -1
+                    self.last_bear_break = idx
+                    break
+    
     def analyze(self, df: pd.DataFrame) -> Dict:
         """
         Main ICT analysis function
         
+        Swings, displacement, FVG and OB candidates, liquidity sweeps and
+        mitigation are computed as array passes; only structure breaks and
+        duplicate filtering run in a per-bar loop over NumPy-backed lists.
+        
         Args:
             df: DataFrame with OHLCV data
         
@@ -396,144 +497,116 @@ class LuxAlgoICT:
         self.liquidity_levels = []
         self.structures = []
         
+        n = len(df)
+        length = self.swing_length
+        
+        # Bars are addressed by position, so any index works (the engine
+        # passes a DatetimeIndex frame)
+        open_ = df['open'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        
         # Step 1: Detect swing points
-        for idx in range(self.swing_length, len(df) - self.swing_length):
-            # Swing highs
-            swing_high = self.detect_swing_high(df, idx)
-            if swing_high is not None:
-                self.swing_highs.append(SwingPoint(
-                    index=idx,
-                    price=swing_high,
-                    type=SwingType.HIGH
-                ))
-                
+        swing_high_mask = self._swing_mask(high, True)
+        swing_low_mask = self._swing_mask(low, False)
+        high_prices = df['high'].tolist()
+        low_prices = df['low'].tolist()
+        for idx in np.flatnonzero(swing_high_mask | swing_low_mask).tolist():
+            if swing_high_mask[idx]:
+                self.swing_highs.append(SwingPoint(index=idx, price=high_prices[idx], type=SwingType.HIGH))
                 if self.show_liquidity:
-                    self.liquidity_levels.append(LiquidityLevel(
-                        index=idx,
-                        price=swing_high,
-                        is_buy_side=True
-                    ))
-            
-            # Swing lows
-            swing_low = self.detect_swing_low(df, idx)
-            if swing_low is not None:
-                self.swing_lows.append(SwingPoint(
-                    index=idx,
-                    price=swing_low,
-                    type=SwingType.LOW
-                ))
-                
+                    self.liquidity_levels.append(LiquidityLevel(index=idx, price=high_prices[idx], is_buy_side=True))
+            if swing_low_mask[idx]:
+                self.swing_lows.append(SwingPoint(index=idx, price=low_prices[idx], type=SwingType.LOW))
                 if self.show_liquidity:
-                    self.liquidity_levels.append(LiquidityLevel(
-                        index=idx,
-                        price=swing_low,
-                        is_buy_side=False
-                    ))
+                    self.liquidity_levels.append(LiquidityLevel(index=idx, price=low_prices[idx], is_buy_side=False))
         
-        # Step 2: Detect market structures, OBs, and FVGs
-        for idx in range(self.swing_length + 2, len(df)):
-            curr = df.iloc[idx]
-            prev = df.iloc[idx - 1]
+        first = length + 2
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Displacement: body > 2x mean body of the previous 20 bars
+            body = np.abs(close - open_)
+            avg_body = self._mean_prior_bodies(body)
+            displacement = (avg_body > 0) & (body > avg_body * 2)
             
-            # Calculate displacement
-            body_size = abs(curr['close'] - curr['open'])
-            avg_body = df['close'].iloc[max(0, idx-20):idx].sub(
-                df['open'].iloc[max(0, idx-20):idx]
-            ).abs().mean()
+            # OB candidates: candle i followed by a >0.5% move beyond it
+            next_close = np.append(close[1:], np.nan)
+            bull_strength = (next_close - high) / high
+            bear_strength = (low - next_close) / low
+            bull_ob = (close > open_) & (next_close > high) & (bull_strength > 0.005)
+            bear_ob = (close < open_) & (next_close < low) & (bear_strength > 0.005)
             
-            displacement_detected = body_size > avg_body * 2 if avg_body > 0 else False
+            prev_high = np.append(np.nan, high[:-1])
+            prev_low = np.append(np.nan, low[:-1])
+            bull_trigger = displacement & (close > open_) & (close > prev_high)
+            bear_trigger = displacement & (close < open_) & (close < prev_low)
             
-            # Check for BOS/MSS
-            if self.show_structure:
-                # Check bullish breaks
-                for swing_high in reversed(self.swing_highs):
-                    if swing_high.broken or swing_high.index >= idx - 1:
+            # FVG between candle i-2 and candle i
+            high_2 = np.concatenate(([np.nan, np.nan], high[:-2]))
+            low_2 = np.concatenate(([np.nan, np.nan], low[:-2]))
+            bull_fvg = (high_2 < low) & ((low - high_2) / high_2 >= 0.003)
+            bear_fvg = ~bull_fvg & (low_2 > high) & ((low_2 - high) / high >= 0.003)
+        
+        closes = df['close'].tolist()
+        self._scan_structure(closes, first, n)
+        
+        if self.show_ob:
+            ob_bars = np.flatnonzero(bull_trigger[first:] | bear_trigger[first:]) + first
+            seen = {True: set(), False: set()}
+            for idx in ob_bars.tolist():
+                for is_bullish, trigger, candidates, strength in (
+                    (True, bull_trigger, bull_ob, bull_strength),
+                    (False, bear_trigger, bear_ob, bear_strength),
+                ):
+                    if not trigger[idx] or idx < 3:
                         continue
-                    
-                    if curr['close'] > swing_high.price:
-                        is_counter = self.trend == -1
-                        structure = self.detect_break_of_structure(df, idx, swing_high, is_counter)
-                        if structure:
-                            self.structures.append(structure)
-                            swing_high.broken = True
-                            self.trend = 1
-                            self.last_bull_break = idx
-                        break
-                
-                # Check bearish breaks
-                for swing_low in reversed(self.swing_lows):
-                    if swing_low.broken or swing_low.index >= idx - 1:
+                    # Last qualifying candle among the previous (up to) 4 bars
+                    i = next((i for i in range(idx - 1, max(idx - 5, 0), -1) if candidates[i]), None)
+                    if i is None or strength[i] < self.ob_filter_strength / 100:
                         continue
-                    
-                    if curr['close'] < swing_low.price:
-                        is_counter = self.trend == 1
-                        structure = self.detect_break_of_structure(df, idx, swing_low, is_counter)
-                        if structure:
-                            self.structures.append(structure)
-                            swing_low.broken = True
-                            self.trend = -1
-                            self.last_bear_break = idx
-                        break
-            
-            # Detect Order Blocks
-            if self.show_ob and displacement_detected:
-                # Bullish OB
-                if curr['close'] > curr['open'] and curr['close'] > prev['high']:
-                    ob = self.detect_order_block(df, idx, True, True)
-                    if ob and ob.strength >= self.ob_filter_strength / 100:
-                        # Check for duplicates
-                        is_duplicate = any(
-                            abs(existing.start_idx - ob.start_idx) <= 1 and
-                            existing.is_bullish == ob.is_bullish
-                            for existing in self.order_blocks
-                        )
-                        if not is_duplicate:
-                            self.order_blocks.append(ob)
-                
-                # Bearish OB
-                if curr['close'] < curr['open'] and curr['close'] < prev['low']:
-                    ob = self.detect_order_block(df, idx, True, False)
-                    if ob and ob.strength >= self.ob_filter_strength / 100:
-                        is_duplicate = any(
-                            abs(existing.start_idx - ob.start_idx) <= 1 and
-                            existing.is_bullish == ob.is_bullish
-                            for existing in self.order_blocks
-                        )
-                        if not is_duplicate:
-                            self.order_blocks.append(ob)
-            
-            # Detect FVG
-            if self.show_fvg:
-                fvg = self.detect_fvg(df, idx)
-                if fvg:
-                    # Check for duplicates
-                    is_duplicate = any(
-                        abs(existing.start_idx - fvg.start_idx) <= 1
-                        for existing in self.fvgs
+                    if seen[is_bullish] & {i - 1, i, i + 1}:
+                        continue
+                    seen[is_bullish].add(i)
+                    ob = OrderBlock(
+                        start_idx=i,
+                        end_idx=i,
+                        top=high_prices[i],
+                        bottom=low_prices[i],
+                        is_bullish=is_bullish,
+                        strength=float(strength[i])
                     )
-                    if not is_duplicate:
-                        self.fvgs.append(fvg)
-            
-            # Check liquidity sweeps
-            if self.show_liquidity:
-                for liq in self.liquidity_levels:
-                    if not liq.swept and idx > liq.index:
-                        if liq.is_buy_side:
-                            if curr['high'] > liq.price and curr['close'] < liq.price:
-                                liq.swept = True
-                        else:
-                            if curr['low'] < liq.price and curr['close'] > liq.price:
-                                liq.swept = True
-            
-            # Check OB mitigation
-            for ob in self.order_blocks:
-                if self.check_ob_mitigation(df, ob, idx):
-                    ob.mitigated = True
-            
-            # Check FVG mitigation
-            for fvg in self.fvgs:
-                if self.check_fvg_mitigation(df, fvg, idx):
-                    fvg.mitigated = True
+                    # Checked for mitigation from the bar it was found on
+                    mid_point = (ob.top + ob.bottom) / 2
+                    if is_bullish:
+                        ob.mitigated = bool((low[idx:] <= mid_point).any())
+                    else:
+                        ob.mitigated = bool((high[idx:] >= mid_point).any())
+                    self.order_blocks.append(ob)
+        
+        if self.show_fvg:
+            for idx in (np.flatnonzero(bull_fvg[first:] | bear_fvg[first:]) + first).tolist():
+                # Starts only increase, so the last FVG is the only possible duplicate
+                if self.fvgs and abs(self.fvgs[-1].start_idx - (idx - 1)) <= 1:
+                    continue
+                if bull_fvg[idx]:
+                    fvg = FairValueGap(start_idx=idx - 1, end_idx=idx, top=low_prices[idx],
+                                       bottom=high_prices[idx - 2], is_bullish=True)
+                    fvg.mitigated = bool((low[idx + 1:] <= fvg.top).any())
+                else:
+                    fvg = FairValueGap(start_idx=idx - 1, end_idx=idx, top=low_prices[idx - 2],
+                                       bottom=high_prices[idx], is_bullish=False)
+                    fvg.mitigated = bool((high[idx + 1:] >= fvg.bottom).any())
+                self.fvgs.append(fvg)
+        
+        if self.show_liquidity:
+            for liq in self.liquidity_levels:
+                start = max(liq.index + 1, first)
+                if liq.is_buy_side:
+                    swept = (high[start:] > liq.price) & (close[start:] < liq.price)
+                else:
+                    swept = (low[start:] < liq.price) & (close[start:] > liq.price)
+                liq.swept = bool(swept.any())
         
         # Calculate Premium/Discount
         premium_discount = self.calculate_premium_discount(df)
@@ -96,6 +96,7 @@ class LuxAlgoSRMTF:
         self.pivot = PivotPoint()
         self.signals: List[LuxAlgoSignal] = []
         self.mss = 0  # Market structure state
+        self._bar_cache: Optional[Tuple[pd.DataFrame, Dict[str, list], float]] = None
         
     def calculate_atr(self, df: pd.DataFrame, period: int = 17) -> pd.Series:
         """Calculate Average True Range"""
@@ -126,16 +127,58 @@ class LuxAlgoSRMTF:
         else:
             return 'average'
     
+    def _bars(self, df: pd.DataFrame) -> Dict[str, list]:
+        """OHLCV columns as lists for positional bar access (cached during analyze)"""
+        cached = self._bar_cache
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        return {col: df[col].tolist() for col in ('open', 'high', 'low', 'close', 'volume') if col in df.columns}
+    
+    def _zone_margin(self, df: pd.DataFrame) -> float:
+        """Relative price range of the frame used for zone widths (cached during analyze)"""
+        cached = self._bar_cache
+        if cached is not None and cached[0] is df:
+            return cached[2]
+        price_range = df['high'].max() - df['low'].min()
+        return price_range / df['high'].max()
+    
+    def _pivot_levels(self, values: np.ndarray, is_high: bool) -> Dict[int, float]:
+        """
+        Vectorized detect_pivot_high / detect_pivot_low over all bars
+        
+        Returns:
+            {bar_index: pivot_price} for every pivot bar
+        """
+        length = self.detection_length
+        n = len(values)
+        if length < 1 or n < 2 * length + 1:
+            return {}
+        
+        windows = np.lib.stride_tricks.sliding_window_view(values, length)
+        center = values[length:n - length]
+        if is_high:
+            # fmax/fmin skip NaN like Series.max()/min()
+            left = np.fmax.reduce(windows[:n - 2 * length], axis=1)
+            right = np.fmax.reduce(windows[length + 1:], axis=1)
+            mask = (center > left) & (center > right)
+        else:
+            left = np.fmin.reduce(windows[:n - 2 * length], axis=1)
+            right = np.fmin.reduce(windows[length + 1:], axis=1)
+            mask = (center < left) & (center < right)
+        
+        positions = np.flatnonzero(mask)
+        return dict(zip((positions + length).tolist(), center[positions].tolist()))
+    
     def detect_pivot_high(self, df: pd.DataFrame, idx: int) -> Optional[float]:
         """Detect pivot high at index"""
         if idx < self.detection_length or idx >= len(df) - self.detection_length:
             return None
         
-        center_high = df.loc[idx, 'high']
+        center_high = df['high'].iloc[idx]
         
         # Check if highest in the window
-        left_window = df.loc[idx - self.detection_length:idx - 1, 'high']
-        right_window = df.loc[idx + 1:idx + self.detection_length, 'high']
+        left_window = df['high'].iloc[idx - self.detection_length:idx]
+        right_window = df['high'].iloc[idx + 1:idx + self.detection_length + 1]
         
         if center_high > left_window.max() and center_high > right_window.max():
             return center_high
@@ -147,11 +190,11 @@ class LuxAlgoSRMTF:
         if idx < self.detection_length or idx >= len(df) - self.detection_length:
             return None
         
-        center_low = df.loc[idx, 'low']
+        center_low = df['low'].iloc[idx]
         
         # Check if lowest in the window
-        left_window = df.loc[idx - self.detection_length:idx - 1, 'low']
-        right_window = df.loc[idx + 1:idx + self.detection_length, 'low']
+        left_window = df['low'].iloc[idx - self.detection_length:idx]
+        right_window = df['low'].iloc[idx + 1:idx + self.detection_length + 1]
         
         if center_low < left_window.min() and center_low < right_window.min():
             return center_low
@@ -166,8 +209,7 @@ class LuxAlgoSRMTF:
         current_idx: int
     ) -> SnRZone:
         """Create resistance zone from pivot high"""
-        price_range = df['high'].max() - df['low'].min()
-        margin = price_range / df['high'].max()
+        margin = self._zone_margin(df)
         
         top = pivot_price
         bottom = pivot_price * (1 - margin * 0.17 * self.sr_margin)
@@ -189,8 +231,7 @@ class LuxAlgoSRMTF:
         current_idx: int
     ) -> SnRZone:
         """Create support zone from pivot low"""
-        price_range = df['high'].max() - df['low'].min()
-        margin = price_range / df['high'].max()
+        margin = self._zone_margin(df)
         
         top = pivot_price * (1 + margin * 0.17 * self.sr_margin)
         bottom = pivot_price
@@ -211,8 +252,9 @@ class LuxAlgoSRMTF:
         idx: int
     ) -> Optional[LuxAlgoSignal]:
         """Check for breakout of S/R zone"""
-        close = df.loc[idx, 'close']
-        close_prev = df.loc[idx - 1, 'close']
+        closes = self._bars(df)['close']
+        close = closes[idx]
+        close_prev = closes[idx - 1]
         
         if zone.breakout:
             return None
@@ -272,10 +314,11 @@ class LuxAlgoSRMTF:
         if zone.test or zone.breakout:
             return None
         
-        high = df.loc[idx - 1, 'high']
-        low = df.loc[idx - 1, 'low']
-        close = df.loc[idx - 1, 'close']
-        close_current = df.loc[idx, 'close']
+        bars = self._bars(df)
+        high = bars['high'][idx - 1]
+        low = bars['low'][idx - 1]
+        close = bars['close'][idx - 1]
+        close_current = bars['close'][idx]
         
         if zone.is_support:
             # Test from above
@@ -317,10 +360,11 @@ class LuxAlgoSRMTF:
         if not opposite_broken or zone.retest:
             return None
         
-        open_prev = df.loc[idx - 1, 'open']
-        high_prev = df.loc[idx - 1, 'high']
-        low_prev = df.loc[idx - 1, 'low']
-        close_prev = df.loc[idx - 1, 'close']
+        bars = self._bars(df)
+        open_prev = bars['open'][idx - 1]
+        high_prev = bars['high'][idx - 1]
+        low_prev = bars['low'][idx - 1]
+        close_prev = bars['close'][idx - 1]
         
         if zone.is_support:
             # Retest from below after bullish breakout
@@ -361,9 +405,10 @@ class LuxAlgoSRMTF:
         if zone.liquidity_sweep or idx != zone.right:
             return False
         
-        high = df.loc[idx, 'high']
-        low = df.loc[idx, 'low']
-        close = df.loc[idx, 'close']
+        bars = self._bars(df)
+        high = bars['high'][idx]
+        low = bars['low'][idx]
+        close = bars['close'][idx]
         
         if zone.is_support:
             # Sweep below support
@@ -404,6 +449,9 @@ class LuxAlgoSRMTF:
         """
         Main analysis function
         
+        Pivots are found in one vectorized pass; the per-bar zone bookkeeping
+        then runs over plain column lists instead of DataFrame row lookups.
+        
         Args:
             df: DataFrame with OHLCV data (columns: open, high, low, close, volume)
         
@@ -415,17 +463,43 @@ class LuxAlgoSRMTF:
         self.support_zones = []
         self.signals = []
         
-        # Calculate indicators
-        atr = self.calculate_atr(df)
-        volume_sma = df['volume'].rolling(window=17).mean()
+        # Bars are addressed by position, so any index works (the engine
+        # passes a DatetimeIndex frame)
+        bars = self._bars(df)
+        self._bar_cache = (df, bars, self._zone_margin(df))
+        try:
+            self._process_bars(df, bars)
+        finally:
+            self._bar_cache = None
+        
+        # Return results
+        return {
+            'support_zones': self.support_zones,
+            'resistance_zones': self.resistance_zones,
+            'signals': self.signals,
+            'market_structure': 'bullish' if self.mss == 1 else 'bearish' if self.mss == -1 else 'neutral',
+            'last_pivot_high': self.pivot.h,
+            'last_pivot_low': self.pivot.l
+        }
+    
+    def _process_bars(self, df: pd.DataFrame, bars: Dict[str, list]):
+        """Stateful zone / signal pass over the bars of df"""
+        highs = bars['high']
+        lows = bars['low']
+        closes = bars['close']
+        volumes = bars['volume']
+        volume_sma = df['volume'].rolling(window=17).mean().tolist()
+        
+        pivot_highs = self._pivot_levels(df['high'].to_numpy(), True)
+        pivot_lows = self._pivot_levels(df['low'].to_numpy(), False)
         
         # Process each bar
         for idx in range(self.detection_length, len(df)):
-            # Detect pivot high
-            pivot_high = self.detect_pivot_high(df, idx - self.detection_length)
+            pivot_idx = idx - self.detection_length
+            
+            # Pivot high confirmed detection_length bars ago
+            pivot_high = pivot_highs.get(pivot_idx)
             if pivot_high is not None:
-                pivot_idx = idx - self.detection_length
-                
                 # Update pivot data
                 self.pivot.h1 = self.pivot.h
                 self.pivot.h = pivot_high
@@ -436,7 +510,6 @@ class LuxAlgoSRMTF:
                 # Create or update resistance zone
                 if len(self.resistance_zones) > 0:
                     last_zone = self.resistance_zones[0]
-                    zone_range = last_zone.top - last_zone.bottom
                     
                     # Check if new pivot is in different zone
                     if (pivot_high < last_zone.bottom * (1 - last_zone.margin * 0.17 * self.sr_margin) or
@@ -453,11 +526,9 @@ class LuxAlgoSRMTF:
                     new_zone = self.create_resistance_zone(df, pivot_idx, pivot_high, idx)
                     self.resistance_zones.append(new_zone)
             
-            # Detect pivot low
-            pivot_low = self.detect_pivot_low(df, idx - self.detection_length)
+            # Pivot low confirmed detection_length bars ago
+            pivot_low = pivot_lows.get(pivot_idx)
             if pivot_low is not None:
-                pivot_idx = idx - self.detection_length
-                
                 # Update pivot data
                 self.pivot.l1 = self.pivot.l
                 self.pivot.l = pivot_low
@@ -485,8 +556,8 @@ class LuxAlgoSRMTF:
                     self.support_zones.append(new_zone)
             
             # Check market structure
-            close = df.loc[idx, 'close']
-            close_prev = df.loc[idx - 1, 'close']
+            close = closes[idx]
+            close_prev = closes[idx - 1]
             
             if close_prev > self.pivot.h and close > self.pivot.h and not self.pivot.hx:
                 self.pivot.hx = True
@@ -501,9 +572,9 @@ class LuxAlgoSRMTF:
                 zone = self.resistance_zones[0]
                 
                 # Extend zone if price interacts
-                if (df.loc[idx, 'high'] > zone.bottom * (1 - zone.margin * 0.17) and
+                if (highs[idx] > zone.bottom * (1 - zone.margin * 0.17) and
                     not zone.breakout):
-                    if df.loc[idx, 'high'] > zone.bottom:
+                    if highs[idx] > zone.bottom:
                         zone.right = idx
                 
                 # Check for signals
@@ -513,8 +584,8 @@ class LuxAlgoSRMTF:
                     zone.retest = False
                     zone.right = idx - 1
                     breakout_signal.volume_profile = self.get_volume_profile(
-                        df.loc[idx - 1, 'volume'],
-                        volume_sma.loc[idx - 1]
+                        volumes[idx - 1],
+                        volume_sma[idx - 1]
                     )
                     self.signals.append(breakout_signal)
                     
@@ -536,8 +607,8 @@ class LuxAlgoSRMTF:
                     zone.retest = True
                     zone.right = idx
                     retest_signal.volume_profile = self.get_volume_profile(
-                        df.loc[idx - 1, 'volume'],
-                        volume_sma.loc[idx - 1]
+                        volumes[idx - 1],
+                        volume_sma[idx - 1]
                     )
                     self.signals.append(retest_signal)
                 
@@ -546,8 +617,8 @@ class LuxAlgoSRMTF:
                     zone.test = True
                     zone.right = idx
                     test_signal.volume_profile = self.get_volume_profile(
-                        df.loc[idx - 1, 'volume'],
-                        volume_sma.loc[idx - 1]
+                        volumes[idx - 1],
+                        volume_sma[idx - 1]
                     )
                     self.signals.append(test_signal)
                 
@@ -557,7 +628,7 @@ class LuxAlgoSRMTF:
                     sweep_signal = LuxAlgoSignal(
                         type='liquidity_sweep',
                         direction='bearish',
-                        price=df.loc[idx, 'high'],
+                        price=highs[idx],
                         bar_index=idx,
                         zone=zone
                     )
@@ -568,9 +639,9 @@ class LuxAlgoSRMTF:
                 zone = self.support_zones[0]
                 
                 # Extend zone if price interacts
-                if (df.loc[idx, 'low'] < zone.top * (1 + zone.margin * 0.17) and
+                if (lows[idx] < zone.top * (1 + zone.margin * 0.17) and
                     not zone.breakout):
-                    if df.loc[idx, 'low'] < zone.top:
+                    if lows[idx] < zone.top:
                         zone.right = idx
                 
                 # Check for signals
@@ -580,8 +651,8 @@ class LuxAlgoSRMTF:
                     zone.retest = False
                     zone.right = idx - 1
                     breakout_signal.volume_profile = self.get_volume_profile(
-                        df.loc[idx - 1, 'volume'],
-                        volume_sma.loc[idx - 1]
+                        volumes[idx - 1],
+                        volume_sma[idx - 1]
                     )
                     self.signals.append(breakout_signal)
                     
@@ -603,8 +674,8 @@ class LuxAlgoSRMTF:
                     zone.retest = True
                     zone.right = idx
                     retest_signal.volume_profile = self.get_volume_profile(
-                        df.loc[idx - 1, 'volume'],
-                        volume_sma.loc[idx - 1]
+                        volumes[idx - 1],
+                        volume_sma[idx - 1]
                     )
                     self.signals.append(retest_signal)
                 
@@ -613,8 +684,8 @@ class LuxAlgoSRMTF:
                     zone.test = True
                     zone.right = idx
                     test_signal.volume_profile = self.get_volume_profile(
-                        df.loc[idx - 1, 'volume'],
-                        volume_sma.loc[idx - 1]
+                        volumes[idx - 1],
+                        volume_sma[idx - 1]
                     )
                     self.signals.append(test_signal)
                 
@@ -624,18 +695,8 @@ class LuxAlgoSRMTF:
                     sweep_signal = LuxAlgoSignal(
                         type='liquidity_sweep',
                         direction='bullish',
-                        price=df.loc[idx, 'low'],
+                        price=lows[idx],
                         bar_index=idx,
                         zone=zone
                     )
                     self.signals.append(sweep_signal)
-        
-        # Return results
-        return {
-            'support_zones': self.support_zones,
-            'resistance_zones': self.resistance_zones,
-            'signals': self.signals,
-            'market_structure': 'bullish' if self.mss == 1 else 'bearish' if self.mss == -1 else 'neutral',
-            'last_pivot_high': self.pivot.h,
-            'last_pivot_low': self.pivot.l
-        }
@@ -0,0 +1,577 @@
+"""
+🛰️ Market Data Backend
+Configurable Binance REST base URL + a local Binance-compatible stand-in
+
+Every fetch path (bot.py fetch_json / fetch_klines_df, the position
+monitors, BTC reference series, diagnostics) builds its URLs from
+BINANCE_API_BASE, so pointing it at a LocalBinanceServer runs the whole
+pipeline - auto signal passes, position monitoring, backtests - offline.
+
+The stand-in serves the endpoints the bot uses (klines, uiKlines,
+ticker/price, ticker/24hr, depth, ping, time) from:
+- SyntheticKlineSource: deterministic synthetic_ohlcv candles for ANY symbol
+  (so 100+ symbols need no recordings); the window always ends at the
+  currently open candle, so prices move with the clock
+- RecordedKlineSource: kline arrays saved from Binance ({SYMBOL}_{interval}.json)
+
+Faults (FaultProfile) are configurable: fixed latency + jitter, a share of
+HTTP 5xx errors, and Binance-style request-weight limiting (HTTP 429 with
+Retry-After and X-MBX-USED-WEIGHT-1M headers).
+
+Usage:
+    python market_data_backend.py --port 8765 --latency 0.05 --error-rate 0.02 --weight-limit 6000
+    BINANCE_API_BASE=http://127.0.0.1:8765 python bot.py
+
+Environment:
+    BINANCE_API_BASE: REST base URL (default https://api.binance.com)
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE = "https://api.binance.com"
+
+# Binance interval lengths (seconds)
+INTERVAL_SECONDS = {
+    '1m': 60, '3m': 180, '5m': 300, '15m': 900, '30m': 1800,
+    '1h': 3600, '2h': 7200, '4h': 14400, '6h': 21600, '8h': 28800, '12h': 43200,
+    '1d': 86400, '3d': 259200, '1w': 604800,
+}
+WEEK_OFFSET = 4 * 86400  # epoch is a Thursday; weekly candles open on Monday
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+# Request weights (approximation of the Binance spot API weights)
+ENDPOINT_WEIGHTS = {
+    '/api/v3/ping': 1,
+    '/api/v3/time': 1,
+    '/api/v3/klines': 2,
+    '/api/v3/uiKlines': 2,
+    '/api/v3/ticker/price': 2,
+    '/api/v3/ticker/24hr': 2,
+    '/api/v3/depth': 5,
+}
+ALL_SYMBOLS_WEIGHT = {'/api/v3/ticker/price': 4, '/api/v3/ticker/24hr': 80}
+
+
+def binance_api_base() -> str:
+    """Binance REST base URL (BINANCE_API_BASE, read at call time)"""
+    return os.getenv('BINANCE_API_BASE', DEFAULT_API_BASE).rstrip('/')
+
+
+def binance_url(path: str) -> str:
+    """
+    Full URL of a Binance REST endpoint
+
+    Args:
+        path: Endpoint path, e.g. '/api/v3/klines'
+    """
+    return f"{binance_api_base()}{path}"
+
+
+class MarketDataError(Exception):
+    """Request the stand-in answers with a Binance error body"""
+
+    def __init__(self, status: int, code: int, msg: str):
+        super().__init__(msg)
+        self.status = status
+        self.code = code
+        self.msg = msg
+
+
+def _open_time(interval: str, now: float) -> int:
+    """Open time (ms) of the candle of `interval` that contains `now`"""
+    period = INTERVAL_SECONDS[interval]
+    offset = WEEK_OFFSET if interval == '1w' else 0
+    return int(((now - offset) // period) * period + offset) * 1000
+
+
+def _select_window(rows: List[list], limit: int, start_time: Optional[int], end_time: Optional[int]) -> List[list]:
+    """Binance paging: startTime -> first `limit` rows from it, otherwise the last `limit` rows"""
+    if end_time is not None:
+        rows = [row for row in rows if row[0] <= end_time]
+    if start_time is not None:
+        return [row for row in rows if row[0] >= start_time][:limit]
+    return rows[-limit:]
+
+
+# ----------------------------------------------------------------------
+# Kline sources
+# ----------------------------------------------------------------------
+
+class KlineSource:
+    """Base class: klines() + derived price / 24h ticker / order book"""
+
+    def klines(self, symbol: str, interval: str, limit: int = DEFAULT_LIMIT,
+               start_time: Optional[int] = None, end_time: Optional[int] = None) -> List[list]:
+        """
+        Kline rows in Binance format
+
+        Returns:
+            [[open_time, "open", "high", "low", "close", "volume", close_time,
+              "quote_volume", trades, "taker_buy_base", "taker_buy_quote", "0"], ...]
+
+        Raises:
+            MarketDataError: Unknown symbol
+        """
+        raise NotImplementedError
+
+    def symbols(self) -> List[str]:
+        """Symbols listed by the all-symbol ticker endpoints"""
+        return []
+
+    def price(self, symbol: str) -> float:
+        return float(self.klines(symbol, '1m', 1)[-1][4])
+
+    def ticker_24h(self, symbol: str) -> Dict[str, Any]:
+        rows = self.klines(symbol, '1h', 24)
+        first_open, last_close = float(rows[0][1]), float(rows[-1][4])
+        volume = sum(float(row[5]) for row in rows)
+        return {
+            'symbol': symbol,
+            'priceChange': f"{last_close - first_open:.8f}",
+            'priceChangePercent': f"{(last_close / first_open - 1) * 100:.3f}",
+            'lastPrice': f"{last_close:.8f}",
+            'openPrice': f"{first_open:.8f}",
+            'highPrice': f"{max(float(row[2]) for row in rows):.8f}",
+            'lowPrice': f"{min(float(row[3]) for row in rows):.8f}",
+            'volume': f"{volume:.8f}",
+            'quoteVolume': f"{sum(float(row[7]) for row in rows):.8f}",
+            'openTime': rows[0][0],
+            'closeTime': rows[-1][6],
+            'count': sum(int(row[8]) for row in rows),
+        }
+
+    def depth(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        """Symmetric book around the current price (0.01% steps, size grows away from mid)"""
+        mid = self.price(symbol)
+        step = mid * 0.0001
+        bids = [[f"{mid - step * (i + 1):.8f}", f"{1 + i * 0.1:.4f}"] for i in range(limit)]
+        asks = [[f"{mid + step * (i + 1):.8f}", f"{1 + i * 0.1:.4f}"] for i in range(limit)]
+        return {'lastUpdateId': int(time.time() * 1000), 'bids': bids, 'asks': asks}
+
+
+class SyntheticKlineSource(KlineSource):
+    """
+    Deterministic synthetic klines for any symbol
+
+    Each (symbol, interval) gets its own seed, start price (0.1 .. 100k) and
+    regime derived from the symbol name, so the same symbol always looks the
+    same and different symbols differ.
+
+    Args:
+        seed: Base seed
+        history: Candles generated per (symbol, interval) window
+        symbols: Symbols listed by the all-symbol endpoints
+        clock: Wall clock (Unix seconds), injectable for tests
+    """
+
+    CACHE_SIZE = 512
+
+    def __init__(self, seed: int = 42, history: int = MAX_LIMIT, symbols: Optional[List[str]] = None,
+                 clock: Callable[[], float] = time.time):
+        self.seed = seed
+        self.history = history
+        self._symbols = list(symbols or ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'XRPUSDT', 'ADAUSDT'])
+        self.clock = clock
+        self._cache: 'OrderedDict[Tuple[str, str, int], List[list]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def klines(self, symbol, interval, limit=DEFAULT_LIMIT, start_time=None, end_time=None):
+        if interval not in INTERVAL_SECONDS:
+            raise MarketDataError(400, -1120, 'Invalid interval.')
+        if not symbol or not symbol.isalnum():
+            raise MarketDataError(400, -1121, 'Invalid symbol.')
+        current_open = _open_time(interval, self.clock())
+        return _select_window(self._window(symbol, interval, current_open), limit, start_time, end_time)
+
+    def _window(self, symbol: str, interval: str, current_open: int) -> List[list]:
+        key = (symbol, interval, current_open)
+        with self._lock:
+            rows = self._cache.get(key)
+            if rows is not None:
+                self._cache.move_to_end(key)
+                return rows
+
+        rows = self._generate(symbol, interval, current_open)
+        with self._lock:
+            self._cache[key] = rows
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return rows
+
+    def _generate(self, symbol: str, interval: str, current_open: int) -> List[list]:
+        from synthetic_ohlcv import REGIMES, generate_ohlcv
+
+        symbol_hash = zlib.crc32(symbol.encode())
+        regime = sorted(REGIMES)[symbol_hash % len(REGIMES)]
+        start_price = 10 ** ((symbol_hash % 6000) / 1000 - 1)
+        seed = (self.seed * 1_000_003 + symbol_hash + zlib.crc32(interval.encode())) % 2 ** 32
+        df = generate_ohlcv(self.history, regime, seed=seed, start_price=start_price)
+
+        period_ms = INTERVAL_SECONDS[interval] * 1000
+        first_open = current_open - (self.history - 1) * period_ms
+        rows = []
+        for i, (open_, high, low, close, volume) in enumerate(
+                df[['open', 'high', 'low', 'close', 'volume']].itertuples(index=False)):
+            open_time = first_open + i * period_ms
+            rows.append([
+                open_time, f"{open_:.8f}", f"{high:.8f}", f"{low:.8f}", f"{close:.8f}", f"{volume:.8f}",
+                open_time + period_ms - 1, f"{volume * close:.8f}", int(volume) + 1,
+                f"{volume / 2:.8f}", f"{volume * close / 2:.8f}", "0",
+            ])
+        return rows
+
+
+class RecordedKlineSource(KlineSource):
+    """
+    Klines recorded from Binance
+
+    Files are `{SYMBOL}_{interval}.json` holding the raw /api/v3/klines
+    array. Symbols / intervals without a recording go to `fallback`
+    (e.g. a SyntheticKlineSource) or are answered as invalid symbols.
+
+    Args:
+        directory: Recording directory
+        fallback: Source for missing recordings
+    """
+
+    PRICE_INTERVALS = ('1m', '5m', '15m', '30m', '1h', '2h', '4h', '1d')
+
+    def __init__(self, directory: str, fallback: Optional[KlineSource] = None):
+        self.directory = directory
+        self.fallback = fallback
+        self._loaded: Dict[Tuple[str, str], Optional[List[list]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def record(directory: str, symbol: str, interval: str, klines: List[list]) -> str:
+        """Save a klines response as a recording; returns the file path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{symbol}_{interval}.json")
+        with open(path, 'w') as f:
+            json.dump(klines, f)
+        return path
+
+    def _recording(self, symbol: str, interval: str) -> Optional[List[list]]:
+        key = (symbol, interval)
+        with self._lock:
+            if key not in self._loaded:
+                path = os.path.join(self.directory, f"{symbol}_{interval}.json")
+                try:
+                    with open(path) as f:
+                        self._loaded[key] = json.load(f)
+                except (OSError, ValueError):
+                    self._loaded[key] = None
+            return self._loaded[key]
+
+    def symbols(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            names = []
+        recorded = sorted({name.rsplit('_', 1)[0] for name in names if name.endswith('.json')})
+        return recorded or (self.fallback.symbols() if self.fallback else [])
+
+    def klines(self, symbol, interval, limit=DEFAULT_LIMIT, start_time=None, end_time=None):
+        rows = self._recording(symbol, interval)
+        if rows is None:
+            if self.fallback is not None:
+                return self.fallback.klines(symbol, interval, limit, start_time, end_time)
+            raise MarketDataError(400, -1121, 'Invalid symbol.')
+        return _select_window(rows, limit, start_time, end_time)
+
+    def price(self, symbol: str) -> float:
+        for interval in self.PRICE_INTERVALS:
+            rows = self._recording(symbol, interval)
+            if rows:
+                return float(rows[-1][4])
+        if self.fallback is not None:
+            return self.fallback.price(symbol)
+        raise MarketDataError(400, -1121, 'Invalid symbol.')
+
+
+# ----------------------------------------------------------------------
+# Request handling (in-process) + faults
+# ----------------------------------------------------------------------
+
+@dataclass
+class FaultProfile:
+    """
+    Injected latency, errors and rate limiting
+
+    Args:
+        latency: Seconds added to every response
+        jitter: Extra uniform(0, jitter) seconds
+        error_rate: Share of requests answered with HTTP 503 (0..1)
+        weight_limit: Request weight allowed per minute before HTTP 429 (None = unlimited;
+            Binance spot allows 6000)
+        seed: Seed for jitter / error draws (reproducible runs)
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    weight_limit: Optional[int] = None
+    seed: Optional[int] = None
+
+
+class MarketDataStub:
+    """
+    Binance REST semantics on top of a KlineSource, without the HTTP layer
+
+    handle() is what LocalBinanceServer serves; it can also be called
+    directly for in-process load tests.
+
+    Args:
+        source: Kline source (default: SyntheticKlineSource)
+        faults: Fault profile (default: none)
+        clock: Clock for the weight window
+        sleep: Sleep used for injected latency
+    """
+
+    WINDOW = 60.0
+
+    def __init__(self, source: Optional[KlineSource] = None, faults: Optional[FaultProfile] = None,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep):
+        self.source = source or SyntheticKlineSource()
+        self.faults = faults or FaultProfile()
+        self.clock = clock
+        self.sleep = sleep
+        self._rng = random.Random(self.faults.seed)
+        self._weights: deque = deque()  # (time, weight) inside the current minute
+        self._used = 0
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0, 'bad_requests': 0}
+        self.by_endpoint: Dict[str, int] = {}
+
+    def handle(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict[str, str], Any]:
+        """
+        Answer one request
+
+        Args:
+            path: Endpoint path ('/api/v3/klines')
+            params: Query parameters
+
+        Returns:
+            (HTTP status, headers, JSON-serialisable body)
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+            self.by_endpoint[path] = self.by_endpoint.get(path, 0) + 1
+            delay = self.faults.latency + (self._rng.uniform(0, self.faults.jitter) if self.faults.jitter else 0.0)
+            fail = self.faults.error_rate > 0 and self._rng.random() < self.faults.error_rate
+
+        if delay > 0:
+            self.sleep(delay)
+
+        if path not in ENDPOINT_WEIGHTS:
+            return self._error(404, -1000, 'Unknown endpoint.', 'bad_requests')
+
+        weight = ENDPOINT_WEIGHTS[path]
+        if path in ALL_SYMBOLS_WEIGHT and not params.get('symbol'):
+            weight = ALL_SYMBOLS_WEIGHT[path]
+        allowed, used, retry_after = self._take_weight(weight)
+        headers = {'X-MBX-USED-WEIGHT-1M': str(used)}
+        if not allowed:
+            headers['Retry-After'] = str(retry_after)
+            status, _, body = self._error(429, -1003, 'Too many requests; current limit of IP is '
+                                                      f'{self.faults.weight_limit} request weight per 1 MINUTE.',
+                                          'rate_limited')
+            return status, headers, body
+
+        if fail:
+            status, _, body = self._error(503, -1001, 'Internal error; unable to process your request. '
+                                                      'Please try again.', 'errors')
+            return status, headers, body
+
+        try:
+            body = self._route(path, params)
+        except MarketDataError as e:
+            status, _, body = self._error(e.status, e.code, e.msg, 'bad_requests')
+            return status, headers, body
+
+        with self._lock:
+            self.stats['ok'] += 1
+        return 200, headers, body
+
+    def _error(self, status: int, code: int, msg: str, counter: str) -> Tuple[int, Dict[str, str], Any]:
+        with self._lock:
+            self.stats[counter] += 1
+        return status, {}, {'code': code, 'msg': msg}
+
+    def _take_weight(self, weight: int) -> Tuple[bool, int, int]:
+        """Sliding one-minute weight window; returns (allowed, used weight, retry-after seconds)"""
+        now = self.clock()
+        with self._lock:
+            while self._weights and self._weights[0][0] <= now - self.WINDOW:
+                self._used -= self._weights.popleft()[1]
+            limit = self.faults.weight_limit
+            if limit is not None and self._used + weight > limit:
+                retry_after = max(1, math.ceil(self._weights[0][0] + self.WINDOW - now)) if self._weights else 1
+                return False, self._used, retry_after
+            self._weights.append((now, weight))
+            self._used += weight
+            return True, self._used, 0
+
+    def _route(self, path: str, params: Dict[str, str]) -> Any:
+        symbol = params.get('symbol')
+        if path == '/api/v3/ping':
+            return {}
+        if path == '/api/v3/time':
+            return {'serverTime': int(self.clock() * 1000)}
+        if path in ('/api/v3/klines', '/api/v3/uiKlines'):
+            if not symbol or 'interval' not in params:
+                raise MarketDataError(400, -1102, "Mandatory parameter 'symbol' or 'interval' was not sent.")
+            limit = min(max(int(params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+            start_time = int(params['startTime']) if params.get('startTime') else None
+            end_time = int(params['endTime']) if params.get('endTime') else None
+            return self.source.klines(symbol, params['interval'], limit, start_time, end_time)
+        if path == '/api/v3/ticker/price':
+            if symbol:
+                return {'symbol': symbol, 'price': f"{self.source.price(symbol):.8f}"}
+            return [{'symbol': s, 'price': f"{self.source.price(s):.8f}"} for s in self.source.symbols()]
+        if path == '/api/v3/ticker/24hr':
+            if symbol:
+                return self.source.ticker_24h(symbol)
+            return [self.source.ticker_24h(s) for s in self.source.symbols()]
+        if path == '/api/v3/depth':
+            if not symbol:
+                raise MarketDataError(400, -1102, "Mandatory parameter 'symbol' was not sent.")
+            return self.source.depth(symbol, min(int(params.get('limit', 100)), 5000))
+        raise MarketDataError(404, -1000, 'Unknown endpoint.')
+
+
+# ----------------------------------------------------------------------
+# HTTP server
+# ----------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    stub: MarketDataStub = None  # set per server class
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            status, headers, body = self.stub.handle(url.path, params)
+        except Exception as e:
+            logger.error(f"❌ Market data stand-in failed on {self.path}: {e}")
+            status, headers, body = 500, {}, {'code': -1000, 'msg': str(e)}
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug("stand-in %s - %s", self.address_string(), format % args)
+
+
+class LocalBinanceServer:
+    """
+    Local HTTP server speaking the Binance REST endpoints the bot uses
+
+    Args:
+        stub: Request handler (default: MarketDataStub over synthetic klines)
+        host: Bind address
+        port: Port (0 = pick a free one)
+    """
+
+    def __init__(self, stub: Optional[MarketDataStub] = None, host: str = '127.0.0.1', port: int = 0):
+        self.stub = stub or MarketDataStub()
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Serve in a background thread; returns the base URL for BINANCE_API_BASE"""
+        handler = type('StubHandler', (_Handler,), {'stub': self.stub})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='binance-stand-in', daemon=True)
+        self._thread.start()
+        logger.info(f"🛰️ Local Binance stand-in listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        """Shut the server down"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> 'LocalBinanceServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Local Binance-compatible market data stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--recorded', help='Directory with {SYMBOL}_{interval}.json recordings')
+    parser.add_argument('--symbols', type=int, default=0,
+                        help='List N synthetic symbols (SYM0USDT..) on the all-symbol endpoints')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency (0..jitter seconds)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of HTTP 503 responses (0..1)')
+    parser.add_argument('--weight-limit', type=int, default=None, help='Request weight per minute before HTTP 429')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)] or None
+    source: KlineSource = SyntheticKlineSource(seed=args.seed, symbols=symbols)
+    if args.recorded:
+        source = RecordedKlineSource(args.recorded, fallback=source)
+    faults = FaultProfile(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          weight_limit=args.weight_limit, seed=args.seed)
+
+    server = LocalBinanceServer(MarketDataStub(source, faults), host=args.host, port=args.port)
+    base_url = server.start()
+    print(f"✅ Serving Binance stand-in - run the bot with BINANCE_API_BASE={base_url}")
+    try:
+        while True:
+            time.sleep(60)
+            logger.info(f"📊 {server.stub.stats}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
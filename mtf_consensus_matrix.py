@@ -0,0 +1,228 @@
+"""
+MTF Consensus Matrix - Per-symbol timeframe bias rows, updated on candle close
+
+Multi-timeframe consensus used to re-run the per-timeframe bias analysis
+for all 10-13 timeframes on every signal, /market report and reanalysis.
+The bias of a timeframe only changes when it closes a new candle, so this
+matrix keeps one row per (symbol, analysis, timeframe) and recomputes a row
+only when that timeframe's last closed candle has moved. The consensus
+itself (a cheap aggregation over the rows) is still derived per request.
+
+Two analyses share the matrix, distinguished by namespace:
+- 'ict'     - ICTSignalEngine._calculate_pure_ict_bias_for_tf rows
+- 'luxalgo' - luxalgo_ict_analysis.analyze_all_timeframes rows
+
+Author: galinborisov10-art
+Date: 2026-02-02
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from utils.candle_time import last_closed_candle_key, next_close_after, utc_now_naive
+
+logger = logging.getLogger(__name__)
+
+# (candle key, row value, time the next candle closes or None)
+_Row = Tuple[Hashable, Any, Optional[datetime]]
+
+
+class MTFConsensusMatrix:
+    """
+    Per-symbol matrix of timeframe rows keyed on the last closed candle.
+
+    Features:
+    - Row recomputed only when its timeframe closes a new candle
+    - Rows can be served without fetching data until the next close
+    - LRU eviction of whole symbols beyond max_symbols
+    - Thread-safe; computation runs outside the lock
+    """
+
+    def __init__(self, max_symbols: int = 500):
+        """
+        Initialize the matrix.
+
+        Args:
+            max_symbols: Maximum number of symbols kept
+        """
+        self.max_symbols = max_symbols
+        self._symbols: OrderedDict[str, Dict[Tuple[str, str], _Row]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _store(self, symbol: str, row_key: Tuple[str, str], row: _Row):
+        with self._lock:
+            rows = self._symbols.setdefault(symbol, {})
+            rows[row_key] = row
+            self._symbols.move_to_end(symbol)
+            while len(self._symbols) > self.max_symbols:
+                self._symbols.popitem(last=False)
+
+    def get_row(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        compute: Callable[[pd.DataFrame], Any],
+        namespace: str = 'ict',
+        now: Optional[datetime] = None
+    ) -> Any:
+        """
+        Get a timeframe row, recomputing it only on a newly closed candle
+
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe of df
+            df: OHLCV DataFrame for the timeframe
+            compute: Callback computing the row value from df
+            namespace: Analysis the row belongs to
+            now: Reference time, naive UTC (default: current UTC time)
+
+        Returns:
+            Row value (cached or freshly computed)
+        """
+        row_key = (namespace, timeframe)
+        candle_key = last_closed_candle_key(df, timeframe, now)
+
+        if candle_key is not None:
+            with self._lock:
+                rows = self._symbols.get(symbol)
+                row = rows.get(row_key) if rows else None
+                if row is not None and row[0] == candle_key:
+                    self._symbols.move_to_end(symbol)
+                    self._hits += 1
+                    return row[1]
+                self._misses += 1
+
+        value = compute(df)
+
+        if candle_key is not None:
+            valid_until = None
+            if isinstance(candle_key, tuple) and isinstance(candle_key[0], pd.Timestamp):
+                valid_until = next_close_after(candle_key[0].to_pydatetime(), timeframe)
+            self._store(symbol, row_key, (candle_key, value, valid_until))
+
+        return value
+
+    def get_fresh_row(
+        self,
+        symbol: str,
+        timeframe: str,
+        namespace: str = 'ict',
+        now: Optional[datetime] = None
+    ) -> Optional[Any]:
+        """
+        Get a row that is known to be current without looking at new data
+
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe
+            namespace: Analysis the row belongs to
+            now: Reference time, naive UTC (default: current UTC time)
+
+        Returns:
+            Row value, or None if missing or a newer candle may have closed
+        """
+        now = now or utc_now_naive()
+        with self._lock:
+            rows = self._symbols.get(symbol)
+            row = rows.get((namespace, timeframe)) if rows else None
+            if row is None or row[2] is None or now >= row[2]:
+                self._misses += 1
+                return None
+            self._symbols.move_to_end(symbol)
+            self._hits += 1
+            return row[1]
+
+    def put_row(
+        self,
+        symbol: str,
+        timeframe: str,
+        value: Any,
+        candle_open: datetime,
+        namespace: str = 'ict'
+    ):
+        """
+        Store a row computed outside get_row (e.g. from raw klines)
+
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe
+            value: Row value
+            candle_open: Open time of the last closed candle the row is based on
+            namespace: Analysis the row belongs to
+        """
+        valid_until = next_close_after(candle_open, timeframe)
+        self._store(symbol, (namespace, timeframe), (candle_open, value, valid_until))
+
+    def get_matrix(self, symbol: str, namespace: str = 'ict') -> Dict[str, Any]:
+        """
+        Get all cached rows of a symbol for one analysis
+
+        Returns:
+            {timeframe: row value}
+        """
+        with self._lock:
+            rows = self._symbols.get(symbol) or {}
+            return {tf: row[1] for (ns, tf), row in rows.items() if ns == namespace}
+
+    def invalidate(self, symbol: Optional[str] = None) -> int:
+        """
+        Drop cached rows
+
+        Args:
+            symbol: Only drop this symbol (None = drop all)
+
+        Returns:
+            Number of symbols removed
+        """
+        with self._lock:
+            if symbol is None:
+                removed = len(self._symbols)
+                self._symbols.clear()
+                return removed
+            return 1 if self._symbols.pop(symbol, None) is not None else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get matrix statistics"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'symbols': len(self._symbols),
+                'rows': sum(len(rows) for rows in self._symbols.values()),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / total * 100, 2) if total else 0.0,
+            }
+
+
+# Global consensus matrix instance
+_mtf_consensus_matrix_instance: Optional[MTFConsensusMatrix] = None
+
+
+def get_mtf_consensus_matrix() -> MTFConsensusMatrix:
+    """
+    Get or create the global MTF consensus matrix (singleton).
+
+    Returns:
+        MTFConsensusMatrix instance
+    """
+    global _mtf_consensus_matrix_instance
+
+    if _mtf_consensus_matrix_instance is None:
+        _mtf_consensus_matrix_instance = MTFConsensusMatrix()
+        logger.info("Created global MTF consensus matrix instance")
+
+    return _mtf_consensus_matrix_instance
+
+
+def reset_mtf_consensus_matrix() -> None:
+    """Reset global MTF consensus matrix instance (for testing)."""
+    global _mtf_consensus_matrix_instance
+    _mtf_consensus_matrix_instance = None
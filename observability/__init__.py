@@ -6,11 +6,15 @@ Zero behavioral impact on FSM, invariants, or audit logic.
 """
 
 from .metrics import MetricsCollector
+from .histogram import StreamingHistogram
+from .exporter import MetricsExporter
 from .structured_logger import StructuredLogger
 from .hooks import ObservabilityHooks
 
 __all__ = [
     'MetricsCollector',
+    'StreamingHistogram',
+    'MetricsExporter',
     'StructuredLogger',
     'ObservabilityHooks',
 ]
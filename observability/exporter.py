@@ -0,0 +1,114 @@
+"""
+observability/exporter.py
+
+ESB v1.0 §3.5 - Local text exposition endpoint for MetricsCollector.
+Serves Prometheus-format metrics on a local port from a daemon thread.
+Read-only: scraping never mutates collector state.
+"""
+
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from .metrics import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsExporter:
+    """
+    ESB v1.0 §3.5 - HTTP exporter for a MetricsCollector.
+
+    GET /metrics returns the collector's text exposition. Binds to
+    127.0.0.1 by default so metrics are only reachable by a local scraper.
+    """
+
+    def __init__(
+        self,
+        metrics: MetricsCollector,
+        host: str = '127.0.0.1',
+        port: int = 9108,
+        prefix: str = 'signal_bot_'
+    ):
+        """
+        Initialize exporter (does not start serving).
+
+        Args:
+            metrics: Collector to expose
+            host: Bind address
+            port: Bind port (0 picks a free port)
+            prefix: Metric name prefix
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _make_handler(self):
+        exporter = self
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                try:
+                    body = exporter.metrics.render_prometheus(exporter.prefix).encode('utf-8')
+                except Exception as e:
+                    logger.warning(f"Metrics render failed: {e}")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes are frequent - keep them out of the bot log
+                pass
+
+        return _MetricsHandler
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the HTTP server is currently serving."""
+        return self._server is not None
+
+    def start(self) -> int:
+        """
+        Start serving in a daemon thread.
+
+        Returns:
+            The bound port
+        """
+        if self._server is not None:
+            return self.port
+
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name='metrics-exporter',
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"📈 Metrics exporter listening on http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,131 @@
+"""
+observability/histogram.py
+
+ESB v1.0 §3.5 - Fixed-memory streaming histogram for latency metrics.
+Log-bucketed (DDSketch-style) so quantiles carry a bounded relative error
+and memory does not grow with the number of recorded samples.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+
+class StreamingHistogram:
+    """
+    ESB v1.0 §3.5 - Log-bucketed streaming histogram.
+
+    Values are mapped to geometrically growing buckets. Any quantile is
+    reported within ``relative_accuracy`` of the true sample value, and the
+    bucket array is allocated once, so memory stays constant no matter how
+    long the collector runs.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        min_value: float = 1e-3,
+        max_value: float = 1e7
+    ):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            relative_accuracy: Maximum relative error of reported quantiles
+            min_value: Smallest distinguishable value (smaller values are clamped)
+            max_value: Largest distinguishable value (larger values are clamped)
+        """
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._offset = math.floor(math.log(min_value) / self._log_gamma)
+        top = math.ceil(math.log(max_value) / self._log_gamma)
+        self._counts: List[int] = [0] * (top - self._offset + 1)
+
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _bucket_index(self, value: float) -> int:
+        """Map a value to its bucket index (clamped to the allocated range)."""
+        if value <= 0:
+            return 0
+        index = math.ceil(math.log(value) / self._log_gamma) - self._offset
+        return min(max(index, 0), len(self._counts) - 1)
+
+    def _bucket_value(self, index: int) -> float:
+        """Representative value of a bucket (minimises relative error)."""
+        upper = self._gamma ** (index + self._offset)
+        return 2 * upper / (self._gamma + 1)
+
+    def record(self, value: float) -> None:
+        """
+        Record one sample.
+
+        Args:
+            value: Sample value (e.g. latency in milliseconds)
+        """
+        self._counts[self._bucket_index(value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: 'StreamingHistogram') -> None:
+        """
+        Add another histogram's samples into this one.
+
+        Args:
+            other: Histogram created with the same accuracy and range
+        """
+        if len(other._counts) != len(self._counts) or other._offset != self._offset:
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for index, bucket_count in enumerate(other._counts):
+            if bucket_count:
+                self._counts[index] += bucket_count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q-quantile of recorded samples.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value, or None if no samples were recorded
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen > rank:
+                value = self._bucket_value(index)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        """
+        Get count, sum and standard percentiles.
+
+        Returns:
+            Dict with count, sum, min, max, p50, p95, p99
+        """
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
@@ -5,8 +5,33 @@ ESB v1.0 §3.5 - Metrics emission for signal lifecycle events.
 Passive, read-only observability with zero behavioral impact.
 """
 
-from typing import Dict, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 from signal_state_machine import SignalState
+from .histogram import StreamingHistogram
+
+# (metric name, sorted label pairs) - identity of one labeled series
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# Quantiles reported for every histogram series
+EXPORTED_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _series_key(name: str, labels: Optional[Dict[str, str]]) -> SeriesKey:
+    """Build a hashable series key from a metric name and label dict."""
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(pairs: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render label pairs in Prometheus text exposition syntax."""
+    items = list(pairs) + ([extra] if extra else [])
+    if not items:
+        return ''
+    rendered = ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in items
+    )
+    return '{' + rendered + '}'
 
 
 class MetricsCollector:
@@ -15,10 +40,21 @@ class MetricsCollector:
     
     Emits counters, gauges, and histograms for signal lifecycle events.
     Does NOT influence any business logic or state transitions.
+    
+    Histograms are fixed-memory streaming sketches, so the collector can
+    stay enabled indefinitely without accumulating raw samples.
     """
     
-    def __init__(self):
-        """Initialize in-memory metrics storage."""
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Initialize in-memory metrics storage.
+        
+        Args:
+            relative_accuracy: Relative error bound for histogram quantiles
+        """
+        self._lock = threading.Lock()
+        self._relative_accuracy = relative_accuracy
+        
         # Counters
         self._signals_created_total = 0
         self._signals_rejected_total = 0
@@ -30,9 +66,9 @@ class MetricsCollector:
             state: 0 for state in SignalState
         }
         
-        # Histograms (store samples for later aggregation)
-        self._state_transition_latency_samples = []
-        self._dispatch_to_ack_latency_samples = []
+        # Labeled counters and streaming histograms
+        self._labeled_counters: Dict[SeriesKey, float] = {}
+        self._histograms: Dict[SeriesKey, StreamingHistogram] = {}
     
     def increment_signals_created(self) -> None:
         """Increment signals_created_total counter."""
@@ -82,11 +118,11 @@ class MetricsCollector:
             to_state: Target state
             latency_ms: Transition latency in milliseconds
         """
-        self._state_transition_latency_samples.append({
-            'from': from_state.value,
-            'to': to_state.value,
-            'latency_ms': latency_ms
-        })
+        self.observe(
+            'state_transition_latency_ms',
+            latency_ms,
+            {'from': from_state.value, 'to': to_state.value}
+        )
     
     def record_dispatch_to_ack_latency(self, latency_ms: float) -> None:
         """
@@ -95,7 +131,78 @@ class MetricsCollector:
         Args:
             latency_ms: Latency in milliseconds
         """
-        self._dispatch_to_ack_latency_samples.append(latency_ms)
+        self.observe('dispatch_to_ack_latency_ms', latency_ms)
+    
+    def increment_counter(
+        self,
+        name: str,
+        labels: Optional[Dict[str, str]] = None,
+        amount: float = 1
+    ) -> None:
+        """
+        Increment a labeled counter.
+        
+        Args:
+            name: Counter name (e.g. 'signals_sent_total')
+            labels: Optional label values (e.g. {'timeframe': '4h'})
+            amount: Increment amount
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            self._labeled_counters[key] = self._labeled_counters.get(key, 0) + amount
+    
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Record a sample in a labeled streaming histogram.
+        
+        Args:
+            name: Histogram name (e.g. 'dispatch_to_ack_latency_ms')
+            value: Sample value
+            labels: Optional label values
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = StreamingHistogram(self._relative_accuracy)
+                self._histograms[key] = histogram
+            histogram.record(value)
+    
+    def get_histogram_summary(
+        self,
+        name: str,
+        labels: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict]:
+        """
+        Get count/sum/p50/p95/p99 for one histogram series.
+        
+        Returns:
+            Summary dict, or None if the series has no samples
+        """
+        with self._lock:
+            histogram = self._histograms.get(_series_key(name, labels))
+            return histogram.summary() if histogram else None
+    
+    def _histogram_count(self, name: str) -> int:
+        """Total samples across all label sets of a histogram."""
+        return sum(h.count for (n, _), h in self._histograms.items() if n == name)
+    
+    def _merged_summary(self, name: str) -> Dict:
+        """Percentiles across all label sets of a histogram."""
+        merged = None
+        for (n, _), histogram in self._histograms.items():
+            if n != name:
+                continue
+            if merged is None:
+                merged = StreamingHistogram(self._relative_accuracy)
+            merged.merge(histogram)
+        summary = merged.summary() if merged else StreamingHistogram().summary()
+        return {k: summary[k] for k in ('p50', 'p95', 'p99')}
     
     def get_metrics_snapshot(self) -> Dict:
         """
@@ -107,6 +214,18 @@ class MetricsCollector:
         Returns:
             Dict with current metric values
         """
+        with self._lock:
+            state_transition_count = self._histogram_count('state_transition_latency_ms')
+            dispatch_count = self._histogram_count('dispatch_to_ack_latency_ms')
+            percentiles = {
+                'state_transition_latency_ms': self._merged_summary('state_transition_latency_ms'),
+                'dispatch_to_ack_latency_ms': self._merged_summary('dispatch_to_ack_latency_ms'),
+            }
+            labeled_counters = {
+                name + _format_labels(pairs): value
+                for (name, pairs), value in self._labeled_counters.items()
+            }
+        
         return {
             'counters': {
                 'signals_created_total': self._signals_created_total,
@@ -118,8 +237,61 @@ class MetricsCollector:
                 f'signals_in_state_{state.value}': count
                 for state, count in self._signals_in_state.items()
             },
+            'labeled_counters': labeled_counters,
             'histograms': {
-                'state_transition_latency_samples': len(self._state_transition_latency_samples),
-                'dispatch_to_ack_latency_samples': len(self._dispatch_to_ack_latency_samples),
-            }
+                'state_transition_latency_samples': state_transition_count,
+                'dispatch_to_ack_latency_samples': dispatch_count,
+            },
+            'percentiles': percentiles,
         }
+    
+    def render_prometheus(self, prefix: str = 'signal_bot_') -> str:
+        """
+        Render all metrics in Prometheus text exposition format.
+        
+        Histograms are exported as summaries (quantiles, _sum, _count).
+        
+        Args:
+            prefix: Metric name prefix
+            
+        Returns:
+            Exposition text (version 0.0.4)
+        """
+        lines: List[str] = []
+        
+        fixed_counters = {
+            'signals_created_total': self._signals_created_total,
+            'signals_rejected_total': self._signals_rejected_total,
+            'signals_expired_total': self._signals_expired_total,
+            'signals_cancelled_total': self._signals_cancelled_total,
+        }
+        for name, value in fixed_counters.items():
+            lines.append(f'# TYPE {prefix}{name} counter')
+            lines.append(f'{prefix}{name} {value}')
+        
+        lines.append(f'# TYPE {prefix}signals_in_state gauge')
+        for state, count in self._signals_in_state.items():
+            lines.append(f'{prefix}signals_in_state{_format_labels((("state", state.value),))} {count}')
+        
+        with self._lock:
+            counters = sorted(self._labeled_counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            
+            typed = set()
+            for (name, pairs), value in counters:
+                if name not in typed:
+                    lines.append(f'# TYPE {prefix}{name} counter')
+                    typed.add(name)
+                lines.append(f'{prefix}{name}{_format_labels(pairs)} {value}')
+            
+            for (name, pairs), histogram in histograms:
+                if name not in typed:
+                    lines.append(f'# TYPE {prefix}{name} summary')
+                    typed.add(name)
+                for q in EXPORTED_QUANTILES:
+                    value = histogram.quantile(q)
+                    lines.append(f'{prefix}{name}{_format_labels(pairs, ("quantile", str(q)))} {value}')
+                lines.append(f'{prefix}{name}_sum{_format_labels(pairs)} {histogram.sum}')
+                lines.append(f'{prefix}{name}_count{_format_labels(pairs)} {histogram.count}')
+        
+        return '\n'.join(lines) + '\n'
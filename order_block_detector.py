@@ -23,6 +23,8 @@ from datetime import datetime
 from enum import Enum
 import logging
 
+from candle_frame import candle_features
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -207,7 +209,8 @@ class OrderBlockDetector:
         return valid_obs
     
     def _prepare_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Prepare dataframe with required indicators"""
+        """Prepare dataframe with required indicators (shared with the other detectors)"""
+        features = candle_features(df)
         df = df.copy()
         
         # Ensure datetime index
@@ -217,23 +220,23 @@ class OrderBlockDetector:
         
         # Calculate volume metrics
         if 'volume' in df.columns:
-            df['volume_ma'] = df['volume'].rolling(window=20).mean()
-            df['volume_ratio'] = df['volume'] / df['volume_ma'].replace(0, 1)
+            df['volume_ma'] = features.volume_mean(20)
+            df['volume_ratio'] = features.volume_ratio(20)
         else:
             df['volume'] = 0
             df['volume_ma'] = 0
             df['volume_ratio'] = 1.0
         
         # Calculate candle characteristics
-        df['body'] = abs(df['close'] - df['open'])
-        df['range'] = df['high'] - df['low']
-        df['body_ratio'] = df['body'] / df['range'].replace(0, 1)
-        df['upper_wick'] = df['high'] - df[['open', 'close']].max(axis=1)
-        df['lower_wick'] = df[['open', 'close']].min(axis=1) - df['low']
-        df['wick_ratio'] = (df['upper_wick'] + df['lower_wick']) / df['range'].replace(0, 1)
+        df['body'] = features.body()
+        df['range'] = features.range()
+        df['body_ratio'] = features.body_ratio()
+        df['upper_wick'] = features.upper_wick()
+        df['lower_wick'] = features.lower_wick()
+        df['wick_ratio'] = features.wick_ratio()
         
         # Calculate price change
-        df['price_change'] = df['close'].pct_change() * 100
+        df['price_change'] = features.price_change()
         
         return df
     
@@ -0,0 +1,267 @@
+"""
+📊 Portfolio State Engine
+Running O(1) risk aggregates for RiskManager and the ICT signal engine
+
+Keeps open risk per symbol and per direction, today's realized P/L and the
+concurrent trade count in memory. Totals are updated incrementally on
+position open / partial close / close events (emitted by PositionManager)
+and rebuilt once from positions.db at startup, so risk checks no longer
+re-read the whole trading journal.
+
+Units:
+    Open risk is expressed in % of account: every position risks
+    risk_per_position_pct scaled by its remaining size (1.0 = full).
+    Realized P/L is the sum of profit_loss_percent of positions closed today.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RISK_PER_POSITION_PCT = 1.0  # Matches ICTSignalEngine._get_signal_risk default
+
+_DIRECTION_ALIASES = {
+    'BUY': 'BUY', 'STRONG_BUY': 'BUY', 'LONG': 'BUY', 'BULLISH': 'BUY',
+    'SELL': 'SELL', 'STRONG_SELL': 'SELL', 'SHORT': 'SELL', 'BEARISH': 'SELL',
+}
+
+
+def normalize_direction(direction) -> str:
+    """Map signal types / enum values to 'BUY' or 'SELL' (others pass through upper-cased)"""
+    value = getattr(direction, 'value', direction)
+    value = str(value).upper()
+    return _DIRECTION_ALIASES.get(value, value)
+
+
+def _utc_today() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+class PortfolioState:
+    """
+    In-memory portfolio aggregates, updated by position events
+
+    Args:
+        risk_per_position_pct: Account risk (%) of a full-size open position
+    """
+
+    def __init__(self, risk_per_position_pct: float = DEFAULT_RISK_PER_POSITION_PCT):
+        self.risk_per_position_pct = risk_per_position_pct
+        self._lock = threading.Lock()
+        self._positions: Dict[int, Dict] = {}
+        self._symbol_risk: Dict[str, float] = {}
+        self._direction_risk: Dict[str, float] = {}
+        self._total_risk = 0.0
+        self._day = _utc_today()
+        self._realized_pnl = 0.0
+        self._closed_today = 0
+        self.loaded = False
+
+    # ------------------------------------------------------------------
+    # Internal bookkeeping (callers hold the lock)
+    # ------------------------------------------------------------------
+
+    def _add_risk(self, symbol: str, direction: str, risk: float):
+        self._total_risk += risk
+        self._symbol_risk[symbol] = self._symbol_risk.get(symbol, 0.0) + risk
+        self._direction_risk[direction] = self._direction_risk.get(direction, 0.0) + risk
+
+        # Drop float dust left over when the last position of a bucket closes
+        for bucket, key in ((self._symbol_risk, symbol), (self._direction_risk, direction)):
+            if abs(bucket[key]) < 1e-9:
+                del bucket[key]
+        if not self._positions:
+            self._total_risk = 0.0
+
+    def _roll_day(self, day: Optional[str] = None):
+        day = day or _utc_today()
+        if day != self._day:
+            self._day = day
+            self._realized_pnl = 0.0
+            self._closed_today = 0
+
+    def _open(self, position_id: int, symbol: str, direction: str, size: float):
+        if position_id in self._positions:
+            self._close(position_id)
+        risk = self.risk_per_position_pct * size
+        self._positions[position_id] = {
+            'symbol': symbol,
+            'direction': direction,
+            'size': size,
+            'risk': risk,
+        }
+        self._add_risk(symbol, direction, risk)
+
+    def _close(self, position_id: int) -> Optional[Dict]:
+        position = self._positions.pop(position_id, None)
+        if position is not None:
+            self._add_risk(position['symbol'], position['direction'], -position['risk'])
+        return position
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def on_position_open(self, position_id: int, symbol: str, direction, size: float = 1.0):
+        """
+        Register a newly opened position
+
+        Args:
+            position_id: Position database ID
+            symbol: Trading pair (e.g., 'BTCUSDT')
+            direction: 'BUY' / 'SELL' (SignalType enums accepted)
+            size: Remaining position size (1.0 = full)
+        """
+        with self._lock:
+            self._open(position_id, symbol, normalize_direction(direction), float(size))
+
+    def on_partial_close(self, position_id: int, new_size: float):
+        """Shrink an open position to its remaining size"""
+        with self._lock:
+            position = self._positions.get(position_id)
+            if position is None:
+                return
+            self._open(position_id, position['symbol'], position['direction'], float(new_size))
+
+    def on_position_close(self, position_id: int, pnl_pct: float, closed_at: Optional[datetime] = None):
+        """
+        Remove a position from open risk and book its realized P/L
+
+        Args:
+            position_id: Position database ID
+            pnl_pct: Realized P/L (%), as returned by PositionManager.close_position
+            closed_at: Close time (defaults to now); closes on earlier days only leave open risk
+        """
+        with self._lock:
+            self._close(position_id)
+            self._roll_day()
+            if closed_at is not None and closed_at.tzinfo is not None:
+                closed_at = closed_at.astimezone(timezone.utc)
+            if closed_at is None or closed_at.strftime('%Y-%m-%d') == self._day:
+                self._realized_pnl += float(pnl_pct)
+                self._closed_today += 1
+
+    # ------------------------------------------------------------------
+    # Startup rebuild
+    # ------------------------------------------------------------------
+
+    def rebuild_from_db(self, db_path: str) -> bool:
+        """
+        Rebuild all aggregates from positions.db (open_positions + today's history)
+
+        Args:
+            db_path: Path to the positions SQLite database
+
+        Returns:
+            True if the state was rebuilt
+        """
+        try:
+            conn = sqlite3.connect(db_path)
+            try:
+                open_rows = conn.execute("""
+                    SELECT id, symbol, signal_type, current_size
+                    FROM open_positions
+                    WHERE status IN ('OPEN', 'PARTIAL')
+                """).fetchall()
+                today = _utc_today()
+                realized, closed = conn.execute("""
+                    SELECT COALESCE(SUM(profit_loss_percent), 0), COUNT(*)
+                    FROM position_history
+                    WHERE date(closed_at) = ?
+                """, (today,)).fetchone()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"❌ Portfolio state rebuild error: {e}")
+            return False
+
+        with self._lock:
+            self._positions.clear()
+            self._symbol_risk.clear()
+            self._direction_risk.clear()
+            self._total_risk = 0.0
+            for position_id, symbol, signal_type, size in open_rows:
+                self._open(position_id, symbol, normalize_direction(signal_type),
+                           1.0 if size is None else float(size))
+            self._day = today
+            self._realized_pnl = float(realized or 0.0)
+            self._closed_today = int(closed or 0)
+            self.loaded = True
+
+        logger.info(
+            f"✅ Portfolio state rebuilt: {len(open_rows)} open, "
+            f"risk={self._total_risk:.2f}%, today P/L={self._realized_pnl:+.2f}%"
+        )
+        return True
+
+    # ------------------------------------------------------------------
+    # O(1) queries
+    # ------------------------------------------------------------------
+
+    @property
+    def open_count(self) -> int:
+        return len(self._positions)
+
+    def total_open_risk(self) -> float:
+        """Total open risk across all positions (%)"""
+        return self._total_risk
+
+    def symbol_exposure(self, symbol: str) -> float:
+        """Open risk on a single symbol (%)"""
+        return self._symbol_risk.get(symbol, 0.0)
+
+    def direction_exposure(self, direction) -> float:
+        """Open risk in one direction (%)"""
+        return self._direction_risk.get(normalize_direction(direction), 0.0)
+
+    def daily_pnl(self) -> float:
+        """Realized P/L of positions closed today (%)"""
+        with self._lock:
+            self._roll_day()
+            return self._realized_pnl
+
+    def closed_today(self) -> int:
+        """Number of positions closed today"""
+        with self._lock:
+            self._roll_day()
+            return self._closed_today
+
+    def daily_loss(self) -> float:
+        """Today's realized loss as a positive % (0.0 when flat or in profit)"""
+        return max(0.0, -self.daily_pnl())
+
+    def get_stats(self) -> Dict:
+        """Snapshot of all aggregates"""
+        with self._lock:
+            self._roll_day()
+            return {
+                'loaded': self.loaded,
+                'open_count': len(self._positions),
+                'total_open_risk': self._total_risk,
+                'symbol_exposure': dict(self._symbol_risk),
+                'direction_exposure': dict(self._direction_risk),
+                'daily_pnl': self._realized_pnl,
+                'closed_today': self._closed_today,
+            }
+
+
+# Global instance
+_portfolio_state: Optional[PortfolioState] = None
+
+
+def get_portfolio_state() -> PortfolioState:
+    """Get or create the global portfolio state (singleton)"""
+    global _portfolio_state
+    if _portfolio_state is None:
+        _portfolio_state = PortfolioState()
+    return _portfolio_state
+
+
+def reset_portfolio_state() -> None:
+    """Reset global portfolio state instance (for testing)"""
+    global _portfolio_state
+    _portfolio_state = None
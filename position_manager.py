@@ -41,6 +41,12 @@ else:
 
 DB_PATH = os.path.join(BASE_PATH, 'positions.db')
 
+try:
+    from portfolio_state import get_portfolio_state
+    PORTFOLIO_STATE_AVAILABLE = True
+except ImportError:
+    PORTFOLIO_STATE_AVAILABLE = False
+
 
 class PositionManager:
     """
@@ -57,16 +63,25 @@ class PositionManager:
         - partial_close() - Partial position close
         - get_position_history() - Recent closed positions
         - get_position_stats() - Aggregate statistics
+        - get_journal_watermark() - Last journal sequence synced
+        - get_journal_id() - Id of the journal the watermark belongs to
+        - open_journal_positions() - Bulk insert of journal trades (one transaction)
     """
     
-    def __init__(self, db_path: str = DB_PATH):
+    def __init__(self, db_path: str = DB_PATH, portfolio_state: Any = None):
         """
         Initialize Position Manager
         
         Args:
             db_path: Path to SQLite database
+            portfolio_state: PortfolioState notified on open/partial/close
+                (default: the global state when db_path is the shared positions.db)
         """
         self.db_path = db_path
+        if portfolio_state is None and PORTFOLIO_STATE_AVAILABLE and \
+                os.path.abspath(db_path) == os.path.abspath(DB_PATH):
+            portfolio_state = get_portfolio_state()
+        self.portfolio_state = portfolio_state
         self._ensure_database_exists()
         logger.info(f"✅ PositionManager initialized (DB: {self.db_path})")
     
@@ -76,6 +91,16 @@ class PositionManager:
             logger.warning(f"⚠️  Database not found, creating: {self.db_path}")
             from init_positions_db import create_positions_database
             create_positions_database()
+        
+        # Journal sync schema (journal_key + watermark table) on older databases
+        try:
+            from init_positions_db import ensure_journal_sync_schema
+            conn = sqlite3.connect(self.db_path)
+            ensure_journal_sync_schema(conn)
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"❌ Journal sync schema migration error: {e}")
     
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
@@ -166,32 +191,8 @@ class PositionManager:
             conn = self._get_connection()
             cursor = conn.cursor()
             
-            # Extract signal data with defensive parsing
-            signal_type = signal.signal_type.value if hasattr(signal.signal_type, 'value') else str(signal.signal_type)
-            entry_price = signal.entry_price
-            sl_price = signal.sl_price
-            
-            # Extract tp_prices safely - handle both ICTSignal (tp_prices list) and MockSignal
-            tp_prices = []
-            if hasattr(signal, 'tp_prices') and signal.tp_prices:
-                # Modern format: tp_prices as array
-                tp_prices = signal.tp_prices if isinstance(signal.tp_prices, list) else [signal.tp_prices]
-            elif hasattr(signal, 'tp1_price'):
-                # Legacy format: tp1_price, tp2_price, tp3_price as separate attributes
-                if hasattr(signal, 'tp1_price') and signal.tp1_price:
-                    tp_prices.append(signal.tp1_price)
-                if hasattr(signal, 'tp2_price') and signal.tp2_price:
-                    tp_prices.append(signal.tp2_price)
-                if hasattr(signal, 'tp3_price') and signal.tp3_price:
-                    tp_prices.append(signal.tp3_price)
-            
-            # Extract individual TP prices for database
-            tp1_price = tp_prices[0] if len(tp_prices) > 0 else None
-            tp2_price = tp_prices[1] if len(tp_prices) > 1 else None
-            tp3_price = tp_prices[2] if len(tp_prices) > 2 else None
-            
-            # Serialize full signal
-            signal_json = self._serialize_signal(signal)
+            values = self._position_values(signal, symbol, timeframe, source)
+            signal_type, entry_price = values[2], values[3]
             
             # Insert position
             cursor.execute("""
@@ -200,11 +201,7 @@ class PositionManager:
                     entry_price, tp1_price, tp2_price, tp3_price, sl_price,
                     original_signal_json, source, status
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'OPEN')
-            """, (
-                symbol, timeframe, signal_type,
-                entry_price, tp1_price, tp2_price, tp3_price, sl_price,
-                signal_json, source
-            ))
+            """, values)
             
             position_id = cursor.lastrowid
             
@@ -213,12 +210,169 @@ class PositionManager:
             
             logger.info(f"✅ Position opened: ID={position_id}, {symbol} {signal_type} @ ${entry_price:,.2f}")
             
+            if self.portfolio_state is not None:
+                self.portfolio_state.on_position_open(position_id, symbol, signal_type)
+            
             return position_id
             
         except Exception as e:
             logger.error(f"❌ Open position error: {e}")
             return -1
     
+    def _position_values(self, signal: Any, symbol: str, timeframe: str, source: str) -> tuple:
+        """
+        Column values of a new open_positions row
+        
+        Returns:
+            (symbol, timeframe, signal_type, entry_price, tp1_price, tp2_price,
+             tp3_price, sl_price, original_signal_json, source)
+        """
+        # Extract signal data with defensive parsing
+        signal_type = signal.signal_type.value if hasattr(signal.signal_type, 'value') else str(signal.signal_type)
+        entry_price = signal.entry_price
+        sl_price = signal.sl_price
+        
+        # Extract tp_prices safely - handle both ICTSignal (tp_prices list) and MockSignal
+        tp_prices = []
+        if hasattr(signal, 'tp_prices') and signal.tp_prices:
+            # Modern format: tp_prices as array
+            tp_prices = signal.tp_prices if isinstance(signal.tp_prices, list) else [signal.tp_prices]
+        elif hasattr(signal, 'tp1_price'):
+            # Legacy format: tp1_price, tp2_price, tp3_price as separate attributes
+            if hasattr(signal, 'tp1_price') and signal.tp1_price:
+                tp_prices.append(signal.tp1_price)
+            if hasattr(signal, 'tp2_price') and signal.tp2_price:
+                tp_prices.append(signal.tp2_price)
+            if hasattr(signal, 'tp3_price') and signal.tp3_price:
+                tp_prices.append(signal.tp3_price)
+        
+        # Extract individual TP prices for database
+        tp1_price = tp_prices[0] if len(tp_prices) > 0 else None
+        tp2_price = tp_prices[1] if len(tp_prices) > 1 else None
+        tp3_price = tp_prices[2] if len(tp_prices) > 2 else None
+        
+        return (
+            symbol, timeframe, signal_type,
+            entry_price, tp1_price, tp2_price, tp3_price, sl_price,
+            self._serialize_signal(signal), source
+        )
+    
+    def _get_journal_sync_value(self, name: str) -> Optional[int]:
+        """Read one journal_sync_state value (None if never stored)"""
+        try:
+            conn = self._get_connection()
+            row = conn.execute(
+                "SELECT value FROM journal_sync_state WHERE name = ?", (name,)
+            ).fetchone()
+            conn.close()
+            return row['value'] if row else None
+            
+        except Exception as e:
+            logger.error(f"❌ Get journal sync state error ({name}): {e}")
+            return None
+    
+    def get_journal_watermark(self) -> Optional[int]:
+        """
+        Last journal sequence number processed by the journal sync
+        
+        Returns:
+            Sequence number, or None if the journal was never synced
+        """
+        return self._get_journal_sync_value('journal_seq')
+    
+    def get_journal_id(self) -> Optional[int]:
+        """
+        journal_id (metadata) of the journal the watermark belongs to
+        
+        Returns:
+            Journal id, or None if never synced / the journal has no id
+        """
+        return self._get_journal_sync_value('journal_id')
+    
+    def open_journal_positions(self, entries: List[tuple], watermark: int, journal_id: Optional[int] = None,
+                               release_keys: bool = False) -> Dict[str, Any]:
+        """
+        Insert journal trades as positions and advance the watermark in one transaction
+        
+        An entry is skipped when its journal_key was already inserted (UNIQUE
+        index) or when an OPEN/PARTIAL position with the same symbol and
+        timeframe has an entry price within 0.01% (e.g. the AUTO-opened
+        position of the same signal).
+        
+        Args:
+            entries: (journal_key, signal, symbol, timeframe) tuples
+            watermark: Journal sequence number to store after the inserts
+            journal_id: Id of the synced journal (stored with the watermark)
+            release_keys: Rescan of a replaced journal - drop the 'seq:N' keys of
+                journals without an id first so the new entries cannot collide
+            
+        Returns:
+            {'added': [(position_id, journal_key)], 'skipped': int, 'errors': [(journal_key, error)]}
+        """
+        result = {'added': [], 'skipped': 0, 'errors': []}
+        opened = []
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            if release_keys:
+                cursor.execute("UPDATE open_positions SET journal_key = NULL WHERE journal_key LIKE 'seq:%'")
+            for journal_key, signal, symbol, timeframe in entries:
+                try:
+                    values = self._position_values(signal, symbol, timeframe, 'JOURNAL_SYNC')
+                    cursor.execute("""
+                        INSERT INTO open_positions (
+                            symbol, timeframe, signal_type,
+                            entry_price, tp1_price, tp2_price, tp3_price, sl_price,
+                            original_signal_json, source, status, journal_key
+                        )
+                        SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'OPEN', ?
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM open_positions
+                            WHERE symbol = ? AND timeframe = ?
+                              AND status IN ('OPEN', 'PARTIAL')
+                              AND entry_price > 0
+                              AND ABS(entry_price - ?) / entry_price < 0.0001
+                        )
+                        ON CONFLICT(journal_key) DO NOTHING
+                    """, values + (journal_key, symbol, timeframe, values[3]))
+                    
+                    if cursor.rowcount == 1:
+                        result['added'].append((cursor.lastrowid, journal_key))
+                        opened.append((cursor.lastrowid, symbol, values[2]))
+                    else:
+                        result['skipped'] += 1
+                except sqlite3.Error as e:
+                    result['errors'].append((journal_key, str(e)))
+            
+            cursor.execute("""
+                INSERT INTO journal_sync_state (name, value, updated_at)
+                VALUES ('journal_seq', ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """, (watermark,))
+            if journal_id is not None:
+                cursor.execute("""
+                    INSERT INTO journal_sync_state (name, value, updated_at)
+                    VALUES ('journal_id', ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+                """, (journal_id,))
+            else:
+                cursor.execute("DELETE FROM journal_sync_state WHERE name = 'journal_id'")
+            conn.commit()
+            
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        if self.portfolio_state is not None:
+            for position_id, symbol, signal_type in opened:
+                self.portfolio_state.on_position_open(position_id, symbol, signal_type)
+        
+        logger.info(f"✅ Journal positions: {len(result['added'])} added, {result['skipped']} skipped, "
+                    f"{len(result['errors'])} errors (watermark {watermark})")
+        return result
+    
     def get_open_positions(self) -> List[Dict]:
         """
         Get all open positions
@@ -533,6 +687,8 @@ class PositionManager:
             
             # Calculate duration
             opened_at = datetime.fromisoformat(position['opened_at'])
+            if opened_at.tzinfo is None:
+                opened_at = opened_at.replace(tzinfo=timezone.utc)  # SQLite CURRENT_TIMESTAMP is UTC
             closed_at = datetime.now(timezone.utc)
             duration_hours = (closed_at - opened_at).total_seconds() / 3600
             
@@ -588,6 +744,9 @@ class PositionManager:
             
             logger.info(f"✅ Position closed: ID={position_id}, P&L={pl_percent:+.2f}%, outcome={outcome}")
             
+            if self.portfolio_state is not None:
+                self.portfolio_state.on_position_close(position_id, pl_percent, closed_at)
+            
             return pl_percent
             
         except Exception as e:
@@ -646,6 +805,9 @@ class PositionManager:
             
             logger.info(f"✅ Partial close: position={position_id}, closed={close_percent}%, remaining={new_size*100:.0f}%")
             
+            if self.portfolio_state is not None:
+                self.portfolio_state.on_partial_close(position_id, new_size)
+            
             return True
             
         except Exception as e:
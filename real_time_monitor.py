@@ -18,6 +18,13 @@ from typing import Dict, List, Optional, Any
 import requests
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
 
+try:
+    from telegram_dispatcher import get_telegram_dispatcher, PRIORITY_CRITICAL, PRIORITY_ALERT
+    TELEGRAM_DISPATCHER_AVAILABLE = True
+except ImportError:
+    TELEGRAM_DISPATCHER_AVAILABLE = False
+    PRIORITY_CRITICAL, PRIORITY_ALERT = 0, 1
+
 logger = logging.getLogger(__name__)
 
 # Alert stage thresholds
@@ -61,6 +68,24 @@ class RealTimePositionMonitor:
         self.binance_klines_url = binance_klines_url
         self.monitoring = False
         self.monitored_signals: Dict[str, Dict] = {}  # signal_id -> signal_data
+    
+    async def _send_alert(self, signal_id: str, chat_id: int, text: str, priority: int, **kwargs):
+        """
+        Queue an alert on the Telegram dispatcher
+        
+        Alerts for the same position that are still queued are merged into
+        one message; WIN/LOSS use PRIORITY_CRITICAL so they overtake
+        progress alerts and new signals.
+        """
+        if TELEGRAM_DISPATCHER_AVAILABLE:
+            get_telegram_dispatcher().send_message(
+                self.bot, chat_id, text,
+                priority=priority,
+                coalesce_key=f"position:{signal_id}",
+                **kwargs
+            )
+        else:
+            await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
         
     def add_signal(
         self,
@@ -417,9 +442,11 @@ class RealTimePositionMonitor:
                     message += f"   • {warning}\n"
             
             # Send alert
-            await self.bot.send_message(
-                chat_id=signal['user_chat_id'],
-                text=message,
+            await self._send_alert(
+                signal_id,
+                signal['user_chat_id'],
+                message,
+                priority=PRIORITY_ALERT,
                 parse_mode='HTML',
                 disable_notification=False  # WITH SOUND
             )
@@ -462,9 +489,11 @@ class RealTimePositionMonitor:
 ✅ <b>Trade closed successfully at TP!</b>
 """
             
-            await self.bot.send_message(
-                chat_id=signal['user_chat_id'],
-                text=message,
+            await self._send_alert(
+                signal_id,
+                signal['user_chat_id'],
+                message,
+                priority=PRIORITY_CRITICAL,
                 parse_mode='HTML',
                 disable_notification=False  # WITH SOUND
             )
@@ -507,9 +536,11 @@ class RealTimePositionMonitor:
 ⚠️ <b>Trade closed at Stop Loss</b>
 """
             
-            await self.bot.send_message(
-                chat_id=signal['user_chat_id'],
-                text=message,
+            await self._send_alert(
+                signal_id,
+                signal['user_chat_id'],
+                message,
+                priority=PRIORITY_CRITICAL,
                 parse_mode='HTML',
                 disable_notification=False  # WITH SOUND
             )
@@ -594,9 +625,11 @@ class RealTimePositionMonitor:
             # Format and send message
             message = self._format_halfway_message(signal, current_price, progress_pct, recommendation)
             
-            await self.bot.send_message(
-                chat_id=signal['user_chat_id'],
-                text=message,
+            await self._send_alert(
+                signal_id,
+                signal['user_chat_id'],
+                message,
+                priority=PRIORITY_ALERT,
                 parse_mode='HTML',
                 reply_markup=self._get_stage_buttons(signal_id),
                 disable_notification=False
@@ -637,9 +670,11 @@ class RealTimePositionMonitor:
             # Format and send message
             message = self._format_approaching_message(signal, current_price, progress_pct, recommendation)
             
-            await self.bot.send_message(
-                chat_id=signal['user_chat_id'],
-                text=message,
+            await self._send_alert(
+                signal_id,
+                signal['user_chat_id'],
+                message,
+                priority=PRIORITY_ALERT,
                 parse_mode='HTML',
                 reply_markup=self._get_stage_buttons(signal_id),
                 disable_notification=False
@@ -713,9 +748,11 @@ class RealTimePositionMonitor:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
             
-            await self.bot.send_message(
-                chat_id=signal['user_chat_id'],
-                text=message,
+            await self._send_alert(
+                signal_id,
+                signal['user_chat_id'],
+                message,
+                priority=PRIORITY_ALERT,
                 parse_mode='HTML',
                 disable_notification=False
             )
@@ -0,0 +1,256 @@
+"""
+📊 Report Aggregates
+Materialized per-day rollups for the daily / weekly / monthly reports
+
+DailyReportEngine used to reload the whole journal for every report, convert
+every trade with _convert_journal_to_signal_format and parse every timestamp
+to filter one day, week or month. ReportAggregates keeps one bucket per
+calendar day (counts, win/loss, P/L, confidence-range accuracy, per-symbol
+and per-timeframe breakdowns, best/worst trades) and re-syncs against the
+trade list by diffing: only trades whose report fields changed (new trades,
+closed trades) are converted again and only their days are rebuilt. Weekly
+and monthly reports merge 7 or ~30 day buckets.
+
+Signals are in the report "signal format" (see
+DailyReportEngine._convert_journal_to_signal_format): symbol, timeframe,
+type, confidence, timestamp, status (ACTIVE / COMPLETED), result
+(WIN / LOSS / BREAKEVEN), profit_pct, ml_mode.
+"""
+
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+CONFIDENCE_RANGES = ('60-69', '70-79', '80-89', '90-100')
+
+# Journal trade fields read by _convert_journal_to_signal_format
+JOURNAL_FIELDS = ('id', 'symbol', 'timeframe', 'signal', 'confidence', 'timestamp', 'entry_price',
+                  'tp_price', 'sl_price', 'status', 'outcome', 'profit_loss_pct', 'closed_at')
+
+# Fields of signals that are already in report format (bot_stats.json backup source)
+SIGNAL_FIELDS = ('id', 'symbol', 'timeframe', 'type', 'confidence', 'timestamp', 'entry_price',
+                 'tp_price', 'sl_price', 'status', 'result', 'profit_pct', 'exit_timestamp', 'ml_mode')
+
+
+def confidence_range(confidence: float) -> Optional[str]:
+    """Report confidence range of a signal (same bounds as _in_confidence_range)"""
+    if 60 <= confidence < 70:
+        return '60-69'
+    if 70 <= confidence < 80:
+        return '70-79'
+    if 80 <= confidence < 90:
+        return '80-89'
+    if 90 <= confidence <= 100:
+        return '90-100'
+    return None
+
+
+def empty_bucket() -> Dict[str, Any]:
+    return {
+        'total': 0, 'by_type': {}, 'active': 0, 'completed': 0,
+        'wins': 0, 'losses': 0, 'breakeven': 0,
+        'profit_sum': 0.0, 'win_sum': 0.0, 'win_count': 0, 'loss_sum': 0.0, 'loss_count': 0,
+        'confidence_sum': 0.0, 'confidence_accuracy': {},
+        'symbols': {}, 'timeframes': {},
+        'ml_signals': 0, 'ml_completed': 0, 'ml_wins': 0,
+        # (profit, order, signal) - order breaks ties like max()/min() over the trade list
+        'best_profitable': None, 'worst_losing': None, 'best_completed': None, 'worst_completed': None,
+    }
+
+
+def _better(candidate, current, sign: int) -> bool:
+    """True if candidate (profit, order, signal) beats current for max (sign=1) / min (sign=-1)"""
+    if current is None:
+        return True
+    if candidate[0] != current[0]:
+        return (candidate[0] - current[0]) * sign > 0
+    return candidate[1] < current[1]
+
+
+def _add_breakdown(breakdown: Dict, key, completed: bool, win: bool, profit: float):
+    entry = breakdown.get(key)
+    if entry is None:
+        entry = breakdown[key] = {'total': 0, 'completed': 0, 'wins': 0, 'profit': 0}
+    entry['total'] += 1
+    if completed:
+        entry['completed'] += 1
+        entry['wins'] += win
+        entry['profit'] += profit
+
+
+def add_signal(bucket: Dict[str, Any], signal: Dict, order: int):
+    """Add one report-format signal to a bucket"""
+    signal_type = signal.get('type')
+    status = signal.get('status')
+    result = signal.get('result')
+    confidence = signal.get('confidence') or 0
+    completed = status == 'COMPLETED'
+    win = completed and result == 'WIN'
+    profit = (signal.get('profit_pct') or 0) if completed else 0
+
+    bucket['total'] += 1
+    bucket['by_type'][signal_type] = bucket['by_type'].get(signal_type, 0) + 1
+    bucket['confidence_sum'] += confidence
+    if status == 'ACTIVE':
+        bucket['active'] += 1
+
+    if completed:
+        bucket['completed'] += 1
+        bucket['wins'] += win
+        bucket['losses'] += result == 'LOSS'
+        bucket['breakeven'] += result == 'BREAKEVEN'
+        bucket['profit_sum'] += profit
+        ranked = (profit, order, signal)
+        if profit > 0:
+            bucket['win_sum'] += profit
+            bucket['win_count'] += 1
+            if _better(ranked, bucket['best_profitable'], 1):
+                bucket['best_profitable'] = ranked
+        elif profit < 0:
+            bucket['loss_sum'] += profit
+            bucket['loss_count'] += 1
+            if _better(ranked, bucket['worst_losing'], -1):
+                bucket['worst_losing'] = ranked
+        if _better(ranked, bucket['best_completed'], 1):
+            bucket['best_completed'] = ranked
+        if _better(ranked, bucket['worst_completed'], -1):
+            bucket['worst_completed'] = ranked
+
+        range_name = confidence_range(confidence)
+        if range_name is not None:
+            entry = bucket['confidence_accuracy'].setdefault(range_name, {'total': 0, 'wins': 0})
+            entry['total'] += 1
+            entry['wins'] += win
+
+    _add_breakdown(bucket['symbols'], signal.get('symbol'), completed, win, profit)
+    _add_breakdown(bucket['timeframes'], signal.get('timeframe'), completed, win, profit)
+
+    if signal.get('ml_mode'):
+        bucket['ml_signals'] += 1
+        if completed:
+            bucket['ml_completed'] += 1
+            bucket['ml_wins'] += win
+
+
+def merge_buckets(buckets: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine day buckets into one period bucket (inputs are not modified)"""
+    merged = empty_bucket()
+    for bucket in buckets:
+        for key in ('total', 'active', 'completed', 'wins', 'losses', 'breakeven', 'profit_sum',
+                    'win_sum', 'win_count', 'loss_sum', 'loss_count', 'confidence_sum',
+                    'ml_signals', 'ml_completed', 'ml_wins'):
+            merged[key] += bucket[key]
+        for signal_type, count in bucket['by_type'].items():
+            merged['by_type'][signal_type] = merged['by_type'].get(signal_type, 0) + count
+        for range_name, entry in bucket['confidence_accuracy'].items():
+            target = merged['confidence_accuracy'].setdefault(range_name, {'total': 0, 'wins': 0})
+            target['total'] += entry['total']
+            target['wins'] += entry['wins']
+        for field in ('symbols', 'timeframes'):
+            for key, entry in bucket[field].items():
+                target = merged[field].setdefault(key, {'total': 0, 'completed': 0, 'wins': 0, 'profit': 0})
+                for stat in ('total', 'completed', 'wins', 'profit'):
+                    target[stat] += entry[stat]
+        for field, sign in (('best_profitable', 1), ('worst_losing', -1),
+                            ('best_completed', 1), ('worst_completed', -1)):
+            if bucket[field] is not None and _better(bucket[field], merged[field], sign):
+                merged[field] = bucket[field]
+    return merged
+
+
+class ReportAggregates:
+    """
+    Per-day report buckets kept in sync with a trade list
+
+    Args:
+        convert: Maps a source record to report signal format (identity if None)
+        fields: Source fields whose change requires re-converting the record
+    """
+
+    def __init__(self, convert: Optional[Callable[[Dict], Dict]] = None, fields: Sequence[str] = SIGNAL_FIELDS):
+        self.convert = convert or (lambda record: record)
+        self.fields = tuple(fields)
+        self._lock = threading.Lock()
+        self._slots: List[tuple] = []                      # position -> (signature, day_key)
+        self._day_signals: Dict[date, Dict[int, Dict]] = {}  # day -> {position: signal}
+        self._buckets: Dict[date, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @staticmethod
+    def _day_of(signal: Dict) -> Optional[date]:
+        try:
+            return datetime.fromisoformat(signal['timestamp']).date()
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def sync(self, records: Sequence[Dict]) -> int:
+        """
+        Bring the buckets in line with the current record list
+
+        Records are matched by list position; a record is re-converted only
+        when one of self.fields changed, and only the affected days are rebuilt.
+
+        Returns:
+            Number of records that were (re)converted or removed
+        """
+        with self._lock:
+            dirty = set()
+            changed = 0
+            for position, record in enumerate(records):
+                signature = tuple(record.get(field) for field in self.fields)
+                if position < len(self._slots):
+                    old_signature, old_day = self._slots[position]
+                    if old_signature == signature:
+                        continue
+                    if old_day is not None:
+                        self._day_signals[old_day].pop(position, None)
+                        dirty.add(old_day)
+                signal = self.convert(record)
+                day = self._day_of(signal)
+                if day is not None:
+                    self._day_signals.setdefault(day, {})[position] = signal
+                    dirty.add(day)
+                slot = (signature, day)
+                if position < len(self._slots):
+                    self._slots[position] = slot
+                else:
+                    self._slots.append(slot)
+                changed += 1
+
+            for position in range(len(records), len(self._slots)):
+                old_day = self._slots[position][1]
+                if old_day is not None:
+                    self._day_signals[old_day].pop(position, None)
+                    dirty.add(old_day)
+                changed += 1
+            del self._slots[len(records):]
+
+            for day in dirty:
+                self._rebuild_day(day)
+            return changed
+
+    def _rebuild_day(self, day: date):
+        signals = self._day_signals.get(day)
+        if not signals:
+            self._day_signals.pop(day, None)
+            self._buckets.pop(day, None)
+            return
+        bucket = empty_bucket()
+        for position in sorted(signals):
+            add_signal(bucket, signals[position], position)
+        self._buckets[day] = bucket
+
+    def day(self, day: date) -> Dict[str, Any]:
+        """Bucket of one day (empty bucket if no signals)"""
+        with self._lock:
+            return self._buckets.get(day) or empty_bucket()
+
+    def period(self, start: date, end: date) -> Dict[str, Any]:
+        """Merged bucket of start..end (inclusive)"""
+        with self._lock:
+            days = [self._buckets[start + timedelta(days=offset)]
+                    for offset in range((end - start).days + 1)
+                    if start + timedelta(days=offset) in self._buckets]
+        return merge_buckets(days)
@@ -8,46 +8,65 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 
+from config.config_registry import get_config_registry
+
 class RiskManager:
     """Управлява риска и проверява trade safety"""
     
+    DEFAULT_CONFIG = {
+        "max_position_size_pct": 20.0,      # Макс 20% от портфейла в 1 trade
+        "max_daily_loss_pct": 6.0,           # Макс 6% загуба на ден
+        "max_concurrent_trades": 5,          # Макс 5 паралелни trades
+        "min_risk_reward_ratio": 2.0,        # Минимум 1:2 (за $1 риск, $2 печалба)
+        "risk_per_trade_pct": 2.0,           # Риск 2% на trade
+        "portfolio_balance": 1000.0,         # Начален баланс (user set)
+        "stop_trading_on_daily_limit": True  # Спри при дневен лимит
+    }
+    
     def __init__(self, config_file: str = "risk_config.json"):
         self.config_file = config_file
-        self.config = self.load_config()
+        self._config_name = f"risk_config:{os.path.abspath(config_file)}"
+        self.portfolio_state = None
+        self.load_config()
+    
+    def attach_portfolio_state(self, portfolio_state):
+        """
+        Serve daily loss / concurrent trade checks from a PortfolioState
         
-    def load_config(self) -> Dict:
-        """Зарежда risk configuration"""
-        default_config = {
-            "max_position_size_pct": 20.0,      # Макс 20% от портфейла в 1 trade
-            "max_daily_loss_pct": 6.0,           # Макс 6% загуба на ден
-            "max_concurrent_trades": 5,          # Макс 5 паралелни trades
-            "min_risk_reward_ratio": 2.0,        # Минимум 1:2 (за $1 риск, $2 печалба)
-            "risk_per_trade_pct": 2.0,           # Риск 2% на trade
-            "portfolio_balance": 1000.0,         # Начален баланс (user set)
-            "stop_trading_on_daily_limit": True  # Спри при дневен лимит
-        }
+        Once the state has been rebuilt from positions.db the checks read its
+        running totals instead of scanning the trading journal.
+        """
+        self.portfolio_state = portfolio_state
+    
+    def _live_portfolio_state(self):
+        state = self.portfolio_state
+        return state if state is not None and state.loaded else None
+    
+    @property
+    def config(self) -> Dict:
+        """Текуща конфигурация (от паметта, презарежда се при промяна на файла)"""
+        return self.load_config()
         
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
-                    default_config.update(loaded)
-            except:
-                pass
-        else:
-            self.save_config(default_config)
-            
-        return default_config
+    def load_config(self) -> Dict:
+        """Зарежда risk configuration (парсва се веднъж, после от паметта)"""
+        registry = get_config_registry()
+        registry.register(self._config_name, self.config_file, self.DEFAULT_CONFIG, create_if_missing=True)
+        return registry.get(self._config_name)
     
     def save_config(self, config: Dict):
         """Запазва configuration"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        self.load_config()
+        get_config_registry().write(self._config_name, config)
+    
+    def update_setting(self, key: str, value):
+        """Обновява една настройка (копие на snapshot-а, не in-place)"""
+        config = dict(self.config)
+        config[key] = value
+        self.save_config(config)
     
     def update_portfolio_balance(self, new_balance: float):
         """Обновява portfolio баланса"""
-        self.config['portfolio_balance'] = new_balance
-        self.save_config(self.config)
+        self.update_setting('portfolio_balance', new_balance)
     
     def calculate_position_size(self, entry_price: float, stop_loss_price: float) -> Tuple[float, str]:
         """
@@ -112,6 +131,12 @@ class RiskManager:
         Returns:
             (can_trade, daily_loss_pct, message)
         """
+        state = self._live_portfolio_state()
+        if state is not None:
+            if state.closed_today() == 0:
+                return True, 0.0, "✅ No closed trades today"
+            return self._daily_loss_verdict(state.daily_pnl())
+        
         if not os.path.exists(journal_file):
             return True, 0.0, "✅ No trades today"
         
@@ -131,7 +156,9 @@ class RiskManager:
         
         # Изчисли дневна загуба
         total_profit_loss = sum(t.get('profit_loss_pct', 0) for t in today_trades)
-        
+        return self._daily_loss_verdict(total_profit_loss)
+    
+    def _daily_loss_verdict(self, total_profit_loss: float) -> Tuple[bool, float, str]:
         max_daily_loss = self.config['max_daily_loss_pct']
         
         if abs(total_profit_loss) >= max_daily_loss and total_profit_loss < 0:
@@ -146,6 +173,10 @@ class RiskManager:
         Returns:
             (can_open, active_count, message)
         """
+        state = self._live_portfolio_state()
+        if state is not None:
+            return self._concurrent_verdict(state.open_count)
+        
         if not os.path.exists(journal_file):
             return True, 0, "✅ No active trades"
         
@@ -157,8 +188,9 @@ class RiskManager:
         
         # Брой PENDING trades
         active = [t for t in journal if t.get('status') == 'PENDING']
-        active_count = len(active)
-        
+        return self._concurrent_verdict(len(active))
+    
+    def _concurrent_verdict(self, active_count: int) -> Tuple[bool, int, str]:
         max_concurrent = self.config['max_concurrent_trades']
         
         if active_count >= max_concurrent:
@@ -3,13 +3,21 @@ Security Package
 Comprehensive security features for the Crypto Signal Bot
 """
 
-from .rate_limiter import RateLimiter, check_rate_limit, rate_limiter
+from .rate_limiter import (
+    RateLimiter,
+    InMemoryRateLimitBackend,
+    SQLiteRateLimitBackend,
+    check_rate_limit,
+    rate_limiter,
+)
 from .auth import AuthManager, require_auth, require_admin, auth_manager
 from .token_manager import SecureTokenManager, get_secure_token, token_manager
 from .security_monitor import SecurityMonitor, log_security_event, security_monitor
 
 __all__ = [
     'RateLimiter',
+    'InMemoryRateLimitBackend',
+    'SQLiteRateLimitBackend',
     'check_rate_limit',
     'rate_limiter',
     'AuthManager',
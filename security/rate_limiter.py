@@ -1,15 +1,364 @@
 """
 Rate Limiter Module
 Implements rate limiting to prevent spam and DDoS attacks
+
+Request counting uses sliding-window counters: each window keeps only the
+count of the current and the previous fixed slot, so every check is O(1)
+and memory per user is constant. Idle users are evicted LRU-style.
+Counter, violation and ban state lives in a backend - in-process by
+default, or a shared SQLite file so several bot processes enforce one
+limit and one ban list.
 """
 
+import os
 import time
+import sqlite3
 import logging
-from collections import defaultdict
-from typing import Dict, List
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+# (window_seconds, max_requests) pairs checked on every request
+Windows = Sequence[Tuple[int, int]]
+
+
+def _roll_window(state: List[float], now: float, window_seconds: int) -> List[float]:
+    """
+    Advance a [slot_id, current, previous] counter to the slot containing ``now``
+    
+    Args:
+        state: Counter state, mutated in place
+        now: Current timestamp
+        window_seconds: Window length in seconds
+        
+    Returns:
+        The same state list
+    """
+    slot_id = int(now // window_seconds)
+    if slot_id == state[0]:
+        return state
+    if slot_id == state[0] + 1:
+        state[2] = state[1]
+    else:
+        state[2] = 0
+    state[0] = slot_id
+    state[1] = 0
+    return state
+
+
+def _estimate(state: List[float], now: float, window_seconds: int) -> float:
+    """
+    Estimate requests in the sliding window ending at ``now``
+    
+    The previous slot is weighted by how much of it still overlaps the window.
+    """
+    elapsed = (now % window_seconds) / window_seconds
+    return state[2] * (1.0 - elapsed) + state[1]
+
+
+def _evaluate(states: List[List[float]], now: float, windows: Windows,
+              record: bool) -> Tuple[bool, List[float], Optional[int]]:
+    """
+    Roll all window counters, check limits and optionally record the request
+    
+    Returns:
+        (allowed, estimates, index of violated window or None)
+    """
+    estimates = []
+    violated = None
+    for i, (window_seconds, limit) in enumerate(windows):
+        _roll_window(states[i], now, window_seconds)
+        estimate = _estimate(states[i], now, window_seconds)
+        estimates.append(estimate)
+        if violated is None and estimate >= limit:
+            violated = i
+    
+    allowed = violated is None
+    if allowed and record:
+        for state in states:
+            state[1] += 1
+    return allowed, estimates, violated
+
+
+class InMemoryRateLimitBackend:
+    """
+    Process-local counter and penalty store with LRU eviction of idle users
+    
+    Counters and penalties (violations, ban expiry) are two LRU maps, each
+    bounded by max_tracked_users. A banned user touches its entry on every
+    request, so only idle entries are evicted.
+    """
+    
+    def __init__(self, max_tracked_users: int = 10000):
+        self.max_tracked_users = max_tracked_users
+        self._counters: "OrderedDict[int, List[List[float]]]" = OrderedDict()
+        self._penalties: "OrderedDict[int, List[float]]" = OrderedDict()  # user_id: [violations, ban_until]
+        self._lock = threading.Lock()
+    
+    def _lru_entry(self, table: OrderedDict, user_id: int, create):
+        entry = table.get(user_id)
+        if entry is None:
+            entry = table[user_id] = create()
+            while len(table) > self.max_tracked_users:
+                table.popitem(last=False)
+        else:
+            table.move_to_end(user_id)
+        return entry
+    
+    def _states(self, user_id: int, windows: Windows) -> List[List[float]]:
+        return self._lru_entry(self._counters, user_id, lambda: [[0, 0, 0] for _ in windows])
+    
+    def acquire(self, user_id: int, now: float,
+                windows: Windows) -> Tuple[bool, List[float], Optional[int]]:
+        """Check limits and record the request if allowed"""
+        with self._lock:
+            return _evaluate(self._states(user_id, windows), now, windows, record=True)
+    
+    def peek(self, user_id: int, now: float, windows: Windows) -> List[float]:
+        """Current window estimates without recording a request"""
+        with self._lock:
+            states = self._counters.get(user_id)
+            if states is None:
+                return [0.0 for _ in windows]
+            return _evaluate(states, now, windows, record=False)[1]
+    
+    def forget(self, user_id: int):
+        """Drop all counters for a user"""
+        with self._lock:
+            self._counters.pop(user_id, None)
+    
+    def tracked_users(self) -> int:
+        """Number of users currently holding counter state"""
+        return len(self._counters)
+    
+    def add_violation(self, user_id: int, now: float) -> int:
+        """Count one limit violation, returns the user's total"""
+        with self._lock:
+            penalty = self._lru_entry(self._penalties, user_id, lambda: [0, 0.0])
+            penalty[0] += 1
+            return int(penalty[0])
+    
+    def violations(self, user_id: int) -> int:
+        """Violations recorded for a user"""
+        with self._lock:
+            penalty = self._penalties.get(user_id)
+            return int(penalty[0]) if penalty else 0
+    
+    def ban(self, user_id: int, ban_until: float, now: float):
+        """Ban a user until the given timestamp"""
+        with self._lock:
+            self._lru_entry(self._penalties, user_id, lambda: [0, 0.0])[1] = ban_until
+    
+    def ban_until(self, user_id: int) -> Optional[float]:
+        """Ban expiry timestamp, None if the user was not banned"""
+        with self._lock:
+            penalty = self._penalties.get(user_id)
+            if not penalty or not penalty[1]:
+                return None
+            self._penalties.move_to_end(user_id)
+            return penalty[1]
+    
+    def clear_penalties(self, user_id: int):
+        """Drop ban and violations of a user"""
+        with self._lock:
+            self._penalties.pop(user_id, None)
+    
+    def penalized_users(self) -> int:
+        """Number of users currently holding violation / ban state"""
+        return len(self._penalties)
+
+
+class SQLiteRateLimitBackend:
+    """
+    Counter store shared between processes through a SQLite file
+    
+    Each check runs in one ``BEGIN IMMEDIATE`` transaction, so concurrent
+    bot processes see a single consistent count per user. Violations and
+    bans live in a second table, so a ban set by one process holds in all.
+    Counter rows idle for longer than the largest window, and penalty rows
+    idle as long without an active ban, are purged periodically.
+    """
+    
+    def __init__(self, db_path: str = 'rate_limits.db', purge_interval_seconds: int = 300):
+        self.db_path = db_path
+        self.purge_interval_seconds = purge_interval_seconds
+        self._last_purge = 0.0
+        self._ensure_table()
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+        return conn
+    
+    def _ensure_table(self):
+        conn = self._get_connection()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_counters (
+                    user_id INTEGER PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    last_seen REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_penalties (
+                    user_id INTEGER PRIMARY KEY,
+                    violations INTEGER NOT NULL DEFAULT 0,
+                    ban_until REAL NOT NULL DEFAULT 0,
+                    last_seen REAL NOT NULL
+                )
+            """)
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _decode(raw: Optional[str], windows: Windows) -> List[List[float]]:
+        if raw:
+            values = [float(v) for v in raw.split(',')]
+            if len(values) == 3 * len(windows):
+                return [values[i:i + 3] for i in range(0, len(values), 3)]
+        return [[0, 0, 0] for _ in windows]
+    
+    @staticmethod
+    def _encode(states: List[List[float]]) -> str:
+        return ','.join(repr(float(v)) for state in states for v in state)
+    
+    def _load(self, conn: sqlite3.Connection, user_id: int, windows: Windows) -> List[List[float]]:
+        row = conn.execute(
+            "SELECT state FROM rate_limit_counters WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return self._decode(row[0] if row else None, windows)
+    
+    def _maybe_purge(self, conn: sqlite3.Connection, now: float, windows: Windows):
+        if now - self._last_purge < self.purge_interval_seconds:
+            return
+        self._last_purge = now
+        horizon = 2 * max(window_seconds for window_seconds, _ in windows)
+        conn.execute("DELETE FROM rate_limit_counters WHERE last_seen < ?", (now - horizon,))
+        conn.execute("DELETE FROM rate_limit_penalties WHERE last_seen < ? AND ban_until < ?",
+                     (now - horizon, now))
+    
+    def acquire(self, user_id: int, now: float,
+                windows: Windows) -> Tuple[bool, List[float], Optional[int]]:
+        """Check limits and record the request if allowed (atomic across processes)"""
+        conn = self._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            states = self._load(conn, user_id, windows)
+            result = _evaluate(states, now, windows, record=True)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_counters (user_id, state, last_seen) "
+                "VALUES (?, ?, ?)",
+                (user_id, self._encode(states), now)
+            )
+            self._maybe_purge(conn, now, windows)
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def peek(self, user_id: int, now: float, windows: Windows) -> List[float]:
+        """Current window estimates without recording a request"""
+        conn = self._get_connection()
+        try:
+            states = self._load(conn, user_id, windows)
+        finally:
+            conn.close()
+        return _evaluate(states, now, windows, record=False)[1]
+    
+    def forget(self, user_id: int):
+        """Drop all counters for a user"""
+        conn = self._get_connection()
+        try:
+            conn.execute("DELETE FROM rate_limit_counters WHERE user_id = ?", (user_id,))
+        finally:
+            conn.close()
+    
+    def tracked_users(self) -> int:
+        """Number of users currently holding counter state"""
+        conn = self._get_connection()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM rate_limit_counters").fetchone()[0]
+        finally:
+            conn.close()
+    
+    def add_violation(self, user_id: int, now: float) -> int:
+        """Count one limit violation, returns the user's total (atomic across processes)"""
+        conn = self._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO rate_limit_penalties (user_id, violations, last_seen) VALUES (?, 1, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET violations = violations + 1, last_seen = excluded.last_seen",
+                (user_id, now)
+            )
+            violations = conn.execute(
+                "SELECT violations FROM rate_limit_penalties WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+            conn.execute("COMMIT")
+            return violations
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def violations(self, user_id: int) -> int:
+        """Violations recorded for a user"""
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT violations FROM rate_limit_penalties WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            return row[0] if row else 0
+        finally:
+            conn.close()
+    
+    def ban(self, user_id: int, ban_until: float, now: float):
+        """Ban a user until the given timestamp"""
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                "INSERT INTO rate_limit_penalties (user_id, ban_until, last_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET ban_until = excluded.ban_until, last_seen = excluded.last_seen",
+                (user_id, ban_until, now)
+            )
+        finally:
+            conn.close()
+    
+    def ban_until(self, user_id: int) -> Optional[float]:
+        """Ban expiry timestamp, None if the user was not banned"""
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT ban_until FROM rate_limit_penalties WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            return row[0] if row and row[0] else None
+        finally:
+            conn.close()
+    
+    def clear_penalties(self, user_id: int):
+        """Drop ban and violations of a user"""
+        conn = self._get_connection()
+        try:
+            conn.execute("DELETE FROM rate_limit_penalties WHERE user_id = ?", (user_id,))
+        finally:
+            conn.close()
+    
+    def penalized_users(self) -> int:
+        """Number of users currently holding violation / ban state"""
+        conn = self._get_connection()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM rate_limit_penalties").fetchone()[0]
+        finally:
+            conn.close()
+
 
 class RateLimiter:
     """
@@ -20,27 +369,30 @@ class RateLimiter:
     - Per-hour limit (default: 100 requests)
     - Auto-ban after 3 violations (default: 60 minutes)
     - Suspicious activity tracking
+    - O(1) sliding-window counters with LRU eviction of idle users
+    - Pluggable backend (in-memory or shared SQLite) for counters, violations and bans
     """
     
     def __init__(
         self,
         max_requests_per_minute: int = 20,
         max_requests_per_hour: int = 100,
-        ban_duration_minutes: int = 60
+        ban_duration_minutes: int = 60,
+        backend=None,
+        max_tracked_users: int = 10000
     ):
         self.max_requests_per_minute = max_requests_per_minute
         self.max_requests_per_hour = max_requests_per_hour
         self.ban_duration_minutes = ban_duration_minutes
         
-        # Track requests per user
-        self.requests_minute: Dict[int, List[float]] = defaultdict(list)
-        self.requests_hour: Dict[int, List[float]] = defaultdict(list)
-        
-        # Banned users
-        self.banned_users: Dict[int, float] = {}  # user_id: ban_until_timestamp
+        # Request counters (per-user sliding windows)
+        self.backend = backend or InMemoryRateLimitBackend(max_tracked_users)
+        self.windows: Tuple[Tuple[int, int], ...] = (
+            (60, max_requests_per_minute),
+            (3600, max_requests_per_hour),
+        )
         
-        # Suspicious activity counter
-        self.suspicious_users: Dict[int, int] = defaultdict(int)
+        # Banned / suspicious users live in the backend as well (bounded, shared with other processes)
         
         logger.info(f"✅ Rate Limiter initialized: {max_requests_per_minute}/min, {max_requests_per_hour}/hour")
     
@@ -61,48 +413,17 @@ class RateLimiter:
             logger.warning(f"🚫 User {user_id} is banned, request denied")
             return False
         
-        # Cleanup old requests
-        self._cleanup_old_requests(user_id, current_time)
+        # Check minute/hour limits and record the request in one step
+        allowed, estimates, violated = self.backend.acquire(user_id, current_time, self.windows)
         
-        # Check minute limit (20 requests)
-        minute_requests = len(self.requests_minute[user_id])
-        if minute_requests >= self.max_requests_per_minute:
-            logger.warning(f"⚠️ User {user_id} exceeded minute limit: {minute_requests}/{self.max_requests_per_minute}")
+        if violated == 0:
+            logger.warning(f"⚠️ User {user_id} exceeded minute limit: {int(estimates[0])}/{self.max_requests_per_minute}")
             self._mark_suspicious(user_id, "MINUTE_LIMIT")
-            return False
-        
-        # Check hour limit (100 requests)
-        hour_requests = len(self.requests_hour[user_id])
-        if hour_requests >= self.max_requests_per_hour:
-            logger.warning(f"⚠️ User {user_id} exceeded hour limit: {hour_requests}/{self.max_requests_per_hour}")
+        elif violated == 1:
+            logger.warning(f"⚠️ User {user_id} exceeded hour limit: {int(estimates[1])}/{self.max_requests_per_hour}")
             self._mark_suspicious(user_id, "HOUR_LIMIT")
-            return False
         
-        # Record request
-        self.requests_minute[user_id].append(current_time)
-        self.requests_hour[user_id].append(current_time)
-        
-        return True
-    
-    def _cleanup_old_requests(self, user_id: int, current_time: float):
-        """
-        Remove old request timestamps
-        
-        Args:
-            user_id: Telegram user ID
-            current_time: Current timestamp
-        """
-        # Remove requests older than 1 minute
-        minute_cutoff = current_time - 60
-        self.requests_minute[user_id] = [
-            ts for ts in self.requests_minute[user_id] if ts > minute_cutoff
-        ]
-        
-        # Remove requests older than 1 hour
-        hour_cutoff = current_time - 3600
-        self.requests_hour[user_id] = [
-            ts for ts in self.requests_hour[user_id] if ts > hour_cutoff
-        ]
+        return allowed
     
     def _mark_suspicious(self, user_id: int, reason: str):
         """
@@ -112,8 +433,7 @@ class RateLimiter:
             user_id: Telegram user ID
             reason: Reason for marking as suspicious
         """
-        self.suspicious_users[user_id] += 1
-        violations = self.suspicious_users[user_id]
+        violations = self.backend.add_violation(user_id, time.time())
         
         logger.warning(f"⚠️ User {user_id} marked suspicious ({reason}): Violation #{violations}")
         
@@ -133,8 +453,9 @@ class RateLimiter:
         if duration_minutes is None:
             duration_minutes = self.ban_duration_minutes
         
-        ban_until = time.time() + (duration_minutes * 60)
-        self.banned_users[user_id] = ban_until
+        now = time.time()
+        ban_until = now + (duration_minutes * 60)
+        self.backend.ban(user_id, ban_until, now)
         
         logger.error(f"🔒 User {user_id} BANNED for {duration_minutes} minutes")
     
@@ -145,12 +466,9 @@ class RateLimiter:
         Args:
             user_id: Telegram user ID
         """
-        if user_id in self.banned_users:
-            del self.banned_users[user_id]
-            
-            # Reset suspicious counter
-            if user_id in self.suspicious_users:
-                del self.suspicious_users[user_id]
+        if self.backend.ban_until(user_id) is not None:
+            # Also resets the suspicious counter
+            self.backend.clear_penalties(user_id)
             
             logger.info(f"✅ User {user_id} UNBANNED")
     
@@ -164,11 +482,11 @@ class RateLimiter:
         Returns:
             True if banned, False otherwise
         """
-        if user_id not in self.banned_users:
+        ban_until = self.backend.ban_until(user_id)
+        if ban_until is None:
             return False
         
         current_time = time.time()
-        ban_until = self.banned_users[user_id]
         
         # Check if ban expired
         if current_time >= ban_until:
@@ -192,10 +510,9 @@ class RateLimiter:
         if not self.is_banned(user_id):
             return 0
         
-        current_time = time.time()
-        ban_until = self.banned_users[user_id]
+        ban_until = self.backend.ban_until(user_id) or 0
         
-        return int(ban_until - current_time)
+        return max(0, int(ban_until - time.time()))
     
     def get_user_stats(self, user_id: int) -> dict:
         """
@@ -207,23 +524,25 @@ class RateLimiter:
         Returns:
             Dictionary with user stats
         """
-        current_time = time.time()
-        self._cleanup_old_requests(user_id, current_time)
+        minute_estimate, hour_estimate = self.backend.peek(user_id, time.time(), self.windows)
         
         return {
-            'requests_last_minute': len(self.requests_minute[user_id]),
-            'requests_last_hour': len(self.requests_hour[user_id]),
-            'violations': self.suspicious_users.get(user_id, 0),
+            'requests_last_minute': int(round(minute_estimate)),
+            'requests_last_hour': int(round(hour_estimate)),
+            'violations': self.backend.violations(user_id),
             'is_banned': self.is_banned(user_id),
             'ban_time_remaining': self.get_ban_time_remaining(user_id)
         }
 
 
 # Global instance
+# Set RATE_LIMIT_DB_PATH to share limits between several bot processes
+_shared_db_path = os.getenv('RATE_LIMIT_DB_PATH')
 rate_limiter = RateLimiter(
     max_requests_per_minute=20,
     max_requests_per_hour=100,
-    ban_duration_minutes=60
+    ban_duration_minutes=60,
+    backend=SQLiteRateLimitBackend(_shared_db_path) if _shared_db_path else None
 )
 
 
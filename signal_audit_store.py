@@ -0,0 +1,448 @@
+"""
+Signal Audit Store for ESB v1.0 Phase 3.4
+
+Persistent, append-only, segmented on-disk storage for SignalAuditLogger.
+
+Layout of the store directory:
+- segment-000001.jsonl ...   One JSON event per line, append-only
+- segment-000001.idx.json    Per-signal byte-offset index of a sealed segment
+- checkpoints.jsonl          Periodic hash-chain checkpoints
+- manifest.json              Compaction anchor (hash preceding the oldest kept event)
+
+Per-signal lookups seek directly to indexed offsets (O(k) for k events),
+verification re-hashes only events after the last checkpoint, and
+compaction drops the oldest sealed segments to keep disk usage bounded.
+
+Author: ESB v1.0 Implementation
+Date: 2026-01-22
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from signal_state_machine import SignalState
+from signal_state_audit import AuditEvent, SignalAuditLogger, compute_event_hash
+
+logger = logging.getLogger(__name__)
+
+# (segment number, byte offset of the event line)
+EventLocation = Tuple[int, int]
+
+
+def _event_to_record(event: AuditEvent, seq: int) -> Dict[str, Any]:
+    """Serialize an AuditEvent to a JSON-compatible record."""
+    return {
+        'seq': seq,
+        'signal_id': event.signal_id,
+        'prev_state': event.prev_state.value,
+        'next_state': event.next_state.value,
+        'timestamp': event.timestamp.isoformat(),
+        'actor': event.actor,
+        'reason': event.reason,
+        'metadata': event.metadata,
+        'event_hash': event.event_hash,
+    }
+
+
+def _record_to_event(record: Dict[str, Any]) -> AuditEvent:
+    """Deserialize a stored record back to an AuditEvent."""
+    return AuditEvent(
+        signal_id=record['signal_id'],
+        prev_state=SignalState(record['prev_state']),
+        next_state=SignalState(record['next_state']),
+        timestamp=datetime.fromisoformat(record['timestamp']),
+        actor=record['actor'],
+        reason=record['reason'],
+        metadata=record.get('metadata', {}),
+        event_hash=record['event_hash'],
+    )
+
+
+class SegmentedAuditStore:
+    """
+    ESB v1.0 §3.4 - Append-only segmented audit log on disk.
+
+    Events are written once and never modified. When the active segment
+    reaches ``max_segment_events`` it is sealed (its index is written next
+    to it) and a new segment is started.
+    """
+
+    SEGMENT_PREFIX = "segment-"
+    SEGMENT_SUFFIX = ".jsonl"
+    INDEX_SUFFIX = ".idx.json"
+    CHECKPOINTS_FILE = "checkpoints.jsonl"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_events: int = 10000,
+        checkpoint_interval: int = 1000,
+        max_segments: Optional[int] = None,
+        fsync: bool = False
+    ):
+        """
+        Open (or create) an audit store.
+
+        Args:
+            directory: Store directory
+            max_segment_events: Events per segment before rotation
+            checkpoint_interval: Write a hash-chain checkpoint every N events
+            max_segments: Keep at most N segments (None = unbounded); enforced on rotation
+            fsync: fsync every append (durable but slower)
+        """
+        self.directory = directory
+        self.max_segment_events = max_segment_events
+        self.checkpoint_interval = checkpoint_interval
+        self.max_segments = max_segments
+        self.fsync = fsync
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._index: Dict[str, List[EventLocation]] = {}
+        # Offsets per signal in the active segment only, so sealing is O(segment)
+        self._active_offsets: Dict[str, List[int]] = {}
+        self._segment_counts: Dict[int, int] = {}
+        self._segment_last_hash: Dict[int, str] = {}
+        self._checkpoints: List[Dict[str, Any]] = []
+        self._manifest: Dict[str, Any] = {
+            'anchor_hash': SignalAuditLogger.GENESIS_HASH,
+            'anchor_seq': 0,
+        }
+        self._last_hash = SignalAuditLogger.GENESIS_HASH
+        self._next_seq = 1
+        self._active_segment = 1
+        self._active_file = None
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{self.SEGMENT_PREFIX}{segment:06d}{self.SEGMENT_SUFFIX}")
+
+    def _index_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{self.SEGMENT_PREFIX}{segment:06d}{self.INDEX_SUFFIX}")
+
+    def _list_segments(self) -> List[int]:
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith(self.SEGMENT_PREFIX) and name.endswith(self.SEGMENT_SUFFIX):
+                number = name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]
+                if number.isdigit():
+                    segments.append(int(number))
+        return sorted(segments)
+
+    # ------------------------------------------------------------------
+    # Startup
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Rebuild in-memory index from sealed indexes plus the active segment."""
+        manifest_path = os.path.join(self.directory, self.MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self._manifest.update(json.load(f))
+        self._last_hash = self._manifest['anchor_hash']
+        self._next_seq = self._manifest['anchor_seq'] + 1
+
+        checkpoints_path = os.path.join(self.directory, self.CHECKPOINTS_FILE)
+        if os.path.exists(checkpoints_path):
+            with open(checkpoints_path, 'r', encoding='utf-8') as f:
+                self._checkpoints = [json.loads(line) for line in f if line.strip()]
+
+        segments = self._list_segments()
+        for segment in segments:
+            index_path = self._index_path(segment)
+            if os.path.exists(index_path):
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    sealed = json.load(f)
+                for signal_id, offsets in sealed['signals'].items():
+                    self._index.setdefault(signal_id, []).extend((segment, o) for o in offsets)
+                self._segment_counts[segment] = sealed['count']
+                self._segment_last_hash[segment] = sealed['last_hash']
+                self._last_hash = sealed['last_hash']
+                self._next_seq = sealed['last_seq'] + 1
+            else:
+                # Unsealed (active) segment: scan it - bounded by max_segment_events
+                self._scan_active_segment(segment)
+
+        self._active_segment = segments[-1] if segments else 1
+        if segments and os.path.exists(self._index_path(self._active_segment)):
+            self._active_segment += 1
+
+    def _scan_active_segment(self, segment: int):
+        count = 0
+        self._active_offsets = {}
+        with open(self._segment_path(segment), 'rb') as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if not line.endswith(b'\n'):
+                    # Torn write from a crash - drop the partial tail
+                    logger.warning(f"⚠️ Truncating partial audit record in segment {segment}")
+                    f.close()
+                    with open(self._segment_path(segment), 'r+b') as tf:
+                        tf.truncate(offset)
+                    break
+                record = json.loads(line)
+                self._index.setdefault(record['signal_id'], []).append((segment, offset))
+                self._active_offsets.setdefault(record['signal_id'], []).append(offset)
+                self._last_hash = record['event_hash']
+                self._next_seq = record['seq'] + 1
+                count += 1
+        self._segment_counts[segment] = count
+        self._segment_last_hash[segment] = self._last_hash
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _open_active(self):
+        if self._active_file is None:
+            self._active_file = open(self._segment_path(self._active_segment), 'ab')
+            self._segment_counts.setdefault(self._active_segment, 0)
+        return self._active_file
+
+    def append(self, event: AuditEvent) -> int:
+        """
+        Persist an event (already hash-chained by the logger).
+
+        Args:
+            event: AuditEvent to append
+
+        Returns:
+            Sequence number assigned to the event
+        """
+        seq = self._next_seq
+        f = self._open_active()
+        offset = f.tell()
+        line = json.dumps(_event_to_record(event, seq), sort_keys=True) + '\n'
+        f.write(line.encode('utf-8'))
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+        segment = self._active_segment
+        self._index.setdefault(event.signal_id, []).append((segment, offset))
+        self._active_offsets.setdefault(event.signal_id, []).append(offset)
+        self._segment_counts[segment] += 1
+        self._segment_last_hash[segment] = event.event_hash
+        self._last_hash = event.event_hash
+        self._next_seq = seq + 1
+
+        if seq % self.checkpoint_interval == 0:
+            self._write_checkpoint(seq, segment, offset, event.event_hash)
+
+        if self._segment_counts[segment] >= self.max_segment_events:
+            self._seal_active()
+
+        return seq
+
+    def _write_checkpoint(self, seq: int, segment: int, offset: int, event_hash: str):
+        checkpoint = {'seq': seq, 'segment': segment, 'offset': offset, 'hash': event_hash}
+        with open(os.path.join(self.directory, self.CHECKPOINTS_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(checkpoint) + '\n')
+        self._checkpoints.append(checkpoint)
+
+    def _seal_active(self):
+        """Write the active segment's index and start a new segment."""
+        segment = self._active_segment
+        if self._active_file is not None:
+            self._active_file.close()
+            self._active_file = None
+
+        sealed = {
+            'count': self._segment_counts.get(segment, 0),
+            'last_hash': self._segment_last_hash.get(segment, self._last_hash),
+            'last_seq': self._next_seq - 1,
+            'signals': self._active_offsets,
+        }
+        tmp_path = self._index_path(segment) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(sealed, f)
+        os.replace(tmp_path, self._index_path(segment))
+
+        self._active_offsets = {}
+        self._active_segment = segment + 1
+
+        if self.max_segments is not None:
+            self.compact(self.max_segments)
+
+    def close(self):
+        """Close the active segment file handle."""
+        if self._active_file is not None:
+            self._active_file.close()
+            self._active_file = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _read_at(self, locations: List[EventLocation]) -> List[AuditEvent]:
+        events = []
+        current_segment = None
+        f = None
+        try:
+            for segment, offset in locations:
+                if segment != current_segment:
+                    if f is not None:
+                        f.close()
+                    if self._active_file is not None and segment == self._active_segment:
+                        self._active_file.flush()
+                    f = open(self._segment_path(segment), 'rb')
+                    current_segment = segment
+                f.seek(offset)
+                events.append(_record_to_event(json.loads(f.readline())))
+        finally:
+            if f is not None:
+                f.close()
+        return events
+
+    def _iter_records(self, start: Optional[EventLocation] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate stored records in append order, optionally from a location."""
+        if self._active_file is not None:
+            self._active_file.flush()
+        for segment in self._list_segments():
+            if start is not None and segment < start[0]:
+                continue
+            with open(self._segment_path(segment), 'rb') as f:
+                if start is not None and segment == start[0]:
+                    f.seek(start[1])
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def get_events(self, signal_id: Optional[str] = None) -> List[AuditEvent]:
+        """
+        Retrieve events, all or for one signal.
+
+        Per-signal lookup seeks to indexed offsets only (O(k)).
+        """
+        if signal_id is None:
+            return [_record_to_event(r) for r in self._iter_records()]
+        return self._read_at(self._index.get(signal_id, []))
+
+    def get_event_count(self) -> int:
+        """Total number of retained events."""
+        return sum(self._segment_counts.values())
+
+    @property
+    def last_hash(self) -> str:
+        """Hash of the most recently appended event (or the chain anchor)."""
+        return self._last_hash
+
+    # ------------------------------------------------------------------
+    # Verification and compaction
+    # ------------------------------------------------------------------
+
+    def verify(self, full: bool = False) -> bool:
+        """
+        Verify the hash chain.
+
+        By default verification resumes from the last checkpoint: the
+        checkpointed event's stored hash must match, then only the events
+        after it are re-hashed.
+
+        Args:
+            full: Re-hash every retained event from the compaction anchor
+
+        Returns:
+            True if chain is valid, False if tampered/corrupted
+        """
+        previous_hash = self._manifest['anchor_hash']
+        start = None
+        skip_first = False
+
+        if not full and self._checkpoints:
+            checkpoint = self._checkpoints[-1]
+            start = (checkpoint['segment'], checkpoint['offset'])
+            previous_hash = checkpoint['hash']
+            skip_first = True
+
+        try:
+            for record in self._iter_records(start):
+                if skip_first:
+                    skip_first = False
+                    if record['event_hash'] != previous_hash:
+                        return False
+                    continue
+                event = _record_to_event(record)
+                expected_hash = compute_event_hash(
+                    signal_id=event.signal_id,
+                    prev_state=event.prev_state,
+                    next_state=event.next_state,
+                    timestamp=event.timestamp,
+                    actor=event.actor,
+                    reason=event.reason,
+                    metadata=event.metadata,
+                    previous_hash=previous_hash
+                )
+                if event.event_hash != expected_hash:
+                    return False
+                previous_hash = event.event_hash
+        except (ValueError, KeyError):
+            return False  # Corrupted record
+
+        return previous_hash == self._last_hash
+
+    def compact(self, max_segments: int) -> int:
+        """
+        Drop the oldest sealed segments so at most ``max_segments`` remain.
+
+        The hash preceding the oldest retained event is recorded in the
+        manifest, so chain verification stays possible after compaction.
+
+        Args:
+            max_segments: Number of segments (including the active one) to keep
+
+        Returns:
+            Number of segments removed
+        """
+        segments = self._list_segments()
+        if self._active_segment not in segments:
+            segments.append(self._active_segment)
+        removable = [s for s in segments[:-max_segments] if os.path.exists(self._index_path(s))] \
+            if len(segments) > max_segments else []
+        if not removable:
+            return 0
+
+        last_removed = removable[-1]
+        with open(self._index_path(last_removed), 'r', encoding='utf-8') as f:
+            sealed = json.load(f)
+        self._manifest = {'anchor_hash': sealed['last_hash'], 'anchor_seq': sealed['last_seq']}
+        tmp_path = os.path.join(self.directory, self.MANIFEST_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp_path, os.path.join(self.directory, self.MANIFEST_FILE))
+
+        removed = set(removable)
+        for segment in removable:
+            os.remove(self._segment_path(segment))
+            os.remove(self._index_path(segment))
+            self._segment_counts.pop(segment, None)
+            self._segment_last_hash.pop(segment, None)
+
+        for signal_id in list(self._index):
+            kept = [loc for loc in self._index[signal_id] if loc[0] not in removed]
+            if kept:
+                self._index[signal_id] = kept
+            else:
+                del self._index[signal_id]
+
+        self._checkpoints = [c for c in self._checkpoints if c['segment'] not in removed]
+        tmp_path = os.path.join(self.directory, self.CHECKPOINTS_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for checkpoint in self._checkpoints:
+                f.write(json.dumps(checkpoint) + '\n')
+        os.replace(tmp_path, os.path.join(self.directory, self.CHECKPOINTS_FILE))
+
+        logger.info(f"🗜️ Audit log compacted: removed {len(removable)} segment(s)")
+        return len(removable)
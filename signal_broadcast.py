@@ -0,0 +1,238 @@
+"""
+📡 Signal Broadcast
+Fan-out of one rendered signal (text + chart) to many subscribers
+
+Auto signals were sent to the owner only. SignalBroadcaster selects the
+subscribers of a signal from the per-user settings (bot_data, see
+get_user_settings in bot.py) and delivers the already rendered message
+through the Telegram dispatcher:
+
+- One render: the caller formats the signal and generates the chart once
+- One upload: the chart is uploaded to the first recipient and every other
+  recipient gets the returned photo file_id
+- Batched sends: recipients are queued in batches; the next batch is queued
+  when the previous one is delivered, so a large fan-out never fills the
+  queue ahead of SL/TP alerts queued meanwhile
+
+Subscription settings (per chat, in bot_data[chat_id]):
+    auto_signals_subscribed: bool - receive auto signals
+    signal_timeframes: list or None - only these timeframes (None = all)
+    signal_symbols: list or None - only these symbols (None = all)
+    min_confidence: float - minimum signal confidence in %
+"""
+
+import asyncio
+import logging
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from telegram_dispatcher import PRIORITY_SIGNAL, TelegramDispatcher, get_telegram_dispatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 25
+
+# Defaults merged into the user settings by get_user_settings
+SUBSCRIPTION_DEFAULTS = {
+    'auto_signals_subscribed': False,
+    'signal_timeframes': None,
+    'signal_symbols': None,
+    'min_confidence': 0,
+}
+
+
+def subscription_settings(bot_data: Dict[Any, Any], chat_id: int) -> Dict[str, Any]:
+    """
+    Subscription settings of one chat, read without touching bot_data
+
+    get_user_settings creates a bot_data entry for an unknown chat; signal
+    selection runs over every allowed user and must not do that.
+
+    Args:
+        bot_data: application.bot_data
+        chat_id: Telegram chat id
+
+    Returns:
+        SUBSCRIPTION_DEFAULTS overlaid with the stored settings (a new dict)
+    """
+    stored = bot_data.get(chat_id)
+    return {**SUBSCRIPTION_DEFAULTS, **(stored if isinstance(stored, dict) else {})}
+
+
+def subscription_matches(settings: Dict[str, Any], symbol: str, timeframe: str, confidence: float) -> bool:
+    """
+    Check a signal against one user's subscription settings
+
+    Args:
+        settings: User settings (bot_data[chat_id])
+        symbol: Signal symbol (e.g. 'BTCUSDT')
+        timeframe: Signal timeframe (e.g. '4h')
+        confidence: Signal confidence in %
+
+    Returns:
+        True if the user should receive the signal
+    """
+    if not settings.get('auto_signals_subscribed'):
+        return False
+    timeframes = settings.get('signal_timeframes')
+    if timeframes and timeframe not in timeframes:
+        return False
+    symbols = settings.get('signal_symbols')
+    if symbols and symbol not in symbols:
+        return False
+    return confidence >= (settings.get('min_confidence') or 0)
+
+
+def select_subscribers(
+    user_ids: Iterable[int],
+    settings_for: Callable[[int], Dict[str, Any]],
+    symbol: str,
+    timeframe: str,
+    confidence: float,
+    always: Iterable[int] = (),
+    is_authorized: Optional[Callable[[int], bool]] = None
+) -> List[int]:
+    """
+    Recipients of one signal
+
+    Args:
+        user_ids: Candidate chats (allowed users)
+        settings_for: chat_id -> settings dict (e.g. subscription_settings bound to bot_data)
+        symbol, timeframe, confidence: The signal
+        always: Chats that receive every signal (the owner), listed first
+        is_authorized: Optional access check (blacklist / whitelist)
+
+    Returns:
+        Ordered, de-duplicated chat ids
+    """
+    recipients = list(dict.fromkeys(always))
+    seen = set(recipients)
+    for chat_id in sorted(user_ids):
+        if chat_id in seen:
+            continue
+        seen.add(chat_id)
+        if is_authorized is not None and not is_authorized(chat_id):
+            continue
+        if subscription_matches(settings_for(chat_id), symbol, timeframe, confidence):
+            recipients.append(chat_id)
+    return recipients
+
+
+def _photo_file_id(message: Any) -> Optional[str]:
+    photos = getattr(message, 'photo', None)
+    if photos:
+        return photos[-1].file_id
+    return None
+
+
+class SignalBroadcaster:
+    """
+    Delivers one rendered signal to many chats via the Telegram dispatcher
+
+    Args:
+        dispatcher: TelegramDispatcher (global dispatcher if None)
+        batch_size: Recipients queued at once
+    """
+
+    def __init__(self, dispatcher: Optional[TelegramDispatcher] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.dispatcher = dispatcher
+        self.batch_size = max(1, batch_size)
+        self.stats = {'broadcasts': 0, 'messages': 0, 'photos': 0, 'uploads': 0, 'failed': 0}
+        self._tasks = set()
+
+    def _dispatcher(self) -> TelegramDispatcher:
+        return self.dispatcher or get_telegram_dispatcher()
+
+    async def broadcast(
+        self,
+        bot: Any,
+        recipients: List[int],
+        text: str,
+        chart: Optional[bytes] = None,
+        caption: Optional[str] = None,
+        priority: int = PRIORITY_SIGNAL,
+        **message_kwargs
+    ) -> Dict[str, int]:
+        """
+        Send a rendered signal (and optional chart) to all recipients
+
+        Args:
+            bot: Bot instance
+            recipients: Chat ids in delivery order
+            text: Rendered signal message
+            chart: PNG bytes of the chart (uploaded once)
+            caption: Chart caption
+            priority: Dispatcher lane
+            **message_kwargs: Extra send_message arguments (parse_mode, ...)
+
+        Returns:
+            {'recipients', 'delivered', 'failed'} - delivered counts chats that got the text
+        """
+        dispatcher = self._dispatcher()
+        file_id = None
+        delivered = failed = 0
+
+        for start in range(0, len(recipients), self.batch_size):
+            batch = recipients[start:start + self.batch_size]
+            texts = [dispatcher.send_message(bot, chat_id, text, priority=priority, **message_kwargs)
+                     for chat_id in batch]
+
+            photos = []
+            if chart is not None:
+                pending = list(batch)
+                while file_id is None and pending:
+                    # Upload to one chat; the rest of the fan-out reuses the file_id
+                    chat_id = pending.pop(0)
+                    message = await dispatcher.send_photo(bot, chat_id, BytesIO(chart), priority=priority,
+                                                          caption=caption, parse_mode='HTML')
+                    self.stats['uploads'] += 1
+                    if message is not None:
+                        self.stats['photos'] += 1
+                        file_id = _photo_file_id(message)
+                    else:
+                        failed += 1
+                photos = [dispatcher.send_photo(bot, chat_id, file_id, priority=priority,
+                                                caption=caption, parse_mode='HTML')
+                          for chat_id in pending] if file_id is not None else []
+
+            results = await asyncio.gather(*texts, *photos)
+            text_results, photo_results = results[:len(texts)], results[len(texts):]
+            delivered += sum(result is not None for result in text_results)
+            failed += sum(result is None for result in results)
+            self.stats['photos'] += sum(result is not None for result in photo_results)
+
+        self.stats['broadcasts'] += 1
+        self.stats['messages'] += delivered
+        self.stats['failed'] += failed
+        logger.info(f"📡 Broadcast to {len(recipients)} chat(s): {delivered} delivered, {failed} failed sends")
+        return {'recipients': len(recipients), 'delivered': delivered, 'failed': failed}
+
+    def schedule(self, bot: Any, recipients: List[int], text: str, **kwargs) -> asyncio.Task:
+        """
+        Run broadcast() in the background and return immediately
+
+        Returns:
+            The broadcast task (result: broadcast() stats)
+        """
+        task = asyncio.get_running_loop().create_task(self.broadcast(bot, recipients, text, **kwargs))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+
+# Global instance
+_broadcaster: Optional[SignalBroadcaster] = None
+
+
+def get_signal_broadcaster() -> SignalBroadcaster:
+    """Get or create the global signal broadcaster (singleton)"""
+    global _broadcaster
+    if _broadcaster is None:
+        _broadcaster = SignalBroadcaster()
+    return _broadcaster
+
+
+def reset_signal_broadcaster() -> None:
+    """Reset global broadcaster instance (for testing)"""
+    global _broadcaster
+    _broadcaster = None
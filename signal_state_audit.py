@@ -91,14 +91,24 @@ class SignalAuditLogger:
     ESB v1.0 §3.4 - Append-only audit logger for signal state transitions.
     
     Maintains an immutable event log with cryptographic hash chaining.
-    All operations are in-memory (no I/O).
+    Operations are in-memory (no I/O) unless a persistent store is given
+    (see signal_audit_store.SegmentedAuditStore).
     """
     
     GENESIS_HASH = "GENESIS"
     
-    def __init__(self):
-        """Initialize empty audit log."""
+    def __init__(self, store=None):
+        """
+        Initialize audit log.
+        
+        Args:
+            store: Optional persistent store (e.g. SegmentedAuditStore).
+                   When given, events are written through to it and
+                   survive restarts; the chain continues from its last hash.
+        """
+        self._store = store
         self._events: List[AuditEvent] = []
+        self._signal_index: Dict[str, List[int]] = {}
     
     def append_event(
         self,
@@ -165,12 +175,18 @@ class SignalAuditLogger:
         )
         
         # Append to log (event is immutable, so safe to store)
-        self._events.append(event)
+        if self._store is not None:
+            self._store.append(event)
+        else:
+            self._signal_index.setdefault(signal_id, []).append(len(self._events))
+            self._events.append(event)
         
         return event
     
     def _get_last_hash(self) -> str:
         """Get hash of last event, or GENESIS if log is empty."""
+        if self._store is not None:
+            return self._store.last_hash
         if not self._events:
             return self.GENESIS_HASH
         return self._events[-1].event_hash
@@ -179,23 +195,47 @@ class SignalAuditLogger:
         """
         Retrieve audit events.
         
+        Per-signal lookups use an index (O(k) for k matching events).
+        
         Args:
             signal_id: Optional filter by signal_id
             
         Returns:
             List of audit events (immutable)
         """
+        if self._store is not None:
+            return self._store.get_events(signal_id)
+        
         if signal_id is None:
             return list(self._events)  # Return copy to prevent external mutation
         
-        return [e for e in self._events if e.signal_id == signal_id]
+        return [self._events[i] for i in self._signal_index.get(signal_id, [])]
     
     def get_event_count(self) -> int:
         """Get total number of audit events."""
+        if self._store is not None:
+            return self._store.get_event_count()
         return len(self._events)
+    
+    def verify_chain(self, full: bool = False) -> bool:
+        """
+        Verify integrity of this log's hash chain.
+        
+        With a persistent store, verification is incremental from the last
+        checkpoint unless ``full`` is requested.
+        
+        Returns:
+            True if chain is valid, False if tampered/corrupted
+        """
+        if self._store is not None:
+            return self._store.verify(full=full)
+        return verify_event_chain(self._events)
 
 
-def verify_event_chain(events: List[AuditEvent]) -> bool:
+def verify_event_chain(
+    events: List[AuditEvent],
+    previous_hash: str = SignalAuditLogger.GENESIS_HASH
+) -> bool:
     """
     ESB v1.0 §3.4 - Verify integrity of audit event chain.
     
@@ -204,6 +244,8 @@ def verify_event_chain(events: List[AuditEvent]) -> bool:
     
     Args:
         events: List of audit events to verify
+        previous_hash: Hash preceding the first event (GENESIS for a full
+            chain, or a checkpoint hash for incremental verification)
         
     Returns:
         True if chain is valid, False if tampered/corrupted
@@ -224,8 +266,6 @@ def verify_event_chain(events: List[AuditEvent]) -> bool:
             raise ValueError(f"Event at index {i} is not AuditEvent: {type(event)}")
     
     # Verify chain
-    previous_hash = SignalAuditLogger.GENESIS_HASH
-    
     for event in events:
         # Recompute expected hash
         expected_hash = compute_event_hash(
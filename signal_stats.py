@@ -0,0 +1,398 @@
+"""
+📊 Signal Statistics Store
+Append-only signal records with in-memory rollups and periodic snapshots
+
+record_signal() used to load bot_stats.json, bump its counters, append to a
+list capped at 1000 signals and rewrite the whole file for every signal.
+This store appends one JSON line per signal to an event log, updates the
+rollup counters (total / symbol / timeframe / confidence / day) in memory
+and writes bot_stats.json as a snapshot at most every snapshot_interval
+seconds. A restart loads the snapshot and replays only the events appended
+after it, so the full history stays in the event log instead of being cut
+at 1000 records.
+
+Files:
+    bot_stats.json          Snapshot: legacy counters + by_day rollups +
+                            the signals of the retained days + event log offset
+    bot_stats_events.jsonl  Append-only log, one signal record per line
+
+Timestamps are naive local time (datetime.now()), as before, so "yesterday"
+in the daily reports keeps meaning the server's local day.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_INTERVAL = 60.0  # seconds between bot_stats.json rewrites
+DEFAULT_RETAIN_DAYS = 35          # days whose signal records stay in memory and in the snapshot
+
+
+def confidence_bucket(confidence: float) -> str:
+    """Legacy by_confidence key, e.g. 73.5 -> '70-79'"""
+    low = int(confidence // 10) * 10
+    return f"{low}-{low + 9}"
+
+
+def _empty_day() -> Dict[str, Any]:
+    return {'count': 0, 'by_type': {}, 'confidence_sum': 0.0, 'by_symbol': {}, 'by_timeframe': {}}
+
+
+class SignalStatsStore:
+    """
+    Signal statistics with O(1) recording and bucketed queries
+
+    Args:
+        stats_file: Snapshot path (bot_stats.json)
+        events_file: Event log path (default: <stats_file stem>_events.jsonl)
+        snapshot_interval: Minimum seconds between snapshots written by record()
+        retain_days: Days whose signal records are kept in memory and snapshotted
+    """
+
+    def __init__(
+        self,
+        stats_file: str,
+        events_file: Optional[str] = None,
+        snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL,
+        retain_days: int = DEFAULT_RETAIN_DAYS
+    ):
+        self.stats_file = stats_file
+        self.events_file = events_file or f"{os.path.splitext(stats_file)[0]}_events.jsonl"
+        self.snapshot_interval = snapshot_interval
+        self.retain_days = retain_days
+
+        self._lock = threading.Lock()
+        self._reset()
+        self._last_snapshot = time.monotonic()
+        self.loaded = False
+
+    def _reset(self):
+        self._total = 0
+        self._last_id = -1
+        self._by_symbol: Dict[str, Dict[str, int]] = {}
+        self._by_timeframe: Dict[str, Dict[str, int]] = {}
+        self._by_confidence: Dict[str, Dict[str, int]] = {}
+        self._by_day: Dict[str, Dict[str, Any]] = {}
+        self._day_records: Dict[str, List[Dict]] = {}
+        self._events_offset = 0
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Rollups (callers hold the lock)
+    # ------------------------------------------------------------------
+
+    def _apply(self, record: Dict):
+        symbol = record.get('symbol', 'Unknown')
+        timeframe = record.get('timeframe', 'N/A')
+        signal_type = record.get('type', 'UNKNOWN')
+        confidence = record.get('confidence', 0) or 0
+
+        self._total += 1
+        self._last_id = max(self._last_id, record.get('id', self._last_id + 1))
+
+        by_symbol = self._by_symbol.setdefault(symbol, {'count': 0, 'BUY': 0, 'SELL': 0})
+        by_symbol['count'] += 1
+        by_symbol[signal_type] = by_symbol.get(signal_type, 0) + 1
+        self._by_timeframe.setdefault(timeframe, {'count': 0})['count'] += 1
+        self._by_confidence.setdefault(confidence_bucket(confidence), {'count': 0})['count'] += 1
+
+        try:
+            day_key = datetime.fromisoformat(record['timestamp']).date().isoformat()
+        except (KeyError, TypeError, ValueError):
+            return
+        self._add_to_day(day_key, record)
+
+    def _add_to_day(self, day_key: str, record: Dict):
+        day = self._by_day.setdefault(day_key, _empty_day())
+        signal_type = record.get('type', 'UNKNOWN')
+        symbol = record.get('symbol', 'Unknown')
+        timeframe = record.get('timeframe', 'N/A')
+        day['count'] += 1
+        day['by_type'][signal_type] = day['by_type'].get(signal_type, 0) + 1
+        day['confidence_sum'] += record.get('confidence', 0) or 0
+        day['by_symbol'][symbol] = day['by_symbol'].get(symbol, 0) + 1
+        day['by_timeframe'][timeframe] = day['by_timeframe'].get(timeframe, 0) + 1
+        self._day_records.setdefault(day_key, []).append(record)
+
+    def _prune_days(self):
+        cutoff = (date.today() - timedelta(days=self.retain_days)).isoformat()
+        for day_key in [key for key in self._day_records if key < cutoff]:
+            del self._day_records[day_key]
+
+    def _recent(self, limit: Optional[int] = None) -> List[Dict]:
+        records: List[Dict] = []
+        for day_key in sorted(self._day_records, reverse=True):
+            records[:0] = self._day_records[day_key]
+            if limit is not None and len(records) >= limit:
+                break
+        if limit is None:
+            return records
+        return records[-limit:] if limit > 0 else []
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """
+        Load the snapshot and replay events appended after it
+
+        A legacy bot_stats.json (no event log offset) seeds the counters and
+        the day buckets from its 'signals' list.
+
+        Returns:
+            True if state was loaded (an empty start counts as loaded)
+        """
+        with self._lock:
+            self._reset()
+            try:
+                if os.path.exists(self.stats_file):
+                    with open(self.stats_file, 'r') as f:
+                        self._load_snapshot(json.load(f))
+                self._replay_events()
+                self._prune_days()
+            except Exception as e:
+                logger.error(f"❌ Signal stats load failed: {e}")
+                self._reset()
+                self.loaded = False
+                return False
+            self.loaded = True
+            logger.info(f"📊 Signal stats loaded: {self._total} signals, {len(self._by_day)} days")
+            return True
+
+    def _load_snapshot(self, data: Dict):
+        self._total = int(data.get('total_signals', 0))
+        self._by_symbol = data.get('by_symbol', {}) or {}
+        self._by_timeframe = data.get('by_timeframe', {}) or {}
+        self._by_confidence = data.get('by_confidence', {}) or {}
+        signals = data.get('signals', []) or []
+
+        if 'events_offset' in data:
+            self._events_offset = int(data['events_offset'])
+            self._last_id = int(data.get('last_id', -1))
+            self._by_day = data.get('by_day', {}) or {}
+            for record in signals:
+                try:
+                    day_key = datetime.fromisoformat(record['timestamp']).date().isoformat()
+                except (KeyError, TypeError, ValueError):
+                    continue
+                self._day_records.setdefault(day_key, []).append(record)
+            return
+
+        # Legacy snapshot: counters are authoritative, signals rebuild the day buckets
+        for record in signals:
+            try:
+                day_key = datetime.fromisoformat(record['timestamp']).date().isoformat()
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._add_to_day(day_key, record)
+        self._last_id = len(signals) - 1
+        self._dirty = True
+
+    def _replay_events(self):
+        if not os.path.exists(self.events_file):
+            self._events_offset = 0
+            return
+        size = os.path.getsize(self.events_file)
+        if size < self._events_offset:
+            logger.warning(f"⚠️ Signal event log shorter than snapshot offset - not replaying {self.events_file}")
+            self._events_offset = size
+            return
+
+        replayed = 0
+        with open(self.events_file, 'rb+') as f:
+            f.seek(self._events_offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Partial trailing write (crash mid-append) - drop it so the next append starts clean
+                    logger.warning("⚠️ Truncating partial signal event at end of log")
+                    f.truncate(self._events_offset)
+                    break
+                self._events_offset += len(line)
+                try:
+                    self._apply(json.loads(line))
+                    replayed += 1
+                except ValueError:
+                    logger.warning("⚠️ Skipping malformed signal event")
+        if replayed:
+            self._dirty = True
+            logger.info(f"📊 Replayed {replayed} signal events after snapshot")
+
+    def _write_snapshot(self):
+        data = {
+            'total_signals': self._total,
+            'by_symbol': self._by_symbol,
+            'by_timeframe': self._by_timeframe,
+            'by_confidence': self._by_confidence,
+            'by_day': self._by_day,
+            'signals': self._recent(),
+            'events_offset': self._events_offset,
+            'last_id': self._last_id,
+        }
+        tmp_path = f"{self.stats_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.stats_file)
+        self._dirty = False
+        self._last_snapshot = time.monotonic()
+
+    def snapshot(self) -> bool:
+        """Write bot_stats.json now if anything changed since the last snapshot"""
+        with self._lock:
+            if not self._dirty:
+                return False
+            try:
+                self._prune_days()
+                self._write_snapshot()
+                return True
+            except Exception as e:
+                logger.error(f"❌ Signal stats snapshot failed: {e}")
+                return False
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        symbol: str,
+        timeframe: str,
+        signal_type: str,
+        confidence: float,
+        entry_price: Optional[float] = None,
+        tp_price: Optional[float] = None,
+        sl_price: Optional[float] = None,
+        timestamp: Optional[datetime] = None
+    ) -> int:
+        """
+        Append one signal and update the rollups
+
+        Returns:
+            Signal ID (monotonic sequence number)
+        """
+        with self._lock:
+            record = {
+                'id': self._last_id + 1,
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'type': signal_type,
+                'confidence': confidence,
+                'timestamp': (timestamp or datetime.now()).isoformat()
+            }
+            if entry_price is not None:
+                record['entry_price'] = entry_price
+            if tp_price is not None:
+                record['tp_price'] = tp_price
+            if sl_price is not None:
+                record['sl_price'] = sl_price
+
+            line = (json.dumps(record) + '\n').encode('utf-8')
+            with open(self.events_file, 'ab') as f:
+                f.write(line)
+            self._events_offset += len(line)
+
+            self._apply(record)
+            self._dirty = True
+
+            if time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+                try:
+                    self._prune_days()
+                    self._write_snapshot()
+                except Exception as e:
+                    logger.error(f"❌ Signal stats snapshot failed: {e}")
+            return record['id']
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def total_signals(self) -> int:
+        return self._total
+
+    def summary(self) -> Dict[str, Any]:
+        """Legacy counters: total_signals, by_symbol, by_timeframe, by_confidence"""
+        with self._lock:
+            return {
+                'total_signals': self._total,
+                'by_symbol': {key: dict(value) for key, value in self._by_symbol.items()},
+                'by_timeframe': {key: dict(value) for key, value in self._by_timeframe.items()},
+                'by_confidence': {key: dict(value) for key, value in self._by_confidence.items()},
+            }
+
+    def day_rollup(self, day: date) -> Dict[str, Any]:
+        """Counters of one day: count, by_type, confidence_sum, by_symbol, by_timeframe"""
+        with self._lock:
+            rollup = self._by_day.get(day.isoformat())
+            if rollup is None:
+                return _empty_day()
+            return {
+                'count': rollup['count'],
+                'by_type': dict(rollup['by_type']),
+                'confidence_sum': rollup['confidence_sum'],
+                'by_symbol': dict(rollup['by_symbol']),
+                'by_timeframe': dict(rollup['by_timeframe']),
+            }
+
+    def signals_for_day(self, day: date) -> List[Dict]:
+        """Signal records of one (retained) day, oldest first"""
+        with self._lock:
+            return list(self._day_records.get(day.isoformat(), []))
+
+    def signals_between(self, start: datetime, end: datetime) -> List[Dict]:
+        """Signal records with start <= timestamp < end, from the day buckets"""
+        records = []
+        with self._lock:
+            day = start.date()
+            while day <= end.date():
+                for record in self._day_records.get(day.isoformat(), []):
+                    try:
+                        if start <= datetime.fromisoformat(record['timestamp']) < end:
+                            records.append(record)
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                day += timedelta(days=1)
+        return records
+
+    def recent_signals(self, limit: Optional[int] = None) -> List[Dict]:
+        """Retained signal records, oldest first (the last `limit` if given)"""
+        with self._lock:
+            return self._recent(limit)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """bot_stats.json-shaped view (legacy load_stats() callers)"""
+        data = self.summary()
+        data['signals'] = self.recent_signals()
+        return data
+
+
+# Global instance
+_signal_stats: Optional[SignalStatsStore] = None
+
+
+def get_signal_stats(stats_file: Optional[str] = None) -> SignalStatsStore:
+    """
+    Get or create the global signal stats store (singleton)
+
+    Args:
+        stats_file: Snapshot path, used when the store is first created
+    """
+    global _signal_stats
+    if _signal_stats is None:
+        if stats_file is None:
+            stats_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot_stats.json')
+        _signal_stats = SignalStatsStore(stats_file)
+        _signal_stats.load()
+    return _signal_stats
+
+
+def reset_signal_stats() -> None:
+    """Reset global signal stats instance (for testing)"""
+    global _signal_stats
+    _signal_stats = None
@@ -0,0 +1,262 @@
+"""
+🔬 Stage Profiler
+Per-stage timing of ICTSignalEngine.generate_signal
+
+The only timing was log_timing / track_metric around whole bot handlers, so
+it was not visible which of the ~20 steps of generate_signal (HTF bias, MTF
+structure, ICT components, entry zone, SL/TP, ML, news, ...) dominates.
+
+- Always on, low overhead: stage(name) closes the previous stage of the
+  current run and opens the next one (two perf_counter() calls, no locks
+  on the hot path); the run lives in a ContextVar, so concurrent calls in
+  threads or asyncio tasks do not mix
+- Bounded histograms: observability.StreamingHistogram (log buckets, ~1%
+  relative error on percentiles, constant memory) per (stage), (timeframe,
+  stage) and (symbol, stage). The number of symbols is capped (extra
+  symbols go to OTHER_KEY)
+- Sampling mode (off by default): every Nth run is profiled with cProfile
+  and/or tracemalloc; the last few reports are kept for /performance
+
+Environment:
+    STAGE_PROFILE_SAMPLE_EVERY: profile every Nth run with cProfile (0 = off)
+    STAGE_PROFILE_TRACEMALLOC: 'true' to add tracemalloc peak / top allocations
+"""
+
+import contextvars
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from observability.histogram import StreamingHistogram
+
+logger = logging.getLogger(__name__)
+
+# Stage timings in seconds: 10us .. 1000s at 1% relative error (~900 buckets per histogram)
+HISTOGRAM_ACCURACY = 0.01
+HISTOGRAM_MIN_SECONDS = 1e-5
+HISTOGRAM_MAX_SECONDS = 1e3
+MAX_SYMBOLS = 64
+OTHER_KEY = '__other__'
+TOTAL_STAGE = 'total'
+REPORTS_KEPT = 5
+
+
+def new_histogram() -> StreamingHistogram:
+    """Empty histogram for stage timings (seconds)"""
+    return StreamingHistogram(HISTOGRAM_ACCURACY, HISTOGRAM_MIN_SECONDS, HISTOGRAM_MAX_SECONDS)
+
+
+def histogram_summary(histogram: StreamingHistogram) -> Dict[str, float]:
+    """
+    Stage summary of one histogram (seconds)
+
+    Args:
+        histogram: Stage timing histogram
+
+    Returns:
+        Dict with count, avg, min, max, p50, p95, p99, total (zeros when empty)
+    """
+    if not histogram.count:
+        return {'count': 0, 'avg': 0.0, 'min': 0.0, 'max': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'total': 0.0}
+    return {
+        'count': histogram.count,
+        'avg': histogram.sum / histogram.count,
+        'min': histogram.min,
+        'max': histogram.max,
+        'p50': histogram.quantile(0.50),
+        'p95': histogram.quantile(0.95),
+        'p99': histogram.quantile(0.99),
+        'total': histogram.sum,
+    }
+
+
+class StageRun:
+    """Timing state of one generate_signal call"""
+
+    __slots__ = ('symbol', 'timeframe', 'started', 'stage', 'stage_started', 'durations')
+
+    def __init__(self, symbol: str, timeframe: str):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.started = self.stage_started = time.perf_counter()
+        self.stage: Optional[str] = None
+        self.durations: List[Tuple[str, float]] = []
+
+    def enter(self, stage: str):
+        now = time.perf_counter()
+        if self.stage is not None:
+            self.durations.append((self.stage, now - self.stage_started))
+        self.stage = stage
+        self.stage_started = now
+
+    def close(self) -> float:
+        self.enter(None)
+        return time.perf_counter() - self.started
+
+
+_current_run: contextvars.ContextVar = contextvars.ContextVar('stage_run', default=None)
+
+
+def stage(name: str):
+    """Start stage `name` of the current run (no-op outside a profiled call)"""
+    run = _current_run.get()
+    if run is not None:
+        run.enter(name)
+
+
+class StageProfiler:
+    """
+    Aggregates stage timings into bounded histograms
+
+    Args:
+        sample_every: Run cProfile on every Nth call (0 = never)
+        trace_memory: Add tracemalloc peak + top allocation sites to sampled calls
+        max_symbols: Symbols tracked individually
+    """
+
+    def __init__(self, sample_every: int = 0, trace_memory: bool = False, max_symbols: int = MAX_SYMBOLS):
+        self.sample_every = max(0, sample_every)
+        self.trace_memory = trace_memory
+        self.max_symbols = max_symbols
+        self._lock = threading.Lock()
+        self._calls = 0
+        self.by_stage: Dict[str, StreamingHistogram] = {}
+        self.by_timeframe: Dict[Tuple[str, str], StreamingHistogram] = {}
+        self.by_symbol: Dict[Tuple[str, str], StreamingHistogram] = {}
+        self._symbols = set()
+        self.outcomes: Dict[str, int] = {}
+        self.reports: deque = deque(maxlen=REPORTS_KEPT)
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+
+    def begin(self, symbol: str, timeframe: str) -> Tuple[StageRun, contextvars.Token, Any]:
+        """Start timing a call; returns the handle for end()"""
+        run = StageRun(symbol, timeframe)
+        token = _current_run.set(run)
+
+        sampler = None
+        with self._lock:
+            self._calls += 1
+            sampled = self.sample_every and self._calls % self.sample_every == 0
+        if sampled:
+            sampler = self._start_sampling()
+        return run, token, sampler
+
+    def end(self, handle: Tuple[StageRun, contextvars.Token, Any], outcome: str = 'ok'):
+        """Finish a call started with begin() and record its stages"""
+        run, token, sampler = handle
+        total = run.close()
+        _current_run.reset(token)
+        if sampler is not None:
+            self._finish_sampling(run, sampler, total)
+
+        with self._lock:
+            symbol = run.symbol
+            if symbol not in self._symbols:
+                if len(self._symbols) < self.max_symbols:
+                    self._symbols.add(symbol)
+                else:
+                    symbol = OTHER_KEY
+            for stage_name, seconds in run.durations + [(TOTAL_STAGE, total)]:
+                self._histogram(self.by_stage, stage_name).record(seconds)
+                self._histogram(self.by_timeframe, (run.timeframe, stage_name)).record(seconds)
+                self._histogram(self.by_symbol, (symbol, stage_name)).record(seconds)
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    @staticmethod
+    def _histogram(table: Dict, key) -> StreamingHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = new_histogram()
+        return histogram
+
+    # ------------------------------------------------------------------
+    # Sampling (cProfile / tracemalloc)
+    # ------------------------------------------------------------------
+
+    def _start_sampling(self):
+        profile = cProfile.Profile()
+        started_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active (e.g. concurrent sampled call) - time-only sample
+            profile = None
+        return profile, started_tracing
+
+    def _finish_sampling(self, run: StageRun, sampler, total: float):
+        profile, started_tracing = sampler
+        report = {'symbol': run.symbol, 'timeframe': run.timeframe, 'total': total,
+                  'stages': list(run.durations), 'time': time.time()}
+        if profile is not None:
+            profile.disable()
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(15)
+            report['profile'] = stream.getvalue()
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            report['memory_peak'] = tracemalloc.get_traced_memory()[1]
+            report['memory_top'] = [str(stat) for stat in snapshot.statistics('lineno')[:5]]
+            if started_tracing:
+                tracemalloc.stop()
+        self.reports.append(report)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def summary(self, by: str = 'stage', key: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Histogram summaries
+
+        Args:
+            by: 'stage', 'timeframe' or 'symbol'
+            key: Only this timeframe / symbol (all keys if None)
+
+        Returns:
+            {stage: summary} for by='stage', else {(key, stage): summary}
+        """
+        table = {'stage': self.by_stage, 'timeframe': self.by_timeframe, 'symbol': self.by_symbol}[by]
+        with self._lock:
+            if by == 'stage':
+                return {name: histogram_summary(histogram) for name, histogram in table.items()}
+            return {name: histogram_summary(histogram) for name, histogram in table.items()
+                    if key is None or name[0] == key}
+
+    def top_stages(self, limit: int = 8) -> List[Tuple[str, Dict[str, float]]]:
+        """Stages ordered by total time spent (excluding the total)"""
+        stages = [(name, stats) for name, stats in self.summary().items() if name != TOTAL_STAGE]
+        return sorted(stages, key=lambda item: item[1]['total'], reverse=True)[:limit]
+
+
+# Global instance
+_profiler: Optional[StageProfiler] = None
+
+
+def get_stage_profiler() -> StageProfiler:
+    """Get or create the global stage profiler (singleton)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StageProfiler(
+            sample_every=int(os.getenv('STAGE_PROFILE_SAMPLE_EVERY', '0') or 0),
+            trace_memory=os.getenv('STAGE_PROFILE_TRACEMALLOC', 'false').lower() == 'true'
+        )
+    return _profiler
+
+
+def reset_stage_profiler() -> None:
+    """Reset global profiler instance (for testing)"""
+    global _profiler
+    _profiler = None
@@ -12,7 +12,14 @@ Purpose:
 
 Features:
 - Idempotent (safe to run multiple times)
-- Duplicate detection (skips existing positions)
+- Incremental: journal writers stamp every new entry with a monotonically
+  increasing 'seq' (metadata.last_seq); only entries after the watermark
+  stored in positions.db are processed
+- Journal identity: metadata.journal_id is part of every journal_key, so a
+  replaced journal (new id, or seq behind the watermark) is rescanned
+  without colliding with the keys of the old one
+- Bulk insert + watermark update in one transaction
+- Duplicate detection via UNIQUE journal_key (and open-position price match)
 - Comprehensive logging
 - Error handling
 
@@ -23,6 +30,7 @@ Date: 2026-01-28
 import json
 import os
 import logging
+import time
 from typing import List, Dict, Optional
 from datetime import datetime
 from dataclasses import dataclass
@@ -75,6 +83,66 @@ class MockSignal:
             self.tp_prices = [self.tp_prices]
 
 
+def next_journal_seq(journal: Dict) -> int:
+    """
+    Allocate the sequence number of a new journal entry
+    
+    Called by journal writers right before appending a trade; bumps
+    journal['metadata']['last_seq'] and gives a journal without one its
+    journal_id (creation time in ms).
+    
+    Args:
+        journal: Journal dictionary (modified in place)
+        
+    Returns:
+        Sequence number for the new entry
+    """
+    metadata = journal.setdefault('metadata', {})
+    if metadata.get('journal_id') is None:
+        metadata['journal_id'] = int(time.time() * 1000)
+    metadata['last_seq'] = int(metadata.get('last_seq') or 0) + 1
+    return metadata['last_seq']
+
+
+def journal_key(trade: Dict, journal_id: Optional[int] = None) -> str:
+    """Stable identity of a journal entry for the positions.db UNIQUE index"""
+    if trade.get('seq') is not None:
+        if journal_id is not None:
+            return f"{journal_id}:seq:{trade['seq']}"
+        # Journal written before journal ids
+        return f"seq:{trade['seq']}"
+    # Legacy entry written before sequence numbers
+    return f"legacy:{trade.get('id')}:{trade.get('timestamp')}"
+
+
+def trades_after_watermark(journal: Dict, watermark: Optional[int]) -> List[Dict]:
+    """
+    Journal entries appended after the watermark, oldest first
+    
+    Sequence numbers grow with append order, so the scan walks back from the
+    end of the journal and stops at the first entry at or below the
+    watermark (or the first legacy entry without 'seq').
+    
+    Args:
+        journal: Journal dictionary
+        watermark: Last processed sequence number (None = never synced: all entries)
+        
+    Returns:
+        List of journal entries
+    """
+    trades = journal.get('trades', []) if journal else []
+    if watermark is None:
+        return list(trades)
+    
+    start = len(trades)
+    while start > 0:
+        seq = trades[start - 1].get('seq')
+        if seq is None or seq <= watermark:
+            break
+        start -= 1
+    return trades[start:]
+
+
 def load_journal() -> Optional[Dict]:
     """
     Load trading journal
@@ -166,6 +234,9 @@ def check_position_exists(position_manager, symbol: str, timeframe: str, entry_p
     """
     Check if position already exists in database
     
+    Note: sync_journal_to_positions() no longer calls this per trade - the
+    same match runs inside PositionManager.open_journal_positions().
+    
     Args:
         position_manager: PositionManager instance
         symbol: Trading symbol
@@ -196,10 +267,18 @@ def check_position_exists(position_manager, symbol: str, timeframe: str, entry_p
         return False
 
 
-def sync_journal_to_positions() -> Dict[str, int]:
+def sync_journal_to_positions(position_manager=None) -> Dict[str, int]:
     """
     Main sync function - sync pending journal trades to positions.db
     
+    Only journal entries appended after the stored watermark are examined;
+    their PENDING trades are inserted and the watermark advanced in one
+    transaction. A replaced journal (different journal_id, or last_seq
+    behind the watermark) is rescanned from the start.
+    
+    Args:
+        position_manager: PositionManager to use (a new one is created if None)
+    
     Returns:
         Dictionary with sync statistics: {added, skipped, errors}
     """
@@ -213,19 +292,20 @@ def sync_journal_to_positions() -> Dict[str, int]:
     logger.info("🔄 JOURNAL TO POSITIONS SYNC - START")
     logger.info("=" * 70)
     
-    try:
-        # Import PositionManager
-        from position_manager import PositionManager
-        position_manager = PositionManager()
-        
-    except ImportError as e:
-        logger.error(f"❌ Cannot import PositionManager: {e}")
-        stats['errors'] = 1
-        return stats
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize PositionManager: {e}")
-        stats['errors'] = 1
-        return stats
+    if position_manager is None:
+        try:
+            # Import PositionManager
+            from position_manager import PositionManager
+            position_manager = PositionManager()
+            
+        except ImportError as e:
+            logger.error(f"❌ Cannot import PositionManager: {e}")
+            stats['errors'] = 1
+            return stats
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize PositionManager: {e}")
+            stats['errors'] = 1
+            return stats
     
     # Load journal
     journal = load_journal()
@@ -233,66 +313,81 @@ def sync_journal_to_positions() -> Dict[str, int]:
         logger.error("❌ Failed to load journal")
         return stats
     
+    # Entries after the watermark
+    watermark = position_manager.get_journal_watermark()
+    synced_id = position_manager.get_journal_id()
+    metadata = journal.get('metadata', {})
+    last_seq = int(metadata.get('last_seq') or 0)
+    journal_id = metadata.get('journal_id')
+    rescan = False
+    if watermark is not None and synced_id is not None and journal_id != synced_id:
+        logger.warning(f"⚠️  Journal id changed ({synced_id} -> {journal_id}) - "
+                       f"journal was replaced, rescanning all entries")
+        rescan = True
+    elif watermark is not None and last_seq < watermark:
+        logger.warning(f"⚠️  Journal sequence ({last_seq}) behind watermark ({watermark}) - "
+                       f"journal was replaced, rescanning all entries")
+        rescan = True
+    if rescan:
+        watermark = None
+    
+    new_trades = trades_after_watermark(journal, watermark)
+    new_watermark = max([last_seq] + [t['seq'] for t in new_trades if t.get('seq') is not None])
+    logger.info(f"📊 {len(new_trades)} journal entries after watermark {watermark}")
+    
     # Get pending trades
-    pending_trades = get_pending_trades(journal)
-    if not pending_trades:
-        logger.info("ℹ️  No pending trades to sync")
-        return stats
+    pending_trades = get_pending_trades({'trades': new_trades})
     
-    # Process each pending trade
+    # Validate and build insert batch
+    entries = []
     for trade in pending_trades:
-        try:
-            trade_id = trade.get('id', 'unknown')
-            symbol = trade.get('symbol', '')
-            timeframe = trade.get('timeframe', '')
-            signal_type = trade.get('signal', '')
-            entry_price = trade.get('entry_price', 0)
-            
-            logger.info(f"\n📝 Processing trade #{trade_id}: {symbol} {signal_type} @ ${entry_price}")
-            
-            # Validate required fields
-            if not symbol:
-                logger.error(f"   ❌ SKIPPED - Missing symbol")
-                stats['errors'] += 1
-                continue
-            
-            if not timeframe:
-                logger.error(f"   ❌ SKIPPED - Missing timeframe")
-                stats['errors'] += 1
-                continue
-            
-            if entry_price <= 0:
-                logger.error(f"   ❌ SKIPPED - Invalid entry price: {entry_price}")
-                stats['errors'] += 1
-                continue
-            
-            # Check if already exists
-            if check_position_exists(position_manager, symbol, timeframe, entry_price):
-                logger.info(f"   ⏭️  SKIPPED - Position already exists")
-                stats['skipped'] += 1
-                continue
-            
-            # Create mock signal
-            signal = create_mock_signal(trade)
-            
-            # Add to position tracking
-            position_id = position_manager.open_position(
-                signal=signal,
-                symbol=symbol,
-                timeframe=timeframe,
-                source='JOURNAL_SYNC'
-            )
-            
-            if position_id > 0:
-                logger.info(f"   ✅ ADDED - Position ID: {position_id}")
-                stats['added'] += 1
-            else:
-                logger.error(f"   ❌ ERROR - Failed to add position")
-                stats['errors'] += 1
-                
-        except Exception as e:
-            logger.error(f"   ❌ ERROR - Exception: {e}")
+        trade_id = trade.get('id', 'unknown')
+        symbol = trade.get('symbol', '')
+        timeframe = trade.get('timeframe', '')
+        signal_type = trade.get('signal', '')
+        entry_price = trade.get('entry_price', 0)
+        
+        logger.info(f"\n📝 Processing trade #{trade_id}: {symbol} {signal_type} @ ${entry_price}")
+        
+        # Validate required fields
+        if not symbol:
+            logger.error(f"   ❌ SKIPPED - Missing symbol")
+            stats['errors'] += 1
+            continue
+        
+        if not timeframe:
+            logger.error(f"   ❌ SKIPPED - Missing timeframe")
             stats['errors'] += 1
+            continue
+        
+        if not entry_price or entry_price <= 0:
+            logger.error(f"   ❌ SKIPPED - Invalid entry price: {entry_price}")
+            stats['errors'] += 1
+            continue
+        
+        entries.append((journal_key(trade, journal_id), create_mock_signal(trade), symbol, timeframe))
+    
+    if new_watermark == watermark and journal_id == synced_id and not entries:
+        logger.info("ℹ️  No new journal entries to sync")
+        return stats
+    
+    # Bulk insert + watermark in one transaction
+    try:
+        result = position_manager.open_journal_positions(entries, new_watermark, journal_id=journal_id,
+                                                         release_keys=rescan)
+    except Exception as e:
+        logger.error(f"❌ Bulk insert failed (watermark unchanged): {e}")
+        stats['errors'] += len(entries) or 1
+        return stats
+    
+    for position_id, key in result['added']:
+        logger.info(f"   ✅ ADDED - {key} -> Position ID: {position_id}")
+    for key, error in result['errors']:
+        logger.error(f"   ❌ ERROR - {key}: {error}")
+    
+    stats['added'] += len(result['added'])
+    stats['skipped'] += result['skipped']
+    stats['errors'] += len(result['errors'])
     
     # Summary
     logger.info("\n" + "=" * 70)
@@ -301,6 +396,7 @@ def sync_journal_to_positions() -> Dict[str, int]:
     logger.info(f"✅ Added:   {stats['added']}")
     logger.info(f"⏭️  Skipped: {stats['skipped']}")
     logger.info(f"❌ Errors:  {stats['errors']}")
+    logger.info(f"🔖 Watermark: {new_watermark}")
     logger.info("=" * 70 + "\n")
     
     return stats
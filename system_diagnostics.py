@@ -17,12 +17,14 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional, Any, Tuple
 
+from log_query_engine import get_log_query_engine
+
 logger = logging.getLogger(__name__)
 
 # ==================== CONFIGURATION ====================
 # File size limits to prevent blocking I/O on large files
 # These limits are chosen based on production bot log file sizes and available memory:
-# - LOG: 500MB limit for enterprise-grade production crypto bot logs (2-4 weeks retention)
+# - LOG: 500MB reference size for production logs (grep_logs mmaps the file, so no longer a hard limit)
 # - JOURNAL: 10MB limit handles ~10,000 trades without blocking (typical: 1-5MB)
 # - LINES: 1000 lines covers last ~2 hours of activity (typical line length: 200 bytes)
 MAX_LOG_FILE_SIZE_MB = 500  # Increased for production stability (crypto bot generates verbose logs)
@@ -165,6 +167,52 @@ async def grep_logs_cached(
     return result
 
 
+async def grep_logs_cached_multi(
+    patterns: List[str],
+    hours: int = 6,
+    base_path: str = None,
+    max_lines: int = DEFAULT_MAX_LOG_LINES,
+    force_refresh: bool = False
+) -> Dict[str, List[str]]:
+    """
+    Cached multi-pattern grep - uncached patterns are answered in one pass
+    
+    Results are stored under the same cache keys as grep_logs_cached, so
+    calling this first warms the cache for subsequent single-pattern calls.
+    
+    Args:
+        patterns: Patterns to search
+        hours: Hours of logs to search
+        base_path: Base path for logs
+        max_lines: Maximum lines to read from end of file
+        force_refresh: Force fresh grep (bypass cache)
+        
+    Returns:
+        Dict of pattern -> list of matching log lines
+    """
+    cleanup_expired_cache()
+    
+    results: Dict[str, List[str]] = {}
+    missing = []
+    for pattern in patterns:
+        cache_key = f"grep_{pattern}_{hours}_{base_path or 'default'}_{max_lines}"
+        cached = None if force_refresh else get_cached_result(cache_key)
+        if cached is not None:
+            results[pattern] = cached
+        else:
+            missing.append(pattern)
+    
+    if missing:
+        logger.debug(f"🔄 Running fresh grep for {len(missing)} patterns in one pass")
+        fresh = grep_logs_multi(missing, hours, base_path, max_lines)
+        for pattern in missing:
+            cache_key = f"grep_{pattern}_{hours}_{base_path or 'default'}_{max_lines}"
+            set_cached_result(cache_key, fresh[pattern])
+            results[pattern] = fresh[pattern]
+    
+    return results
+
+
 # ==================== LOG PARSING UTILITIES ====================
 
 def grep_logs(pattern: str, hours: int = 6, base_path: str = None, max_lines: int = DEFAULT_MAX_LOG_LINES) -> List[str]:
@@ -172,16 +220,39 @@ def grep_logs(pattern: str, hours: int = 6, base_path: str = None, max_lines: in
     Grep logs for pattern in last N hours (LIGHTWEIGHT - max 1000 lines)
     
     PR #116: Added max_lines limit to prevent blocking on large log files
+    Reads backwards from the end of bot.log via mmap (see log_query_engine),
+    so file size no longer matters.
     
     Args:
         pattern: String pattern to search for
         hours: Look back N hours
         base_path: Base path for bot files
-        max_lines: Maximum lines to read from end of file (default 1000)
+        max_lines: Maximum lines to read from end of file (default 1000, None = whole window)
     
     Returns:
         List of matching log lines
     """
+    return grep_logs_multi([pattern], hours, base_path, max_lines).get(pattern, [])
+
+
+def grep_logs_multi(
+    patterns: List[str],
+    hours: int = 6,
+    base_path: str = None,
+    max_lines: int = DEFAULT_MAX_LOG_LINES
+) -> Dict[str, List[str]]:
+    """
+    Grep logs for several patterns in a single pass
+    
+    Args:
+        patterns: String patterns to search for
+        hours: Look back N hours
+        base_path: Base path for bot files
+        max_lines: Maximum lines to read from end of file (None = whole window)
+    
+    Returns:
+        Dict of pattern -> list of matching log lines
+    """
     try:
         if base_path is None:
             base_path = os.path.dirname(os.path.abspath(__file__))
@@ -189,42 +260,12 @@ def grep_logs(pattern: str, hours: int = 6, base_path: str = None, max_lines: in
         log_file = f'{base_path}/bot.log'
         
         if not os.path.exists(log_file):
-            return []
+            return {p: [] for p in patterns}
         
-        # Check file size first - skip if over limit
-        file_size = os.path.getsize(log_file)
-        max_size_bytes = MAX_LOG_FILE_SIZE_MB * 1024 * 1024
-        if file_size > max_size_bytes:
-            logger.warning(f"Log file too large ({file_size / 1024 / 1024:.1f}MB), skipping grep")
-            return []
-        
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        matching_lines = []
-        
-        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-            # Read last max_lines for performance (not entire file)
-            lines = f.readlines()
-            lines_to_check = lines[-max_lines:]  # Works correctly even if len(lines) < max_lines
-            
-            for line in lines_to_check:
-                try:
-                    # Parse timestamp (format: 2026-01-14 10:45:43,746)
-                    timestamp_match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
-                    if timestamp_match:
-                        timestamp_str = timestamp_match.group(1)
-                        log_time = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                        
-                        if log_time > cutoff_time and pattern in line:
-                            matching_lines.append(line.strip())
-                except Exception:
-                    # If timestamp parsing fails, check pattern anyway (better safe than sorry)
-                    if pattern in line:
-                        matching_lines.append(line.strip())
-        
-        return matching_lines
+        return get_log_query_engine(log_file).query(patterns, hours=hours, max_lines=max_lines)
     except Exception as e:
         logger.error(f"❌ Error grepping logs: {e}")
-        return []
+        return {p: [] for p in patterns}
 
 
 def normalize_text(text: str) -> str:
@@ -766,6 +807,9 @@ async def diagnose_scheduler_issue(base_path: str = None) -> List[Dict[str, Any]
     if base_path is None:
         base_path = os.path.dirname(os.path.abspath(__file__))
     
+    # Warm the cache for both 12h patterns in a single pass over the log
+    await grep_logs_cached_multi(['ERROR.*scheduler|ERROR.*APScheduler', 'misfire'], hours=12, base_path=base_path)
+    
     # Check for scheduler errors
     scheduler_errors = await grep_logs_cached('ERROR.*scheduler|ERROR.*APScheduler', hours=12, base_path=base_path)
     
@@ -870,6 +914,14 @@ async def diagnose_real_time_monitor_issue(base_path: str = None) -> List[Dict[s
     if base_path is None:
         base_path = os.path.dirname(os.path.abspath(__file__))
     
+    # Warm the cache for all 24h patterns in a single pass over the log
+    await grep_logs_cached_multi([
+        'cannot access free variable.*asyncio',
+        'Real-time Position Monitor STARTED',
+        'ICT_SIGNAL_ENGINE_AVAILABLE',
+        'Failed to start real-time monitor',
+    ], hours=24, base_path=base_path)
+    
     # Check for asyncio scope errors in last 24 hours
     asyncio_errors = await grep_logs_cached('cannot access free variable.*asyncio', hours=24, base_path=base_path)
     
@@ -0,0 +1,375 @@
+"""
+📮 Telegram Dispatcher
+Prioritized, rate-shaped outbound queue for Bot API sends
+
+Send paths (signals + charts, position alerts, news) used to await the Bot
+API inline, so a burst blocked the calling job and ran into flood control.
+Producers now enqueue and return; one worker task delivers:
+
+- Priority lanes: SL/TP hits > position alerts > signals > news/reports
+  (FIFO inside a lane)
+- Rate shaping: global token bucket (messages/second) plus a minimum
+  interval per chat (longer for groups)
+- Coalescing: queued text messages with the same (chat, coalesce_key) -
+  e.g. several alerts for one position - are merged into one message that
+  takes the highest priority of the merged alerts
+- Retry: RetryAfter pauses the whole queue for the requested time;
+  timeouts / network errors are retried with exponential backoff + jitter;
+  BadRequest / Forbidden fail immediately
+
+enqueue() returns an asyncio.Future resolved with the sent Message, or with
+None if delivery failed (the failure is logged), so fire-and-forget
+producers never leave unretrieved exceptions behind.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter, TimedOut
+    TELEGRAM_ERRORS_AVAILABLE = True
+except ImportError:
+    TELEGRAM_ERRORS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_CRITICAL = 0  # SL / TP hits, positions closed
+PRIORITY_ALERT = 1     # Checkpoint / progress alerts on open positions
+PRIORITY_SIGNAL = 2    # New signals, charts, command replies
+PRIORITY_NEWS = 3      # News, reports, status messages
+PRIORITIES = (PRIORITY_CRITICAL, PRIORITY_ALERT, PRIORITY_SIGNAL, PRIORITY_NEWS)
+
+DEFAULT_GLOBAL_RATE = 25.0     # messages/second across all chats (Bot API limit ~30)
+DEFAULT_CHAT_INTERVAL = 1.0    # seconds between messages to one private chat
+DEFAULT_GROUP_INTERVAL = 3.0   # seconds between messages to one group (~20/minute)
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 60.0
+
+MAX_MESSAGE_LENGTH = 4096
+COALESCE_SEPARATOR = "\n\n━━━━━━━━━━━━━━━━━━━━\n\n"
+
+
+@dataclass
+class OutboundMessage:
+    """One queued Bot API call"""
+    seq: int
+    priority: int
+    bot: Any
+    method: str
+    chat_id: Any
+    kwargs: Dict[str, Any]
+    coalesce_key: Optional[str] = None
+    futures: List[asyncio.Future] = field(default_factory=list)
+    attempts: int = 0
+    not_before: float = 0.0
+
+
+def _is_group(chat_id: Any) -> bool:
+    if isinstance(chat_id, int):
+        return chat_id < 0
+    return str(chat_id).startswith(('-', '@'))
+
+
+def _retry_after_seconds(error: Exception) -> float:
+    retry_after = getattr(error, 'retry_after', 1)
+    if hasattr(retry_after, 'total_seconds'):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class TelegramDispatcher:
+    """
+    Outbound Telegram queue with priority lanes, rate shaping, coalescing and retry
+
+    Args:
+        global_rate: Messages per second across all chats (token bucket, burst = rate)
+        chat_interval: Minimum seconds between two messages to one private chat
+        group_interval: Minimum seconds between two messages to one group/channel
+        max_retries: Retries of timeouts / network errors before giving up
+        base_backoff: First retry delay in seconds (doubles per attempt)
+        max_backoff: Retry delay cap in seconds
+    """
+
+    def __init__(
+        self,
+        global_rate: float = DEFAULT_GLOBAL_RATE,
+        chat_interval: float = DEFAULT_CHAT_INTERVAL,
+        group_interval: float = DEFAULT_GROUP_INTERVAL,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF
+    ):
+        self.global_rate = global_rate
+        self.chat_interval = chat_interval
+        self.group_interval = group_interval
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._lanes: Dict[int, deque] = {priority: deque() for priority in PRIORITIES}
+        self._coalescing: Dict[tuple, OutboundMessage] = {}
+        self._chat_ready: Dict[Any, float] = {}
+        self._tokens = global_rate
+        self._token_time = time.monotonic()
+        self._paused_until = 0.0
+        self._seq = 0
+        self._in_flight = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.stats = {'queued': 0, 'sent': 0, 'coalesced': 0, 'retried': 0, 'failed': 0}
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        bot: Any,
+        method: str,
+        chat_id: Any,
+        priority: int = PRIORITY_SIGNAL,
+        coalesce_key: Optional[str] = None,
+        **kwargs
+    ) -> asyncio.Future:
+        """
+        Queue a Bot API call and return immediately
+
+        Args:
+            bot: telegram.Bot (or anything with the given coroutine method)
+            method: 'send_message', 'send_photo', 'send_document', ...
+            chat_id: Target chat
+            priority: PRIORITY_* lane
+            coalesce_key: Merge with a queued send_message of the same chat and key
+            **kwargs: Arguments of the Bot method (text, photo, parse_mode, ...)
+
+        Returns:
+            Future resolved with the sent Message (None if delivery failed)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        if coalesce_key is not None and method == 'send_message':
+            queued = self._coalescing.get((chat_id, coalesce_key))
+            if queued is not None and self._merge(queued, priority, kwargs):
+                queued.futures.append(future)
+                self.stats['coalesced'] += 1
+                return future
+
+        self._seq += 1
+        message = OutboundMessage(self._seq, priority, bot, method, chat_id, dict(kwargs), coalesce_key, [future])
+        self._lanes[priority].append(message)
+        if coalesce_key is not None and method == 'send_message':
+            self._coalescing[(chat_id, coalesce_key)] = message
+        self.stats['queued'] += 1
+
+        self._ensure_worker(loop)
+        self._wakeup.set()
+        return future
+
+    def send_message(self, bot: Any, chat_id: Any, text: str, priority: int = PRIORITY_SIGNAL,
+                     coalesce_key: Optional[str] = None, **kwargs) -> asyncio.Future:
+        """Queue bot.send_message (see enqueue)"""
+        return self.enqueue(bot, 'send_message', chat_id, priority, coalesce_key, text=text, **kwargs)
+
+    def send_photo(self, bot: Any, chat_id: Any, photo: Any, priority: int = PRIORITY_SIGNAL,
+                   **kwargs) -> asyncio.Future:
+        """Queue bot.send_photo (see enqueue)"""
+        return self.enqueue(bot, 'send_photo', chat_id, priority, photo=photo, **kwargs)
+
+    def _merge(self, queued: OutboundMessage, priority: int, kwargs: Dict[str, Any]) -> bool:
+        """Append a text to a queued message; False if options differ or it would be too long"""
+        text = kwargs.get('text', '')
+        options = {key: value for key, value in kwargs.items() if key != 'text'}
+        queued_options = {key: value for key, value in queued.kwargs.items() if key != 'text'}
+        merged_text = f"{queued.kwargs.get('text', '')}{COALESCE_SEPARATOR}{text}"
+        if options != queued_options or len(merged_text) > MAX_MESSAGE_LENGTH:
+            return False
+
+        queued.kwargs['text'] = merged_text
+        if priority < queued.priority:
+            # Promote: keep arrival order inside the new lane
+            self._lanes[queued.priority].remove(queued)
+            lane = self._lanes[priority]
+            position = next((i for i, other in enumerate(lane) if other.seq > queued.seq), len(lane))
+            lane.insert(position, queued)
+            queued.priority = priority
+        return True
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop):
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+
+    def pending(self) -> int:
+        """Queued messages (not counting the one being sent)"""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def _interval(self, chat_id: Any) -> float:
+        return self.group_interval if _is_group(chat_id) else self.chat_interval
+
+    def _take_ready(self, now: float):
+        """
+        Pop the highest-priority message that may be sent now
+
+        Returns:
+            (message, None) or (None, seconds until the next message is ready / None if empty)
+        """
+        if now < self._paused_until:
+            return None, self._paused_until - now
+
+        next_ready = None
+        for priority in PRIORITIES:
+            lane = self._lanes[priority]
+            for message in lane:
+                ready_at = max(message.not_before, self._chat_ready.get(message.chat_id, 0.0))
+                if ready_at <= now:
+                    lane.remove(message)
+                    if message.coalesce_key is not None:
+                        key = (message.chat_id, message.coalesce_key)
+                        if self._coalescing.get(key) is message:
+                            del self._coalescing[key]
+                    return message, None
+                if next_ready is None or ready_at < next_ready:
+                    next_ready = ready_at
+        return None, (next_ready - now) if next_ready is not None else None
+
+    async def _acquire_token(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.global_rate, self._tokens + (now - self._token_time) * self.global_rate)
+            self._token_time = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.global_rate)
+
+    async def _run(self):
+        while True:
+            message, wait = self._take_ready(time.monotonic())
+            if message is None:
+                self._wakeup.clear()
+                try:
+                    if wait is None:
+                        await self._wakeup.wait()
+                    else:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._in_flight += 1
+            try:
+                await self._acquire_token()
+                await self._deliver(message)
+            finally:
+                self._in_flight -= 1
+
+    def _requeue(self, message: OutboundMessage):
+        lane = self._lanes[message.priority]
+        position = next((i for i, other in enumerate(lane) if other.seq > message.seq), len(lane))
+        lane.insert(position, message)
+
+    def _resolve(self, message: OutboundMessage, result: Any):
+        for future in message.futures:
+            if not future.done():
+                future.set_result(result)
+
+    async def _deliver(self, message: OutboundMessage):
+        photo = message.kwargs.get('photo')
+        if hasattr(photo, 'seek'):
+            photo.seek(0)  # a retried upload re-reads the buffer
+
+        try:
+            result = await getattr(message.bot, message.method)(chat_id=message.chat_id, **message.kwargs)
+        except Exception as e:
+            self._chat_ready[message.chat_id] = time.monotonic() + self._interval(message.chat_id)
+            self._handle_error(message, e)
+            return
+
+        self._chat_ready[message.chat_id] = time.monotonic() + self._interval(message.chat_id)
+        self.stats['sent'] += 1
+        self._resolve(message, result)
+
+    def _handle_error(self, message: OutboundMessage, error: Exception):
+        if TELEGRAM_ERRORS_AVAILABLE and isinstance(error, RetryAfter):
+            pause = _retry_after_seconds(error)
+            self._paused_until = time.monotonic() + pause
+            self.stats['retried'] += 1
+            logger.warning(f"⚠️ Telegram flood control: pausing sends for {pause:.1f}s")
+            self._requeue(message)
+            return
+
+        retryable = TELEGRAM_ERRORS_AVAILABLE and isinstance(error, (TimedOut, NetworkError)) \
+            and not isinstance(error, (BadRequest, Forbidden))
+        if not TELEGRAM_ERRORS_AVAILABLE:
+            retryable = isinstance(error, (asyncio.TimeoutError, ConnectionError, OSError))
+
+        message.attempts += 1
+        if retryable and message.attempts <= self.max_retries:
+            delay = min(self.max_backoff, self.base_backoff * 2 ** (message.attempts - 1))
+            message.not_before = time.monotonic() + delay * (1 + 0.1 * random.random())
+            self.stats['retried'] += 1
+            logger.warning(f"⚠️ Telegram {message.method} to {message.chat_id} failed ({error}), "
+                           f"retry {message.attempts}/{self.max_retries} in {delay:.1f}s")
+            self._requeue(message)
+            return
+
+        self.stats['failed'] += 1
+        logger.error(f"❌ Telegram {message.method} to {message.chat_id} failed: {error}")
+        self._resolve(message, None)
+
+    async def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the queue is drained
+
+        Returns:
+            True if drained, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending() or self._in_flight:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    async def stop(self):
+        """Cancel the worker (queued messages stay queued)"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
+# Global instance
+_dispatcher: Optional[TelegramDispatcher] = None
+
+
+def get_telegram_dispatcher() -> TelegramDispatcher:
+    """Get or create the global Telegram dispatcher (singleton)"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = TelegramDispatcher()
+    return _dispatcher
+
+
+def reset_telegram_dispatcher() -> None:
+    """Reset global dispatcher instance (for testing)"""
+    global _dispatcher
+    _dispatcher = None
@@ -105,7 +105,7 @@ def test_multi_pair_swing_analysis():
             return False
         
         # Check helper uses fetch_json
-        if 'await fetch_json(f"https://api.binance.com/api/v3/klines?symbol={symbol}' in content:
+        if 'await fetch_json(\n            BINANCE_KLINES_URL,' in content:
             print("  ✅ Helper function uses fetch_json for data")
         else:
             print("  ❌ Helper function doesn't use fetch_json")
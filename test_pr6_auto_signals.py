@@ -14,7 +14,8 @@ def test_auto_signal_job_exists():
     
     # Check for the function definition
     assert 'async def auto_signal_job(' in content, "auto_signal_job function not found"
-    assert 'async def auto_signal_job(timeframe: str, bot_instance)' in content, "auto_signal_job signature incorrect"
+    assert 'async def auto_signal_job(timeframe: str, bot_instance, bot_data=None, kline_cache=None)' in content, \
+        "auto_signal_job signature incorrect"
     print("✅ auto_signal_job function exists with correct signature")
 
 def test_scheduler_jobs_configured():
@@ -8,7 +8,6 @@ import os
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from pathlib import Path
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
@@ -236,7 +235,7 @@ def test_capture_function():
 
 
 def test_cache_file_format():
-    """Test replay_cache.json file format"""
+    """Test replay store segment format"""
     print("=" * 60)
     print("TEST 4: Cache File Format")
     print("=" * 60)
@@ -272,43 +271,32 @@ def test_cache_file_format():
         
         cache.save_signal(signal_data, klines)
         
-        # Read and validate JSON structure
-        cache_file = Path("replay_cache.json")
-        assert cache_file.exists(), "Cache file should exist"
-        print(f"✅ Cache file created: {cache_file}")
+        # Read and validate segment structure
+        meta_file = cache.CACHE_DIR / "segment-000001.jsonl"
+        klines_file = cache.CACHE_DIR / "segment-000001.f8"
+        assert meta_file.exists(), "Metadata segment should exist"
+        assert klines_file.exists(), "Klines segment should exist"
+        print(f"✅ Cache segments created: {meta_file}, {klines_file}")
         
-        with open(cache_file, 'r') as f:
-            cache_data = json.load(f)
-        
-        # Validate structure
-        assert 'signals' in cache_data, "Should have 'signals' key"
-        assert 'metadata' in cache_data, "Should have 'metadata' key"
-        print("✅ Cache file has correct top-level structure")
-        
-        # Validate metadata
-        metadata = cache_data['metadata']
-        assert metadata['max_signals'] == 10, "Should have max_signals = 10"
-        assert metadata['max_klines'] == 100, "Should have max_klines = 100"
-        assert metadata['version'] == "1.0", "Should have version 1.0"
-        print("✅ Metadata is correct")
+        with open(meta_file, 'r') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
         
         # Validate signal structure
-        signals = cache_data['signals']
-        assert len(signals) == 1, "Should have 1 signal"
+        assert len(entries) == 1, "Should have 1 signal"
         
-        sig = signals[0]
+        sig = entries[0]
         assert 'timestamp' in sig, "Signal should have timestamp"
         assert 'symbol' in sig, "Signal should have symbol"
         assert 'timeframe' in sig, "Signal should have timeframe"
-        assert 'klines_snapshot' in sig, "Signal should have klines_snapshot"
         assert 'original_signal' in sig, "Signal should have original_signal"
         assert 'signal_hash' in sig, "Signal should have signal_hash"
+        assert sig['rows'] == 10, "Should have 10 klines rows"
         print("✅ Signal structure is correct")
         
-        # Validate klines snapshot
-        klines_snap = sig['klines_snapshot']
+        # Validate klines snapshot (float64 rows: timestamp + OHLCV)
+        klines_snap = np.fromfile(klines_file, dtype='<f8').reshape(-1, 6)
         assert len(klines_snap) == 10, "Should have 10 klines rows"
-        assert len(klines_snap[0]) == 6, "Each kline should have 6 values (OHLCV + timestamp)"
+        assert klines_snap[0][4] == 45050.0, "Close price should round-trip exactly"
         print(f"✅ Klines snapshot is correct: {len(klines_snap)} rows")
         
         print("\n✅ TEST 4 PASSED: Cache file format is correct\n")
@@ -0,0 +1,96 @@
+"""
+tests/test_analysis_scheduler.py
+
+Tests for the candle-close-aligned analysis scheduler (analysis_scheduler.py):
+close alignment, merging of coinciding closes, concurrency coalescing,
+deadlines and lag metrics.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_scheduler import CandleCloseScheduler, due_timeframes, next_close
+
+MIDNIGHT = datetime(2026, 3, 9, tzinfo=timezone.utc).timestamp()  # a Monday
+
+
+def test_next_close_alignment():
+    assert next_close('1h', MIDNIGHT - 1) == MIDNIGHT
+    assert next_close('1h', MIDNIGHT) == MIDNIGHT + 3600  # strictly after
+    assert next_close('4h', MIDNIGHT + 3600) == MIDNIGHT + 4 * 3600
+    assert next_close('1d', MIDNIGHT + 5) == MIDNIGHT + 86400
+    assert next_close('1w', MIDNIGHT - 3 * 86400) == MIDNIGHT
+
+    timeframes = ['1d', '4h', '2h', '1h']
+    assert due_timeframes(timeframes, MIDNIGHT - 10) == (MIDNIGHT, ('1h', '2h', '4h', '1d'))
+    assert due_timeframes(timeframes, MIDNIGHT) == (MIDNIGHT + 3600, ('1h',))
+    assert due_timeframes(timeframes, MIDNIGHT + 3600) == (MIDNIGHT + 7200, ('1h', '2h'))
+
+    with pytest.raises(ValueError):
+        CandleCloseScheduler(lambda *_: None, ['7m'])
+
+
+def test_loop_fires_one_pass_per_close():
+    now = [MIDNIGHT - 0.05]
+    passes = []
+
+    async def handler(timeframes, close_time):
+        passes.append((timeframes, close_time))
+
+    async def scenario():
+        scheduler = CandleCloseScheduler(handler, ['1h', '4h', '1d'], settle_delay=0, clock=lambda: now[0])
+        scheduler.max_sleep = 0.01
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert passes == []  # waiting for the close
+        now[0] = MIDNIGHT + 1
+        await asyncio.sleep(0.05)
+        now[0] = MIDNIGHT + 3601
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert passes[0] == (('1h', '4h', '1d'), datetime(2026, 3, 9, tzinfo=timezone.utc))
+    assert [p[0] for p in passes] == [('1h', '4h', '1d'), ('1h',)]
+    assert scheduler.metrics()['timeframes']['1d']['runs'] == 1
+
+
+def test_busy_passes_are_merged_and_deadlines_enforced():
+    release = None
+    passes = []
+
+    async def handler(timeframes, close_time):
+        passes.append(timeframes)
+        if timeframes == ('1h',):
+            await release.wait()
+        if '1d' in timeframes:
+            await asyncio.sleep(10)  # exceeds the deadline
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        scheduler = CandleCloseScheduler(handler, ['1h', '2h', '1d'], deadline=0.2, clock=lambda: MIDNIGHT + 30)
+        scheduler.trigger(('1h',), MIDNIGHT - 3600)
+        assert scheduler.trigger(('1h', '2h'), MIDNIGHT - 7200) is None
+        assert scheduler.trigger(('1h', '1d'), MIDNIGHT) is None
+        release.set()
+        await asyncio.sleep(0.4)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert passes == [('1h',), ('1h', '2h', '1d')]
+
+    metrics = scheduler.metrics()
+    assert metrics['stats'] == {'passes': 2, 'ok': 1, 'timeout': 1, 'error': 0, 'coalesced': 2}
+    assert metrics['last']['status'] == 'timeout'
+    assert metrics['last']['close'] == datetime(2026, 3, 9, tzinfo=timezone.utc).isoformat()
+    assert metrics['timeframes']['1h']['max_lag'] == pytest.approx(3630)
+    assert metrics['timeframes']['2h']['avg_lag'] == pytest.approx(30)
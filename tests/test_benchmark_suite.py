@@ -0,0 +1,88 @@
+"""
+tests/test_benchmark_suite.py
+
+Tests for the synthetic OHLCV generator (synthetic_ohlcv.py) and the
+benchmark suite (benchmark_suite.py): reproducible frames, baseline
+round-trip and regression comparison.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_suite import compare_results, load_results, main, run_suite, save_results
+from synthetic_ohlcv import REGIMES, generate_ohlcv
+
+
+def test_generator_is_deterministic_and_valid():
+    for regime in REGIMES:
+        df = generate_ohlcv(500, regime, seed=7)
+        pd.testing.assert_frame_equal(df, generate_ohlcv(500, regime, seed=7))
+        assert list(df.columns) == ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        assert (df['high'] >= df[['open', 'close']].max(axis=1)).all()
+        assert (df['low'] <= df[['open', 'close']].min(axis=1)).all()
+        assert (df['volume'] > 0).all() and (df['low'] > 0).all()
+
+    assert not generate_ohlcv(500, 'trend', seed=8)['close'].equals(generate_ohlcv(500, 'trend', seed=7)['close'])
+
+    # Regimes differ in character: volatile moves more, range stays near the start
+    returns = {regime: np.log(generate_ohlcv(2000, regime)['close']).diff().std() for regime in REGIMES}
+    assert returns['volatile'] > 2 * returns['trend']
+    assert abs(generate_ohlcv(2000, 'range')['close'].iloc[-1] / 30000 - 1) < 0.2
+
+    with pytest.raises(ValueError):
+        generate_ohlcv(100)
+    with pytest.raises(ValueError):
+        generate_ohlcv(500, 'sideways')
+
+
+def test_compare_flags_regressions():
+    baseline = {'meta': {'seed': 42}, 'results': {
+        'fvg/trend/200': {'median': 0.010},
+        'ilp/trend/200': {'median': 0.010},
+        'chart/trend/200': {'median': 1.0},
+        'fibonacci/trend/200': {'median': 0.001},
+    }}
+    current = {'meta': {'seed': 42}, 'results': {
+        'fvg/trend/200': {'median': 0.013},
+        'ilp/trend/200': {'median': 0.005},
+        'chart/trend/200': {'median': 1.1},
+        'whale_blocks/trend/200': {'median': 0.001},
+    }}
+
+    rows = {row['key']: row for row in compare_results(baseline, current, threshold=0.2)}
+    assert rows['fvg/trend/200']['status'] == 'regression'
+    assert rows['fvg/trend/200']['change'] == pytest.approx(0.3)
+    assert rows['ilp/trend/200']['status'] == 'improvement'
+    assert rows['chart/trend/200']['status'] == 'ok'
+    assert rows['fibonacci/trend/200']['status'] == 'missing'
+    assert rows['whale_blocks/trend/200']['status'] == 'new'
+
+
+def test_run_save_and_compare(tmp_path):
+    results = run_suite(['whale_blocks', 'fibonacci'], ['range'], sizes=[200], repeat=2, warmup=0)
+    assert set(results['results']) == {'whale_blocks/range/200', 'fibonacci/range/200'}
+    assert results['results']['fibonacci/range/200']['runs'] == 2
+    assert results['meta']['seed'] == 42
+
+    baseline_path = str(tmp_path / 'baseline.json')
+    save_results(results, baseline_path)
+    assert load_results(baseline_path) == results
+
+    # A 10x slower run fails the compare command
+    slower = load_results(baseline_path)
+    for timing in slower['results'].values():
+        timing['median'] *= 10
+    current_path = str(tmp_path / 'current.json')
+    save_results(slower, current_path)
+    assert main(['compare', baseline_path, baseline_path]) == 0
+    assert main(['compare', baseline_path, current_path]) == 1
+
+    with pytest.raises(ValueError):
+        run_suite(['no_such_case'], sizes=[200])
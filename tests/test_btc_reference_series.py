@@ -0,0 +1,182 @@
+"""
+tests/test_btc_reference_series.py
+
+Tests for the shared BTC reference series (btc_reference_series.py):
+incremental refresh, vectorized correlations, and engine/correlator use.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btc_reference_series import BTCReferenceSeries, correlate_returns, reset_btc_reference_series
+import btc_reference_series
+
+START = pd.Timestamp('2026-03-01')
+NOW = datetime(2026, 3, 9, 8, 30)  # 200 hourly candles after START
+
+
+def _btc_closes(n=400, seed=1):
+    rng = np.random.default_rng(seed)
+    return 40000 * np.cumprod(1 + rng.normal(0, 0.004, n))
+
+
+class FakeBinance:
+    """Serves hourly BTC klines up to a moving 'now'."""
+
+    def __init__(self):
+        self.closes = _btc_closes()
+        self.now = NOW
+        self.calls = []
+
+    def __call__(self, symbol, interval, start_ms, limit):
+        assert interval in ('1h', '4h'), f"Binance has no {interval} klines"
+        self.calls.append(start_ms)
+        last = int((pd.Timestamp(self.now) - START) / pd.Timedelta(hours=1))
+        first = 0 if start_ms is None else int((pd.Timestamp(start_ms, unit='ms') - START) / pd.Timedelta(hours=1))
+        first = max(first, last + 1 - limit)
+        return [
+            [int((START + pd.Timedelta(hours=i)).value // 10**6), 0, 0, 0, self.closes[i], 0]
+            for i in range(first, last + 1)
+        ]
+
+
+@pytest.fixture
+def fake():
+    return FakeBinance()
+
+
+@pytest.fixture
+def series(fake):
+    return BTCReferenceSeries(fetcher=fake)
+
+
+def _asset(closes, beta=0.8, seed=2):
+    rng = np.random.default_rng(seed)
+    btc_returns = closes[1:] / closes[:-1] - 1
+    asset_returns = beta * btc_returns + rng.normal(0, 0.002, len(btc_returns))
+    return np.concatenate([[10.0], 10.0 * np.cumprod(1 + asset_returns)])
+
+
+class TestRefresh:
+    """BTC is fetched once per new candle, incrementally."""
+
+    def test_one_fetch_per_candle(self, series, fake):
+        for _ in range(5):
+            series.get_closes('1h', now=NOW)
+        assert fake.calls == [None]
+
+        fake.now = datetime(2026, 3, 9, 9, 0, 5)
+        closes = series.get_closes('1h', now=fake.now)
+
+        assert len(fake.calls) == 2
+        assert fake.calls[1] == int(pd.Timestamp('2026-03-09 08:00').value // 10**6)
+        assert closes.index[-1] == pd.Timestamp('2026-03-09 09:00')
+        assert closes.index.is_unique
+
+    def test_update_from_klines_without_fetch(self, series, fake):
+        series.update_from_klines('4h', [[int(START.value // 10**6), 0, 0, 0, 1.5, 0]])
+
+        assert series.get_closes('4h', refresh=False).iloc[0] == 1.5
+        assert fake.calls == []
+
+    def test_max_candles_bound(self, fake):
+        series = BTCReferenceSeries(fetcher=fake, max_candles=50)
+
+        assert len(series.get_closes('1h', now=NOW)) == 50
+
+    def test_3h_built_from_1h_incrementally(self, series, fake):
+        closes = series.get_closes('3h', now=NOW)
+
+        # 2026-03-09 08:30: last 3h candle opened 06:00 and is still forming
+        assert closes.index[-1] == pd.Timestamp('2026-03-09 06:00')
+        assert (closes.index.hour % 3 == 0).all() and closes.index.is_unique
+        assert closes.loc['2026-03-08 21:00'] == fake.closes[int((pd.Timestamp('2026-03-08 23:00') - START)
+                                                                 / pd.Timedelta(hours=1))]
+        series.get_closes('3h', now=NOW)
+        assert len(fake.calls) == 1
+
+        fake.now = datetime(2026, 3, 9, 9, 0, 5)
+        closes = series.get_closes('3h', now=fake.now)
+        assert fake.calls[1] == int(pd.Timestamp('2026-03-09 06:00').value // 10**6)
+        assert closes.index[-1] == pd.Timestamp('2026-03-09 09:00')
+        assert closes.loc['2026-03-09 06:00'] == fake.closes[int((pd.Timestamp('2026-03-09 08:00') - START)
+                                                                 / pd.Timedelta(hours=1))]
+
+    def test_fetch_failure_returns_none(self):
+        def broken(*args):
+            raise ConnectionError("offline")
+
+        assert BTCReferenceSeries(fetcher=broken).get_closes('1h', now=NOW) is None
+
+
+class TestCorrelations:
+    """Vectorized correlations match a pandas merge + pct_change + corr."""
+
+    def test_matches_pandas(self, series, fake):
+        index = START + pd.to_timedelta(np.arange(60, 180), unit='h')
+        btc = pd.Series(fake.closes[60:180], index=index)
+        assets = {f'C{i}USDT': pd.Series(_asset(btc.to_numpy(), beta=0.2 * i, seed=i), index=index)
+                  for i in range(1, 6)}
+
+        result = series.correlations('1h', assets, now=NOW)
+
+        for symbol, closes in assets.items():
+            merged = closes.to_frame('a').join(btc.to_frame('b'), how='inner').pct_change().dropna()
+            assert result[symbol] == pytest.approx(merged['a'].corr(merged['b']), abs=1e-9)
+
+    def test_gaps_use_pairwise_returns(self):
+        ref = np.array([1.0, 1.1, 1.0, 1.2, 1.3, 1.1])
+        assets = np.column_stack([ref * 2, [np.nan, 2.2, 2.0, 2.4, 2.6, 2.2]])
+
+        corr = correlate_returns(ref, assets, min_periods=3)
+
+        assert corr[0] == pytest.approx(1.0)
+        assert corr[1] == pytest.approx(1.0)
+
+    def test_insufficient_overlap_is_none(self, series):
+        index = START + pd.to_timedelta(np.arange(5), unit='h')
+
+        assert series.correlation('XUSDT', pd.Series(np.arange(1.0, 6.0), index=index), '1h', now=NOW) is None
+
+
+class TestConsumers:
+    """Engine and BTCCorrelator read the shared series."""
+
+    @pytest.fixture(autouse=True)
+    def shared(self, monkeypatch, fake):
+        reset_btc_reference_series()
+        monkeypatch.setattr(btc_reference_series, '_btc_reference_series_instance', BTCReferenceSeries(fetcher=fake))
+        yield
+        reset_btc_reference_series()
+
+    def test_correlator_uses_shared_series(self, fake):
+        from fundamental.btc_correlator import BTCCorrelator
+        index = START + pd.to_timedelta(np.arange(100, 200), unit='h')
+        symbol_df = pd.DataFrame({'close': _asset(fake.closes[100:200])}, index=index)
+
+        result = BTCCorrelator(window=30).calculate_correlation('ETHUSDT', symbol_df, timeframe='1h')
+
+        assert result is not None
+        assert result['correlation'] > 0.7
+
+    def test_engine_correlation_from_timestamp_column(self, fake):
+        ict_signal_engine = pytest.importorskip('ict_signal_engine')
+        engine = ict_signal_engine.ICTSignalEngine()
+        index = START + pd.to_timedelta(np.arange(100, 200), unit='h')
+        df = pd.DataFrame({'timestamp': index, 'close': _asset(fake.closes[100:200], beta=1.0)})
+
+        btc_reference_series.get_btc_reference_series().get_closes('1h', now=NOW)
+        correlation, aligned = engine._calculate_btc_correlation('ETHUSDT', df)
+
+        assert correlation > 0.7
+        assert aligned is True
+        # Engine refresh (wall clock is past NOW) is incremental, not a full download
+        assert all(start is not None for start in fake.calls[1:])
@@ -0,0 +1,94 @@
+"""
+tests/test_candle_frame.py
+
+Tests for compact kline frames and shared derived columns (candle_frame.py):
+parsing, dtypes, per-frame feature caching and equality with the formulas
+the detectors used inline.
+"""
+
+import gc
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candle_frame import COMPACT_DTYPE, CANDLE_COLUMNS, cached_frames, candle_features, klines_to_frame
+from synthetic_ohlcv import generate_ohlcv
+
+KLINE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'close_time', 'quote_volume',
+                 'trades', 'taker_buy_base', 'taker_buy_quote', 'ignore']
+
+
+def _klines(n=60):
+    df = generate_ohlcv(200, 'volatile', seed=5).head(n)
+    opens = (df['timestamp'].astype('int64') // 10 ** 6).tolist()
+    return [[t, f"{o:.8f}", f"{h:.8f}", f"{lo:.8f}", f"{c:.8f}", f"{v:.8f}", t + 3599999, "0", 10, "0", "0", "0"]
+            for t, o, h, lo, c, v in zip(opens, df['open'], df['high'], df['low'], df['close'], df['volume'])]
+
+
+def test_klines_to_frame_matches_legacy_parsing():
+    klines = _klines()
+    legacy = pd.DataFrame(klines, columns=KLINE_COLUMNS)
+    legacy['timestamp'] = pd.to_datetime(legacy['timestamp'], unit='ms')
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        legacy[col] = legacy[col].astype(float)
+
+    frame = klines_to_frame(klines)
+    assert tuple(frame.columns) == CANDLE_COLUMNS
+    pd.testing.assert_frame_equal(frame, legacy[list(CANDLE_COLUMNS)])
+    assert frame.memory_usage(deep=True).sum() * 4 < legacy.memory_usage(deep=True).sum()
+
+    indexed = klines_to_frame(klines, set_index=True)
+    assert isinstance(indexed.index, pd.DatetimeIndex) and list(indexed.columns) == list(CANDLE_COLUMNS[1:])
+    assert (klines_to_frame(klines, dtype=COMPACT_DTYPE).dtypes[1:] == np.float32).all()
+    assert len(klines_to_frame([])) == 0 and list(klines_to_frame([]).columns) == list(CANDLE_COLUMNS)
+
+
+def test_features_are_computed_once_per_frame():
+    from fvg_detector import FVGDetector
+    from order_block_detector import OrderBlockDetector
+
+    df = generate_ohlcv(300, 'trend').set_index('timestamp')
+    features = candle_features(df)
+    assert candle_features(df) is features
+    assert candle_features(df.copy()) is not features
+
+    OrderBlockDetector()._prepare_dataframe(df)
+    computed = features.computed
+    FVGDetector()._prepare_dataframe(df)
+    # FVG only adds ATR (+ true range); volume_ma / volume_ratio / price_change come from the cache
+    assert features.computed == computed + 2
+    assert features.atr(14) is features.atr(14)
+
+    count = len(cached_frames())
+    del df, features
+    gc.collect()
+    assert len(cached_frames()) < count
+
+
+def test_features_match_inline_formulas():
+    df = generate_ohlcv(500, 'range', seed=9)
+    df.loc[10, ['open', 'high', 'low', 'close']] = 100.0  # zero-range candle
+    df.loc[20, 'volume'] = 0.0
+    features = candle_features(df)
+
+    tr = pd.concat([df['high'] - df['low'], abs(df['high'] - df['close'].shift()),
+                    abs(df['low'] - df['close'].shift())], axis=1).max(axis=1)
+    body = abs(df['close'] - df['open'])
+    candle_range = df['high'] - df['low']
+    upper = df['high'] - df[['open', 'close']].max(axis=1)
+    lower = df[['open', 'close']].min(axis=1) - df['low']
+    volume_ma = df['volume'].rolling(window=20).mean()
+    volume_median = df['volume'].rolling(window=20).median()
+
+    np.testing.assert_array_equal(features.atr(14), tr.rolling(window=14).mean().to_numpy())
+    np.testing.assert_array_equal(features.body_ratio(), (body / candle_range.replace(0, 1)).to_numpy())
+    np.testing.assert_array_equal(features.wick_ratio(), ((upper + lower) / candle_range.replace(0, 1)).to_numpy())
+    np.testing.assert_array_equal(features.price_change(), (df['close'].pct_change() * 100).to_numpy())
+    np.testing.assert_array_equal(features.volume_ratio(20), (df['volume'] / volume_ma.replace(0, 1)).to_numpy())
+    np.testing.assert_array_equal(features.volume_ratio(20, average='median'),
+                                  (df['volume'] / volume_median.replace(0, 1)).to_numpy())
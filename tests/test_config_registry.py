@@ -0,0 +1,166 @@
+"""
+tests/test_config_registry.py
+
+Tests for the in-memory config registry (config/config_registry.py) and the
+feature flag / risk config consumers built on it.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config_loader
+from config.config_registry import ConfigRegistry, get_config_registry, reset_config_registry
+
+
+def _write(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    # Make the change visible to mtime polling even on coarse clocks
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def registry():
+    return ConfigRegistry(poll_interval=0)
+
+
+class TestConfigRegistry:
+    """Parse once, serve from memory, reload on change."""
+
+    def test_lookup_dotted_paths(self, registry, tmp_path):
+        path = tmp_path / 'flags.json'
+        _write(path, {'a': {'b': {'c': 3}}, 'flag': True})
+        registry.register('flags', str(path))
+
+        assert registry.lookup('flags', 'a.b.c') == 3
+        assert registry.lookup('flags', 'flag') is True
+        assert registry.lookup('flags', 'a.missing', 'dflt') == 'dflt'
+        assert registry.lookup('flags', 'flag.nested', 'dflt') == 'dflt'
+
+    def test_no_reparse_without_change(self, registry, tmp_path, monkeypatch):
+        path = tmp_path / 'flags.json'
+        _write(path, {'x': 1})
+        registry.register('flags', str(path))
+        loads = []
+        original = json.load
+        monkeypatch.setattr(json, 'load', lambda f: loads.append(1) or original(f))
+
+        for _ in range(100):
+            registry.lookup('flags', 'x')
+
+        assert loads == []
+
+    def test_reload_on_file_change(self, registry, tmp_path):
+        path = tmp_path / 'flags.json'
+        _write(path, {'x': 1})
+        registry.register('flags', str(path))
+        seen = []
+        registry.subscribe('flags', seen.append)
+
+        _write(path, {'x': 2})
+
+        assert registry.lookup('flags', 'x') == 2
+        assert seen == [{'x': 2}]
+
+    def test_poll_interval_limits_stat_calls(self, tmp_path):
+        registry = ConfigRegistry(poll_interval=3600)
+        path = tmp_path / 'flags.json'
+        _write(path, {'x': 1})
+        registry.register('flags', str(path))
+
+        _write(path, {'x': 2})
+
+        assert registry.lookup('flags', 'x') == 1
+        registry.reload('flags')
+        assert registry.lookup('flags', 'x') == 2
+
+    def test_broken_edit_keeps_previous_snapshot(self, registry, tmp_path):
+        path = tmp_path / 'flags.json'
+        _write(path, {'x': 1})
+        registry.register('flags', str(path))
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"x": ')
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2 * 10**9))
+
+        assert registry.lookup('flags', 'x') == 1
+
+    def test_defaults_and_create_if_missing(self, registry, tmp_path):
+        path = tmp_path / 'risk.json'
+        registry.register('risk', str(path), {'a': 1, 'b': 2}, create_if_missing=True)
+
+        assert json.loads(path.read_text()) == {'a': 1, 'b': 2}
+        registry.write('risk', {'a': 5})
+        assert registry.get('risk') == {'a': 5, 'b': 2}
+
+
+class TestConsumers:
+    """config_loader and RiskManager read through the registry."""
+
+    @pytest.fixture(autouse=True)
+    def isolated(self, tmp_path, monkeypatch):
+        reset_config_registry()
+        flags = tmp_path / 'feature_flags.json'
+        _write(flags, {'fundamental_analysis': {'enabled': True}, 'use_ict_only': False})
+        monkeypatch.setattr(config_loader, 'CONFIG_PATH', str(flags))
+        yield flags
+        reset_config_registry()
+
+    def test_feature_flag_functions(self):
+        assert config_loader.is_feature_enabled('fundamental_analysis.enabled') is True
+        assert config_loader.get_feature_flag('fundamental_analysis.missing', 'x') == 'x'
+        assert config_loader.get_flag('use_ict_only') is False
+
+    def test_load_feature_flags_returns_copy(self):
+        flags = config_loader.load_feature_flags()
+        flags['fundamental_analysis']['enabled'] = False
+
+        assert config_loader.is_feature_enabled('fundamental_analysis.enabled') is True
+
+    def test_toggle_and_update_persist(self, isolated):
+        assert config_loader.toggle_flag('use_ict_only') is True
+        assert config_loader.update_feature_flag('pr8.enabled', True) is True
+
+        on_disk = json.loads(isolated.read_text())
+        assert on_disk['use_ict_only'] is True
+        assert on_disk['pr8'] == {'enabled': True}
+        assert config_loader.get_flag('pr8.enabled') is True
+
+    def test_risk_manager_config_live(self, tmp_path):
+        from risk_management import RiskManager
+        get_config_registry().poll_interval = 0
+        path = tmp_path / 'risk_config.json'
+        manager = RiskManager(config_file=str(path))
+
+        assert manager.config['max_concurrent_trades'] == 5
+        manager.update_portfolio_balance(2500.0)
+        assert json.loads(path.read_text())['portfolio_balance'] == 2500.0
+
+        _write(path, {'max_concurrent_trades': 2})
+        assert manager.config['max_concurrent_trades'] == 2
+        assert manager.config['portfolio_balance'] == 1000.0
+
+    def test_risk_manager_update_setting_keeps_snapshot(self, tmp_path):
+        from risk_management import RiskManager
+        path = tmp_path / 'risk_config.json'
+        manager = RiskManager(config_file=str(path))
+        snapshot = manager.config
+
+        manager.update_setting('max_concurrent_trades', 3.0)
+
+        assert snapshot['max_concurrent_trades'] == 5
+        assert manager.config['max_concurrent_trades'] == 3.0
+        assert json.loads(path.read_text())['max_concurrent_trades'] == 3.0
+
+    def test_flag_integration_is_opt_in(self, monkeypatch):
+        monkeypatch.delenv('FEATURE_FLAG_INTEGRATION', raising=False)
+        assert config_loader.feature_flag_integration_enabled() is False
+        monkeypatch.setenv('FEATURE_FLAG_INTEGRATION', 'true')
+        assert config_loader.feature_flag_integration_enabled() is True
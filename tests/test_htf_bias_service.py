@@ -0,0 +1,141 @@
+"""
+tests/test_htf_bias_service.py
+
+Tests for the per-symbol HTF bias cache (htf_bias_service.HTFBiasService)
+and the last-closed-candle helper it is keyed on.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from htf_bias_service import HTFBiasService, get_htf_bias_service, reset_htf_bias_service
+from utils.candle_time import last_closed_candle_key, timeframe_duration
+
+
+def _daily(rows=60, start='2026-01-01'):
+    """Daily frame in the bot.fetch_mtf_data layout (timestamp column, RangeIndex)."""
+    close = np.linspace(100.0, 130.0, rows)
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start=start, periods=rows, freq='1D'),
+        'open': close - 1,
+        'high': close + 2,
+        'low': close - 2,
+        'close': close,
+        'volume': np.full(rows, 1000.0),
+    })
+
+
+class _Counter:
+    def __init__(self, bias='BULLISH'):
+        self.calls = 0
+        self.bias = bias
+
+    def __call__(self, df):
+        self.calls += 1
+        return self.bias, {'order_blocks': []}
+
+
+class TestLastClosedCandleKey:
+    """The key changes only when a new candle closes."""
+
+    def test_forming_candle_is_ignored(self):
+        df = _daily()  # last candle opens 2026-03-01
+        forming = last_closed_candle_key(df, '1d', now=datetime(2026, 3, 1, 15, 0))
+        closed = last_closed_candle_key(df, '1d', now=datetime(2026, 3, 2, 0, 0))
+
+        assert forming[0] == pd.Timestamp('2026-02-28')
+        assert closed[0] == pd.Timestamp('2026-03-01')
+
+    def test_datetime_index_supported(self):
+        df = _daily().set_index('timestamp')
+
+        key = last_closed_candle_key(df, '1d', now=datetime(2026, 3, 1, 15, 0))
+
+        assert key[0] == pd.Timestamp('2026-02-28')
+
+    def test_month_timeframe_has_no_duration(self):
+        assert timeframe_duration('1M') is None
+        assert timeframe_duration('4H') == timeframe_duration('4h')
+
+
+class TestHTFBiasService:
+    """Bias is computed once per (symbol, HTF, closed candle)."""
+
+    def test_reused_until_new_candle_closes(self):
+        service = HTFBiasService()
+        compute = _Counter()
+        df = _daily()
+
+        for hour in (1, 5, 12, 23):
+            bias, _ = service.get_bias('BTCUSDT', '1d', df, compute, now=datetime(2026, 3, 1, hour))
+            assert bias == 'BULLISH'
+        assert compute.calls == 1
+
+        service.get_bias('BTCUSDT', '1d', df, compute, now=datetime(2026, 3, 2, 0, 1))
+        assert compute.calls == 2
+        assert service.get_stats()['hits'] == 3
+
+    def test_symbols_and_timeframes_are_separate(self):
+        service = HTFBiasService()
+        compute = _Counter()
+        df = _daily()
+        now = datetime(2026, 3, 1, 12)
+
+        service.get_bias('BTCUSDT', '1d', df, compute, now=now)
+        service.get_bias('ETHUSDT', '1d', df, compute, now=now)
+        service.get_bias('BTCUSDT', '4h', df, compute, now=now)
+
+        assert compute.calls == 3
+
+    def test_lru_eviction_and_invalidate(self):
+        service = HTFBiasService(max_entries=2)
+        compute = _Counter()
+        now = datetime(2026, 3, 1, 12)
+        for symbol in ('A', 'B', 'C'):
+            service.get_bias(symbol, '1d', _daily(), compute, now=now)
+
+        assert service.get_stats()['entries'] == 2
+        assert service.invalidate('B') == 1
+        assert service.invalidate() == 1
+
+    def test_singleton_reset(self):
+        reset_htf_bias_service()
+        first = get_htf_bias_service()
+
+        assert get_htf_bias_service() is first
+        reset_htf_bias_service()
+        assert get_htf_bias_service() is not first
+
+
+class TestEngineIntegration:
+    """ICTSignalEngine routes HTF bias through the shared service."""
+
+    def test_engine_reuses_cached_bias(self, monkeypatch):
+        ict_signal_engine = pytest.importorskip('ict_signal_engine')
+        reset_htf_bias_service()
+        engine = ict_signal_engine.ICTSignalEngine()
+        calls = []
+        original = engine._compute_htf_bias
+
+        def counting(df, tf):
+            calls.append(tf)
+            return original(df, tf)
+
+        monkeypatch.setattr(engine, '_compute_htf_bias', counting)
+        mtf_data = {'1d': _daily(rows=120, start='2020-01-01'), '4h': None}
+
+        first = engine._get_htf_bias_with_fallback('BTCUSDT', mtf_data)
+        second = engine._get_htf_bias_with_fallback('BTCUSDT', mtf_data)
+
+        assert first == second
+        assert calls == ['1d']
+        assert hasattr(engine, 'htf_components')
+        reset_htf_bias_service()
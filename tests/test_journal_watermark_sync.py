@@ -0,0 +1,175 @@
+"""
+tests/test_journal_watermark_sync.py
+
+Tests for the incremental journal -> positions sync: journal sequence
+numbers, the positions.db watermark, bulk insert in one transaction, the
+UNIQUE journal_key constraint and rescans of a replaced journal.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import init_positions_db
+import sync_journal_to_positions as sync
+from position_manager import PositionManager
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'positions.db')
+    monkeypatch.setattr(init_positions_db, 'DB_PATH', path)
+    init_positions_db.create_positions_database()
+    return path
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    path = str(tmp_path / 'trading_journal.json')
+    monkeypatch.setattr(sync, 'JOURNAL_PATH', path)
+    data = {'metadata': {'total_trades': 0}, 'trades': []}
+
+    def replace():
+        """Start over with a new journal file (ids created in the same ms stay distinct)"""
+        data['metadata'] = {'total_trades': 0, 'journal_id': data['metadata']['journal_id'] + 1}
+        data['trades'] = []
+
+    def append(symbol, entry_price, status='PENDING', **fields):
+        trade = {'id': len(data['trades']) + 1, 'timestamp': '2026-03-10T12:00:00', 'symbol': symbol,
+                 'timeframe': '1h', 'signal': 'BUY', 'confidence': 75, 'entry_price': entry_price,
+                 'tp_price': entry_price * 1.02, 'sl_price': entry_price * 0.99, 'status': status}
+        trade.update(fields)
+        trade.setdefault('seq', sync.next_journal_seq(data))
+        data['trades'].append(trade)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return trade
+
+    append.data = data
+    append.replace = replace
+    return append
+
+
+def _positions(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT symbol, entry_price, source, journal_key FROM open_positions ORDER BY id").fetchall()
+
+
+def test_sync_is_incremental_and_idempotent(db_path, journal):
+    manager = PositionManager(db_path=db_path)
+    journal('BTCUSDT', 100.0)
+    journal('ETHUSDT', 50.0, status='COMPLETED')
+    journal('SOLUSDT', 20.0)
+
+    assert sync.sync_journal_to_positions(manager) == {'added': 2, 'skipped': 0, 'errors': 0}
+    journal_id = journal.data['metadata']['journal_id']
+    assert manager.get_journal_watermark() == 3 and manager.get_journal_id() == journal_id
+    assert [row[3] for row in _positions(db_path)] == [f'{journal_id}:seq:1', f'{journal_id}:seq:3']
+
+    # Nothing new: no inserts, even after the synced position is closed
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE open_positions SET status = 'CLOSED' WHERE journal_key = ?", (f'{journal_id}:seq:1',))
+    assert sync.sync_journal_to_positions(manager) == {'added': 0, 'skipped': 0, 'errors': 0}
+
+    journal('XRPUSDT', 0.5)
+    assert sync.sync_journal_to_positions(manager)['added'] == 1
+    assert manager.get_journal_watermark() == 4
+    assert len(_positions(db_path)) == 3
+
+
+def test_open_position_match_and_unique_key(db_path, journal):
+    manager = PositionManager(db_path=db_path)
+    auto = sync.create_mock_signal({'symbol': 'BTCUSDT', 'timeframe': '1h', 'signal': 'BUY',
+                                    'entry_price': 100.0, 'tp_price': 102.0, 'sl_price': 99.0})
+    manager.open_position(auto, 'BTCUSDT', '1h', source='AUTO')
+
+    journal('BTCUSDT', 100.005)  # same signal, already tracked by the AUTO position
+    journal('BTCUSDT', 101.0)
+    journal('BTCUSDT', 101.0)    # duplicate inside the batch
+    journal('ETHUSDT', 50.0, tp_price=None)  # tp1_price NOT NULL -> error, batch continues
+    journal('', 10.0)
+
+    stats = sync.sync_journal_to_positions(manager)
+
+    assert stats == {'added': 1, 'skipped': 2, 'errors': 2}
+    assert [row[:3] for row in _positions(db_path)] == [('BTCUSDT', 100.0, 'AUTO'), ('BTCUSDT', 101.0, 'JOURNAL_SYNC')]
+
+    key = sync.journal_key({'seq': 2}, journal.data['metadata']['journal_id'])
+    result = manager.open_journal_positions([(key, auto, 'ADAUSDT', '1h')], watermark=5)
+    assert result['added'] == [] and result['skipped'] == 1  # journal_key already inserted
+
+
+def test_legacy_entries_synced_once(db_path, journal):
+    manager = PositionManager(db_path=db_path)
+    journal('BTCUSDT', 100.0, seq=None)  # written before sequence numbers
+
+    assert sync.sync_journal_to_positions(manager)['added'] == 1
+    assert manager.get_journal_watermark() == 1  # metadata.last_seq advanced by the fixture
+    assert sync.sync_journal_to_positions(manager)['added'] == 0
+
+
+def test_replaced_journal_is_rescanned(db_path, journal):
+    manager = PositionManager(db_path=db_path)
+    journal('BTCUSDT', 100.0)
+    journal('ETHUSDT', 50.0)
+    journal('SOLUSDT', 20.0)
+    assert sync.sync_journal_to_positions(manager)['added'] == 3
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE open_positions SET status = 'CLOSED'")
+
+    # New journal file, seq restarts at 1 - must not collide with the closed rows
+    journal.replace()
+    journal('XRPUSDT', 0.5)
+    journal('ADAUSDT', 0.4)
+    assert journal.data['metadata']['last_seq'] == 2
+    assert sync.sync_journal_to_positions(manager) == {'added': 2, 'skipped': 0, 'errors': 0}
+    assert manager.get_journal_watermark() == 2
+    assert manager.get_journal_id() == journal.data['metadata']['journal_id']
+
+    # Same journal with more entries than the old one: id change alone triggers the rescan
+    journal.replace()
+    for symbol in ['DOGEUSDT', 'LINKUSDT', 'DOTUSDT', 'AVAXUSDT']:
+        journal(symbol, 1.0 + len(symbol))
+    assert sync.sync_journal_to_positions(manager)['added'] == 4
+    assert sync.sync_journal_to_positions(manager)['added'] == 0
+
+    # Journal without an id (written before journal ids): old 'seq:N' keys are released
+    signal = sync.create_mock_signal({'symbol': 'BNBUSDT', 'timeframe': '1h', 'signal': 'BUY',
+                                      'entry_price': 300.0, 'tp_price': 306.0, 'sl_price': 297.0})
+    manager.open_journal_positions([(sync.journal_key({'seq': 1}), signal, 'BNBUSDT', '1h')], watermark=9)
+    trade = dict(journal.data['trades'][0], symbol='TRXUSDT', seq=1)
+    with open(sync.JOURNAL_PATH, 'w') as f:
+        json.dump({'metadata': {'last_seq': 1}, 'trades': [trade]}, f)
+    assert sync.sync_journal_to_positions(manager)['added'] == 1
+    assert manager.get_journal_id() is None
+    assert len(_positions(db_path)) == 3 + 2 + 4 + 2
+
+
+def test_trades_after_watermark():
+    trades = [{'id': 1}, {'id': 2, 'seq': 1}, {'id': 3, 'seq': 2}, {'id': 4, 'seq': 3}]
+
+    assert sync.trades_after_watermark({'trades': trades}, None) == trades
+    assert sync.trades_after_watermark({'trades': trades}, 1) == trades[2:]
+    assert sync.trades_after_watermark({'trades': trades}, 3) == []
+    assert sync.journal_key(trades[0]) == 'legacy:1:None'
+    assert sync.journal_key(trades[1]) == 'seq:1'
+    assert sync.journal_key(trades[1], 1773014400000) == '1773014400000:seq:1'
+
+
+def test_schema_migration_on_old_database(tmp_path):
+    path = str(tmp_path / 'old.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE open_positions (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT)")
+
+    manager = PositionManager(db_path=path)
+
+    with sqlite3.connect(path) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(open_positions)")}
+    assert 'journal_key' in columns
+    assert manager.get_journal_watermark() is None
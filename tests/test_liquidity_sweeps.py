@@ -0,0 +1,99 @@
+"""
+tests/test_liquidity_sweeps.py
+
+The sorted-level LiquidityMapper.detect_liquidity_sweeps must produce the
+same sweeps as the bar-by-bar zone scan built from _check_fake_breakout,
+_calculate_sweep_strength and _count_reversal_candles.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from liquidity_map import LiquidityMapper, LiquidityZone
+
+
+def _per_bar_sweeps(mapper, df, zones):
+    """Reference: every bar against every zone."""
+    sweeps = []
+    volume_ma = df['volume'].rolling(20).mean()
+    for i in range(20, len(df)):
+        candle = df.iloc[i]
+        for order, zone in enumerate(zones):
+            if zone.swept:
+                continue
+            if zone.zone_type == 'BSL':
+                pierced = candle['high'] > zone.price_level and candle['close'] < zone.price_level
+                price, direction = candle['high'], 'down'
+            else:
+                pierced = candle['low'] < zone.price_level and candle['close'] > zone.price_level
+                price, direction = candle['low'], 'up'
+            if pierced and mapper._check_fake_breakout(df, i, zone.price_level, zone.zone_type):
+                spike = candle['volume'] / volume_ma.iloc[i] if volume_ma.iloc[i] > 0 else 1.0
+                sweeps.append((df.index[i], price, f'{zone.zone_type}_SWEEP', order,
+                               mapper._calculate_sweep_strength(df, i, zone),
+                               mapper._count_reversal_candles(df, i, direction), spike))
+                zone.swept = True
+    return sweeps
+
+
+def _ohlcv(n, seed, with_nans=False):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, n))
+    open_ = np.roll(close, 1) * (1 + rng.normal(0, 0.003, n))
+    open_[0] = close[0]
+    df = pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, n))),
+        'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, n))),
+        'close': close,
+        'volume': rng.lognormal(10, 0.8, n),
+    }, index=pd.date_range('2026-01-01', periods=n, freq='h'))
+    if with_nans:
+        for column in df.columns:
+            df.loc[df.index[rng.choice(n, n // 40)], column] = np.nan
+    return df
+
+
+def _zones(df, count, seed):
+    rng = np.random.default_rng(seed + 100)
+    low, high = np.nanmin(df['low']), np.nanmax(df['high'])
+    zones = [LiquidityZone(float(rng.uniform(low, high)), str(rng.choice(['BSL', 'SSL'])), 0.5, 3,
+                           None, None, 1.0, swept=bool(rng.random() < 0.05), confidence=float(rng.random()))
+             for _ in range(count)]
+    zones.append(zones[3])  # same zone listed twice
+    return zones
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('with_nans', [False, True])
+def test_matches_per_bar_scan(seed, with_nans):
+    df = _ohlcv(500, seed, with_nans)
+    zones, reference_zones = _zones(df, 150, seed), _zones(df, 150, seed)
+
+    mapper = LiquidityMapper()
+    result = mapper.detect_liquidity_sweeps(df, zones)
+    expected = _per_bar_sweeps(LiquidityMapper(), df, reference_zones)
+
+    assert len(expected) > 0
+    got = [(s.timestamp, s.price, s.sweep_type, next(i for i, z in enumerate(zones) if z is s.liquidity_zone),
+            s.strength, s.reversal_candles, s.volume_spike) for s in result]
+    assert len(got) == len(expected)
+    for a, b in zip(got, expected):
+        assert all(x == y or (x != x and y != y) for x, y in zip(a, b))
+    assert [z.swept for z in zones] == [z.swept for z in reference_zones]
+    assert mapper.sweep_events == result
+
+
+def test_short_frame_and_no_zones():
+    mapper = LiquidityMapper()
+    df = _ohlcv(15, 0)
+
+    assert mapper.detect_liquidity_sweeps(df, _zones(_ohlcv(50, 0), 10, 0)) == []
+    assert mapper.detect_liquidity_sweeps(_ohlcv(100, 1), []) == []
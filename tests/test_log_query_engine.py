@@ -0,0 +1,131 @@
+"""
+tests/test_log_query_engine.py
+
+Tests for the mmap/sparse-index log query engine used by system_diagnostics.
+Results are compared with a naive readlines() + strptime scan.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import log_query_engine
+from log_query_engine import LogQueryEngine
+from system_diagnostics import grep_logs, grep_logs_multi
+
+
+NOW = datetime(2026, 1, 14, 12, 0, 0)
+MESSAGES = ['auto_signal_job ran', 'ERROR in journal', 'misfire detected', 'heartbeat ok']
+
+
+def _write_log(path, start, count, step_seconds=10):
+    """Write a log with one line per step, plus an occasional traceback line."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            ts = start + timedelta(seconds=i * step_seconds)
+            f.write(f"{ts.strftime('%Y-%m-%d %H:%M:%S')},123 - INFO - {MESSAGES[i % len(MESSAGES)]} #{i}\n")
+            if i % 50 == 0:
+                f.write("Traceback line without timestamp ERROR in journal\n")
+
+
+def _naive(paths, pattern, hours):
+    cutoff = NOW - timedelta(hours=hours)
+    result = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f.readlines():
+                try:
+                    log_time = datetime.strptime(line[:19], '%Y-%m-%d %H:%M:%S')
+                except ValueError:
+                    continue
+                if log_time > cutoff and pattern in line:
+                    result.append(line.strip())
+    return result
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    # bot.log.1 is the older rotated file, bot.log the active one
+    _write_log(tmp_path / 'bot.log.1', NOW - timedelta(hours=30), 5000)
+    _write_log(tmp_path / 'bot.log', NOW - timedelta(hours=16), 5760)
+    return tmp_path
+
+
+class TestTimeWindowQueries:
+    """Whole-window queries match a naive full scan across rotated files."""
+
+    @pytest.mark.parametrize("hours", [1, 6, 20, 48])
+    def test_matches_naive_scan(self, log_dir, monkeypatch, hours):
+        monkeypatch.setattr(log_query_engine, 'INDEX_STRIDE_BYTES', 1024)
+        engine = LogQueryEngine(str(log_dir / 'bot.log'))
+        paths = [str(log_dir / 'bot.log.1'), str(log_dir / 'bot.log')]
+
+        result = engine.query(['ERROR in journal'], hours=hours, now=NOW)
+
+        assert result['ERROR in journal'] == _naive(paths, 'ERROR in journal', hours)
+
+    def test_multiple_patterns_in_one_pass(self, log_dir):
+        engine = LogQueryEngine(str(log_dir / 'bot.log'))
+        paths = [str(log_dir / 'bot.log.1'), str(log_dir / 'bot.log')]
+
+        result = engine.query(['misfire', 'auto_signal_job'], hours=6, now=NOW)
+
+        assert result['misfire'] == _naive(paths, 'misfire', 6)
+        assert result['auto_signal_job'] == _naive(paths, 'auto_signal_job', 6)
+
+    def test_sparse_index_reused(self, log_dir, monkeypatch):
+        monkeypatch.setattr(log_query_engine, 'INDEX_STRIDE_BYTES', 1024)
+        engine = LogQueryEngine(str(log_dir / 'bot.log'))
+        engine.query(['misfire'], hours=3, now=NOW)
+
+        assert any(index.offsets for index in engine._indexes.values())
+
+
+class TestTailQueries:
+    """max_lines queries read backwards from the end of the log."""
+
+    def test_tail_matches_last_lines(self, log_dir):
+        engine = LogQueryEngine(str(log_dir / 'bot.log'))
+        with open(log_dir / 'bot.log', 'r', encoding='utf-8') as f:
+            tail = f.readlines()[-1000:]
+        cutoff = NOW - timedelta(hours=24)
+        expected = [
+            l.strip() for l in tail
+            if l[:4].isdigit() and datetime.strptime(l[:19], '%Y-%m-%d %H:%M:%S') > cutoff and 'misfire' in l
+        ]
+
+        result = engine.query(['misfire'], hours=24, max_lines=1000, now=NOW)['misfire']
+
+        assert result == expected
+        assert result  # sanity: there is something to find
+
+    def test_tail_stops_at_cutoff(self, log_dir):
+        engine = LogQueryEngine(str(log_dir / 'bot.log'))
+
+        result = engine.query(['heartbeat'], hours=0.5, max_lines=100000, now=NOW)
+
+        assert result['heartbeat'] == _naive([str(log_dir / 'bot.log')], 'heartbeat', 0.5)
+
+
+class TestSystemDiagnosticsIntegration:
+    """grep_logs keeps its signature and handles missing logs."""
+
+    def test_missing_log_returns_empty(self, tmp_path):
+        assert grep_logs('ERROR', hours=1, base_path=str(tmp_path)) == []
+        assert grep_logs_multi(['a', 'b'], base_path=str(tmp_path)) == {'a': [], 'b': []}
+
+    def test_grep_logs_uses_engine(self, tmp_path):
+        now = datetime.now()
+        with open(tmp_path / 'bot.log', 'w', encoding='utf-8') as f:
+            f.write(f"{(now - timedelta(hours=2)).strftime('%Y-%m-%d %H:%M:%S')},000 - ERROR old\n")
+            f.write(f"{(now - timedelta(minutes=5)).strftime('%Y-%m-%d %H:%M:%S')},000 - ERROR new\n")
+
+        result = grep_logs('ERROR', hours=1, base_path=str(tmp_path))
+
+        assert len(result) == 1
+        assert result[0].endswith('ERROR new')
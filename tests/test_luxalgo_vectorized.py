@@ -0,0 +1,146 @@
+"""
+tests/test_luxalgo_vectorized.py
+
+The array-based LuxAlgoSRMTF / LuxAlgoICT analyze passes must match the
+per-bar detectors they replaced (detect_pivot_*, detect_swing_*,
+detect_order_block, detect_fvg, detect_break_of_structure, mitigation checks).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from luxalgo_ict_concepts import LiquidityLevel, LuxAlgoICT, SwingPoint, SwingType
+from luxalgo_sr_mtf import LuxAlgoSRMTF
+
+
+def _ohlcv(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, n) * rng.choice([0.3, 1, 3], n))
+    open_ = np.roll(close, 1) * (1 + rng.normal(0, 0.002, n))
+    open_[0] = close[0]
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n))),
+        'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n))),
+        'close': close,
+        'volume': rng.lognormal(10, 0.8, n),
+    })
+
+
+def _per_bar_ict(analyzer, df):
+    """Reference: the bar-by-bar ICT pass built from the public detectors."""
+    highs, lows, levels, obs, fvgs, structures = [], [], [], [], [], []
+    for idx in range(analyzer.swing_length, len(df) - analyzer.swing_length):
+        price = analyzer.detect_swing_high(df, idx)
+        if price is not None:
+            highs.append(SwingPoint(idx, price, SwingType.HIGH))
+            levels.append(LiquidityLevel(idx, price, True))
+        price = analyzer.detect_swing_low(df, idx)
+        if price is not None:
+            lows.append(SwingPoint(idx, price, SwingType.LOW))
+            levels.append(LiquidityLevel(idx, price, False))
+
+    trend = 0
+    for idx in range(analyzer.swing_length + 2, len(df)):
+        curr, prev = df.iloc[idx], df.iloc[idx - 1]
+        for swings, bullish in ((highs, True), (lows, False)):
+            for swing in reversed(swings):
+                if swing.broken or swing.index >= idx - 1:
+                    continue
+                if (curr['close'] > swing.price) if bullish else (curr['close'] < swing.price):
+                    structures.append(analyzer.detect_break_of_structure(
+                        df, idx, swing, trend == (-1 if bullish else 1)))
+                    swing.broken = True
+                    trend = 1 if bullish else -1
+                    break
+
+        body = abs(curr['close'] - curr['open'])
+        avg_body = (df['close'].iloc[max(0, idx - 20):idx] - df['open'].iloc[max(0, idx - 20):idx]).abs().mean()
+        if avg_body > 0 and body > avg_body * 2:
+            for bullish in (True, False):
+                trigger = (curr['close'] > curr['open'] and curr['close'] > prev['high']) if bullish else \
+                          (curr['close'] < curr['open'] and curr['close'] < prev['low'])
+                ob = analyzer.detect_order_block(df, idx, True, bullish) if trigger else None
+                if ob and not any(abs(o.start_idx - ob.start_idx) <= 1 and o.is_bullish == bullish for o in obs):
+                    obs.append(ob)
+
+        fvg = analyzer.detect_fvg(df, idx)
+        if fvg and not any(abs(f.start_idx - fvg.start_idx) <= 1 for f in fvgs):
+            fvgs.append(fvg)
+
+        for liq in levels:
+            if not liq.swept and idx > liq.index:
+                if liq.is_buy_side:
+                    liq.swept = curr['high'] > liq.price and curr['close'] < liq.price
+                else:
+                    liq.swept = curr['low'] < liq.price and curr['close'] > liq.price
+        for ob in obs:
+            ob.mitigated = ob.mitigated or analyzer.check_ob_mitigation(df, ob, idx)
+        for fvg in fvgs:
+            fvg.mitigated = fvg.mitigated or analyzer.check_fvg_mitigation(df, fvg, idx)
+
+    return highs, lows, levels, obs, fvgs, structures
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_ict_matches_per_bar_detectors(seed):
+    analyzer = LuxAlgoICT(swing_length=(10, 3, 5)[seed % 3])
+    df = _ohlcv(300, seed)
+
+    result = analyzer.analyze(df)
+    highs, lows, levels, obs, fvgs, structures = _per_bar_ict(LuxAlgoICT(swing_length=analyzer.swing_length), df)
+
+    assert analyzer.swing_highs == highs
+    assert analyzer.swing_lows == lows
+    assert result['liquidity_levels'] == levels
+    assert result['all_order_blocks'] == obs
+    assert result['all_fvgs'] == fvgs
+    assert analyzer.structures == structures
+    assert len(structures) > 0 and len(obs) > 0 and len(fvgs) > 0
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_sr_pivots_match_per_bar_detectors(seed):
+    analyzer = LuxAlgoSRMTF(detection_length=(15, 5, 8)[seed])
+    df = _ohlcv(300, seed)
+
+    for column, is_high, detect in (('high', True, analyzer.detect_pivot_high),
+                                    ('low', False, analyzer.detect_pivot_low)):
+        expected = {idx: detect(df, idx) for idx in range(len(df)) if detect(df, idx) is not None}
+        assert analyzer._pivot_levels(df[column].to_numpy(), is_high) == expected
+
+
+def test_sr_analyze_produces_zones_and_signals():
+    result = LuxAlgoSRMTF().analyze(_ohlcv(400, 3))
+
+    assert result['support_zones'] and result['resistance_zones']
+    assert result['signals']
+    assert all(isinstance(s.bar_index, int) for s in result['signals'])
+
+
+def test_datetime_index_matches_range_index():
+    df = _ohlcv(300, 1)
+    indexed = df.set_index(pd.date_range('2026-01-01', periods=len(df), freq='h'))
+
+    assert repr(LuxAlgoSRMTF().analyze(indexed)) == repr(LuxAlgoSRMTF().analyze(df))
+    assert repr(LuxAlgoICT().analyze(indexed)) == repr(LuxAlgoICT().analyze(df))
+
+
+def test_combined_analysis_on_engine_frame():
+    luxalgo_ict_analysis = pytest.importorskip('luxalgo_ict_analysis')
+    df = _ohlcv(300, 2)
+    df.insert(0, 'timestamp', pd.date_range('2026-01-01', periods=len(df), freq='h'))
+    prepared = df.set_index('timestamp')  # what ICTSignalEngine._prepare_dataframe hands over
+
+    result = luxalgo_ict_analysis.CombinedLuxAlgoAnalysis().analyze(prepared)
+
+    assert result['sr_data']['status'] == 'success'
+    assert result['sr_data']['support_zones'] or result['sr_data']['resistance_zones']
+    assert result['ict_data']['status'] == 'success'
@@ -0,0 +1,97 @@
+"""
+tests/test_market_data_backend.py
+
+Tests for the pluggable market data backend (market_data_backend.py):
+BINANCE_API_BASE routing, synthetic / recorded klines, injected faults and
+the local HTTP stand-in.
+"""
+
+import os
+import sys
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data_backend import (
+    FaultProfile,
+    LocalBinanceServer,
+    MarketDataStub,
+    RecordedKlineSource,
+    SyntheticKlineSource,
+    binance_url,
+)
+
+NOW = 1_773_014_400.0 + 1234  # 2026-03-09 00:20:34 UTC
+
+
+def test_binance_url_follows_env(monkeypatch):
+    monkeypatch.delenv('BINANCE_API_BASE', raising=False)
+    assert binance_url('/api/v3/klines') == 'https://api.binance.com/api/v3/klines'
+    monkeypatch.setenv('BINANCE_API_BASE', 'http://127.0.0.1:8765/')
+    assert binance_url('/api/v3/ping') == 'http://127.0.0.1:8765/api/v3/ping'
+
+
+def test_synthetic_klines_are_deterministic_and_paged():
+    source = SyntheticKlineSource(clock=lambda: NOW)
+    rows = source.klines('BTCUSDT', '1h', 100)
+
+    assert len(rows) == 100 and len(rows[0]) == 12
+    assert rows[-1][0] == int(NOW // 3600 * 3600) * 1000  # ends at the open candle
+    assert all(b[0] - a[0] == 3_600_000 for a, b in zip(rows, rows[1:]))
+    assert all(float(r[2]) >= max(float(r[1]), float(r[4])) for r in rows)
+    assert SyntheticKlineSource(clock=lambda: NOW).klines('BTCUSDT', '1h', 100) == rows
+    assert source.klines('ETHUSDT', '1h', 100)[-1][4] != rows[-1][4]
+
+    start = rows[10][0]
+    assert source.klines('BTCUSDT', '1h', 5, start_time=start) == rows[10:15]
+    assert source.price('BTCUSDT') > 0
+    assert float(source.ticker_24h('BTCUSDT')['highPrice']) >= float(source.ticker_24h('BTCUSDT')['lowPrice'])
+
+
+def test_faults_latency_errors_and_rate_limit():
+    now, slept = [NOW], []
+    stub = MarketDataStub(SyntheticKlineSource(clock=lambda: now[0]),
+                          FaultProfile(latency=0.05, weight_limit=6), clock=lambda: now[0], sleep=slept.append)
+    params = {'symbol': 'BTCUSDT', 'interval': '4h', 'limit': '50'}
+
+    statuses = [stub.handle('/api/v3/klines', params)[0] for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]  # weight 2 each, limit 6
+    status, headers, body = stub.handle('/api/v3/klines', params)
+    assert status == 429 and headers['Retry-After'] == '60' and body['code'] == -1003
+    assert slept == [0.05] * 5
+
+    now[0] += 61  # window rolled over
+    status, headers, body = stub.handle('/api/v3/klines', params)
+    assert status == 200 and headers['X-MBX-USED-WEIGHT-1M'] == '2' and len(body) == 50
+    assert stub.stats == {'requests': 6, 'ok': 4, 'errors': 0, 'rate_limited': 2, 'bad_requests': 0}
+
+    failing = MarketDataStub(faults=FaultProfile(error_rate=1.0, seed=1))
+    assert failing.handle('/api/v3/ping', {})[0] == 503
+    assert MarketDataStub().handle('/api/v3/klines', {'symbol': 'BTCUSDT', 'interval': '7m'})[0] == 400
+    assert MarketDataStub().handle('/api/v3/order', {})[0] == 404
+
+
+def test_http_stand_in_serves_recorded_and_synthetic(tmp_path):
+    recorded = [[1_700_000_000_000 + i * 60_000, '10', '11', '9', str(10 + i), '5', 0, '50', 3, '2', '20', '0']
+                for i in range(30)]
+    RecordedKlineSource.record(str(tmp_path), 'TESTUSDT', '1m', recorded)
+    source = RecordedKlineSource(str(tmp_path), fallback=SyntheticKlineSource(symbols=['BTCUSDT']))
+
+    with LocalBinanceServer(MarketDataStub(source)) as server:
+        base = server.base_url
+        klines = requests.get(f"{base}/api/v3/klines", params={'symbol': 'TESTUSDT', 'interval': '1m', 'limit': 10},
+                              timeout=5).json()
+        assert klines == recorded[-10:]
+        assert requests.get(f"{base}/api/v3/ticker/price", params={'symbol': 'TESTUSDT'},
+                            timeout=5).json() == {'symbol': 'TESTUSDT', 'price': '39.00000000'}
+
+        # Symbols without a recording fall back to synthetic data
+        response = requests.get(f"{base}/api/v3/klines", params={'symbol': 'BTCUSDT', 'interval': '4h', 'limit': 3},
+                                timeout=5)
+        assert response.status_code == 200 and len(response.json()) == 3
+        assert 'X-MBX-USED-WEIGHT-1M' in response.headers
+        assert requests.get(f"{base}/api/v3/ping", timeout=5).json() == {}
+
+    assert server.stub.by_endpoint['/api/v3/klines'] == 2
@@ -0,0 +1,173 @@
+"""
+tests/test_mtf_consensus_matrix.py
+
+Tests for the per-symbol MTF consensus matrix (mtf_consensus_matrix.py):
+rows are only recomputed for timeframes that closed a new candle.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mtf_consensus_matrix import MTFConsensusMatrix, get_mtf_consensus_matrix, reset_mtf_consensus_matrix
+
+
+def _frame(freq, rows=60, start='2026-03-01'):
+    close = np.linspace(100.0, 120.0, rows)
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start=start, periods=rows, freq=freq),
+        'open': close - 0.5,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': np.full(rows, 10.0),
+    })
+
+
+@pytest.fixture(autouse=True)
+def fresh_matrix():
+    reset_mtf_consensus_matrix()
+    yield
+    reset_mtf_consensus_matrix()
+
+
+class TestMatrixRows:
+    """Only rows with a newly closed candle are recomputed."""
+
+    def test_only_closed_timeframe_recomputed(self):
+        matrix = MTFConsensusMatrix()
+        calls = []
+
+        def compute(df):
+            calls.append(len(df))
+            return ('BULLISH', 80.0)
+
+        frames = {'15m': _frame('15min'), '1h': _frame('1h')}
+        # 15m frame: last candle opens 2026-03-01 14:45; 1h frame: 2026-03-03 11:00
+        now = datetime(2026, 3, 1, 14, 50)
+        for tf, df in frames.items():
+            matrix.get_row('BTCUSDT', tf, df, compute, now=now)
+        assert len(calls) == 2
+
+        # 15m candle closes at 15:00, 1h candle is still forming
+        later = datetime(2026, 3, 1, 15, 1)
+        for tf, df in frames.items():
+            matrix.get_row('BTCUSDT', tf, df, compute, now=later)
+
+        assert len(calls) == 3
+        assert matrix.get_matrix('BTCUSDT') == {'15m': ('BULLISH', 80.0), '1h': ('BULLISH', 80.0)}
+
+    def test_fresh_row_expires_on_next_close(self):
+        matrix = MTFConsensusMatrix()
+        matrix.put_row('ETHUSDT', '1h', {'signal': 'BUY'}, datetime(2026, 3, 1, 10), namespace='luxalgo')
+
+        assert matrix.get_fresh_row('ETHUSDT', '1h', 'luxalgo', now=datetime(2026, 3, 1, 11, 59)) == {'signal': 'BUY'}
+        assert matrix.get_fresh_row('ETHUSDT', '1h', 'luxalgo', now=datetime(2026, 3, 1, 12, 0)) is None
+        assert matrix.get_fresh_row('ETHUSDT', '1h', 'ict', now=datetime(2026, 3, 1, 11)) is None
+
+    def test_symbol_lru(self):
+        matrix = MTFConsensusMatrix(max_symbols=1)
+        matrix.put_row('A', '1h', 1, datetime(2026, 3, 1))
+        matrix.put_row('B', '1h', 2, datetime(2026, 3, 1))
+
+        assert matrix.get_matrix('A') == {}
+        assert matrix.get_stats()['symbols'] == 1
+
+
+class TestEngineConsensus:
+    """_calculate_mtf_consensus output is unchanged and reuses rows."""
+
+    def test_consensus_reuses_rows(self, monkeypatch):
+        ict_signal_engine = pytest.importorskip('ict_signal_engine')
+        engine = ict_signal_engine.ICTSignalEngine()
+        mtf_data = {'1h': _frame('1h', rows=80, start='2020-01-01'),
+                    '4h': _frame('4h', rows=80, start='2020-01-01')}
+        direct = {tf: engine._calculate_pure_ict_bias_for_tf(df) for tf, df in mtf_data.items()}
+        calls = []
+        original = engine._calculate_pure_ict_bias_for_tf
+
+        def counting(df):
+            calls.append(len(df))
+            return original(df)
+
+        monkeypatch.setattr(engine, '_calculate_pure_ict_bias_for_tf', counting)
+        bias = ict_signal_engine.MarketBias.BULLISH
+
+        first = engine._calculate_mtf_consensus('BTCUSDT', '15m', bias, mtf_data)
+        second = engine._calculate_mtf_consensus('BTCUSDT', '15m', bias, mtf_data)
+
+        assert first == second
+        assert len(calls) == 2
+        for tf, (tf_bias, confidence) in direct.items():
+            assert first['breakdown'][tf]['bias'] == tf_bias.value
+            assert first['breakdown'][tf]['confidence'] == round(confidence, 1)
+
+
+class TestLuxAlgoTimeframes:
+    """analyze_all_timeframes only fetches timeframes with a new closed candle."""
+
+    def test_second_call_skips_fetches(self):
+        luxalgo_ict_analysis = pytest.importorskip('luxalgo_ict_analysis')
+        now = datetime(2026, 3, 1, 12, 0, 30)
+        fetched = []
+
+        async def fetch(symbol, tf, limit=200):
+            fetched.append(tf)
+            duration = pd.Timedelta(luxalgo_ict_analysis.timeframe_duration(tf))
+            start = pd.Timestamp(now).floor(duration) - duration * 99
+            rng = np.random.default_rng(7)
+            close = 100 + np.cumsum(rng.normal(0, 1, 100))
+            return [
+                [int((start + duration * i).value // 10**6), c - 0.2, c + 1, c - 1, c, 5.0]
+                for i, c in enumerate(close)
+            ]
+
+        first = asyncio.run(luxalgo_ict_analysis.analyze_all_timeframes('BTCUSDT', fetch, now=now))
+        assert len(fetched) == 10
+
+        fetched.clear()
+        second = asyncio.run(luxalgo_ict_analysis.analyze_all_timeframes(
+            'BTCUSDT', fetch, now=datetime(2026, 3, 1, 12, 1, 5)))
+
+        assert fetched == ['1m']
+        assert list(second['timeframes']) == list(first['timeframes'])
+        assert second['consensus']['timeframes_analyzed'] == 10
+
+    def test_cached_rows_carry_live_price(self):
+        luxalgo_ict_analysis = pytest.importorskip('luxalgo_ict_analysis')
+        now = datetime(2026, 3, 1, 12, 0, 30)
+        live = {'price': 150.0}
+        fetched = []
+
+        async def fetch(symbol, tf, limit=200):
+            fetched.append((tf, limit))
+            duration = pd.Timedelta(luxalgo_ict_analysis.timeframe_duration(tf))
+            start = pd.Timestamp(now).floor(duration) - duration * (limit - 1)
+            close = np.linspace(100.0, 140.0, limit)
+            close[-1] = live['price']  # forming candle
+            return [
+                [int((start + duration * i).value // 10**6), c - 0.2, c + 1, c - 1, c, 5.0]
+                for i, c in enumerate(close)
+            ]
+
+        first = asyncio.run(luxalgo_ict_analysis.analyze_all_timeframes('BTCUSDT', fetch, now=now))
+        assert {entry['price'] for entry in first['timeframes'].values()} == {150.0}
+        # Matrix rows hold only closed-candle data
+        assert 'price' not in get_mtf_consensus_matrix().get_matrix('BTCUSDT', namespace='luxalgo')['4h']
+
+        live['price'] = 155.0
+        fetched.clear()
+        second = asyncio.run(luxalgo_ict_analysis.analyze_all_timeframes(
+            'BTCUSDT', fetch, now=datetime(2026, 3, 1, 12, 0, 45)))
+
+        assert fetched == [('1m', 1)]  # every row fresh: only the live price is fetched
+        assert {entry['price'] for entry in second['timeframes'].values()} == {155.0}
+        assert second['timeframes']['4h']['analysis'] == first['timeframes']['4h']['analysis']
@@ -25,6 +25,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.trade_id_generator import TradeIDGenerator
 from real_time_monitor import RealTimePositionMonitor, ALERT_STAGES
+from telegram_dispatcher import get_telegram_dispatcher
 
 
 class TestTradeIDGenerator:
@@ -389,6 +390,9 @@ class TestStageAlertLogic:
         # Check stage alerts - should trigger halfway alert
         await monitor._check_stage_alerts('test123', signal, 51000, 35)
         
+        # Alerts are queued on the Telegram dispatcher - wait for delivery
+        await get_telegram_dispatcher().join(timeout=5)
+        
         # Should send alert for halfway stage
         mock_bot.send_message.assert_called_once()
         assert signal['last_alerted_stage'] == 'halfway'
@@ -478,3 +478,94 @@ class TestObservabilityPassivity:
         snapshot = hooks.metrics.get_metrics_snapshot()
         assert snapshot['counters']['signals_created_total'] == 2
         assert snapshot['gauges']['signals_in_state_pending'] == 2
+
+
+class TestStreamingHistograms:
+    """Bounded histograms and text exposition."""
+    
+    def test_percentiles_within_relative_accuracy(self):
+        """Quantiles should be within 1% of exact sample quantiles."""
+        metrics = MetricsCollector()
+        
+        for latency in range(1, 10001):
+            metrics.record_dispatch_to_ack_latency(float(latency))
+        
+        summary = metrics.get_histogram_summary('dispatch_to_ack_latency_ms')
+        assert summary['count'] == 10000
+        assert summary['p50'] == pytest.approx(5000, rel=0.01)
+        assert summary['p95'] == pytest.approx(9500, rel=0.01)
+        assert summary['p99'] == pytest.approx(9900, rel=0.01)
+    
+    def test_memory_does_not_grow_with_samples(self):
+        """Histogram storage should be fixed regardless of sample count."""
+        from observability import StreamingHistogram
+        
+        histogram = StreamingHistogram()
+        buckets_before = len(histogram._counts)
+        for i in range(50000):
+            histogram.record(i * 0.37)
+        
+        assert len(histogram._counts) == buckets_before
+        assert histogram.count == 50000
+    
+    def test_transition_latency_labeled_by_states(self):
+        """State transition histograms are kept per (from, to) pair."""
+        metrics = MetricsCollector()
+        
+        metrics.record_state_transition_latency(SignalState.PENDING, SignalState.VALIDATED, 10.0)
+        metrics.record_state_transition_latency(SignalState.PENDING, SignalState.VALIDATED, 20.0)
+        metrics.record_state_transition_latency(SignalState.VALIDATED, SignalState.ALLOCATED, 5.0)
+        
+        summary = metrics.get_histogram_summary(
+            'state_transition_latency_ms',
+            {'from': 'pending', 'to': 'validated'}
+        )
+        assert summary['count'] == 2
+        snapshot = metrics.get_metrics_snapshot()
+        assert snapshot['histograms']['state_transition_latency_samples'] == 3
+        assert snapshot['percentiles']['state_transition_latency_ms']['p50'] is not None
+    
+    def test_labeled_counters(self):
+        """Labeled counters should be tracked per label set."""
+        metrics = MetricsCollector()
+        
+        metrics.increment_counter('signals_sent_total', {'timeframe': '4h'})
+        metrics.increment_counter('signals_sent_total', {'timeframe': '4h'})
+        metrics.increment_counter('signals_sent_total', {'timeframe': '1h'})
+        
+        counters = metrics.get_metrics_snapshot()['labeled_counters']
+        assert counters['signals_sent_total{timeframe="4h"}'] == 2
+        assert counters['signals_sent_total{timeframe="1h"}'] == 1
+    
+    def test_render_prometheus(self):
+        """Exposition text should contain counters, gauges and summaries."""
+        metrics = MetricsCollector()
+        metrics.increment_signals_created()
+        metrics.increment_signals_in_state(SignalState.PENDING)
+        metrics.record_dispatch_to_ack_latency(12.0)
+        
+        text = metrics.render_prometheus()
+        
+        assert 'signal_bot_signals_created_total 1' in text
+        assert 'signal_bot_signals_in_state{state="pending"} 1' in text
+        assert '# TYPE signal_bot_dispatch_to_ack_latency_ms summary' in text
+        assert 'signal_bot_dispatch_to_ack_latency_ms_count 1' in text
+        assert 'signal_bot_dispatch_to_ack_latency_ms{quantile="0.99"}' in text
+    
+    def test_exporter_serves_metrics(self):
+        """Exporter should serve exposition text on a local port."""
+        import urllib.request
+        from observability import MetricsExporter
+        
+        metrics = MetricsCollector()
+        metrics.increment_signals_created()
+        exporter = MetricsExporter(metrics, port=0)
+        port = exporter.start()
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as response:
+                body = response.read().decode('utf-8')
+        finally:
+            exporter.stop()
+        
+        assert 'signal_bot_signals_created_total 1' in body
+        assert not exporter.is_running
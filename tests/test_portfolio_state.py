@@ -0,0 +1,186 @@
+"""
+tests/test_portfolio_state.py
+
+Tests for the portfolio state engine (portfolio_state.py): running risk
+aggregates, PositionManager events, startup rebuild and RiskManager checks.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import init_positions_db
+import portfolio_state
+import position_manager
+from portfolio_state import PortfolioState, get_portfolio_state, reset_portfolio_state
+from position_manager import PositionManager
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'positions.db')
+    monkeypatch.setattr(init_positions_db, 'DB_PATH', path)
+    init_positions_db.create_positions_database()
+    return path
+
+
+def _signal(signal_type, entry=100.0, sl=95.0):
+    return SimpleNamespace(signal_type=signal_type, entry_price=entry, sl_price=sl,
+                           tp_prices=[110.0, 120.0, 130.0])
+
+
+class TestAggregates:
+    """Open risk, exposure and daily P/L are kept as running totals."""
+
+    def test_open_partial_close(self):
+        state = PortfolioState(risk_per_position_pct=1.0)
+        state.on_position_open(1, 'BTCUSDT', 'BUY')
+        state.on_position_open(2, 'BTCUSDT', 'STRONG_SELL')
+        state.on_position_open(3, 'ETHUSDT', 'BUY')
+
+        assert state.open_count == 3
+        assert state.total_open_risk() == pytest.approx(3.0)
+        assert state.symbol_exposure('BTCUSDT') == pytest.approx(2.0)
+        assert state.direction_exposure('BUY') == pytest.approx(2.0)
+        assert state.direction_exposure('SELL') == pytest.approx(1.0)
+
+        state.on_partial_close(3, 0.5)
+        assert state.symbol_exposure('ETHUSDT') == pytest.approx(0.5)
+
+        state.on_position_close(1, -2.5)
+        state.on_position_close(2, 1.0)
+        state.on_position_close(3, -1.5)
+
+        assert state.open_count == 0
+        assert state.total_open_risk() == 0.0
+        assert state.symbol_exposure('BTCUSDT') == 0.0
+        assert state.daily_pnl() == pytest.approx(-3.0)
+        assert state.daily_loss() == pytest.approx(3.0)
+
+    def test_close_from_previous_day_not_booked(self):
+        state = PortfolioState()
+        state.on_position_open(1, 'BTCUSDT', 'BUY')
+        state.on_position_close(1, -4.0, closed_at=datetime.now(timezone.utc) - timedelta(days=1))
+
+        assert state.open_count == 0
+        assert state.daily_pnl() == 0.0
+
+    def test_day_rollover_resets_realized(self, monkeypatch):
+        state = PortfolioState()
+        state.on_position_close(99, -2.0)
+        monkeypatch.setattr(portfolio_state, '_utc_today', lambda: '2999-01-01')
+
+        assert state.daily_loss() == 0.0
+        assert state.closed_today() == 0
+
+
+class TestPositionManagerEvents:
+    """PositionManager emits events; a restart rebuilds the same totals."""
+
+    def test_events_match_rebuild(self, db_path):
+        state = PortfolioState()
+        manager = PositionManager(db_path=db_path, portfolio_state=state)
+
+        first = manager.open_position(_signal('BUY'), 'BTCUSDT', '1h')
+        second = manager.open_position(_signal('SELL'), 'ETHUSDT', '4h')
+        manager.open_position(_signal('BUY'), 'SOLUSDT', '1h')
+        manager.partial_close(second, 50)
+        pnl = manager.close_position(first, 90.0, 'SL')
+
+        rebuilt = PortfolioState()
+        assert rebuilt.rebuild_from_db(db_path) is True
+
+        for current in (state, rebuilt):
+            assert current.open_count == 2
+            assert current.total_open_risk() == pytest.approx(1.5)
+            assert current.direction_exposure('SELL') == pytest.approx(0.5)
+            assert current.daily_pnl() == pytest.approx(pnl)
+            assert current.closed_today() == 1
+
+    def test_rebuild_missing_db(self, tmp_path):
+        state = PortfolioState()
+
+        assert state.rebuild_from_db(str(tmp_path / 'missing' / 'positions.db')) is False
+        assert state.loaded is False
+
+
+class TestConsumers:
+    """RiskManager and engine helpers read the shared state."""
+
+    @pytest.fixture(autouse=True)
+    def shared(self):
+        reset_portfolio_state()
+        yield
+        reset_portfolio_state()
+
+    def test_risk_manager_uses_state(self, db_path, tmp_path):
+        from risk_management import RiskManager
+        state = get_portfolio_state()
+        state.rebuild_from_db(db_path)
+        manager = RiskManager(config_file=str(tmp_path / 'risk_config.json'))
+        manager.attach_portfolio_state(state)
+        positions = PositionManager(db_path=db_path, portfolio_state=state)
+
+        assert manager.check_daily_loss_limit() == (True, 0.0, "✅ No closed trades today")
+
+        ids = [positions.open_position(_signal('BUY'), f'C{i}USDT', '1h') for i in range(5)]
+        can_open, active, _ = manager.check_concurrent_trades()
+        assert (can_open, active) == (False, 5)
+
+        for position_id in ids[:2]:
+            positions.close_position(position_id, 96.0, 'SL')  # -4% each
+        can_trade, daily_pl, msg = manager.check_daily_loss_limit()
+        assert can_trade is False
+        assert daily_pl == pytest.approx(-8.0)
+        assert msg.startswith("🛑 Daily loss limit reached")
+
+    def test_trade_manager_close_reaches_shared_state(self, db_path, tmp_path, monkeypatch):
+        unified_trade_manager = pytest.importorskip('unified_trade_manager')
+        monkeypatch.setattr(position_manager, 'DB_PATH', db_path)
+        monkeypatch.setattr(unified_trade_manager.UnifiedTradeManager, '_sync_from_journal', lambda self: None)
+        state = get_portfolio_state()
+        state.rebuild_from_db(db_path)
+
+        # A PositionManager on the shared positions.db reports to the global state by default
+        positions = PositionManager(db_path=db_path)
+        assert positions.portfolio_state is state
+        assert PositionManager(db_path=str(tmp_path / 'other.db')).portfolio_state is None
+
+        first = positions.open_position(_signal('BUY'), 'BTCUSDT', '1h')
+        positions.open_position(_signal('SELL'), 'ETHUSDT', '1h')
+        assert state.open_count == 2
+
+        manager = unified_trade_manager.UnifiedTradeManager(position_manager=positions)
+        asyncio.run(manager._handle_tp_hit({'id': first, 'symbol': 'BTCUSDT'}, 110.0, 'TP1'))
+
+        assert state.open_count == 1
+        assert state.total_open_risk() == pytest.approx(1.0)
+        assert state.daily_pnl() == pytest.approx(10.0)
+
+    def test_journal_fallback_without_state(self, tmp_path):
+        from risk_management import RiskManager
+        manager = RiskManager(config_file=str(tmp_path / 'risk_config.json'))
+        manager.attach_portfolio_state(PortfolioState())  # not rebuilt yet
+
+        assert manager.check_concurrent_trades(str(tmp_path / 'none.json')) == (True, 0, "✅ No active trades")
+
+    def test_engine_helpers(self):
+        ict_signal_engine = pytest.importorskip('ict_signal_engine')
+        engine = ict_signal_engine.ICTSignalEngine()
+        assert engine._get_total_open_risk() == 0.0
+
+        state = get_portfolio_state()
+        state.on_position_open(1, 'BTCUSDT', 'BUY')
+        state.on_position_close(2, -1.25)
+
+        assert engine._get_total_open_risk() == pytest.approx(1.0)
+        assert engine._get_symbol_exposure('BTCUSDT') == pytest.approx(1.0)
+        assert engine._get_direction_exposure(ict_signal_engine.SignalType.STRONG_BUY.value) == pytest.approx(1.0)
+        assert engine._get_daily_loss() == pytest.approx(1.25)
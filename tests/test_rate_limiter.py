@@ -0,0 +1,192 @@
+"""
+tests/test_rate_limiter.py
+
+Tests for the O(1) sliding-window rate limiter and its backends.
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from security.rate_limiter import (
+    RateLimiter,
+    InMemoryRateLimitBackend,
+    SQLiteRateLimitBackend,
+)
+
+
+class FakeClock:
+    """Controllable replacement for time.time()"""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch('security.rate_limiter.time.time', fake):
+        yield fake
+
+
+class TestRateLimiterLimits:
+    """Minute/hour limits and auto-ban behaviour."""
+
+    def test_minute_limit_enforced(self, clock):
+        limiter = RateLimiter(max_requests_per_minute=5, max_requests_per_hour=100)
+
+        results = [limiter.is_allowed(1) for _ in range(6)]
+
+        assert results == [True] * 5 + [False]
+        assert limiter.get_user_stats(1)['violations'] == 1
+
+    def test_minute_window_slides(self, clock):
+        limiter = RateLimiter(max_requests_per_minute=5, max_requests_per_hour=100)
+        for _ in range(5):
+            assert limiter.is_allowed(1)
+
+        # Two full windows later the previous slot no longer counts
+        clock.advance(120)
+        assert limiter.is_allowed(1)
+
+    def test_hour_limit_enforced(self, clock):
+        limiter = RateLimiter(max_requests_per_minute=1000, max_requests_per_hour=10)
+        for _ in range(10):
+            assert limiter.is_allowed(1)
+            clock.advance(61)
+
+        assert not limiter.is_allowed(1)
+
+    def test_auto_ban_after_three_violations(self, clock):
+        limiter = RateLimiter(max_requests_per_minute=1, max_requests_per_hour=100)
+        limiter.is_allowed(1)
+        for _ in range(3):
+            limiter.is_allowed(1)
+
+        assert limiter.is_banned(1)
+        assert limiter.get_ban_time_remaining(1) > 0
+
+    def test_users_are_independent(self, clock):
+        limiter = RateLimiter(max_requests_per_minute=2, max_requests_per_hour=100)
+        limiter.is_allowed(1)
+        limiter.is_allowed(1)
+
+        assert not limiter.is_allowed(1)
+        assert limiter.is_allowed(2)
+
+    def test_user_stats(self, clock):
+        limiter = RateLimiter(max_requests_per_minute=20, max_requests_per_hour=100)
+        for _ in range(3):
+            limiter.is_allowed(7)
+
+        stats = limiter.get_user_stats(7)
+        assert stats['requests_last_minute'] == 3
+        assert stats['requests_last_hour'] == 3
+        assert stats['is_banned'] is False
+
+
+class TestInMemoryBackend:
+    """Bounded memory through LRU eviction."""
+
+    def test_lru_eviction_bounds_tracked_users(self, clock):
+        backend = InMemoryRateLimitBackend(max_tracked_users=100)
+        limiter = RateLimiter(backend=backend)
+
+        for user_id in range(1000):
+            limiter.is_allowed(user_id)
+
+        assert backend.tracked_users() == 100
+
+    def test_recently_used_user_survives_eviction(self, clock):
+        backend = InMemoryRateLimitBackend(max_tracked_users=3)
+        limiter = RateLimiter(max_requests_per_minute=2, backend=backend)
+        limiter.is_allowed(1)
+        limiter.is_allowed(1)
+        limiter.is_allowed(2)
+        limiter.is_allowed(1)  # touch user 1 (denied, still counted as recent)
+        limiter.is_allowed(3)
+        limiter.is_allowed(4)  # evicts user 2, not user 1
+
+        assert not limiter.is_allowed(1)
+
+    def test_penalties_bounded_by_lru(self, clock):
+        backend = InMemoryRateLimitBackend(max_tracked_users=50)
+        limiter = RateLimiter(max_requests_per_minute=1, backend=backend)
+
+        for user_id in range(500):  # flood: every user violates three times and is banned
+            for _ in range(4):
+                limiter.is_allowed(user_id)
+
+        assert backend.penalized_users() == 50
+        assert limiter.is_banned(499) and not limiter.is_banned(0)
+
+    def test_unban_resets_violations(self, clock):
+        limiter = RateLimiter(max_requests_per_minute=1)
+        for _ in range(4):
+            limiter.is_allowed(1)
+        assert limiter.is_banned(1)
+
+        limiter.unban_user(1)
+        assert not limiter.is_banned(1) and limiter.get_user_stats(1)['violations'] == 0
+
+        limiter.ban_user(1, duration_minutes=1)
+        clock.advance(61)
+        assert not limiter.is_banned(1) and limiter.backend.penalized_users() == 0
+
+
+class TestSQLiteBackend:
+    """Shared-state backend enforces one limit across limiter instances."""
+
+    def test_limit_shared_between_instances(self, clock, tmp_path):
+        db_path = str(tmp_path / 'rate_limits.db')
+        first = RateLimiter(max_requests_per_minute=4, backend=SQLiteRateLimitBackend(db_path))
+        second = RateLimiter(max_requests_per_minute=4, backend=SQLiteRateLimitBackend(db_path))
+
+        assert first.is_allowed(1)
+        assert second.is_allowed(1)
+        assert first.is_allowed(1)
+        assert second.is_allowed(1)
+        assert not first.is_allowed(1)
+        assert not second.is_allowed(1)
+
+    def test_ban_shared_between_instances(self, clock, tmp_path):
+        db_path = str(tmp_path / 'rate_limits.db')
+        first = RateLimiter(max_requests_per_minute=1, backend=SQLiteRateLimitBackend(db_path))
+        second = RateLimiter(max_requests_per_minute=1, backend=SQLiteRateLimitBackend(db_path))
+
+        first.is_allowed(1)
+        first.is_allowed(1)
+        second.is_allowed(1)
+        assert second.get_user_stats(1)['violations'] == 2
+        first.is_allowed(1)  # third violation: banned by the first process
+
+        assert second.is_banned(1) and not second.is_allowed(1)
+        assert second.get_ban_time_remaining(1) == 3600
+
+        second.unban_user(1)
+        assert not first.is_banned(1)
+
+    def test_idle_rows_purged(self, clock, tmp_path):
+        backend = SQLiteRateLimitBackend(str(tmp_path / 'rate_limits.db'), purge_interval_seconds=0)
+        limiter = RateLimiter(backend=backend)
+        limiter.is_allowed(1)
+
+        limiter.ban_user(3, duration_minutes=24 * 60)
+        backend.add_violation(4, clock.now)
+
+        clock.advance(3 * 3600)
+        limiter.is_allowed(2)
+
+        assert backend.tracked_users() == 1
+        assert backend.penalized_users() == 1  # active ban kept, idle violation purged
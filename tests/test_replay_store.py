@@ -0,0 +1,166 @@
+"""
+tests/test_replay_store.py
+
+Tests for the segmented float64 replay capture store (diagnostics.ReplayCache).
+"""
+
+import os
+import sys
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from diagnostics import ReplayCache, ReplayEngine, SignalSnapshot
+
+
+def _klines(rows=150, start='2024-01-01'):
+    index = pd.date_range(start=start, periods=rows, freq='15min')
+    base = np.linspace(40000.0, 41000.0, rows)
+    return pd.DataFrame({
+        'open': base,
+        'high': base + 50.123456789,
+        'low': base - 50.5,
+        'close': base + 10.25,
+        'volume': np.full(rows, 1234.5),
+    }, index=index)
+
+
+def _signal(i=0):
+    return {
+        'symbol': f'COIN{i}USDT',
+        'timeframe': '15m',
+        'signal_type': 'LONG',
+        'entry_price': 45000.0,
+        'timestamp': f'2026-01-31T10:{i % 60:02d}:00Z',
+    }
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ReplayCache, 'CACHE_FILE', tmp_path / 'replay_cache.json')
+    return ReplayCache(tmp_path / 'replay_store')
+
+
+class TestReplayStore:
+    """Save/load round trip and rotation."""
+
+    def test_round_trip_is_exact(self, cache):
+        klines = _klines()
+
+        assert cache.save_signal(_signal(), klines) is True
+        snapshot = cache.load_signals()[0]
+
+        assert snapshot.symbol == 'COIN0USDT'
+        assert snapshot.klines_snapshot.shape == (150, 6)
+        np.testing.assert_array_equal(snapshot.klines_snapshot[:, 4], klines['close'].to_numpy())
+        assert pd.Timestamp(int(snapshot.klines_snapshot[0, 0]), unit='ms') == klines.index[0]
+
+    def test_klines_limited_to_most_recent(self, cache, monkeypatch):
+        monkeypatch.setattr(ReplayCache, 'MAX_KLINES_PER_SIGNAL', 20)
+
+        cache.save_signal(_signal(), _klines(rows=100))
+        snapshot = cache.load_signals()[0]
+
+        assert snapshot.klines_snapshot.shape[0] == 20
+        assert snapshot.klines_snapshot[-1, 4] == _klines(rows=100)['close'].iloc[-1]
+
+    def test_append_does_not_rewrite_older_segments(self, cache, monkeypatch):
+        monkeypatch.setattr(ReplayCache, 'SIGNALS_PER_SEGMENT', 2)
+        cache.save_signal(_signal(0), _klines())
+        cache.save_signal(_signal(1), _klines())
+        first_segment = cache._klines_path(1)
+        mtime = os.path.getmtime(first_segment)
+
+        cache.save_signal(_signal(2), _klines())
+
+        assert os.path.getmtime(first_segment) == mtime
+        assert cache.get_signal_count() == 3
+
+    def test_rotation_drops_oldest_segments(self, cache, monkeypatch):
+        monkeypatch.setattr(ReplayCache, 'SIGNALS_PER_SEGMENT', 5)
+        monkeypatch.setattr(ReplayCache, 'MAX_SIGNALS', 10)
+
+        for i in range(23):
+            cache.save_signal(_signal(i), _klines(rows=10))
+
+        symbols = [entry['symbol'] for entry in cache.load_metadata()]
+        assert symbols[-1] == 'COIN22USDT'
+        assert symbols == [f'COIN{i}USDT' for i in range(15, 23)]  # 1 sealed segment + the active one
+        assert len(cache._list_segments()) == 2
+
+    def test_rotation_never_exceeds_max_signals(self, cache, monkeypatch):
+        monkeypatch.setattr(ReplayCache, 'SIGNALS_PER_SEGMENT', 5)
+        monkeypatch.setattr(ReplayCache, 'MAX_SIGNALS', 10)
+
+        counts = []
+        for i in range(31):
+            cache.save_signal(_signal(i), _klines(rows=5))
+            counts.append(cache.get_signal_count())
+
+        assert max(counts) == 10
+        assert counts[-1] == 6  # new segment started: 5 sealed + 1 active
+
+    def test_supports_thousands_of_signals(self, cache):
+        klines = _klines(rows=50)
+        for i in range(1000):
+            assert cache.save_signal(_signal(i), klines)
+
+        assert cache.get_signal_count() == 1000
+
+    def test_legacy_json_migrated(self, tmp_path, monkeypatch):
+        legacy_file = tmp_path / 'replay_cache.json'
+        monkeypatch.setattr(ReplayCache, 'CACHE_FILE', legacy_file)
+        legacy = SignalSnapshot(
+            timestamp='2026-01-31T10:00:00',
+            symbol='BTCUSDT',
+            timeframe='1h',
+            klines_snapshot=[[1704067200000, '1.5', '2.5', '0.5', '2.0', '10']],
+            original_signal={'symbol': 'BTCUSDT'},
+            signal_hash='abc123',
+        )
+        legacy_file.write_text(json.dumps({'signals': [legacy.to_dict()], 'metadata': {}}))
+
+        cache = ReplayCache(tmp_path / 'replay_store')
+
+        snapshot = cache.load_signals()[0]
+        assert snapshot.symbol == 'BTCUSDT'
+        assert snapshot.klines_snapshot[0, 4] == 2.0
+        assert not legacy_file.exists()
+
+    def test_clear_cache(self, cache):
+        cache.save_signal(_signal(), _klines())
+
+        assert cache.clear_cache() is True
+        assert cache.get_signal_count() == 0
+        assert cache.clear_cache() is False
+
+
+class TestReplayEngineLazyLoading:
+    """ReplayEngine rebuilds the OHLCV frame from float arrays."""
+
+    @pytest.mark.asyncio
+    async def test_replay_signal_builds_dataframe(self, cache):
+        captured = {}
+
+        class FakeEngine:
+            def generate_signal(self, df, symbol, timeframe, mtf_data=None, is_auto=False):
+                captured['df'] = df
+                return None
+
+        klines = _klines(rows=30)
+        cache.save_signal(_signal(), klines)
+        engine = ReplayEngine(cache, signal_engine=FakeEngine())
+
+        snapshot = next(cache.iter_signals())
+        await engine.replay_signal(snapshot)
+
+        df = captured['df']
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert df.index.name == 'timestamp'
+        assert (df.index == klines.index).all()
+        np.testing.assert_array_equal(df['high'].to_numpy(), klines['high'].to_numpy())
@@ -0,0 +1,122 @@
+"""
+tests/test_report_aggregates.py
+
+Tests for the materialized per-day report rollups (report_aggregates.py)
+and the DailyReportEngine daily / weekly / monthly reports built on them.
+"""
+
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daily_reports import DailyReportEngine
+from report_aggregates import JOURNAL_FIELDS, ReportAggregates, confidence_range, merge_buckets
+
+DAY = date(2026, 3, 10)
+
+
+def _trade(trade_id, day, status='PENDING', outcome=None, profit=None, symbol='BTCUSDT', confidence=75):
+    return {
+        'id': trade_id, 'symbol': symbol, 'timeframe': '1h', 'signal': 'BUY', 'confidence': confidence,
+        'timestamp': datetime.combine(day, datetime.min.time()).replace(hour=12).isoformat(),
+        'status': status, 'outcome': outcome, 'profit_loss_pct': profit,
+    }
+
+
+@pytest.fixture
+def aggregates():
+    return ReportAggregates(DailyReportEngine()._convert_journal_to_signal_format, JOURNAL_FIELDS)
+
+
+def test_day_bucket_counts(aggregates):
+    trades = [
+        _trade(1, DAY, 'COMPLETED', 'SUCCESS', 2.5),
+        _trade(2, DAY, 'COMPLETED', 'FAILED', -1.0, symbol='ETHUSDT', confidence=92),
+        _trade(3, DAY, 'COMPLETED', 'SUCCESS', 2.5),
+        _trade(4, DAY),
+        _trade(5, DAY + timedelta(days=1), 'COMPLETED', 'SUCCESS', 4.0),
+    ]
+    aggregates.sync(trades)
+
+    bucket = aggregates.day(DAY)
+    assert (bucket['total'], bucket['completed'], bucket['active']) == (4, 3, 1)
+    assert (bucket['wins'], bucket['losses']) == (2, 1)
+    assert bucket['profit_sum'] == pytest.approx(4.0)
+    assert bucket['confidence_accuracy'] == {'70-79': {'total': 2, 'wins': 2}, '90-100': {'total': 1, 'wins': 0}}
+    assert bucket['symbols']['ETHUSDT'] == {'total': 1, 'completed': 1, 'wins': 0, 'profit': -1.0}
+    assert bucket['best_profitable'][2]['id'] == 1  # first of the tied best trades
+    assert bucket['worst_completed'][2]['id'] == 2
+    assert aggregates.day(DAY - timedelta(days=1))['total'] == 0
+
+    week = aggregates.period(DAY, DAY + timedelta(days=6))
+    assert week['total'] == 5 and week['best_completed'][2]['id'] == 5
+    assert merge_buckets([aggregates.day(DAY), aggregates.day(DAY + timedelta(days=1))]) == week
+
+
+def test_sync_only_reconverts_changed_trades(aggregates):
+    trades = [_trade(i, DAY) for i in range(1, 101)]
+    assert aggregates.sync(trades) == 100
+    assert aggregates.sync(trades) == 0
+
+    trades[10].update(status='COMPLETED', outcome='SUCCESS', profit_loss_pct=3.0)
+    trades.append(_trade(101, DAY + timedelta(days=2)))
+    assert aggregates.sync(trades) == 2
+    assert aggregates.day(DAY)['wins'] == 1
+
+    assert aggregates.sync(trades[:50]) == 51
+    assert aggregates.day(DAY)['total'] == 50
+    assert aggregates.day(DAY + timedelta(days=2))['total'] == 0
+
+
+def test_confidence_range_bounds():
+    assert [confidence_range(c) for c in (59.9, 60, 79.99, 90, 100, 100.5)] == \
+        [None, '60-69', '70-79', '90-100', '90-100', None]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = DailyReportEngine()
+    engine.journal_path = str(tmp_path / 'trading_journal.json')
+    engine.stats_path = str(tmp_path / 'bot_stats.json')
+    engine.reports_path = str(tmp_path / 'daily_reports.json')
+    return engine
+
+
+def test_engine_reports_from_rollups(engine):
+    yesterday = datetime.now(engine.bg_tz).date() - timedelta(days=1)
+    trades = [_trade(1, yesterday, 'COMPLETED', 'SUCCESS', 3.0), _trade(2, yesterday, 'COMPLETED', 'FAILED', -1.5),
+              _trade(3, yesterday)]
+    with open(engine.journal_path, 'w') as f:
+        json.dump({'trades': trades}, f)
+
+    report = engine.generate_daily_report()
+    assert report['date'] == yesterday.isoformat()
+    assert (report['total_signals'], report['completed_signals'], report['wins']) == (3, 2, 1)
+    assert report['accuracy'] == 50.0 and report['total_profit'] == pytest.approx(1.5)
+    assert report['profit_factor'] == pytest.approx(2.0)
+    assert report['best_trade']['id'] == 1 and report['worst_trade']['id'] == 2
+
+    # Closing a trade through save_journal's hook updates the bucket without a reload
+    trades[2].update(status='COMPLETED', outcome='SUCCESS', profit_loss_pct=1.0)
+    with open(engine.journal_path, 'w') as f:
+        json.dump({'trades': trades}, f)
+    engine.note_journal_saved({'trades': trades})
+    engine._load_trades_from_journal = lambda: pytest.fail('journal reloaded')
+    assert engine.generate_daily_report()['wins'] == 2
+
+
+def test_engine_falls_back_to_stats(engine):
+    last_monday = datetime.now(engine.bg_tz).date() - timedelta(days=datetime.now(engine.bg_tz).weekday() + 7)
+    with open(engine.stats_path, 'w') as f:
+        json.dump({'signals': [{'symbol': 'BTCUSDT', 'timeframe': '4h', 'type': 'SELL', 'confidence': 80,
+                                'timestamp': datetime.combine(last_monday, datetime.min.time()).isoformat()}]}, f)
+
+    summary = engine.get_weekly_summary()
+    assert summary['total_signals'] == 1 and summary['sell_signals'] == 1
+    assert summary['daily_breakdown'][last_monday.isoformat()]['total'] == 1
@@ -0,0 +1,182 @@
+"""
+Unit tests for Signal Audit Store (ESB v1.0 §3.4)
+
+Contract proofs for the persistent audit log:
+- Events survive restart and the hash chain continues
+- Per-signal lookup via index
+- Incremental verification from checkpoints
+- Tampering detection on disk
+- Compaction keeps disk bounded and the chain verifiable
+
+Author: ESB v1.0 Implementation
+Date: 2026-01-22
+"""
+
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_state_machine import SignalState
+from signal_state_audit import SignalAuditLogger, verify_event_chain
+from signal_audit_store import SegmentedAuditStore
+
+
+def _append(logger, signal_id, n=1):
+    for i in range(n):
+        logger.append_event(
+            signal_id=signal_id,
+            prev_state=SignalState.PENDING,
+            next_state=SignalState.VALIDATED,
+            actor="system",
+            reason=f"step {i}",
+            metadata={'i': i}
+        )
+
+
+class TestPersistence:
+    """Contract: Events survive restart."""
+
+    def test_events_survive_reopen(self, tmp_path):
+        store = SegmentedAuditStore(str(tmp_path))
+        logger = SignalAuditLogger(store=store)
+        _append(logger, "sig-1", 3)
+        store.close()
+
+        reopened = SignalAuditLogger(store=SegmentedAuditStore(str(tmp_path)))
+
+        assert reopened.get_event_count() == 3
+        assert verify_event_chain(reopened.get_events()) is True
+
+    def test_chain_continues_after_reopen(self, tmp_path):
+        store = SegmentedAuditStore(str(tmp_path), max_segment_events=4)
+        logger = SignalAuditLogger(store=store)
+        _append(logger, "sig-1", 5)
+        store.close()
+
+        logger = SignalAuditLogger(store=SegmentedAuditStore(str(tmp_path), max_segment_events=4))
+        _append(logger, "sig-2", 5)
+
+        assert logger.get_event_count() == 10
+        assert verify_event_chain(logger.get_events()) is True
+        assert logger.verify_chain(full=True) is True
+
+    def test_persisted_events_match_in_memory(self, tmp_path):
+        memory_logger = SignalAuditLogger()
+        store_logger = SignalAuditLogger(store=SegmentedAuditStore(str(tmp_path)))
+        event = memory_logger.append_event(
+            signal_id="sig-1",
+            prev_state=SignalState.PENDING,
+            next_state=SignalState.VALIDATED,
+            actor="system",
+            reason="test"
+        )
+        store_logger.append_event(
+            signal_id="sig-1",
+            prev_state=SignalState.PENDING,
+            next_state=SignalState.VALIDATED,
+            actor="system",
+            reason="test",
+            timestamp=event.timestamp
+        )
+
+        assert store_logger.get_events() == memory_logger.get_events()
+
+
+class TestIndexedLookup:
+    """Contract: Per-signal lookup returns only that signal's events, in order."""
+
+    def test_lookup_across_segments(self, tmp_path):
+        logger = SignalAuditLogger(store=SegmentedAuditStore(str(tmp_path), max_segment_events=3))
+        for i in range(10):
+            _append(logger, f"sig-{i % 3}")
+
+        events = logger.get_events("sig-1")
+
+        assert len(events) == 3
+        assert all(e.signal_id == "sig-1" for e in events)
+
+    def test_sealed_index_holds_only_its_segment(self, tmp_path):
+        store = SegmentedAuditStore(str(tmp_path), max_segment_events=3)
+        logger = SignalAuditLogger(store=store)
+        _append(logger, "a", 2)
+        _append(logger, "b", 2)
+        store.close()
+
+        # Reopen mid-segment: the rescanned active segment seals correctly
+        store = SegmentedAuditStore(str(tmp_path), max_segment_events=3)
+        logger = SignalAuditLogger(store=store)
+        _append(logger, "c", 2)
+
+        with open(os.path.join(str(tmp_path), "segment-000001.idx.json"), 'r', encoding='utf-8') as f:
+            first = json.load(f)
+        with open(os.path.join(str(tmp_path), "segment-000002.idx.json"), 'r', encoding='utf-8') as f:
+            second = json.load(f)
+
+        assert sorted(first['signals']) == ["a", "b"]
+        assert sorted(second['signals']) == ["b", "c"]
+        assert len(second['signals']['c']) == 2
+        assert [e.signal_id for e in logger.get_events("b")] == ["b", "b"]
+
+    def test_in_memory_lookup_uses_index(self):
+        logger = SignalAuditLogger()
+        _append(logger, "a", 2)
+        _append(logger, "b", 1)
+
+        assert [e.signal_id for e in logger.get_events("a")] == ["a", "a"]
+        assert logger.get_events("missing") == []
+
+
+class TestVerification:
+    """Contract: Incremental verification and tamper detection."""
+
+    def test_incremental_verification(self, tmp_path):
+        logger = SignalAuditLogger(store=SegmentedAuditStore(str(tmp_path), checkpoint_interval=5))
+        _append(logger, "sig-1", 12)
+
+        assert logger.verify_chain() is True
+        assert logger.verify_chain(full=True) is True
+
+    def test_tampering_after_checkpoint_detected(self, tmp_path):
+        store = SegmentedAuditStore(str(tmp_path), checkpoint_interval=5)
+        logger = SignalAuditLogger(store=store)
+        _append(logger, "sig-1", 8)
+        store.close()
+
+        segment = os.path.join(str(tmp_path), "segment-000001.jsonl")
+        with open(segment, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        lines[-1] = lines[-1].replace('"step 7"', '"forged"')
+        with open(segment, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+
+        reopened = SegmentedAuditStore(str(tmp_path), checkpoint_interval=5)
+        assert reopened.verify() is False
+
+
+class TestCompaction:
+    """Contract: Compaction bounds disk usage and keeps the chain verifiable."""
+
+    def test_max_segments_enforced(self, tmp_path):
+        store = SegmentedAuditStore(str(tmp_path), max_segment_events=5, max_segments=2)
+        logger = SignalAuditLogger(store=store)
+        _append(logger, "sig-1", 30)
+
+        segments = [n for n in os.listdir(str(tmp_path)) if n.endswith('.jsonl') and n.startswith('segment-')]
+        assert len(segments) <= 2
+        assert store.verify(full=True) is True
+
+    def test_lookup_after_compaction(self, tmp_path):
+        store = SegmentedAuditStore(str(tmp_path), max_segment_events=5)
+        logger = SignalAuditLogger(store=store)
+        _append(logger, "old", 10)
+        _append(logger, "new", 3)
+
+        removed = store.compact(max_segments=1)
+
+        assert removed == 2
+        assert logger.get_events("old") == []
+        assert len(logger.get_events("new")) == 3
+        assert logger.verify_chain(full=True) is True
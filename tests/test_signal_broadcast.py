@@ -0,0 +1,94 @@
+"""
+tests/test_signal_broadcast.py
+
+Tests for the signal fan-out (signal_broadcast.py): subscriber selection from
+user settings and one chart upload per broadcast (file_id reuse).
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_broadcast import (
+    SUBSCRIPTION_DEFAULTS, SignalBroadcaster, select_subscribers, subscription_matches, subscription_settings
+)
+from telegram_dispatcher import TelegramDispatcher
+
+OWNER = 1
+
+
+class FakeBot:
+    """Returns Message-like objects; photo uploads get a file_id"""
+
+    def __init__(self, fail_chats=()):
+        self.calls = []
+        self.fail_chats = set(fail_chats)
+
+    async def send_message(self, chat_id, text, **kwargs):
+        if chat_id in self.fail_chats:
+            raise RuntimeError('chat not found')
+        self.calls.append(('text', chat_id, text))
+        return SimpleNamespace(chat_id=chat_id, text=text, photo=None)
+
+    async def send_photo(self, chat_id, photo, **kwargs):
+        if chat_id in self.fail_chats:
+            raise RuntimeError('chat not found')
+        kind = 'file_id' if isinstance(photo, str) else 'upload'
+        self.calls.append((kind, chat_id, photo if isinstance(photo, str) else photo.read()))
+        return SimpleNamespace(chat_id=chat_id, photo=[SimpleNamespace(file_id='thumb'), SimpleNamespace(file_id='AgAD')])
+
+
+def _settings(**overrides):
+    return {**SUBSCRIPTION_DEFAULTS, 'auto_signals_subscribed': True, **overrides}
+
+
+def test_subscription_filters():
+    assert subscription_matches(_settings(), 'BTCUSDT', '4h', 61)
+    assert not subscription_matches(SUBSCRIPTION_DEFAULTS, 'BTCUSDT', '4h', 99)
+    assert not subscription_matches(_settings(signal_timeframes=['1d']), 'BTCUSDT', '4h', 99)
+    assert not subscription_matches(_settings(signal_symbols=['ETHUSDT']), 'BTCUSDT', '4h', 99)
+    assert not subscription_matches(_settings(min_confidence=75), 'BTCUSDT', '4h', 74.9)
+
+    settings = {2: _settings(), 3: _settings(signal_symbols=['ETHUSDT']), 4: SUBSCRIPTION_DEFAULTS,
+                5: _settings(), 6: _settings(min_confidence=50)}
+    recipients = select_subscribers([6, 5, 4, 3, 2, OWNER], settings.get, 'BTCUSDT', '1h', 70,
+                                    always=[OWNER], is_authorized=lambda chat_id: chat_id != 5)
+    assert recipients == [OWNER, 2, 6]
+
+
+def test_subscription_settings_do_not_create_entries():
+    bot_data = {2: {'tp': 3.0, 'auto_signals_subscribed': True}, 'kline_cache': object()}
+    recipients = select_subscribers([2, 3, 4], lambda chat_id: subscription_settings(bot_data, chat_id),
+                                    'BTCUSDT', '4h', 70, always=[OWNER])
+
+    assert recipients == [OWNER, 2]
+    assert set(bot_data) == {2, 'kline_cache'} and 'signal_symbols' not in bot_data[2]
+    assert subscription_settings(bot_data, 3) == SUBSCRIPTION_DEFAULTS
+
+
+def test_broadcast_uploads_chart_once():
+    async def scenario(bot, recipients):
+        dispatcher = TelegramDispatcher(chat_interval=0, group_interval=0, global_rate=1000)
+        broadcaster = SignalBroadcaster(dispatcher, batch_size=2)
+        result = await broadcaster.broadcast(bot, recipients, 'BUY BTCUSDT', chart=b'png', caption='BTC')
+        await dispatcher.stop()
+        return result, broadcaster.stats
+
+    bot = FakeBot()
+    result, stats = asyncio.run(scenario(bot, [OWNER, 2, 3, 4, 5]))
+
+    assert result == {'recipients': 5, 'delivered': 5, 'failed': 0}
+    assert [call[1] for call in bot.calls if call[0] == 'text'] == [OWNER, 2, 3, 4, 5]
+    assert [call for call in bot.calls if call[0] == 'upload'] == [('upload', OWNER, b'png')]
+    assert [call[2] for call in bot.calls if call[0] == 'file_id'] == ['AgAD'] * 4
+    assert stats['uploads'] == 1 and stats['photos'] == 5
+
+    # The upload is retried on the next recipient if the first chat fails
+    bot = FakeBot(fail_chats=[OWNER])
+    result, _ = asyncio.run(scenario(bot, [OWNER, 2, 3]))
+    assert result == {'recipients': 3, 'delivered': 2, 'failed': 2}
+    assert [call[:2] for call in bot.calls if call[0] != 'text'] == [('upload', 2), ('file_id', 3)]
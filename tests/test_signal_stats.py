@@ -0,0 +1,121 @@
+"""
+tests/test_signal_stats.py
+
+Tests for the append-only signal stats store (signal_stats.py): rollups,
+day buckets, snapshot + event replay and legacy bot_stats.json migration.
+"""
+
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_stats import SignalStatsStore, confidence_bucket
+
+DAY = datetime(2026, 3, 10, 9, 30)
+
+
+@pytest.fixture
+def stats_file(tmp_path):
+    return str(tmp_path / 'bot_stats.json')
+
+
+def _store(stats_file, **kwargs):
+    store = SignalStatsStore(stats_file, snapshot_interval=kwargs.pop('snapshot_interval', 3600), **kwargs)
+    store.retain_days = 10 ** 5  # fixed test dates must not be pruned
+    store.load()
+    return store
+
+
+def test_record_updates_rollups(stats_file):
+    store = _store(stats_file)
+
+    ids = [
+        store.record('BTCUSDT', '1h', 'BUY', 72.0, entry_price=100.0, timestamp=DAY),
+        store.record('BTCUSDT', '4h', 'STRONG_SELL', 85.5, timestamp=DAY + timedelta(hours=3)),
+        store.record('ETHUSDT', '1h', 'HOLD', 40.0, timestamp=DAY + timedelta(days=1)),
+    ]
+
+    assert ids == [0, 1, 2]
+    summary = store.summary()
+    assert summary['total_signals'] == 3
+    assert summary['by_symbol']['BTCUSDT'] == {'count': 2, 'BUY': 1, 'SELL': 0, 'STRONG_SELL': 1}
+    assert summary['by_timeframe'] == {'1h': {'count': 2}, '4h': {'count': 1}}
+    assert summary['by_confidence'] == {'70-79': {'count': 1}, '80-89': {'count': 1}, '40-49': {'count': 1}}
+
+    day = store.day_rollup(DAY.date())
+    assert day['count'] == 2 and day['by_type'] == {'BUY': 1, 'STRONG_SELL': 1}
+    assert day['confidence_sum'] == pytest.approx(157.5)
+    assert [s['id'] for s in store.signals_for_day(DAY.date())] == [0, 1]
+    assert store.signals_for_day(DAY.date())[0]['entry_price'] == 100.0
+    assert store.day_rollup(date(2020, 1, 1))['count'] == 0
+    assert [s['id'] for s in store.signals_between(DAY + timedelta(hours=1), DAY + timedelta(days=2))] == [1, 2]
+    assert confidence_bucket(79.99) == '70-79'
+
+
+def test_restart_replays_events_after_snapshot(stats_file):
+    store = _store(stats_file)
+    store.record('BTCUSDT', '1h', 'BUY', 70.0, timestamp=DAY)
+    assert store.snapshot() is True
+    assert store.snapshot() is False  # nothing new
+    store.record('BTCUSDT', '1h', 'SELL', 65.0, timestamp=DAY)  # only in the event log
+
+    restarted = _store(stats_file)
+
+    assert restarted.summary() == store.summary()
+    assert restarted.day_rollup(DAY.date()) == store.day_rollup(DAY.date())
+    assert restarted.record('BTCUSDT', '1h', 'BUY', 70.0, timestamp=DAY) == 2
+    with open(restarted.events_file) as f:
+        assert len(f.readlines()) == 3
+
+
+def test_snapshot_keeps_legacy_shape(stats_file):
+    store = _store(stats_file, snapshot_interval=0)
+    store.record('BTCUSDT', '1h', 'BUY', 70.0, timestamp=DAY)
+
+    with open(stats_file) as f:
+        data = json.load(f)
+
+    for key in ('total_signals', 'by_symbol', 'by_timeframe', 'by_confidence', 'signals'):
+        assert key in data
+    assert data['signals'][0]['symbol'] == 'BTCUSDT'
+    assert store.to_dict()['signals'] == data['signals']
+
+
+def test_legacy_file_migrates(stats_file):
+    with open(stats_file, 'w') as f:
+        json.dump({
+            'total_signals': 5,
+            'by_symbol': {'BTCUSDT': {'count': 5, 'BUY': 3, 'SELL': 2}},
+            'by_timeframe': {'1h': {'count': 5}},
+            'by_confidence': {'70-79': {'count': 5}},
+            'signals': [{'symbol': 'BTCUSDT', 'timeframe': '1h', 'type': 'BUY', 'confidence': 75,
+                         'timestamp': DAY.isoformat()}],
+        }, f)
+
+    store = _store(stats_file)
+    assert store.total_signals == 5
+    assert store.day_rollup(DAY.date())['count'] == 1
+
+    store.record('BTCUSDT', '1h', 'SELL', 71.0, timestamp=DAY)
+    store.snapshot()
+    restarted = _store(stats_file)
+    assert restarted.summary()['by_symbol']['BTCUSDT'] == {'count': 6, 'BUY': 3, 'SELL': 3}
+    assert len(restarted.signals_for_day(DAY.date())) == 2
+
+
+def test_partial_trailing_event_is_ignored(stats_file):
+    store = _store(stats_file)
+    store.record('BTCUSDT', '1h', 'BUY', 70.0, timestamp=DAY)
+    with open(store.events_file, 'a') as f:
+        f.write('{"symbol": "BTC')  # crash mid-write
+
+    restarted = _store(stats_file)
+    assert restarted.total_signals == 1
+    restarted.record('BTCUSDT', '1h', 'SELL', 70.0, timestamp=DAY)
+    assert _store(stats_file).total_signals == 2
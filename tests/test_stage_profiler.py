@@ -0,0 +1,99 @@
+"""
+tests/test_stage_profiler.py
+
+Tests for the generate_signal stage profiler (stage_profiler.py): stage
+attribution, bounded histograms, symbol cap and cProfile sampling.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import stage_profiler
+from stage_profiler import OTHER_KEY, TOTAL_STAGE, StageProfiler, histogram_summary, new_histogram, stage
+
+
+def _run(profiler, symbol='BTCUSDT', timeframe='1h', stages=(('fetch', 0.002), ('detect', 0.006))):
+    handle = profiler.begin(symbol, timeframe)
+    for name, seconds in stages:
+        stage(name)
+        time.sleep(seconds)
+    profiler.end(handle)
+
+
+def test_stages_are_attributed_per_key():
+    profiler = StageProfiler()
+    _run(profiler)
+    _run(profiler, symbol='ETHUSDT', timeframe='4h')
+    stage('outside')  # no active run - ignored
+
+    stages = profiler.summary()
+    assert set(stages) == {'fetch', 'detect', TOTAL_STAGE}
+    assert stages['detect']['count'] == 2 and stages['detect']['min'] >= 0.006
+    assert stages[TOTAL_STAGE]['min'] >= stages['fetch']['min'] + stages['detect']['min']
+    assert set(profiler.summary('timeframe', '4h')) == {('4h', 'fetch'), ('4h', 'detect'), ('4h', TOTAL_STAGE)}
+    assert profiler.top_stages()[0][0] == 'detect'
+    assert profiler.outcomes == {'ok': 2}
+
+
+def test_concurrent_runs_do_not_mix():
+    profiler = StageProfiler()
+
+    async def analyze(symbol, pause):
+        handle = profiler.begin(symbol, '1h')
+        stage(f'wait_{symbol}')
+        await asyncio.sleep(pause)
+        profiler.end(handle)
+
+    async def scenario():
+        await asyncio.gather(analyze('A', 0.02), analyze('B', 0.01))
+
+    asyncio.run(scenario())
+    assert set(name for _, name in profiler.summary('symbol', 'A')) == {'wait_A', TOTAL_STAGE}
+
+
+def test_histogram_is_bounded():
+    histogram = new_histogram()
+    buckets = len(histogram._counts)
+    for value in [0.0013] * 90 + [0.37] * 10 + [10 ** 6]:
+        histogram.record(value)
+
+    assert len(histogram._counts) == buckets
+    summary = histogram_summary(histogram)
+    assert summary['count'] == 101 and summary['max'] == 10 ** 6
+    assert abs(summary['p50'] / 0.0013 - 1) <= 0.01  # x2 buckets used to report up to 0.002
+    assert abs(summary['p95'] / 0.37 - 1) <= 0.01
+    assert histogram_summary(new_histogram())['p95'] == 0.0
+
+
+def test_symbol_cap_and_sampling():
+    profiler = StageProfiler(sample_every=2, trace_memory=True, max_symbols=2)
+    for symbol in ('A', 'B', 'C', 'D'):
+        _run(profiler, symbol=symbol, stages=(('work', 0),))
+
+    assert {name[0] for name in profiler.summary('symbol')} == {'A', 'B', OTHER_KEY}
+    assert profiler.summary('symbol', OTHER_KEY)[(OTHER_KEY, TOTAL_STAGE)]['count'] == 2
+    assert len(profiler.reports) == 2
+    assert 'cumulative' in profiler.reports[-1]['profile'] and profiler.reports[-1]['memory_peak'] >= 0
+
+
+def test_generate_signal_is_profiled(monkeypatch):
+    from ict_signal_engine import ICTSignalEngine
+
+    monkeypatch.setattr(stage_profiler, '_profiler', StageProfiler())
+    engine = ICTSignalEngine()
+    engine.cache_manager = None
+    df = pd.DataFrame({'open': [1.0] * 10, 'high': [1.0] * 10, 'low': [1.0] * 10, 'close': [1.0] * 10,
+                       'volume': [1.0] * 10})
+
+    assert engine.generate_signal(df, 'BTCUSDT', '1h') is None  # insufficient data
+
+    profiler = stage_profiler.get_stage_profiler()
+    assert set(profiler.summary()) == {'cache_check', TOTAL_STAGE}
+    assert profiler.outcomes == {'no_signal': 1}
@@ -0,0 +1,132 @@
+"""
+tests/test_telegram_dispatcher.py
+
+Tests for the outbound Telegram queue (telegram_dispatcher.py): priority
+lanes, coalescing of alerts for one position, per-chat rate shaping and
+retry of flood-control / network errors.
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram.error import BadRequest, RetryAfter, TimedOut
+
+from telegram_dispatcher import (
+    COALESCE_SEPARATOR, PRIORITY_ALERT, PRIORITY_CRITICAL, PRIORITY_NEWS, PRIORITY_SIGNAL, TelegramDispatcher
+)
+
+
+class FakeBot:
+    """Records Bot API calls; `failures` is a list of exceptions raised by the next calls"""
+
+    def __init__(self, failures=None):
+        self.calls = []
+        self.failures = list(failures or [])
+
+    async def _call(self, method, **kwargs):
+        if hasattr(kwargs.get('photo'), 'read'):
+            kwargs['photo'] = kwargs['photo'].read()  # an upload consumes the buffer, even if it fails
+        if self.failures:
+            raise self.failures.pop(0)
+        self.calls.append((method, time.monotonic(), kwargs))
+        return {'message_id': len(self.calls), **kwargs}
+
+    async def send_message(self, **kwargs):
+        return await self._call('send_message', **kwargs)
+
+    async def send_photo(self, **kwargs):
+        return await self._call('send_photo', **kwargs)
+
+
+def _dispatcher(**kwargs):
+    kwargs.setdefault('chat_interval', 0)
+    kwargs.setdefault('group_interval', 0)
+    kwargs.setdefault('global_rate', 1000)
+    kwargs.setdefault('base_backoff', 0.01)
+    return TelegramDispatcher(**kwargs)
+
+
+def test_priority_lanes_and_fifo():
+    async def scenario():
+        bot = FakeBot()
+        dispatcher = _dispatcher()
+        dispatcher.send_message(bot, 1, 'news', priority=PRIORITY_NEWS)
+        dispatcher.send_message(bot, 1, 'signal 1', priority=PRIORITY_SIGNAL)
+        dispatcher.send_photo(bot, 1, b'chart', priority=PRIORITY_SIGNAL)
+        future = dispatcher.send_message(bot, 2, 'sl hit', priority=PRIORITY_CRITICAL)
+        dispatcher.send_message(bot, 1, 'halfway', priority=PRIORITY_ALERT)
+
+        assert dispatcher.pending() == 5  # producers return before anything is sent
+        assert await dispatcher.join(timeout=5)
+        assert (await future)['text'] == 'sl hit'
+        await dispatcher.stop()
+        return [kwargs.get('text', kwargs.get('photo')) for _, _, kwargs in bot.calls]
+
+    assert asyncio.run(scenario()) == ['sl hit', 'halfway', 'signal 1', b'chart', 'news']
+
+
+def test_coalescing_alerts_for_one_position():
+    async def scenario():
+        bot = FakeBot()
+        dispatcher = _dispatcher()
+        first = dispatcher.send_message(bot, 1, 'signal', priority=PRIORITY_SIGNAL)
+        halfway = dispatcher.send_message(bot, 1, 'halfway', priority=PRIORITY_ALERT,
+                                          coalesce_key='position:7', parse_mode='HTML')
+        tp_hit = dispatcher.send_message(bot, 1, 'tp hit', priority=PRIORITY_CRITICAL,
+                                         coalesce_key='position:7', parse_mode='HTML')
+        other = dispatcher.send_message(bot, 1, 'plain', priority=PRIORITY_ALERT, coalesce_key='position:7')
+
+        await dispatcher.join(timeout=5)
+        await dispatcher.stop()
+        assert await halfway is await tp_hit
+        assert (await first)['text'] == 'signal' and (await other)['text'] == 'plain'
+        assert dispatcher.stats['coalesced'] == 1
+        return [kwargs['text'] for _, _, kwargs in bot.calls]
+
+    # Merged message is promoted to the critical lane; different options are not merged
+    assert asyncio.run(scenario()) == [f'halfway{COALESCE_SEPARATOR}tp hit', 'plain', 'signal']
+
+
+def test_per_chat_interval_does_not_block_other_chats():
+    async def scenario():
+        bot = FakeBot()
+        dispatcher = _dispatcher(chat_interval=0.2)
+        dispatcher.send_message(bot, 1, 'a1')
+        dispatcher.send_message(bot, 1, 'a2')
+        dispatcher.send_message(bot, 2, 'b1')
+        await dispatcher.join(timeout=5)
+        await dispatcher.stop()
+        return bot.calls
+
+    calls = asyncio.run(scenario())
+    assert [kwargs['text'] for _, _, kwargs in calls] == ['a1', 'b1', 'a2']
+    assert calls[2][1] - calls[0][1] >= 0.19
+
+
+def test_retry_after_timeouts_and_permanent_errors():
+    async def scenario():
+        bot = FakeBot(failures=[RetryAfter(0.05), TimedOut(), BadRequest('chat not found')])
+        dispatcher = _dispatcher(max_retries=1)
+        failed_later = dispatcher.send_message(bot, 1, 'first')
+        started = time.monotonic()
+        await dispatcher.join(timeout=5)
+
+        # RetryAfter + TimedOut retried, then BadRequest fails without retry
+        assert await failed_later is None
+        assert time.monotonic() - started >= 0.05
+        assert dispatcher.stats == {'queued': 1, 'sent': 0, 'coalesced': 0, 'retried': 2, 'failed': 1}
+
+        bot.failures = [TimedOut()]
+        sent = dispatcher.send_photo(bot, 1, io.BytesIO(b'png'))
+        await dispatcher.join(timeout=5)
+        await dispatcher.stop()
+        return await sent
+
+    # The retried upload re-reads the chart from the start
+    assert asyncio.run(scenario())['photo'] == b'png'
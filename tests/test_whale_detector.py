@@ -0,0 +1,89 @@
+"""
+tests/test_whale_detector.py
+
+The vectorized WhaleDetector.detect_whale_blocks must return exactly what
+the per-bar detectors (detect_displacement / detect_fvg /
+detect_wickless_candles / detect_volume_spike) produce bar by bar.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ict_whale_detector import WhaleDetector
+
+
+def _per_bar_blocks(detector, df):
+    """Reference: the original bar-by-bar detection loop."""
+    blocks = []
+    for idx in range(detector.lookback_period, len(df)):
+        is_displacement, displacement_pct = detector.detect_displacement(df, idx)
+        if not is_displacement:
+            continue
+        has_fvg, _ = detector.detect_fvg(df, idx)
+        direction = 'bullish' if df.iloc[idx]['close'] > df.iloc[idx]['open'] else 'bearish'
+        wickless = detector.detect_wickless_candles(df, idx, direction)
+        volume_spike = detector.detect_volume_spike(df, idx)
+        confidence, explanation = detector.calculate_confidence(displacement_pct, has_fvg, wickless, volume_spike)
+        if confidence >= 50:
+            candle = df.iloc[idx]
+            price_level = candle['low'] if direction == 'bullish' else candle['high']
+            blocks.append((price_level, candle['high'], candle['low'], confidence, displacement_pct,
+                           has_fvg, wickless, volume_spike, explanation))
+    return blocks
+
+
+def _as_tuples(blocks):
+    return [(b.price_level, b.zone_high, b.zone_low, b.confidence, b.displacement_pct,
+             b.has_fvg, b.wickless_candles, b.volume_spike, b.explanation) for b in blocks]
+
+
+def _ohlcv(n, seed, as_int=False, with_nans=False):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.015, n) * rng.choice([0.3, 1, 3], n))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.002, n)) * rng.choice([0, 1], n))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.002, n)) * rng.choice([0, 1], n))
+    df = pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close,
+                       'volume': rng.lognormal(10, 0.8, n)})
+    if as_int:
+        df = (df * 100).round().astype('int64')
+    if with_nans:
+        for column in df.columns:
+            df.loc[rng.choice(n, n // 50), column] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('seed', range(6))
+@pytest.mark.parametrize('as_int,with_nans', [(False, False), (True, False), (False, True)])
+def test_matches_per_bar_detection(seed, as_int, with_nans):
+    detector = WhaleDetector(lookback_period=(20, 5, 2)[seed % 3])
+    df = _ohlcv(300, seed, as_int, with_nans)
+
+    expected = _per_bar_blocks(detector, df)
+    result = _as_tuples(detector.detect_whale_blocks(df, timeframe='1h'))
+
+    assert len(expected) > 0
+    assert len(result) == len(expected)
+    for got, want in zip(result, expected):
+        for a, b in zip(got, want):
+            assert a == b or (a != a and b != b)
+
+
+def test_short_and_volumeless_frames():
+    detector = WhaleDetector()
+    df = _ohlcv(120, 7).drop(columns=['volume'])
+
+    assert detector.detect_whale_blocks(df.head(3)) == []
+    assert _as_tuples(detector.detect_whale_blocks(df)) == _per_bar_blocks(detector, df)
+
+
+def test_missing_column_returns_empty():
+    assert WhaleDetector().detect_whale_blocks(pd.DataFrame({'close': np.arange(50.0)})) == []
@@ -0,0 +1,244 @@
+"""
+tests/test_zone_table.py
+
+Tests for the columnar ICT zone table and its price index (zone_table.py)
+and the consumers that query them: entry zone search, obstacle scan, TP
+adjustment, S/R proximity, liquidity distance and nearby-liquidity count.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breaker_block_detector import BreakerBlock, BreakerBlockType
+from fvg_detector import FairValueGap
+from ict_whale_detector import WhaleOrderBlock
+from liquidity_map import LiquidityZone
+from order_block_detector import OrderBlock, OrderBlockType
+from sibi_ssib_detector import SIBISSIBZone
+from zone_table import BEARISH, BULLISH, NEUTRAL, ZoneTable, zone_bounds, zone_table_for
+from zone_explainer import ZoneExplainer
+
+NOW = datetime(2026, 1, 1)
+
+
+def _ob(bottom, top, bullish=True, strength=80.0):
+    kind = OrderBlockType.BULLISH if bullish else OrderBlockType.BEARISH
+    return OrderBlock(top, bottom, kind, NOW, 10, strength, 1.0, 1.5)
+
+
+def _fvg(bottom, top, bullish=True):
+    return FairValueGap(top, bottom, top - bottom, 1.0, bullish, NOW, 12, 65.0)
+
+
+def _whale(low, high, zone_type='sell'):
+    return WhaleOrderBlock(high if zone_type == 'sell' else low, high, low, zone_type, 75, 2.0,
+                           True, 1, 2.5, '1h', NOW)
+
+
+def _liquidity(price, zone_type='BSL'):
+    return LiquidityZone(price, zone_type, 0.8, 3, NOW, NOW, 100.0, confidence=0.7)
+
+
+class TestZoneTable:
+    """Columns are extracted once per zone from every detector shape."""
+
+    def test_columns_from_dataclasses_and_dicts(self):
+        table = ZoneTable.from_components({
+            'order_blocks': [_ob(95, 96), {'type': 'BEARISH_OB', 'zone_low': 104, 'zone_high': 105}],
+            'fvgs': [_fvg(97, 98, bullish=False)],
+            'whale_blocks': [_whale(110, 112, 'buy')],
+            'liquidity_zones': [_liquidity(120.0)],
+            'breaker_blocks': [BreakerBlock(BreakerBlockType.BEARISH_BREAKER, 'BULLISH_OB', 90, 91, 90.5,
+                                            89, 30, 20, 7.5, 2.0, 'ACTIVE')],
+            'sibi_ssib_zones': [SIBISSIBZone('SSIB', 40, 80, 82, 81, 2.0, 'DOWN', 2, True, 6.0, '')],
+            'luxalgo_sr': {'support_zones': [{'price': 93.0}], 'resistance_zones': []},
+        })
+
+        assert len(table) == 8
+        np.testing.assert_array_equal(table.bottom, [95, 104, 97, 110, 120, 90, 80, 93])
+        np.testing.assert_array_equal(table.top, [96, 105, 98, 112, 120, 91, 82, 93])
+        np.testing.assert_array_equal(table.price, [95.5, 104.5, 97.5, 110, 120, 90.5, 81, 93])
+        np.testing.assert_array_equal(table.direction,
+                                      [BULLISH, BEARISH, BEARISH, BULLISH, NEUTRAL, BEARISH, BEARISH, BULLISH])
+        assert table.index[0] == 10 and table.index[1] == -1
+        assert table.strength[0] == 80.0 and np.isnan(table.strength[1]) and table.strength[3] == 75
+        assert table[0] is table.objects[0]
+
+    def test_masks_and_sub_tables(self):
+        table = ZoneTable.from_zones([_ob(95, 96), _ob(99, 101, bullish=False), _ob(0, 0)], 'order_blocks')
+
+        assert table.has_bounds().tolist() == [True, True, False]
+        assert table.overlapping(100, 110).tolist() == [False, True, False]
+        assert table.price_between(95, 96).tolist() == [True, False, False]
+
+        bearish = table[table.bearish()]
+        assert len(bearish) == 1 and bearish.objects[0].type == OrderBlockType.BEARISH
+        assert len(ZoneTable.empty()) == 0
+
+    def test_table_reused_while_lists_unchanged(self):
+        components = {'order_blocks': [_ob(95, 96)], 'fvgs': []}
+
+        first = zone_table_for(components)
+        assert zone_table_for(components) is first
+
+        components['fvgs'].append(_fvg(97, 98))
+        assert len(zone_table_for(components)) == 2
+
+        # Replaced in place with the same length: rebuilt, not served stale
+        components['fvgs'][0] = _fvg(120, 121)
+        assert zone_table_for(components).top[-1] == 121
+
+
+class TestZoneIndex:
+    """Binary-searched range queries match a full scan."""
+
+    @pytest.fixture
+    def table(self):
+        rng = np.random.default_rng(7)
+        bottoms = rng.uniform(90, 110, 300).round(1)
+        zones = [{'bottom': b, 'top': b + w, 'type': 'BULLISH_OB'} for b, w in zip(bottoms, rng.uniform(0, 3, 300))]
+        zones += [{'price': 100.0}, {'type': 'BEARISH_OB'}]  # level-only and bound-less rows
+        return ZoneTable.from_zones(zones, 'order_blocks')
+
+    @pytest.mark.parametrize('low,high', [(95.0, 96.5), (100.0, 100.0), (80.0, 90.0), (108.9, 140.0), (97.0, 96.0)])
+    def test_range_queries_match_scan(self, table, low, high):
+        index = table.price_index()
+
+        with np.errstate(invalid='ignore'):
+            np.testing.assert_array_equal(index.price_between(low, high),
+                                          np.flatnonzero(table.price_between(low, high)))
+            np.testing.assert_array_equal(index.price_between(low, high, inclusive=False),
+                                          np.flatnonzero((table.price > low) & (table.price < high)))
+            np.testing.assert_array_equal(index.overlapping(low, high), np.flatnonzero(table.overlapping(low, high)))
+            np.testing.assert_array_equal(index.price_near(low, 1.5),
+                                          np.flatnonzero(np.abs(table.price - low) <= 1.5))
+
+    def test_nearest(self, table):
+        index = table.price_index()
+        row = index.nearest(100.0)
+
+        assert table.price[row] == 100.0
+        assert row == np.flatnonzero(table.price == 100.0)[0]
+        assert ZoneTable.empty().price_index().nearest(100.0) is None
+
+
+@pytest.fixture(scope='module')
+def engine():
+    ict_signal_engine = pytest.importorskip('ict_signal_engine')
+    return ict_signal_engine.ICTSignalEngine()
+
+
+class TestConsumers:
+    """Engine and explainer queries read the table instead of probing fields."""
+
+    def test_entry_zone_prefers_closer_quality_zone(self, engine):
+        entry_zone, status = engine._calculate_ict_compliant_entry_zone(
+            current_price=100.0,
+            direction='BULLISH',
+            fvg_zones=[_fvg(97, 98), _fvg(101, 102)],
+            order_blocks=[_ob(90, 91, strength=95.0), _ob(95, 96, bullish=False)],
+            sr_levels={'support_zones': [{'price': 93.0, 'strength': 50}]},
+            timeframe='1h'
+        )
+
+        assert status == 'VALID_NEAR'
+        assert entry_zone['source'] == 'FVG'
+        assert entry_zone['center'] == pytest.approx(97.5)
+
+    def test_entry_zone_too_late(self, engine):
+        entry_zone, status = engine._calculate_ict_compliant_entry_zone(
+            current_price=100.0, direction='BEARISH', fvg_zones=[_fvg(97, 98, bullish=False)],
+            order_blocks=[], sr_levels={}, timeframe='1h'
+        )
+
+        assert (entry_zone, status) == (None, 'TOO_LATE')
+
+    def test_obstacles_from_legacy_dicts_unchanged(self, engine):
+        # Before: only dicts with the per-kind scan fields were obstacles - these still are, unchanged
+        components = {
+            'order_blocks': [{'type': 'BEARISH_OB', 'price': 105.0, 'strength': 70}],
+            'fvgs': [{'high': 109.0, 'low': 108.0, 'is_bullish': False}],
+            'whale_blocks': [{'price': 112.0, 'block_type': 'BEARISH'}],
+            'luxalgo_sr': {'resistance_zones': [{'price': 101.0, 'strength': 55}]},
+        }
+
+        obstacles = engine._find_obstacles_in_path(100.0, 120.0, 'LONG', components)
+
+        assert [o['type'] for o in obstacles] == ['RESISTANCE', 'BEARISH_OB', 'BEARISH_FVG', 'BEARISH_WHALE']
+        assert [o['price'] for o in obstacles] == [101.0, 105.0, 108.5, 112.0]
+        assert [o['strength'] for o in obstacles] == [55, 70, 60, 80]
+
+    def test_obstacles_from_detector_dataclasses(self, engine):
+        # After: detector dataclasses (no price / high+low / block_type fields) count too
+        components = {
+            'order_blocks': [_ob(104, 106, bullish=False), _ob(102, 103)],
+            'fvgs': [_fvg(108, 109, bullish=False)],
+            'whale_blocks': [_whale(111, 112, 'sell'), _whale(150, 151, 'sell')],
+        }
+
+        obstacles = engine._find_obstacles_in_path(100.0, 120.0, 'LONG', components)
+
+        # OB/FVG at their mid, whale blocks at price_level
+        assert [o['type'] for o in obstacles] == ['BEARISH_OB', 'BEARISH_FVG', 'BEARISH_WHALE']
+        assert [o['price'] for o in obstacles] == [105.0, 108.5, 112.0]
+        assert [o['strength'] for o in obstacles] == [80.0, 65.0, 75]
+        assert engine._find_obstacles_in_path(100.0, 80.0, 'SHORT', components) == []
+
+        # ... and now move the TP: the bearish OB at 105 rejects a 115 target
+        tp = engine._adjust_tp_before_obstacle(115.0, obstacles, 100.0, 'LONG', risk=1.0, min_rr=2.5)
+        assert tp == pytest.approx(105.0 * (1 - 0.003))
+
+    def test_tp_stops_before_nearest_rejecting_obstacle(self, engine):
+        obstacles = [
+            {'type': 'RESISTANCE', 'price': 112.0, 'strength': 90},
+            {'type': 'BEARISH_OB', 'price': 108.0, 'strength': 85},
+            {'type': 'BEARISH_FVG', 'price': 104.0, 'strength': 40},  # too weak
+        ]
+
+        tp = engine._adjust_tp_before_obstacle(115.0, obstacles, 100.0, 'LONG', risk=2.0, min_rr=2.5)
+
+        assert tp == pytest.approx(108.0 * (1 - 0.003))
+        assert engine._adjust_tp_before_obstacle(106.0, obstacles, 100.0, 'LONG', 2.0, 2.5) == 106.0
+
+    def test_price_near_sr_and_liquidity_distance(self, engine):
+        sr = {'support_zones': [{'price': 95.0}], 'resistance_zones': [{'price': 101.5}]}
+
+        assert engine._check_price_near_sr(100.0, sr) is True
+        assert engine._check_price_near_sr(110.0, sr) is False
+        assert engine._calculate_liquidity_distance(100.0, [{'price_level': 90.0}, {'price_level': 103.0}]) \
+            == pytest.approx(3.0)
+
+    def test_nearest_liquidity_zone_matches_distance(self, engine):
+        zones = [{'price_level': 90.0}, _liquidity(103.0, 'SSL')]
+
+        zone, distance = engine._nearest_liquidity(100.0, zones)
+
+        # The forecast zone is the one the distance was measured to, not the first in the list
+        assert zone is zones[1] and distance == pytest.approx(3.0)
+        assert engine._nearest_liquidity(100.0, []) == (None, None)
+
+    def test_nearby_liquidity_count(self):
+        explainer = ZoneExplainer()
+        legacy = [{'price': 98.5}, {'price': 103.0}, {'price': 130.0}]
+        detected = [_liquidity(100.0), _liquidity(103.0, 'SSL'), _liquidity(130.0)]
+
+        # Before: price_low/price_high zones against liquidity dicts with 'price' - unchanged
+        assert explainer._count_nearby_liquidity({'price_low': 99, 'price_high': 101}, legacy) == 2
+        # After: LiquidityZone (price_level) rows and whale block bounds (zone_low/zone_high) count
+        assert explainer._count_nearby_liquidity({'price_low': 99, 'price_high': 101}, detected) == 2
+        assert explainer._count_nearby_liquidity(_whale(99, 101), legacy + detected) == 4
+        assert explainer._count_nearby_liquidity({'price_low': 0, 'price_high': 0}, legacy) == 0
+        assert explainer._count_nearby_liquidity({'price': 100.0}, legacy) == 0  # level only: no bounds
+
+    def test_zone_bounds(self):
+        assert zone_bounds(_whale(99, 101)) == (99, 101)
+        assert zone_bounds(_fvg(97, 98)) == (97, 98)
+        assert zone_bounds({'price_low': 5, 'price_high': 6}) == (5, 6)
+        assert all(np.isnan(bound) for bound in zone_bounds({'price': 100.0}))
@@ -20,8 +20,10 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import requests
 
+from market_data_backend import binance_url
+
 # Constants
-BINANCE_PRICE_URL = "https://api.binance.com/api/v3/ticker/price"
+BINANCE_PRICE_URL = binance_url('/api/v3/ticker/price')
 
 # Import existing engines (NO MODIFICATIONS to these files)
 try:
@@ -85,17 +87,20 @@ class UnifiedTradeManager:
         monitor_live_trade() - Main monitoring function (called every 60s per position)
     """
     
-    def __init__(self, bot_instance=None):
+    def __init__(self, bot_instance=None, position_manager=None):
         """
         Initialize Unified Trade Manager
         
         Args:
             bot_instance: Telegram bot instance for sending messages
+            position_manager: Shared PositionManager (default: a new one on positions.db)
         """
         self.bot_instance = bot_instance
         
         # Initialize position manager
-        if POSITION_MANAGER_AVAILABLE:
+        if position_manager is not None:
+            self.position_manager = position_manager
+        elif POSITION_MANAGER_AVAILABLE:
             self.position_manager = PositionManager()
         else:
             self.position_manager = None
@@ -149,7 +154,7 @@ class UnifiedTradeManager:
         try:
             logger.info("🔄 Syncing pending trades from journal...")
             from sync_journal_to_positions import sync_journal_to_positions
-            stats = sync_journal_to_positions()
+            stats = sync_journal_to_positions(self.position_manager)
             
             if stats['added'] > 0:
                 logger.info(f"✅ Journal sync complete: {stats['added']} positions added")
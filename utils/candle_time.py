@@ -0,0 +1,135 @@
+"""
+Candle Time Helpers
+Timeframe durations and "last closed candle" detection for kline DataFrames
+
+Binance kline responses include the still-forming candle as the last row.
+Caches keyed on the last *closed* candle stay valid until that timeframe
+actually closes a new candle.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Hashable, Optional
+
+import pandas as pd
+
+# Timeframe → candle duration
+TIMEFRAME_DURATIONS = {
+    '1m': timedelta(minutes=1),
+    '3m': timedelta(minutes=3),
+    '5m': timedelta(minutes=5),
+    '15m': timedelta(minutes=15),
+    '30m': timedelta(minutes=30),
+    '1h': timedelta(hours=1),
+    '2h': timedelta(hours=2),
+    '3h': timedelta(hours=3),
+    '4h': timedelta(hours=4),
+    '6h': timedelta(hours=6),
+    '8h': timedelta(hours=8),
+    '12h': timedelta(hours=12),
+    '1d': timedelta(days=1),
+    '3d': timedelta(days=3),
+    '1w': timedelta(weeks=1),
+}
+
+
+def timeframe_duration(timeframe: str) -> Optional[timedelta]:
+    """
+    Get candle duration for a timeframe string
+
+    Args:
+        timeframe: Timeframe like '1h', '4h', '1D'
+
+    Returns:
+        timedelta or None if unknown
+    """
+    if not timeframe or timeframe.endswith('M'):
+        # '1M' (month) has no fixed duration
+        return None
+    return TIMEFRAME_DURATIONS.get(timeframe.lower())
+
+
+def utc_now_naive() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def candle_open_times(df: pd.DataFrame) -> Optional[pd.DatetimeIndex]:
+    """
+    Extract candle open times (naive UTC) from a kline DataFrame
+
+    Supports a DatetimeIndex or a 'timestamp' column (datetime or ms epoch).
+
+    Returns:
+        DatetimeIndex or None if the frame carries no timestamps
+    """
+    if isinstance(df.index, pd.DatetimeIndex):
+        times = df.index
+    elif 'timestamp' in df.columns:
+        column = df['timestamp']
+        if pd.api.types.is_numeric_dtype(column):
+            times = pd.DatetimeIndex(pd.to_datetime(column, unit='ms'))
+        else:
+            times = pd.DatetimeIndex(pd.to_datetime(column))
+    else:
+        return None
+
+    if times.tz is not None:
+        times = times.tz_convert('UTC').tz_localize(None)
+    return times
+
+
+def last_closed_candle_key(
+    df: pd.DataFrame,
+    timeframe: str,
+    now: Optional[datetime] = None
+) -> Optional[Hashable]:
+    """
+    Identify the most recent closed candle of a kline DataFrame
+
+    Args:
+        df: Kline DataFrame (last row may be the still-forming candle)
+        timeframe: Timeframe of the frame
+        now: Reference time, naive UTC (default: current UTC time)
+
+    Returns:
+        Hashable key that changes only when a new candle closes,
+        or None if it cannot be determined
+    """
+    if df is None or len(df) == 0:
+        return None
+
+    times = candle_open_times(df)
+    duration = timeframe_duration(timeframe)
+
+    if times is None or duration is None:
+        # No timestamps - key on the penultimate row, which is closed
+        if len(df) < 2 or 'close' not in df.columns:
+            return None
+        row = df.iloc[-2]
+        return ('rows', len(df), float(row.get('open', 0)), float(row['close']))
+
+    now = now or utc_now_naive()
+    position = len(df) - 1 if times[-1] + duration <= now else len(df) - 2
+    if position < 0:
+        return None
+    # Close price guards against different series sharing the same timestamps
+    close = float(df['close'].iloc[position]) if 'close' in df.columns else None
+    return (times[position], close)
+
+
+def next_close_after(candle_open: datetime, timeframe: str) -> Optional[datetime]:
+    """
+    Time at which the candle following a closed candle will close
+
+    Until then the closed candle at ``candle_open`` stays the most recent one.
+
+    Args:
+        candle_open: Open time of the last closed candle (naive UTC)
+        timeframe: Timeframe of the candle
+
+    Returns:
+        datetime or None if the timeframe duration is unknown
+    """
+    duration = timeframe_duration(timeframe)
+    if duration is None:
+        return None
+    return candle_open + 2 * duration
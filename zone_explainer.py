@@ -10,6 +10,10 @@ import logging
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+import numpy as np
+
+from zone_table import zone_bounds, zone_table_for
+
 logger = logging.getLogger(__name__)
 
 
@@ -591,39 +595,20 @@ class ZoneExplainer:
             return 0
         
         try:
-            # Get zone price range
-            if hasattr(zone, '__dict__'):
-                zone_dict = zone.__dict__
-            elif hasattr(zone, 'to_dict'):
-                zone_dict = zone.to_dict()
-            else:
-                zone_dict = zone
+            # Get zone price range (any bounds field: price_low/high, zone_low/high, bottom/top, low/high)
+            zone_low, zone_high = zone_bounds(zone)
             
-            zone_low = zone_dict.get('price_low', 0) or zone_dict.get('bottom', 0)
-            zone_high = zone_dict.get('price_high', 0) or zone_dict.get('top', 0)
-            
-            if zone_low == 0 or zone_high == 0:
+            if not (zone_low > 0 and zone_high > 0):  # also False for NaN (no bounds)
                 return 0
             
             zone_mid = (zone_low + zone_high) / 2
             zone_range = zone_high - zone_low
             search_distance = zone_range * 2  # Search within 2x zone size
             
-            # Count nearby liquidity zones
-            count = 0
-            for liq_zone in liquidity_zones:
-                if hasattr(liq_zone, '__dict__'):
-                    liq_dict = liq_zone.__dict__
-                else:
-                    liq_dict = liq_zone
-                
-                liq_price = liq_dict.get('price', 0)
-                if liq_price > 0:
-                    distance = abs(liq_price - zone_mid)
-                    if distance <= search_distance:
-                        count += 1
-            
-            return count
+            # Count nearby liquidity zones (one indexed table per zone list, shared across zones)
+            liquidity = zone_table_for({'liquidity_zones': liquidity_zones}, kinds=('liquidity_zones',))
+            nearby = liquidity.price_index().price_near(zone_mid, search_distance)
+            return int(np.count_nonzero(liquidity.price[nearby] > 0))
             
         except Exception as e:
             logger.error(f"Error counting nearby liquidity: {e}")
@@ -0,0 +1,391 @@
+"""
+Columnar ICT Zone Table
+
+Struct-of-arrays view over the zone lists emitted by the ICT detectors
+(order blocks, FVGs, whale blocks, liquidity zones, breaker/mitigation
+blocks, SIBI/SSIB zones and LuxAlgo S/R zones).
+
+Each zone contributes one row: top / bottom / price / index / strength /
+direction / kind as NumPy columns, and the original object (dataclass or
+dict) in the `objects` side-table so callers keep the dataclass view.
+Field probing happens once per zone here instead of in every consumer;
+consumers filter with vectorized masks and only touch the rows they keep.
+
+Author: galinborisov10-art
+Date: 2026-02-05
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Zone kinds, named after their ict_components keys (column `kind` stores the position)
+KINDS = (
+    'order_blocks',
+    'fvgs',
+    'whale_blocks',
+    'liquidity_zones',
+    'breaker_blocks',
+    'mitigation_blocks',
+    'sibi_ssib_zones',
+    'support_zones',
+    'resistance_zones',
+)
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+# Directions (column `direction`)
+BULLISH = 1
+BEARISH = -1
+NEUTRAL = 0
+
+# Field precedence per column, covering every detector dataclass and its to_dict()
+_TOP_FIELDS = ('top', 'zone_high', 'price_high', 'high')
+_BOTTOM_FIELDS = ('bottom', 'zone_low', 'price_low', 'low')
+_PRICE_FIELDS = ('price', 'price_level')
+_INDEX_FIELDS = ('candle_index', 'index', 'start_idx', 'start_index', 'bar_index')
+_STRENGTH_FIELDS = ('strength', 'confidence')
+
+_DIRECTION_WORDS = (
+    ('BULLISH', BULLISH), ('BEARISH', BEARISH),
+    ('SSIB', BEARISH), ('SIBI', BULLISH),  # SIBI: bullish displacement, SSIB: bearish
+)
+_ZONE_TYPE_DIRECTIONS = {'BUY': BULLISH, 'BULLISH': BULLISH, 'SELL': BEARISH, 'BEARISH': BEARISH}
+_KIND_DIRECTIONS = {'support_zones': BULLISH, 'resistance_zones': BEARISH}
+
+
+def _field(zone: Any, name: str) -> Any:
+    if isinstance(zone, dict):
+        return zone.get(name)
+    return getattr(zone, name, None)
+
+
+def _number(value: Any) -> float:
+    """Numeric field value as float, NaN when missing or not a number"""
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+        return float(value)
+    return np.nan
+
+
+def _first_number(zone: Any, names: Sequence[str]) -> float:
+    for name in names:
+        value = _field(zone, name)
+        if value is not None:
+            return _number(value)
+    return np.nan
+
+
+def zone_bounds(zone: Any) -> Tuple[float, float]:
+    """
+    (bottom, top) of one zone, with the same field precedence as the table columns
+
+    Args:
+        zone: Detector dataclass or dict
+
+    Returns:
+        (bottom, top); a bound without a field is NaN (level-only zones have no bounds)
+    """
+    return _first_number(zone, _BOTTOM_FIELDS), _first_number(zone, _TOP_FIELDS)
+
+
+def _direction(zone: Any, kind: str) -> int:
+    """+1 bullish, -1 bearish, 0 when the zone carries no direction"""
+    is_bullish = _field(zone, 'is_bullish')
+    if isinstance(is_bullish, (bool, np.bool_)):
+        return BULLISH if is_bullish else BEARISH
+
+    for name in ('type', 'block_type'):  # block_type: legacy whale block dicts
+        zone_type = _field(zone, name)
+        if zone_type is not None:
+            type_str = str(getattr(zone_type, 'value', zone_type)).upper()
+            for word, direction in _DIRECTION_WORDS:
+                if word in type_str:
+                    return direction
+
+    zone_type = _field(zone, 'zone_type')
+    if isinstance(zone_type, str) and zone_type.upper() in _ZONE_TYPE_DIRECTIONS:
+        return _ZONE_TYPE_DIRECTIONS[zone_type.upper()]
+
+    is_support = _field(zone, 'is_support')
+    if isinstance(is_support, (bool, np.bool_)):
+        return BULLISH if is_support else BEARISH
+
+    original = _field(zone, 'original_ob')  # mitigation blocks keep their OB's direction
+    if original is not None and original is not zone:
+        return _direction(original, kind)
+
+    return _KIND_DIRECTIONS.get(kind, NEUTRAL)
+
+
+class ZoneTable:
+    """
+    Struct-of-arrays table of ICT zones
+
+    Columns (all length n):
+        top, bottom: zone bounds (a level-only zone has top == bottom == price)
+        price: explicit price / price_level, else the zone mid
+        index: originating candle index, -1 when unknown
+        strength: strength / confidence, NaN when missing
+        direction: +1 bullish, -1 bearish, 0 neutral
+        kind: position in KINDS
+
+    `objects` holds the source zone of each row, so masks map straight
+    back to the detector dataclasses.
+    """
+
+    _COLUMNS = ('top', 'bottom', 'price', 'index', 'strength', 'direction', 'kind')
+    __slots__ = _COLUMNS + ('objects', '_price_index')
+
+    def __init__(
+        self,
+        top: np.ndarray,
+        bottom: np.ndarray,
+        price: np.ndarray,
+        index: np.ndarray,
+        strength: np.ndarray,
+        direction: np.ndarray,
+        kind: np.ndarray,
+        objects: List[Any]
+    ):
+        self.top = top
+        self.bottom = bottom
+        self.price = price
+        self.index = index
+        self.strength = strength
+        self.direction = direction
+        self.kind = kind
+        self.objects = objects
+        self._price_index = None
+
+    # ==================== CONSTRUCTION ====================
+
+    @classmethod
+    def empty(cls) -> 'ZoneTable':
+        return cls.from_zones([], KINDS[0])
+
+    @classmethod
+    def from_zones(cls, zones: Optional[Iterable[Any]], kind: str) -> 'ZoneTable':
+        """
+        Build a table from one detector's zone list
+
+        Args:
+            zones: Dataclass instances and/or dicts (None counts as empty)
+            kind: One of KINDS
+
+        Returns:
+            ZoneTable with one row per zone, in list order
+        """
+        if kind not in KIND_CODES:
+            raise ValueError(f"Unknown zone kind: {kind}")
+
+        objects = [zone for zone in (zones or []) if zone is not None]
+        rows = []
+        for zone in objects:
+            price = _first_number(zone, _PRICE_FIELDS)
+            bottom, top = zone_bounds(zone)
+            if np.isnan(top) and np.isnan(bottom):
+                top = bottom = price
+            if np.isnan(price):
+                price = (top + bottom) / 2
+            index = _first_number(zone, _INDEX_FIELDS)
+            rows.append((top, bottom, price, -1 if np.isnan(index) else int(index),
+                         _first_number(zone, _STRENGTH_FIELDS), _direction(zone, kind)))
+
+        columns = list(zip(*rows)) if rows else [()] * 6
+        return cls(
+            top=np.array(columns[0], dtype=np.float64),
+            bottom=np.array(columns[1], dtype=np.float64),
+            price=np.array(columns[2], dtype=np.float64),
+            index=np.array(columns[3], dtype=np.int64),
+            strength=np.array(columns[4], dtype=np.float64),
+            direction=np.array(columns[5], dtype=np.int8),
+            kind=np.full(len(objects), KIND_CODES[kind], dtype=np.int8),
+            objects=objects
+        )
+
+    @classmethod
+    def from_components(cls, components: Dict, kinds: Sequence[str] = KINDS) -> 'ZoneTable':
+        """
+        Build one table from an ict_components dict
+
+        S/R kinds are read from components['luxalgo_sr']; other kinds from
+        the component list of the same name.
+        """
+        return cls.concat([cls.from_zones(zones, kind) for kind, zones in _component_lists(components, kinds)])
+
+    @classmethod
+    def concat(cls, tables: Sequence['ZoneTable']) -> 'ZoneTable':
+        if not tables:
+            return cls.empty()
+        if len(tables) == 1:
+            return tables[0]
+        objects = []
+        for table in tables:
+            objects.extend(table.objects)
+        return cls(*(np.concatenate([getattr(t, name) for t in tables]) for name in cls._COLUMNS),
+                   objects=objects)
+
+    # ==================== ACCESS ====================
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.objects)
+
+    def __getitem__(self, selector):
+        """Row object for an int; a sub-table for a boolean mask or index array"""
+        if isinstance(selector, (int, np.integer)):
+            return self.objects[selector]
+        rows = np.flatnonzero(selector) if np.asarray(selector).dtype == bool else np.asarray(selector, dtype=np.int64)
+        return ZoneTable(*(getattr(self, name)[rows] for name in self._COLUMNS),
+                         objects=[self.objects[i] for i in rows.tolist()])
+
+    @property
+    def mid(self) -> np.ndarray:
+        return (self.top + self.bottom) / 2
+
+    def rows(self, mask: Optional[np.ndarray] = None) -> List[int]:
+        """Row positions where mask holds (all rows when mask is None)"""
+        if mask is None:
+            return list(range(len(self)))
+        return np.flatnonzero(mask).tolist()
+
+    def price_index(self) -> 'ZoneIndex':
+        """Sorted price / interval index over this table (built on first use)"""
+        if self._price_index is None:
+            self._price_index = ZoneIndex(self)
+        return self._price_index
+
+    # ==================== MASKS ====================
+
+    def of_kind(self, *kinds: str) -> np.ndarray:
+        return np.isin(self.kind, [KIND_CODES[kind] for kind in kinds])
+
+    def bullish(self) -> np.ndarray:
+        return self.direction == BULLISH
+
+    def bearish(self) -> np.ndarray:
+        return self.direction == BEARISH
+
+    def has_bounds(self) -> np.ndarray:
+        """Both bounds present and non-zero"""
+        with np.errstate(invalid='ignore'):
+            return (self.top != 0) & (self.bottom != 0) & ~np.isnan(self.top) & ~np.isnan(self.bottom)
+
+    def overlapping(self, low: float, high: float) -> np.ndarray:
+        """Zones whose [bottom, top] range intersects [low, high]"""
+        with np.errstate(invalid='ignore'):
+            return (self.bottom <= high) & (self.top >= low)
+
+    def price_between(self, low: float, high: float) -> np.ndarray:
+        """Zones whose price lies in [low, high]"""
+        with np.errstate(invalid='ignore'):
+            return (self.price >= low) & (self.price <= high)
+
+
+class ZoneIndex:
+    """
+    Price and interval index over a ZoneTable
+
+    Zone prices are kept sorted, and zone intervals are sorted by bottom with
+    the widest zone width remembered. Range queries binary-search the
+    bounds and touch only the k matching rows: O(log n + k). Overlap
+    queries also visit zones that start up to one max-width below the range.
+    All queries return row positions in ascending row order.
+    """
+
+    def __init__(self, table: ZoneTable):
+        self.table = table
+
+        rows = np.flatnonzero(~np.isnan(table.price))
+        self._price_rows = rows[np.argsort(table.price[rows], kind='stable')]
+        self._prices = table.price[self._price_rows]
+
+        rows = np.flatnonzero(~np.isnan(table.bottom) & ~np.isnan(table.top))
+        self._bottom_rows = rows[np.argsort(table.bottom[rows], kind='stable')]
+        self._bottoms = table.bottom[self._bottom_rows]
+        widths = table.top[rows] - table.bottom[rows]
+        self._max_width = float(widths.max()) if len(widths) and widths.max() > 0 else 0.0
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def price_between(self, low: float, high: float, inclusive: bool = True) -> np.ndarray:
+        """Rows with low <= price <= high (strict bounds when inclusive is False)"""
+        start = np.searchsorted(self._prices, low, side='left' if inclusive else 'right')
+        stop = np.searchsorted(self._prices, high, side='right' if inclusive else 'left')
+        return np.sort(self._price_rows[start:max(start, stop)])
+
+    def price_near(self, price: float, distance: float) -> np.ndarray:
+        """Rows with abs(zone price - price) <= distance"""
+        margin = abs(distance) * 1e-9  # candidates slightly wider, then the exact test
+        rows = self.price_between(price - distance - margin, price + distance + margin)
+        return rows[np.abs(self.table.price[rows] - price) <= distance]
+
+    def overlapping(self, low: float, high: float) -> np.ndarray:
+        """Rows whose [bottom, top] range intersects [low, high]"""
+        start = np.searchsorted(self._bottoms, low - self._max_width, side='left')
+        stop = np.searchsorted(self._bottoms, high, side='right')
+        rows = self._bottom_rows[start:max(start, stop)]
+        return np.sort(rows[self.table.top[rows] >= low])
+
+    def nearest(self, price: float) -> Optional[int]:
+        """Row whose price is closest to price (earliest row on ties), None when empty"""
+        if not len(self._prices):
+            return None
+        pos = int(np.searchsorted(self._prices, price))
+        best = None
+        for candidate in (pos - 1, pos):
+            if 0 <= candidate < len(self._prices):
+                distance = abs(self._prices[candidate] - price)
+                if best is None or distance < best[0]:
+                    best = (distance, candidate)
+        # Equal prices may span several sorted positions; pick the earliest row among them
+        tied = self.price_near(price, best[0])
+        return int(tied[0]) if len(tied) else int(self._price_rows[best[1]])
+
+
+def _component_lists(components: Dict, kinds: Sequence[str]) -> List[Tuple[str, Any]]:
+    lists = []
+    sr_data = components.get('luxalgo_sr') if isinstance(components, dict) else None
+    for kind in kinds:
+        if kind in ('support_zones', 'resistance_zones'):
+            zones = sr_data.get(kind) if isinstance(sr_data, dict) else None
+        else:
+            zones = components.get(kind)
+        lists.append((kind, zones if isinstance(zones, (list, tuple)) else None))
+    return lists
+
+
+# Latest table per kinds signature built by zone_table_for(): kinds -> (rows per kind, table)
+_recent_tables: Dict[Tuple[str, ...], Tuple[Tuple[int, ...], ZoneTable]] = {}
+
+
+def zone_table_for(components: Dict, kinds: Sequence[str] = KINDS) -> ZoneTable:
+    """
+    Zone table for an ict_components dict, reused while its zones are unchanged
+
+    Consumers of the same signal (entry zone, obstacle scan, explanations)
+    share one build per kinds signature. A hit needs the very same zone
+    objects in the same order and kinds, so lists edited in place (append,
+    remove, replace) are rebuilt; zones themselves are treated as immutable
+    once detected.
+    """
+    kinds = tuple(kinds)
+    lists = _component_lists(components, kinds)
+    zones = [[zone for zone in (source or []) if zone is not None] for _, source in lists]
+    counts = tuple(len(kind_zones) for kind_zones in zones)
+
+    cached = _recent_tables.get(kinds)
+    if cached is not None and cached[0] == counts:
+        objects = cached[1].objects
+        if all(a is b for a, b in zip(objects, (zone for kind_zones in zones for zone in kind_zones))):
+            return cached[1]
+
+    table = ZoneTable.concat([ZoneTable.from_zones(kind_zones, kind) for (kind, _), kind_zones in zip(lists, zones)])
+    _recent_tables[kinds] = (counts, table)
+    return table